@@ -13,8 +13,12 @@
 # -----------------------------------------------------------------------------
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import norm
+
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+
+sns = diferido('seaborn')
+norm = diferido('scipy.stats', 'norm')
 
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # -----------------------------------------------------------------------------
@@ -97,14 +101,11 @@ fig.text(0.5, 0.01, '© Alejandro Quintero Ruiz. Generado con Python.',
 # Se guarda la imagen en formato SVG (vectorial, escalable y de alta calidad).
 # El formato PDF también es una excelente alternativa.
 # Para PNG, se recomienda un DPI alto, ej: dpi=300.
-output_filename_svg = 'distribucion_normal_gaussiana.svg'
-output_filename_pdf = 'distribucion_normal_gaussiana.pdf'
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_pdf, format='pdf', bbox_inches='tight')
+# Ambos formatos se exportan con un único cálculo de layout.
+output_filename_svg, output_filename_pdf = guardar_figura(
+    fig, 'distribucion_normal_gaussiana', formatos=('svg', 'pdf'))
 
-# Opcional: Guardar en formato PNG de alta resolución.
-# plt.savefig('distribucion_normal_gaussiana.png', format='png', dpi=300, bbox_inches='tight')
+# Opcional: Añadir 'png' a `formatos` para una copia de alta resolución (300 DPI).
 
 # Opcional: Mostrar el gráfico en una ventana emergente al ejecutar el script.
 plt.show()
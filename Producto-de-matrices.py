@@ -2,6 +2,8 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from utilidades.exportacion import guardar_figura
+
 # 2. Definición de Datos/Parámetros Matemáticos
 # Dimensiones simbólicas para la visualización.
 # Estos valores controlan la proporción de los rectángulos.
@@ -123,11 +125,8 @@ if __name__ == "__main__":
     # 5. Bloque de Guardado/Exportación del Archivo
     # Guardar en formato SVG para máxima calidad y escalabilidad.
     # También se guarda en PNG de alta resolución como alternativa.
-    nombre_archivo_svg = "producto_matrices_visualizacion.svg"
-    nombre_archivo_png = "producto_matrices_visualizacion.png"
-
-    figura.savefig(nombre_archivo_svg, format='svg', bbox_inches='tight')
-    figura.savefig(nombre_archivo_png, format='png', dpi=300, bbox_inches='tight')
+    nombre_archivo_svg, nombre_archivo_png = guardar_figura(
+        figura, "producto_matrices_visualizacion", formatos=('svg', 'png'))
 
     print(f"Gráfico guardado exitosamente como '{nombre_archivo_svg}' y '{nombre_archivo_png}'.")
 
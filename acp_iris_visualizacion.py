@@ -1,27 +1,36 @@
 # 1. IMPORTACIÓN DE LIBRERÍAS
 import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.datasets import load_iris
 
-# 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion_por_categoria
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+from utilidades.medicion import etapa
 
-# Cargar el conjunto de datos Iris
-iris = load_iris()
-X = iris.data
-y = iris.target
-target_names = iris.target_names
+sns = diferido('seaborn')
+load_iris = diferido('sklearn.datasets', 'load_iris')
 
-# Escalar los datos antes de aplicar PCA
-# PCA es sensible a la escala de las variables, por lo que estandarizamos
-# para que cada característica tenga media 0 y desviación estándar 1.
-X_scaled = StandardScaler().fit_transform(X)
+# 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 
-# Aplicar PCA para reducir de 4 a 2 dimensiones
-pca = PCA(n_components=2)
-principal_components = pca.fit_transform(X_scaled)
+# Solver del ACP: 'covarianza', 'aleatorizado' (SVD aleatorizada, solo los
+# componentes dibujados; para datos con miles de columnas) o 'auto'.
+SOLVER_ACP = 'auto'
+
+# Cargar el conjunto de datos Iris
+with etapa('datos'):
+    iris = load_iris()
+    X = iris.data
+    y = iris.target
+    target_names = iris.target_names
+
+with etapa('ajuste_modelo'):
+    # Aplicar PCA para reducir de 4 a 2 dimensiones
+    # PCA es sensible a la escala de las variables, por lo que estandarizamos
+    # para que cada característica tenga media 0 y desviación estándar 1.
+    pca = ACPIncremental(n_components=2, estandarizar=True, solver=SOLVER_ACP)
+    principal_components = pca.fit_transform(X)
+    print(f"ACP (solver {pca.solver_}): error relativo de aproximación {pca.error_aproximacion_:.3f}")
 
 # Crear un DataFrame de pandas con los componentes principales y las especies
 # para facilitar la visualización con seaborn.
@@ -41,7 +50,7 @@ def generar_grafico_pca(df, pca_instance):
 
     Args:
         df (pd.DataFrame): DataFrame con los componentes principales y las especies.
-        pca_instance (PCA): Instancia de PCA ajustada para obtener la varianza explicada.
+        pca_instance (ACPIncremental): Instancia de PCA ajustada para obtener la varianza explicada.
     """
     # --- Configuración de Estilo Profesional ---
     # Usamos un estilo limpio y profesional de seaborn
@@ -54,17 +63,19 @@ def generar_grafico_pca(df, pca_instance):
     fig, ax = plt.subplots(figsize=(12, 6.75))
 
     # --- Creación del Gráfico Principal (Scatterplot) ---
-    sns.scatterplot(
-        x='Componente Principal 1',
-        y='Componente Principal 2',
-        hue='Especie',
-        data=df,
-        palette=color_palette,
+    # Con muchos puntos se dibuja como imagen de densidad, mezclando los
+    # colores de las especies en cada celda.
+    especies = df['Especie'].unique()
+    dispersion_por_categoria(
+        ax,
+        df['Componente Principal 1'],
+        df['Componente Principal 2'],
+        df['Especie'],
+        colores=dict(zip(especies, color_palette)),
         s=100,  # Tamaño de los puntos
         alpha=0.8, # Transparencia
         edgecolor='k', # Borde negro para los puntos
-        linewidth=0.5,
-        ax=ax
+        linewidth=0.5
     )
 
     # --- Ajustes Estéticos, Etiquetas y Títulos ---
@@ -103,9 +114,8 @@ fig, ax = generar_grafico_pca(principal_df, pca)
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # Guardar la imagen en formatos de alta calidad
 # SVG: Formato vectorial, ideal para escalabilidad infinita
-plt.savefig('pca_iris_visualization.svg', format='svg', bbox_inches='tight')
 # PNG: Formato de raster, con alta resolución (DPI) para compatibilidad
-plt.savefig('pca_iris_visualization.png', format='png', dpi=300, bbox_inches='tight')
+guardar_figura(fig, 'pca_iris_visualization', formatos=('svg', 'png'))
 
 # Mostrar el gráfico (opcional, útil en entornos interactivos como Jupyter)
 plt.show()
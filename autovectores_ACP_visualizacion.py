@@ -6,11 +6,16 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from datetime import datetime
 
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion
+from utilidades.exportacion import guardar_figura
+from utilidades.muestreo import generador_figura, normal_multivariante
+
 # ----------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ----------------------------------------------------
 # Configuración para la generación de datos sintéticos
-np.random.seed(42)
+generador = generador_figura('autovectores_ACP_visualizacion')
 num_puntos = 300
 media = [0, 0]
 # Matriz de covarianza para generar datos con correlación
@@ -19,20 +24,15 @@ cov_generacion = [[1, 0.8],
                   [0.8, 1]]
 
 # Generación de los datos
-datos = np.random.multivariate_normal(media, cov_generacion, num_puntos)
+datos = normal_multivariante(media, cov_generacion, num_puntos, generador)
 
 # Cálculo de la matriz de covarianza S a partir de los datos generados
-# ddof=1 para una estimación insesgada de la covarianza de la muestra
-S = np.cov(datos, rowvar=False, ddof=1)
-
-# Cálculo de autovalores (λ) y autovectores (w) de la matriz de covarianza S
-autovalores, autovectores = np.linalg.eig(S)
-
-# Ordenar autovectores y autovalores de mayor a menor
-# Esto es crucial en PCA, ya que nos interesa el componente de mayor varianza
-idx_ordenados = np.argsort(autovalores)[::-1]
-autovalores = autovalores[idx_ordenados]
-autovectores = autovectores[:, idx_ordenados]
+# (estimación insesgada, ddof=1) y de sus autovalores (λ) y autovectores (w),
+# ordenados de mayor a menor: en PCA nos interesa el componente de mayor varianza
+acp = ACPIncremental().fit(datos)
+S = acp.covariance_
+autovalores = acp.explained_variance_
+autovectores = acp.components_.T
 
 # Asignar los componentes principales (autovectores) y sus autovalores
 w1, w2 = autovectores[:, 0], autovectores[:, 1]
@@ -63,7 +63,7 @@ def generar_grafico_pca():
 
     # --- Dibujo de Elementos ---
     # Nube de puntos
-    ax.scatter(datos[:, 0], datos[:, 1], alpha=0.6, c=color_datos, label='Datos Sintéticos')
+    dispersion(ax, datos[:, 0], datos[:, 1], alpha=0.6, color=color_datos, label='Datos Sintéticos')
 
     # Dibujar autovectores (w1 y w2) como flechas desde el origen
     # Se escalan por el autovalor para que su longitud represente la varianza
@@ -137,11 +137,8 @@ fig.text(0.98, 0.02, copyright_texto,
 # ----------------------------------------------------
 # Usar bbox_inches='tight' para asegurar que todo (títulos, etiquetas) se guarde
 # dpi=300 es un buen estándar para publicaciones y presentaciones
-nombre_archivo_svg = "visualizacion_pca_autovectores.svg"
-nombre_archivo_png = "visualizacion_pca_autovectores.png"
-
-plt.savefig(nombre_archivo_svg, format='svg', bbox_inches='tight')
-plt.savefig(nombre_archivo_png, format='png', dpi=300, bbox_inches='tight')
+nombre_archivo_svg, nombre_archivo_png = guardar_figura(
+    fig, "visualizacion_pca_autovectores", formatos=('svg', 'png'))
 
 # Mostrar el gráfico (opcional)
 plt.show()
@@ -10,6 +10,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from utilidades.exportacion import guardar_figura
+
 # 2. DEFINICIÓN DE DATOS/PARÁMETROS (Conceptuales para la estructura del gráfico)
 
 # Coordenadas para las neuronas de cada capa
@@ -109,16 +111,10 @@ if __name__ == '__main__':
     # Ajustar el layout para que no se corten los elementos
     fig.tight_layout(rect=[0, 0.03, 1, 0.95]) # rect=[left, bottom, right, top]
 
-    # Guardar en formato vectorial SVG (ideal para escalabilidad y calidad)
-    output_filename_svg = "backpropagation_diagram.svg"
-    fig.savefig(output_filename_svg, format='svg', dpi=300, bbox_inches='tight')
-
-    # Opcional: Guardar en formato PDF y PNG de alta resolución
-    output_filename_pdf = "backpropagation_diagram.pdf"
-    fig.savefig(output_filename_pdf, format='pdf', dpi=300, bbox_inches='tight')
-
-    output_filename_png = "backpropagation_diagram.png"
-    fig.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+    # Guardar en formato vectorial SVG (ideal para escalabilidad y calidad),
+    # además de PDF y PNG de alta resolución, con un único cálculo de layout.
+    output_filename_svg, output_filename_pdf, output_filename_png = guardar_figura(
+        fig, "backpropagation_diagram")
 
     print(f"Gráfico guardado exitosamente en los siguientes formatos:")
     print(f"- {output_filename_svg}")
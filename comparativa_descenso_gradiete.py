@@ -1,16 +1,28 @@
 # -*- coding: utf-8 -*-
 """
 Script para generar un gráfico comparativo de variantes del Descenso del Gradiente.
-Visualiza los caminos de optimización de GD, SGD y Adam en una superficie de pérdida.
+Visualiza los caminos de optimización de GD, SGD, Momentum, RMSProp y Adam en una
+superficie de pérdida, junto con sus curvas de convergencia.
+
+Importar el módulo no dibuja nada: la figura se genera con
+`figura_comparativa(ParametrosComparativa(...))` o desde `utilidades.registro`.
 """
 
 # ==============================================================================
 # 1. IMPORTACIÓN DE LIBRERÍAS
 # ==============================================================================
 import numpy as np
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.patheffects as path_effects
 
+from utilidades.cache_superficies import malla_adaptativa_memoizada
+from utilidades.malla_adaptativa import NIVEL_MAXIMO
+from utilidades.optimizadores import optimizar
+from utilidades.puntos_criticos import minimos, puntos_criticos
+from utilidades.registro import Parametros, exportar, nueva_figura, registrar
+from utilidades.trayectorias import decimar
+
 # ==============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ==============================================================================
@@ -26,44 +38,51 @@ def loss_function(w1, w2):
         + 0.1 * w1
     )
 
-# Generamos los datos para la superficie de contorno
-w1_space = np.linspace(-5, 5, 400)
-w2_space = np.linspace(-7, 7, 400)
-W1, W2 = np.meshgrid(w1_space, w2_space)
-Z = loss_function(W1, W2)
-
-# Mínimos (aproximados para la visualización)
-global_minimum = np.array([-1.15, 3.9])
-local_minimum = np.array([2.9, -2.5])
-start_point = np.array([-4.5, -6.0])
-
-# Simulación de las trayectorias de optimización (conceptual)
-# Estos no son resultados de una ejecución real, sino representaciones artísticas
-# para ilustrar el comportamiento teórico de cada algoritmo.
-
-# GD (Batch): Camino suave y directo hacia el mínimo más cercano.
-path_gd = np.array([
-    [-4.5, -6.0], [-3.2, -4.5], [-2.5, -3.8], [0.5, -3.0], [2.0, -2.6], [2.9, -2.5]
-])
-
-# SGD: Camino ruidoso que explora más y escapa del mínimo local.
-path_sgd = np.array([
-    [-4.5, -6.0], [-4.0, -4.0], [-2.5, -5.0], [-3.5, -3.0], [-1.5, -3.5],
-    [-2.0, -1.5], [0.0, -1.0], [-1.0, 1.0], [-0.5, 3.0], [-1.5, 3.5], [-1.15, 3.9]
-])
-
-# Adam: Camino eficiente y adaptativo hacia el mínimo global.
-path_adam = np.array([
-    [-4.5, -6.0], [-3.0, -3.5], [-1.5, -1.0], [-1.0, 2.0], [-1.2, 3.5], [-1.15, 3.9]
-])
+# Parámetros de la figura. Cada optimizador se ejecuta sobre `loss_function`
+# desde el mismo punto de inicio; el SGD usa el gradiente exacto más un ruido
+# gaussiano con semilla fija, que imita la estimación del gradiente con minilotes.
+class ParametrosComparativa(Parametros):
+    w1_lim = (-5, 5)
+    w2_lim = (-7, 7)
+    niveles = 20
+    nivel_maximo = NIVEL_MAXIMO   # Resolución máxima de la malla adaptativa
+    start_point = (-4.5, -6.0)
+    num_iteraciones = 2000
+    semilla = 0                   # Semilla del ruido del SGD
+    optimizadores = {
+        'gd':       {'label': 'GD (Estándar)',     'tasa': 0.1,  'hiper': {}},
+        'sgd':      {'label': 'SGD (Estocástico)', 'tasa': 0.1,  'hiper': {'ruido': 1.0}},
+        'momentum': {'label': 'Momentum',          'tasa': 0.02, 'hiper': {'beta': 0.9}},
+        'rmsprop':  {'label': 'RMSProp',           'tasa': 0.05, 'hiper': {}},
+        'adam':     {'label': 'Adam (Adaptativo)', 'tasa': 0.1,  'hiper': {}},
+    }
+    nombre_archivo = 'comparativa_descenso_gradiente'
+
+
+def simular_optimizadores(parametros):
+    """
+    Ejecuta cada optimizador desde el punto de inicio común.
+
+    Returns:
+        tuple: ({método: trayectoria (pasos + 1, 2)}, {método: pérdidas}); cada
+        optimizador se detiene al converger, como mucho tras `num_iteraciones` pasos.
+    """
+    paths, losses = {}, {}
+    for metodo, config in parametros.optimizadores.items():
+        hiper = dict(config['hiper'])
+        if metodo == 'sgd':
+            hiper.setdefault('semilla', parametros.semilla)
+        trayectoria, perdida = optimizar(metodo, loss_function, [np.asarray(parametros.start_point, dtype=float)],
+                                         config['tasa'], parametros.num_iteraciones, **hiper)
+        paths[metodo], losses[metodo] = trayectoria[:, 0, :], perdida[:, 0]
+    return paths, losses
 
 # ==============================================================================
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
 # ==============================================================================
 
 # Configuración del estilo (profesional, limpio, moderno)
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams.update({
+ESTILO = {
     'font.family': 'sans-serif',
     'font.sans-serif': 'Arial', # Fuente clara y profesional
     'axes.labelsize': 12,
@@ -73,57 +92,110 @@ plt.rcParams.update({
     'figure.titlesize': 16,
     'axes.titleweight': 'bold',
     'axes.labelweight': 'bold'
-})
+}
 
 # Paleta de colores armónica y amigable con el daltonismo
-colors = {'gd': '#377eb8', 'sgd': '#ff7f00', 'adam': '#4daf4a'}
-
-# Creación de la figura y los ejes (aspecto 16:9 para PowerPoint)
-fig, ax = plt.subplots(figsize=(12, 6.75))
-
-# Dibujar los contornos de la función de pérdida
-contour = ax.contourf(W1, W2, Z, levels=20, cmap='viridis_r', alpha=0.85)
-ax.contour(W1, W2, Z, levels=20, colors='white', linewidths=0.3, alpha=0.5)
-
-# Dibujar las trayectorias
-for path, label, color in [(path_gd, 'GD (Estándar)', colors['gd']),
-                           (path_sgd, 'SGD (Estocástico)', colors['sgd']),
-                           (path_adam, 'Adam (Adaptativo)', colors['adam'])]:
-    ax.plot(path[:, 0], path[:, 1], marker='o', markersize=4, linestyle='-',
-            linewidth=2.5, color=color, label=label,
-            path_effects=[path_effects.withStroke(linewidth=4, foreground='white')])
-
-# Marcar puntos de interés
-ax.plot(*start_point, 'X', color='red', markersize=12, markeredgewidth=2.5, label='Inicio', zorder=10)
-ax.text(global_minimum[0], global_minimum[1] + 0.4, 'Mínimo Global', ha='center', va='bottom', fontsize=11, fontweight='bold', color='#333333')
-ax.text(local_minimum[0], local_minimum[1] - 0.4, 'Mínimo Local', ha='center', va='top', fontsize=11, fontweight='bold', color='#333333')
-
-# Ajustes estéticos del gráfico
-ax.set_xlabel('Parámetro 1 (w₁)')
-ax.set_ylabel('Parámetro 2 (w₂)')
-ax.set_title('Comparativa de Variantes del Descenso del Gradiente', pad=20)
-ax.set_xlim(w1_space.min(), w1_space.max())
-ax.set_ylim(w2_space.min(), w2_space.max())
-
-# Creación de la leyenda
-legend = ax.legend(loc='upper left', frameon=True, framealpha=0.9, facecolor='white', edgecolor='gray')
-legend.set_title('Algoritmo', prop={'weight':'bold'})
-
-# ==============================================================================
-# 4. BLOQUE DE ADICIÓN DEL COPYRIGHT
-# ==============================================================================
-fig.text(0.98, 0.02, '© Alejandro Quintero Ruiz. Generado con Python.',
-         ha='right', va='bottom', fontsize=8, color='gray', style='italic')
+colors = {'gd': '#377eb8', 'sgd': '#ff7f00', 'momentum': '#984ea3', 'rmsprop': '#e41a1c', 'adam': '#4daf4a'}
+
+@registrar('comparativa_descenso_gradiete', ParametrosComparativa)
+def figura_comparativa(parametros, fig=None):
+    """
+    Dibuja las trayectorias de los optimizadores y sus curvas de convergencia.
+
+    Args:
+        parametros (ParametrosComparativa): Dominio, punto de inicio,
+            iteraciones, semilla y configuración de cada optimizador.
+        fig (Figure, opcional): Figura sobre la que dibujar.
+
+    Returns:
+        matplotlib.figure.Figure: La figura generada.
+    """
+    # Malla adaptativa de la superficie (reutilizada de la caché entre llamadas)
+    w1_lim, w2_lim = parametros.w1_lim, parametros.w2_lim
+    triangulacion, Z = malla_adaptativa_memoizada(loss_function, w1_lim, w2_lim, niveles=parametros.niveles,
+                                                  nivel_maximo=parametros.nivel_maximo)
+    paths, losses = simular_optimizadores(parametros)
+    num_iteraciones = parametros.num_iteraciones
+    start_point = np.asarray(parametros.start_point, dtype=float)
+
+    # Mínimos de la función en el dominio dibujado, del más bajo al más alto
+    minimos_perdida, valores_minimos = minimos(puntos_criticos(loss_function, [w1_lim, w2_lim]))
+
+    # f* es el mínimo global: un optimizador atrapado en el mínimo local se
+    # estanca en f(w) − f* > 0 en lugar de aparentar que converge. La brecha se
+    # acota en 1e-12: f* viene de un gradiente por diferencias finitas (±1e-10)
+    f_estrella = valores_minimos[0]
+
+    with plt.style.context('seaborn-v0_8-whitegrid'), mpl.rc_context(ESTILO):
+        # Creación de la figura (aspecto 16:9 para PowerPoint): superficie y trayectorias
+        # a la izquierda, curvas de convergencia a la derecha
+        fig = nueva_figura(parametros, fig)
+        ax, ax_conv = fig.subplots(1, 2, gridspec_kw={'width_ratios': [1.5, 1]})
+
+        # Dibujar los contornos de la función de pérdida
+        ax.tricontourf(triangulacion, Z, levels=parametros.niveles, cmap='viridis_r', alpha=0.85)
+        ax.tricontour(triangulacion, Z, levels=parametros.niveles, colors='white', linewidths=0.3, alpha=0.5)
+
+        # Marcadores en escala logarítmica: las primeras iteraciones son las que más se desplazan
+        marcas = [0, *np.unique(np.geomspace(1, num_iteraciones, 25).astype(int))]
+
+        # Dibujar las trayectorias (simplificadas) y las curvas de convergencia; cada
+        # optimizador se detiene al converger, así que las longitudes difieren.
+        for metodo, config in parametros.optimizadores.items():
+            path, marcas_path, _ = decimar(paths[metodo], marcas, limites=[w1_lim, w2_lim])
+            ax.plot(path[:, 0], path[:, 1], marker='o', markersize=4, linestyle='-',
+                    linewidth=2.5, color=colors[metodo], label=config['label'], markevery=marcas_path,
+                    path_effects=[path_effects.withStroke(linewidth=4, foreground='white')])
+            ax_conv.plot(np.arange(len(losses[metodo])), np.maximum(losses[metodo] - f_estrella, 1e-12),
+                         linewidth=2, color=colors[metodo], label=config['label'])
+
+        # Marcar puntos de interés
+        ax.plot(*start_point, 'X', color='red', markersize=12, markeredgewidth=2.5, label='Inicio', zorder=10)
+        for i, minimo in enumerate(minimos_perdida):
+            if i == 0:
+                ax.text(minimo[0], minimo[1] - 0.4, 'Mínimo Global', ha='center', va='top', fontsize=11, fontweight='bold', color='#333333')
+            else:
+                ax.text(minimo[0], minimo[1] + 0.4, 'Mínimo Local', ha='center', va='bottom', fontsize=11, fontweight='bold', color='#333333')
+
+        # Ajustes estéticos del gráfico
+        ax.set_xlabel('Parámetro 1 (w₁)')
+        ax.set_ylabel('Parámetro 2 (w₂)')
+        ax.set_title('Comparativa de Variantes del Descenso del Gradiente', pad=20)
+        ax.set_xlim(*w1_lim)
+        ax.set_ylim(*w2_lim)
+
+        # Curvas de convergencia: brecha de pérdida respecto al mínimo global
+        # La fila 0 de cada curva es el punto de inicio (iteración 0): eje
+        # simétrico-logarítmico, lineal en [0, 1] y logarítmico a partir de ahí
+        ax_conv.set_xscale('symlog', linthresh=1)
+        ax_conv.set_xlim(left=0)
+        ax_conv.set_yscale('log')
+        ax_conv.set_xlabel('Iteración')
+        ax_conv.set_ylabel('f(w) − f*')
+        ax_conv.set_title('Convergencia', pad=20)
+
+        # Creación de la leyenda
+        legend = ax.legend(loc='upper left', frameon=True, framealpha=0.9, facecolor='white', edgecolor='gray')
+        legend.set_title('Algoritmo', prop={'weight':'bold'})
+
+        fig.tight_layout(rect=[0, 0.03, 1, 1])
+
+        # ======================================================================
+        # 4. BLOQUE DE ADICIÓN DEL COPYRIGHT
+        # ======================================================================
+        fig.text(0.98, 0.02, '© Alejandro Quintero Ruiz. Generado con Python.',
+                 ha='right', va='bottom', fontsize=8, color='gray', style='italic')
+    return fig
 
 # ==============================================================================
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # ==============================================================================
-output_filename_svg = 'comparativa_descenso_gradiente.svg'
-output_filename_png = 'comparativa_descenso_gradiente.png'
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+if __name__ == '__main__':
+    parametros = ParametrosComparativa()
+    fig = figura_comparativa(parametros, plt.figure())
+    rutas_salida = exportar(fig, parametros)  # Una ruta por formato de `parametros.formatos`
 
-plt.show()
+    plt.show()
 
-print(f"Gráfico guardado como '{output_filename_svg}' y '{output_filename_png}'.")
+    for ruta in rutas_salida:
+        print(f"Gráfico guardado como '{ruta}'.")
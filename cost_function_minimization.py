@@ -6,6 +6,9 @@ Este script genera un gráfico de contorno de alta calidad que ilustra el
 concepto de descenso de gradiente sobre una superficie de pérdida. El gráfico
 está diseñado para presentaciones (formato 16:9) y publicaciones científicas.
 
+Importar el módulo no dibuja nada: la figura se genera con
+`figura_minimizacion(ParametrosMinimizacion(...))` o desde `utilidades.registro`.
+
 Autor: Alejandro Quintero Ruiz (Generado con asistencia de IA)
 """
 
@@ -16,6 +19,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
+from utilidades.descenso_vectorizado import descenso_gradiente_lote
+from utilidades.cache_superficies import malla_adaptativa_memoizada
+from utilidades.malla_adaptativa import NIVEL_MAXIMO
+from utilidades.registro import Parametros, exportar, nueva_figura, registrar
+
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # =============================================================================
@@ -35,100 +43,122 @@ def gradient(theta1, theta2):
     grad_theta2 = 5 * (theta2 - 1)
     return np.array([grad_theta1, grad_theta2])
 
-# Parámetros para el algoritmo de descenso de gradiente
-learning_rate = 0.15  # Tasa de aprendizaje (α)
-num_iterations = 25   # Número de iteraciones
-
-# Puntos de inicio para las trayectorias del descenso de gradiente
-start_points = [np.array([-2.0, 3.5]), np.array([5.5, 4.0])]
+# Parámetros de la figura
+class ParametrosMinimizacion(Parametros):
+    learning_rate = 0.15  # Tasa de aprendizaje (α)
+    num_iterations = 25   # Número de iteraciones
+    # Puntos de inicio para las trayectorias del descenso de gradiente
+    start_points = ((-2.0, 3.5), (5.5, 4.0))
+    x_lim = (-3, 7)
+    y_lim = (-1, 5)
+    niveles = 50
+    nivel_maximo = NIVEL_MAXIMO   # Resolución máxima de la malla adaptativa
+    nombre_archivo = 'cost_function_minimization'
+    rasterizar = True
 
 # =============================================================================
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
 # =============================================================================
-
-# --- Configuración del estilo del gráfico ---
-plt.style.use('seaborn-v0_8-whitegrid') # Estilo profesional y limpio
-mpl.rcParams['font.family'] = 'sans-serif' # Fuente clara y aceptada
-mpl.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans']
-mpl.rcParams['axes.labelweight'] = 'bold'
-mpl.rcParams['axes.titleweight'] = 'bold'
-mpl.rcParams['figure.dpi'] = 300 # Alta resolución por defecto
-
-# --- Creación de la figura y los ejes ---
-# Proporción 16:9 ideal para presentaciones en PowerPoint
-fig, ax = plt.subplots(figsize=(12, 6.75))
-
-# --- Creación de la malla de datos para el contorno ---
-theta1_vals = np.linspace(-3, 7, 400)
-theta2_vals = np.linspace(-1, 5, 400)
-T1, T2 = np.meshgrid(theta1_vals, theta2_vals)
-Z = cost_function(T1, T2)
-
-# --- Dibujo del mapa de contorno relleno (heatmap) ---
-# Se usa el colormap 'magma', que es perceptualmente uniforme y tiene
-# negros/morados oscuros para los valores mínimos, como se solicitó.
-contour = ax.contourf(T1, T2, Z, levels=50, cmap='magma')
-
-# --- Cálculo y dibujo de las trayectorias de descenso de gradiente ---
-for start_point in start_points:
-    path = [start_point]
-    current_point = start_point.copy()
-    for _ in range(num_iterations):
-        grad = gradient(current_point[0], current_point[1])
-        current_point -= learning_rate * grad
-        path.append(current_point.copy())
-    path = np.array(path)
-    
-    # Dibuja la trayectoria
-    ax.plot(path[:, 0], path[:, 1], 'o-', color='cyan', markersize=4, linewidth=1.5, label='Trayectoria de Optimización')
-    # Marca el punto de inicio
-    ax.plot(start_point[0], start_point[1], 'o', color='lime', markersize=8, markeredgecolor='black')
-
-# --- Marcado del punto mínimo ---
-# El mínimo de nuestra función está en (2, 1)
-min_point = np.array([2.0, 1.0])
-ax.plot(min_point[0], min_point[1], '*', color='red', markersize=15, markeredgecolor='white', label='Mínimo Global (∇J(θ)=0)')
-
-# --- Ajustes estéticos, etiquetas y título ---
-ax.set_xlabel('Parámetro θ₁ (Peso 1)', fontsize=14)
-ax.set_ylabel('Parámetro θ₂ (Peso 2)', fontsize=14)
-ax.set_title('Minimización de la Función de Coste mediante Descenso de Gradiente', fontsize=16, pad=20)
-
-# --- Creación de la barra de color ---
-cbar = fig.colorbar(contour)
-cbar.set_label('Valor de la Función de Coste J(θ)', fontsize=14, rotation=270, labelpad=20)
-
-# --- Leyenda ---
-# Para evitar etiquetas duplicadas en la leyenda
-handles, labels = ax.get_legend_handles_labels()
-by_label = dict(zip(labels, handles))
-ax.legend(by_label.values(), by_label.keys(), fontsize=12, loc='upper left')
-
-ax.set_aspect('equal', adjustable='box')
-
-# =============================================================================
-# 4. BLOQUE DE ADICIÓN DEL COPYRIGHT
-# =============================================================================
-copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
-fig.text(0.98, 0.02, copyright_text,
-         ha='right', va='bottom', fontsize=10, color='gray',
-         bbox=dict(facecolor='white', alpha=0.6, edgecolor='none', boxstyle='round,pad=0.2'))
-
-plt.tight_layout(rect=[0, 0.03, 1, 0.95]) # Ajusta el layout para que no se corte nada
+ESTILO = {
+    'font.family': 'sans-serif', # Fuente clara y aceptada
+    'font.sans-serif': ['Arial', 'DejaVu Sans'],
+    'axes.labelweight': 'bold',
+    'axes.titleweight': 'bold',
+    'figure.dpi': 300, # Alta resolución por defecto
+}
+
+@registrar('cost_function_minimization', ParametrosMinimizacion)
+def figura_minimizacion(parametros, fig=None):
+    """
+    Dibuja el mapa de contorno de J(θ) y las trayectorias del descenso de gradiente.
+
+    Args:
+        parametros (ParametrosMinimizacion): Tasa de aprendizaje, iteraciones,
+            puntos de inicio, dominio y resolución de la malla.
+        fig (Figure, opcional): Figura sobre la que dibujar.
+
+    Returns:
+        matplotlib.figure.Figure: La figura generada.
+    """
+    start_points = [np.asarray(punto, dtype=float) for punto in parametros.start_points]
+
+    # --- Configuración del estilo del gráfico (solo dentro de esta figura) ---
+    with plt.style.context('seaborn-v0_8-whitegrid'), mpl.rc_context(ESTILO):
+        # --- Creación de la figura y los ejes ---
+        # Proporción 16:9 ideal para presentaciones en PowerPoint
+        fig = nueva_figura(parametros, fig)
+        ax = fig.subplots()
+
+        # --- Creación de la malla adaptativa de datos para el contorno ---
+        # (reutilizada de la caché de superficies si ya se evaluó antes)
+        triangulacion, Z = malla_adaptativa_memoizada(cost_function, parametros.x_lim, parametros.y_lim,
+                                                      niveles=parametros.niveles,
+                                                      nivel_maximo=parametros.nivel_maximo)
+
+        # --- Dibujo del mapa de contorno relleno (heatmap) ---
+        # Se usa el colormap 'magma', que es perceptualmente uniforme y tiene
+        # negros/morados oscuros para los valores mínimos, como se solicitó.
+        contour = ax.tricontourf(triangulacion, Z, levels=parametros.niveles, cmap='magma')
+
+        # --- Cálculo y dibujo de las trayectorias de descenso de gradiente ---
+        # Todas las trayectorias avanzan a la vez: forma (num_iterations + 1, len(start_points), 2)
+        paths = descenso_gradiente_lote(gradient, start_points, parametros.learning_rate,
+                                        parametros.num_iterations)
+        for k, start_point in enumerate(start_points):
+            path = paths[:, k, :]
+
+            # Dibuja la trayectoria
+            ax.plot(path[:, 0], path[:, 1], 'o-', color='cyan', markersize=4, linewidth=1.5, label='Trayectoria de Optimización')
+            # Marca el punto de inicio
+            ax.plot(start_point[0], start_point[1], 'o', color='lime', markersize=8, markeredgecolor='black')
+
+        # --- Marcado del punto mínimo ---
+        # El mínimo de nuestra función está en (2, 1)
+        min_point = np.array([2.0, 1.0])
+        ax.plot(min_point[0], min_point[1], '*', color='red', markersize=15, markeredgecolor='white', label='Mínimo Global (∇J(θ)=0)')
+
+        # --- Ajustes estéticos, etiquetas y título ---
+        ax.set_xlabel('Parámetro θ₁ (Peso 1)', fontsize=14)
+        ax.set_ylabel('Parámetro θ₂ (Peso 2)', fontsize=14)
+        ax.set_title('Minimización de la Función de Coste mediante Descenso de Gradiente', fontsize=16, pad=20)
+
+        # --- Creación de la barra de color ---
+        cbar = fig.colorbar(contour, ax=ax)
+        cbar.set_label('Valor de la Función de Coste J(θ)', fontsize=14, rotation=270, labelpad=20)
+
+        # --- Leyenda ---
+        # Para evitar etiquetas duplicadas en la leyenda
+        handles, labels = ax.get_legend_handles_labels()
+        by_label = dict(zip(labels, handles))
+        ax.legend(by_label.values(), by_label.keys(), fontsize=12, loc='upper left')
+
+        ax.set_aspect('equal', adjustable='box')
+
+        # =====================================================================
+        # 4. BLOQUE DE ADICIÓN DEL COPYRIGHT
+        # =====================================================================
+        copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
+        fig.text(0.98, 0.02, copyright_text,
+                 ha='right', va='bottom', fontsize=10, color='gray',
+                 bbox=dict(facecolor='white', alpha=0.6, edgecolor='none', boxstyle='round,pad=0.2'))
+
+        fig.tight_layout(rect=[0, 0.03, 1, 0.95]) # Ajusta el layout para que no se corte nada
+    return fig
 
 # =============================================================================
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # =============================================================================
-# Se guardará en formato SVG (vectorial, escalable) y PNG (alta resolución).
-output_filename_svg = "cost_function_minimization.svg"
-output_filename_png = "cost_function_minimization.png"
-
-try:
-    plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-    plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado exitosamente como '{output_filename_svg}' y '{output_filename_png}'")
-except Exception as e:
-    print(f"Error al guardar el archivo: {e}")
-
-# Muestra el gráfico en la consola/notebook (opcional)
-plt.show()
+if __name__ == '__main__':
+    parametros = ParametrosMinimizacion()
+    fig = figura_minimizacion(parametros, plt.figure())
+
+    # Se guardará en formato SVG (vectorial, escalable) y PNG (alta resolución).
+    try:
+        rutas_salida = exportar(fig, parametros)  # Una ruta por formato de `parametros.formatos`
+        for ruta in rutas_salida:
+            print(f"Gráfico guardado exitosamente como '{ruta}'")
+    except Exception as e:
+        print(f"Error al guardar el archivo: {e}")
+
+    # Muestra el gráfico en la consola/notebook (opcional)
+    plt.show()
@@ -7,6 +7,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Arc
 
+from utilidades.exportacion import guardar_figura
+
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # =============================================================================
@@ -166,20 +168,12 @@ if __name__ == "__main__":
     # rect ajustado para dejar espacio para el suptitle y la leyenda externa.
     figura.tight_layout(rect=[0, 0.03, 0.9, 0.95]) # [left, bottom, right, top]
     
-    # Guardar la imagen en formatos de alta calidad
-    # Formato SVG (Vectorial, ideal para escalabilidad y edición)
-    ruta_svg = "derivada_direccional.svg"
-    figura.savefig(ruta_svg, format='svg', dpi=300, bbox_inches='tight')
-    
-    # Formato PDF (Vectorial, excelente para documentos)
-    ruta_pdf = "derivada_direccional.pdf"
-    figura.savefig(ruta_pdf, format='pdf', dpi=300, bbox_inches='tight')    # bbox_inches='tight' es crucial para asegurar que todos los elementos (incluida la leyenda externa)
-    # se incluyan en la imagen final sin ser recortados.
-
-
-    # Formato PNG (Rasterizado de alta resolución, para compatibilidad)
-    ruta_png = "derivada_direccional.png"
-    figura.savefig(ruta_png, format='png', dpi=300, bbox_inches='tight')
+    # Guardar la imagen en formatos de alta calidad: SVG (vectorial, ideal para
+    # escalabilidad y edición), PDF (vectorial, excelente para documentos) y
+    # PNG (rasterizado de alta resolución, para compatibilidad).
+    # El recorte ajustado ('tight') es crucial para asegurar que todos los
+    # elementos (incluida la leyenda externa) se incluyan sin ser recortados.
+    ruta_svg, ruta_pdf, ruta_png = guardar_figura(figura, "derivada_direccional")
     
     print(f"Gráfico guardado exitosamente en los siguientes formatos:")
     print(f"- SVG: {ruta_svg}")
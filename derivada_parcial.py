@@ -11,6 +11,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
+from utilidades.exportacion import guardar_figura
+
 # ----------------------------------------------------------------------------
 
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
@@ -124,21 +126,11 @@ if __name__ == '__main__':
     # Ajustar el layout para evitar que los elementos se corten
     plt.tight_layout(rect=[0, 0.03, 1, 0.95])
 
-    # Guardar la imagen en formatos de alta calidad
-    # SVG (Vectorial, ideal para escalabilidad y edición)
-    nombre_archivo_svg = 'derivada_parcial_concepto.svg'
-    figura.savefig(nombre_archivo_svg, format='svg', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado como: {nombre_archivo_svg}")
-
-    # PDF (Vectorial, excelente para documentos y publicaciones)
-    nombre_archivo_pdf = 'derivada_parcial_concepto.pdf'
-    figura.savefig(nombre_archivo_pdf, format='pdf', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado como: {nombre_archivo_pdf}")
-
-    # PNG (Alta resolución, para compatibilidad)
-    nombre_archivo_png = 'derivada_parcial_concepto.png'
-    figura.savefig(nombre_archivo_png, format='png', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado como: {nombre_archivo_png}")
+    # Guardar la imagen en formatos de alta calidad: SVG (vectorial, ideal para
+    # escalabilidad y edición), PDF (vectorial, excelente para documentos y
+    # publicaciones) y PNG (alta resolución, para compatibilidad).
+    for ruta in guardar_figura(figura, 'derivada_parcial_concepto'):
+        print(f"Gráfico guardado como: {ruta}")
 
     # Mostrar el gráfico (opcional)
     plt.show()
@@ -14,6 +14,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import cm # Colormaps
 
+from utilidades.animacion import animar_trayectorias, formato_animacion
+from utilidades.cache_superficies import superficie
+from utilidades.cuencas import cuencas_atraccion, dibujar_cuencas, rejilla
+from utilidades.descenso_vectorizado import descenso_gradiente_lote
+from utilidades.exportacion import guardar_figura
+
 # ----------------------------------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ----------------------------------------------------------------------------
@@ -37,16 +43,16 @@ tasa_aprendizaje = 0.1
 n_iteraciones = 25
 punto_inicial = np.array([-3.8, 3.5]) # Punto de partida para la optimización
 
-# Calculamos la trayectoria del descenso del gradiente
-trayectoria = [punto_inicial]
-punto_actual = punto_inicial.copy()
-
-for _ in range(n_iteraciones):
-    grad = gradiente(punto_actual[0], punto_actual[1])
-    punto_actual = punto_actual - tasa_aprendizaje * grad
-    trayectoria.append(punto_actual)
+# Modo de la figura: 'trayectoria' (un descenso sobre la superficie 3D) o
+# 'cuencas' (un descenso desde cada punto del plano, coloreado por el mínimo
+# alcanzado y sombreado por las iteraciones que necesita).
+MODO = 'trayectoria'
+cuencas_iteraciones = 500   # Pasos máximos por trayectoria en el mapa de cuencas
 
-trayectoria = np.array(trayectoria)
+# Calculamos la trayectoria del descenso del gradiente (un lote de una sola
+# trayectoria, que se detiene antes de `n_iteraciones` si converge)
+trayectoria = descenso_gradiente_lote(gradiente, [punto_inicial], tasa_aprendizaje, n_iteraciones,
+                                      funcion=funcion_de_perdida)[:, 0, :]
 
 # ----------------------------------------------------------------------------
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
@@ -66,62 +72,88 @@ plt.rcParams.update({
     'figure.dpi': 150 # Buena resolución para la visualización en pantalla
 })
 
-# --- Creación de la Figura y Ejes 3D ---
-# Proporción 16:9 ideal para PowerPoint
-fig = plt.figure(figsize=(12.8, 7.2))
-ax = fig.add_subplot(111, projection='3d')
-
-# --- Preparación de la Malla para la Superficie 3D ---
-w1_vals = np.linspace(-4, 4, 100)
-w2_vals = np.linspace(-4, 4, 100)
-W1, W2 = np.meshgrid(w1_vals, w2_vals)
-Z = funcion_de_perdida(W1, W2)
-
-# --- Dibujo de la Superficie (Función de Pérdida) ---
-# Usamos un colormap amigable con el daltonismo (viridis) y transparencia.
-surf = ax.plot_surface(W1, W2, Z, cmap=cm.viridis, alpha=0.6, antialiased=True)
-
-# --- Dibujo de la Trayectoria del Descenso del Gradiente ---
-# Extraemos los puntos de la trayectoria para graficarlos.
-trayectoria_w1 = trayectoria[:, 0]
-trayectoria_w2 = trayectoria[:, 1]
-trayectoria_z = funcion_de_perdida(trayectoria_w1, trayectoria_w2)
-
-# Dibujamos la línea que une los pasos
-ax.plot(trayectoria_w1, trayectoria_w2, trayectoria_z,
-        color='#E63946', # Rojo contrastante
-        marker='o',      # Círculos para marcar cada paso
-        markersize=5,
-        linewidth=2,
-        label='Trayectoria del Descenso del Gradiente')
-
-# Marcamos el punto inicial y final para mayor claridad
-ax.scatter(trayectoria_w1[0], trayectoria_w2[0], trayectoria_z[0],
-           color='#003F5C', s=100, ec='w', lw=1.5, zorder=10, label='Punto Inicial')
-ax.scatter(trayectoria_w1[-1], trayectoria_w2[-1], trayectoria_z[-1],
-           color='#FFA600', s=150, ec='w', lw=1.5, marker='*', zorder=10, label='Mínimo Encontrado')
-
-
-# --- Ajustes Estéticos y Etiquetas ---
-ax.set_title('Optimización de una Función de Pérdida mediante Descenso del Gradiente',
-             fontsize=18, fontweight='bold', color='#222222')
-ax.set_xlabel('Parámetro 1 (w1)', fontsize=12, labelpad=10)
-ax.set_ylabel('Parámetro 2 (w2)', fontsize=12, labelpad=10)
-ax.set_zlabel('Valor de la Función de Pérdida (Error)', fontsize=12, labelpad=10)
-
-# Ajustamos la perspectiva para una mejor visualización
-ax.view_init(elev=30, azim=-50)
-
-# Añadimos una leyenda clara y bien ubicada
-ax.legend(loc='upper left', fontsize=10, frameon=True, facecolor='white', framealpha=0.8)
-
-# Ajustamos los límites del eje Z para enfocar la parte relevante
-ax.set_zlim(0, 40)
-
-# Eliminamos el relleno gris de los paneles para un look más limpio
-ax.xaxis.pane.fill = False
-ax.yaxis.pane.fill = False
-ax.zaxis.pane.fill = False
+if MODO == 'cuencas':
+    # --- Descenso desde cada celda de una rejilla de 400 × 400 ---
+    limites = (-4, 4)
+    w1s, w2s, puntos = rejilla(limites, limites)
+    cuencas = cuencas_atraccion(gradiente, puntos, tasa_aprendizaje, cuencas_iteraciones,
+                                funcion_de_perdida)
+    forma = (len(w2s), len(w1s))
+
+    fig, ax = plt.subplots(figsize=(12.8, 7.2))
+    elementos = dibujar_cuencas(ax, cuencas['etiquetas'].reshape(forma), (*limites, *limites), cuencas,
+                                iteraciones=cuencas['iteraciones'].reshape(forma))
+
+    # El descenso de la figura 3D, sobre el mapa
+    linea_trayectoria, = ax.plot(trayectoria[:, 0], trayectoria[:, 1], color='#E63946', marker='o',
+                                 markersize=4, linewidth=2, label='Trayectoria desde (-3.8, 3.5)')
+    ax.scatter(*cuencas['minimos'].T, color='#FFA600', s=200, ec='w', lw=1.5, marker='*', zorder=10)
+    elementos.append(linea_trayectoria)
+
+    ax.set_title(f'Cuencas de Atracción del Descenso del Gradiente ($\\eta$ = {tasa_aprendizaje})',
+                 fontsize=18, fontweight='bold', color='#222222')
+    ax.set_xlabel('Parámetro 1 (w1)', fontsize=12)
+    ax.set_ylabel('Parámetro 2 (w2)', fontsize=12)
+    ax.set_aspect('equal')
+    ax.legend(handles=elementos, loc='center left', bbox_to_anchor=(1.02, 0.5), fontsize=10,
+              title='Más oscuro = más iteraciones', frameon=True, facecolor='white', framealpha=0.8)
+    nombre_salida = "descenso_del_gradiente_cuencas"
+else:
+    # --- Creación de la Figura y Ejes 3D ---
+    # Proporción 16:9 ideal para PowerPoint
+    fig = plt.figure(figsize=(12.8, 7.2))
+    ax = fig.add_subplot(111, projection='3d')
+
+    # --- Preparación de la Malla para la Superficie 3D ---
+    W1, W2, Z = superficie(funcion_de_perdida, (-4, 4), (-4, 4), resolucion=100)
+
+    # --- Dibujo de la Superficie (Función de Pérdida) ---
+    # Usamos un colormap amigable con el daltonismo (viridis) y transparencia.
+    surf = ax.plot_surface(W1, W2, Z, cmap=cm.viridis, alpha=0.6, antialiased=True)
+
+    # --- Dibujo de la Trayectoria del Descenso del Gradiente ---
+    # Extraemos los puntos de la trayectoria para graficarlos.
+    trayectoria_w1 = trayectoria[:, 0]
+    trayectoria_w2 = trayectoria[:, 1]
+    trayectoria_z = funcion_de_perdida(trayectoria_w1, trayectoria_w2)
+
+    # Dibujamos la línea que une los pasos
+    linea_trayectoria, = ax.plot(trayectoria_w1, trayectoria_w2, trayectoria_z,
+            color='#E63946', # Rojo contrastante
+            marker='o',      # Círculos para marcar cada paso
+            markersize=5,
+            linewidth=2,
+            label='Trayectoria del Descenso del Gradiente')
+
+    # Marcamos el punto inicial y final para mayor claridad
+    ax.scatter(trayectoria_w1[0], trayectoria_w2[0], trayectoria_z[0],
+               color='#003F5C', s=100, ec='w', lw=1.5, zorder=10, label='Punto Inicial')
+    ax.scatter(trayectoria_w1[-1], trayectoria_w2[-1], trayectoria_z[-1],
+               color='#FFA600', s=150, ec='w', lw=1.5, marker='*', zorder=10, label='Mínimo Encontrado')
+
+
+    # --- Ajustes Estéticos y Etiquetas ---
+    ax.set_title('Optimización de una Función de Pérdida mediante Descenso del Gradiente',
+                 fontsize=18, fontweight='bold', color='#222222')
+    ax.set_xlabel('Parámetro 1 (w1)', fontsize=12, labelpad=10)
+    ax.set_ylabel('Parámetro 2 (w2)', fontsize=12, labelpad=10)
+    ax.set_zlabel('Valor de la Función de Pérdida (Error)', fontsize=12, labelpad=10)
+
+    # Ajustamos la perspectiva para una mejor visualización
+    ax.view_init(elev=30, azim=-50)
+
+    # Añadimos una leyenda clara y bien ubicada
+    ax.legend(loc='upper left', fontsize=10, frameon=True, facecolor='white', framealpha=0.8)
+
+    # Ajustamos los límites del eje Z para enfocar la parte relevante
+    ax.set_zlim(0, 40)
+
+    # Eliminamos el relleno gris de los paneles para un look más limpio
+    ax.xaxis.pane.fill = False
+    ax.yaxis.pane.fill = False
+    ax.zaxis.pane.fill = False
+
+    nombre_salida = "descenso_del_gradiente"
 
 # ----------------------------------------------------------------------------
 # 4. BLOQUE DE ADICIÓN DEL COPYRIGHT
@@ -139,14 +171,18 @@ fig.text(0.98, 0.02, copyright_text,
 fig.tight_layout(rect=[0, 0.03, 1, 0.97])
 
 # Guardamos en formato SVG (vectorial, ideal para escalar) y PNG (alta resolución)
-output_filename_svg = "descenso_del_gradiente.svg"
-output_filename_png = "descenso_del_gradiente.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, nombre_salida, formatos=('svg', 'png'))
 
 # Mostramos el gráfico (opcional)
 plt.show()
 
 print(f"Gráfico guardado exitosamente como '{output_filename_svg}' y '{output_filename_png}'.")
 
+# Animación de la trayectoria (opcional, con EXPORTAR_ANIMACION=gif|mp4)
+formato = formato_animacion()
+if formato:
+    ruta_animacion = animar_trayectorias(fig, [linea_trayectoria], f"{nombre_salida}.{formato}",
+                                         fps=5)
+    print(f"Animación guardada como '{ruta_animacion}'.")
+
@@ -11,6 +11,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
+from utilidades.cache_superficies import superficie
+from utilidades.exportacion import guardar_figura
+
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 
 # --- Parámetros del Algoritmo de Descenso del Gradiente ---
@@ -30,9 +33,9 @@ def gradient(theta):
     return 2 * theta
 
 # --- Generación de datos para la gráfica ---
-# Creamos un rango de valores de theta para graficar la curva de la función.
-theta_range = np.linspace(-4.5, 4.5, 400)
-cost_values = cost_function(theta_range)
+# Creamos un rango de valores de theta para graficar la curva de la función
+# (reutilizada de la caché de superficies si ya se evaluó antes).
+theta_range, cost_values = superficie(cost_function, (-4.5, 4.5), resolucion=400)
 
 # --- Simulación de las iteraciones del Descenso del Gradiente ---
 thetas = [initial_theta]
@@ -127,11 +130,8 @@ plt.tight_layout(rect=[0, 0.03, 1, 0.95]) # Deja espacio para el título y copyr
 
 # Guardar el gráfico en formato vectorial SVG (escalable y de alta calidad).
 # También se guarda en PNG con alta resolución como alternativa.
-output_filename_svg = "descenso_del_gradiente.svg"
-output_filename_png = "descenso_del_gradiente.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, "descenso_del_gradiente", formatos=('svg', 'png'))
 
 # Opcional: Mostrar el gráfico en pantalla.
 plt.show()
@@ -6,6 +6,10 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from matplotlib.patches import FancyArrowPatch
 
+from utilidades.animacion import animar_trayectorias, formato_animacion
+from utilidades.exportacion import guardar_figura
+from utilidades.malla_adaptativa import malla_adaptativa
+
 # ----------------------------------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ----------------------------------------------------------------------------
@@ -39,23 +43,24 @@ def create_gradient_descent_plot():
     """
     Genera y estiliza un gráfico de alta calidad que ilustra el concepto
     de Descenso del Gradiente.
+
+    Returns:
+        tuple: (figura, ejes, línea de la ruta de optimización).
     """
     # --- Configuración Estética Inicial ---
     plt.style.use('seaborn-v0_8-whitegrid') # Estilo base limpio y profesional
     fig, ax = plt.subplots(figsize=(12, 6.75)) # Aspect ratio 16:9 para PowerPoint
 
-    # --- Creación de la Malla y las Curvas de Nivel ---
-    theta0_vals = np.linspace(-4, 4, 400)
-    theta1_vals = np.linspace(-2, 2, 400)
-    T0, T1 = np.meshgrid(theta0_vals, theta1_vals)
-    Z = cost_function(T0, T1)
+    # --- Creación de la Malla Adaptativa y las Curvas de Nivel ---
+    niveles = np.logspace(0, 2, 15)
+    triangulacion, Z = malla_adaptativa(cost_function, (-4, 4), (-2, 2), niveles)
 
     # Paleta de colores amigable con el daltonismo (Viridis)
-    contour = ax.contour(T0, T1, Z, levels=np.logspace(0, 2, 15), cmap='viridis_r')
+    contour = ax.tricontour(triangulacion, Z, levels=niveles, cmap='viridis_r')
     ax.clabel(contour, inline=True, fontsize=9, fmt='%.1f')
     
     # --- Dibujo de la Trayectoria y Puntos ---
-    ax.plot(theta_path[:, 0], theta_path[:, 1], 'o-', 
+    path_line, = ax.plot(theta_path[:, 0], theta_path[:, 1], 'o-',
             color='#c42121', # Rojo oscuro para alta visibilidad
             markersize=8, 
             linewidth=2, 
@@ -115,7 +120,7 @@ def create_gradient_descent_plot():
     ax.set_ylim(-2, 2)
     ax.set_aspect('equal', adjustable='box') # Asegura que los gradientes se vean perpendiculares
 
-    return fig, ax
+    return fig, ax, path_line
 
 # ----------------------------------------------------------------------------
 # 4. BLOQUE DE ADICIÓN DEL COPYRIGHT
@@ -131,7 +136,7 @@ def add_copyright(fig):
 # ----------------------------------------------------------------------------
 if __name__ == '__main__':
     # Generar el gráfico
-    main_fig, main_ax = create_gradient_descent_plot()
+    main_fig, main_ax, main_path = create_gradient_descent_plot()
     
     # Añadir el copyright
     add_copyright(main_fig)
@@ -140,18 +145,20 @@ if __name__ == '__main__':
     main_fig.tight_layout(rect=[0, 0.03, 1, 0.95]) # Deja espacio para título y copyright
     
     # Guardar en formatos de alta calidad
-    output_filename_svg = "descenso_gradiente_optimizacion_IA.svg"
-    output_filename_pdf = "descenso_gradiente_optimizacion_IA.pdf"
-    output_filename_png = "descenso_gradiente_optimizacion_IA.png"
-    
-    main_fig.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-    main_fig.savefig(output_filename_pdf, format='pdf', bbox_inches='tight')
-    main_fig.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+    output_filename_svg, output_filename_pdf, output_filename_png = guardar_figura(
+        main_fig, "descenso_gradiente_optimizacion_IA")
     
     print(f"Gráfico guardado exitosamente en los siguientes formatos:")
     print(f"- {output_filename_svg} (Vectorial, recomendado para PowerPoint)")
     print(f"- {output_filename_pdf} (Vectorial)")
     print(f"- {output_filename_png} (Alta resolución, 300 DPI)")
+
+    # Animación de la ruta de optimización (opcional, con EXPORTAR_ANIMACION=gif|mp4)
+    formato = formato_animacion()
+    if formato:
+        ruta_animacion = animar_trayectorias(main_fig, [main_path],
+                                             f"descenso_gradiente_optimizacion_IA.{formato}", fps=2)
+        print(f"- {ruta_animacion} (Animación de la ruta)")
     
     # Opcional: mostrar el gráfico en pantalla
     plt.show()
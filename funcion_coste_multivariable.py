@@ -17,6 +17,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import cm # Colormaps
 
+from utilidades.cuencas import cuencas_atraccion, dibujar_cuencas, rejilla
+from utilidades.exportacion import guardar_figura
+from utilidades.puntos_criticos import minimos, puntos_criticos
+
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # =============================================================================
@@ -37,6 +41,25 @@ def funcion_coste(x, y):
     ruido = 0.1 * np.cos(5 * x) * np.sin(5 * y)
     return p1 + p2 + ruido
 
+def gradiente_coste(x, y):
+    """
+    Gradiente analítico de `funcion_coste`, para lanzar el descenso del gradiente.
+
+    Returns:
+        tuple: (∂f/∂x, ∂f/∂y), con la forma de `x` e `y`.
+    """
+    p1 = -2.0 * np.exp(-((x - 0.5)**2 + (y - 0.5)**2) / 0.3)
+    p2 = -1.5 * np.exp(-((x + 0.5)**2 + (y + 0.5)**2) / 0.5)
+    df_dx = p1 * (-2 * (x - 0.5) / 0.3) + p2 * (-2 * (x + 0.5) / 0.5) - 0.5 * np.sin(5 * x) * np.sin(5 * y)
+    df_dy = p1 * (-2 * (y - 0.5) / 0.3) + p2 * (-2 * (y + 0.5) / 0.5) + 0.5 * np.cos(5 * x) * np.cos(5 * y)
+    return df_dx, df_dy
+
+# Modo de la figura: 'superficie' (la función en 3D) o 'cuencas' (a qué mínimo
+# llega el descenso del gradiente desde cada punto del plano).
+MODO = 'superficie'
+cuencas_tasa = 0.05          # Tasa de aprendizaje del descenso en el mapa de cuencas
+cuencas_iteraciones = 2000   # Pasos máximos por trayectoria
+
 # Creamos la malla de puntos (x, y) donde se evaluará la función.
 x = np.linspace(-1.5, 1.5, 200)
 y = np.linspace(-1.5, 1.5, 200)
@@ -47,71 +70,152 @@ Z = funcion_coste(X, Y)
 # 3. GENERACIÓN DEL GRÁFICO
 # =============================================================================
 
-# --- Configuración Estética General ---
-# Usamos un estilo que mejora la estética por defecto.
-plt.style.use('seaborn-v0_8-whitegrid')
-
-# Configuración de la fuente para un look profesional y legible.
-plt.rcParams.update({
-    'font.family': 'sans-serif',
-    'font.sans-serif': 'Arial', # O 'Calibri', 'Helvetica', etc.
-    'font.size': 12,
-    'axes.labelweight': 'bold',
-    'axes.titleweight': 'bold'
-})
-
-# --- Creación de la Figura y Ejes 3D ---
-# Proporción 16:9 ideal para presentaciones.
-fig = plt.figure(figsize=(12, 6.75))
-ax = fig.add_subplot(111, projection='3d')
-
-# --- Dibujo de la Superficie ---
-# Se utiliza un colormap amigable con el daltonismo (viridis) y profesional.
-surf = ax.plot_surface(X, Y, Z, cmap=cm.viridis, rstride=5, cstride=5, 
-                       alpha=0.9, antialiased=True, linewidth=0.1, edgecolor='black')
-
-# --- Ajustes Estéticos y Etiquetas ---
-# Título principal del gráfico.
-fig.suptitle(
-    'Visualización de una Función de Coste Escalar de Varias Variables',
-    fontsize=16,
-    y=0.95 # Ajuste de la posición vertical del título
-)
-
-# Etiquetas de los ejes, describiendo qué representa cada uno.
-ax.set_xlabel('Variable 1 (x)', labelpad=10)
-ax.set_ylabel('Variable 2 (y)', labelpad=10)
-ax.set_zlabel('Coste / Error (z)', labelpad=10)
-
-# Ajuste del ángulo de visión para una mejor perspectiva.
-ax.view_init(elev=30, azim=-60)
-
-# Añadir una barra de color para dar escala a los valores de Z.
-cbar = fig.colorbar(surf, shrink=0.6, aspect=10, pad=0.1)
-cbar.set_label('Valor de la Función de Coste')
-
-# Optimizar el espaciado para que no se solapen los elementos.
-fig.tight_layout(rect=[0, 0.05, 1, 0.95]) # Ajuste para dejar espacio al copyright y título
-
-# =============================================================================
-# 4. ADICIÓN DEL COPYRIGHT / MARCA DE AGUA
-# =============================================================================
-copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
-fig.text(0.5, 0.02, copyright_text, ha='center', va='bottom', fontsize=9, color='gray')
-
-# =============================================================================
-# 5. GUARDADO / EXPORTACIÓN DEL ARCHIVO
-# =============================================================================
-# Guardamos la imagen en formato SVG (vectorial) para máxima calidad y escalabilidad.
-# También se guarda una copia en PNG de alta resolución como alternativa.
-output_filename_svg = "funcion_coste_multivariable.svg"
-output_filename_png = "funcion_coste_multivariable.png"
+def aplicar_estilo():
+    """Aplica el estilo y la fuente comunes a los dos modos de la figura."""
+    # Usamos un estilo que mejora la estética por defecto.
+    plt.style.use('seaborn-v0_8-whitegrid')
+
+    # Configuración de la fuente para un look profesional y legible.
+    plt.rcParams.update({
+        'font.family': 'sans-serif',
+        'font.sans-serif': 'Arial', # O 'Calibri', 'Helvetica', etc.
+        'font.size': 12,
+        'axes.labelweight': 'bold',
+        'axes.titleweight': 'bold'
+    })
+
+def minimos_principales():
+    """
+    Mínimo global y mínimo local principal de la superficie.
 
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+    Los mínimos salen de los puntos críticos de la función; el global es el
+    más bajo. El local principal es, entre los demás, el que atrae más
+    puntos iniciales de un descenso del gradiente sobre una rejilla gruesa:
+    las ondulaciones del ruido también son mínimos, pero con cuencas
+    diminutas, así que no basta con tomar el segundo más bajo.
 
-print(f"Gráfico guardado exitosamente como '{output_filename_svg}' y '{output_filename_png}'.")
+    Returns:
+        tuple: (puntos de forma (2, 2), valores de forma (2,)), primero el
+        global y después el local.
+    """
+    x_lim, y_lim = (x[0], x[-1]), (y[0], y[-1])
+    puntos_minimos, valores_minimos = minimos(puntos_criticos(funcion_coste, [x_lim, y_lim],
+                                                              gradiente=gradiente_coste))
+    _, _, iniciales = rejilla(x_lim, y_lim, resolucion=60)
+    cuencas = cuencas_atraccion(gradiente_coste, iniciales, cuencas_tasa, cuencas_iteraciones)
+    # Puntos iniciales que llegan a cada mínimo (el más cercano de los encontrados por el descenso)
+    cercano = np.argmin(np.linalg.norm(puntos_minimos[:, np.newaxis] - cuencas['minimos'], axis=2), axis=1)
+    area = cuencas['area'][cercano]
+    local = 1 + np.argmax(area[1:])
+    return puntos_minimos[[0, local]], valores_minimos[[0, local]]
+
+def crear_grafico_cuencas():
+    """
+    Mapa de cuencas de atracción: a qué mínimo llega el descenso desde cada punto.
 
-# Opcional: Mostrar el gráfico en una ventana.
-# plt.show()
+    Returns:
+        matplotlib.figure.Figure: La figura generada.
+    """
+    # --- Descenso desde cada celda de una rejilla de 400 × 400 ---
+    x_lim, y_lim = (x[0], x[-1]), (y[0], y[-1])
+    x0s, y0s, puntos = rejilla(x_lim, y_lim)
+    cuencas = cuencas_atraccion(gradiente_coste, puntos, cuencas_tasa, cuencas_iteraciones, funcion_coste)
+    forma = (len(y0s), len(x0s))
+
+    fig, ax = plt.subplots(figsize=(12, 6.75))
+    elementos = dibujar_cuencas(ax, cuencas['etiquetas'].reshape(forma), (*x_lim, *y_lim), cuencas,
+                                iteraciones=cuencas['iteraciones'].reshape(forma))
+    # Curvas de nivel de la función y mínimos encontrados sobre el mapa
+    ax.contour(X, Y, Z, levels=15, colors='black', linewidths=0.6, alpha=0.5)
+    ax.scatter(*cuencas['minimos'].T, s=40, color='white', edgecolor='black', zorder=3)
+    ax.scatter(*cuencas['minimos'][0], s=250, marker='*', color='#f9a602', edgecolor='black', zorder=4)
+
+    fig.suptitle('Cuencas de Atracción del Descenso del Gradiente', fontsize=16, y=0.95)
+    ax.set_xlabel('Variable 1 (x)')
+    ax.set_ylabel('Variable 2 (y)')
+    ax.set_xlim(x_lim)   # Algunos mínimos de las ondulaciones quedan fuera de la rejilla
+    ax.set_ylim(y_lim)
+    ax.set_aspect('equal')
+    ax.legend(handles=elementos, fontsize=10, loc='center left', bbox_to_anchor=(1.02, 0.5),
+              title=f'η = {cuencas_tasa}, {len(cuencas["minimos"])} mínimos')
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95])
+    return fig
+
+def crear_grafico_superficie():
+    """
+    Superficie 3D de la función de coste con sus mínimos global y local.
 
+    Returns:
+        matplotlib.figure.Figure: La figura generada.
+    """
+    # --- Creación de la Figura y Ejes 3D ---
+    # Proporción 16:9 ideal para presentaciones.
+    fig = plt.figure(figsize=(12, 6.75))
+    ax = fig.add_subplot(111, projection='3d')
+
+    # --- Dibujo de la Superficie ---
+    # Se utiliza un colormap amigable con el daltonismo (viridis) y profesional.
+    surf = ax.plot_surface(X, Y, Z, cmap=cm.viridis, rstride=5, cstride=5, 
+                           alpha=0.9, antialiased=True, linewidth=0.1, edgecolor='black')
+
+    # --- Mínimos de la Superficie ---
+    # El global y el local principal (ver `minimos_principales`); el resto
+    # son las ondulaciones del ruido.
+    puntos_minimos, valores_minimos = minimos_principales()
+    for (x_min, y_min), z_min, etiqueta in zip(puntos_minimos, valores_minimos, ('Mínimo Global', 'Mínimo Local')):
+        ax.scatter(x_min, y_min, z_min, color='#f9a602', edgecolor='black', s=80, zorder=10, depthshade=False)
+        ax.text(x_min, y_min, z_min + 0.4, etiqueta, ha='center', fontsize=11, fontweight='bold',
+                color='#222222', zorder=11)
+
+    # --- Ajustes Estéticos y Etiquetas ---
+    # Título principal del gráfico.
+    fig.suptitle(
+        'Visualización de una Función de Coste Escalar de Varias Variables',
+        fontsize=16,
+        y=0.95 # Ajuste de la posición vertical del título
+    )
+
+    # Etiquetas de los ejes, describiendo qué representa cada uno.
+    ax.set_xlabel('Variable 1 (x)', labelpad=10)
+    ax.set_ylabel('Variable 2 (y)', labelpad=10)
+    ax.set_zlabel('Coste / Error (z)', labelpad=10)
+
+    # Ajuste del ángulo de visión para una mejor perspectiva.
+    ax.view_init(elev=30, azim=-60)
+
+    # Añadir una barra de color para dar escala a los valores de Z.
+    cbar = fig.colorbar(surf, shrink=0.6, aspect=10, pad=0.1)
+    cbar.set_label('Valor de la Función de Coste')
+
+    # Optimizar el espaciado para que no se solapen los elementos.
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95]) # Ajuste para dejar espacio al copyright y título
+    return fig
+
+if __name__ == '__main__':
+    aplicar_estilo()
+    if MODO == 'cuencas':
+        fig = crear_grafico_cuencas()
+        nombre_salida = "funcion_coste_multivariable_cuencas"
+    else:
+        fig = crear_grafico_superficie()
+        nombre_salida = "funcion_coste_multivariable"
+
+    # =========================================================================
+    # 4. ADICIÓN DEL COPYRIGHT / MARCA DE AGUA
+    # =========================================================================
+    copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
+    fig.text(0.5, 0.02, copyright_text, ha='center', va='bottom', fontsize=9, color='gray')
+
+    # =========================================================================
+    # 5. GUARDADO / EXPORTACIÓN DEL ARCHIVO
+    # =========================================================================
+    # Guardamos la imagen en formato SVG (vectorial) para máxima calidad y escalabilidad.
+    # También se guarda una copia en PNG de alta resolución como alternativa.
+    output_filename_svg, output_filename_png = guardar_figura(
+        fig, nombre_salida, formatos=('svg', 'png'),
+        rasterizar=True)
+
+    print(f"Gráfico guardado exitosamente como '{output_filename_svg}' y '{output_filename_png}'.")
+
+    # Opcional: Mostrar el gráfico en una ventana.
+    # plt.show()
@@ -11,22 +11,22 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 
+from utilidades.cache_superficies import superficie
+from utilidades.exportacion import guardar_figura
+
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # =============================================================================
 
-# Definimos el rango de valores para el parámetro θ.
-# Usamos np.linspace para crear puntos equidistantes.
-theta = np.linspace(-4.5, 4.5, 400)
-
 # Definimos la función de coste J(θ). Usamos una parábola simple (J(θ) = θ^2)
 # como un ejemplo canónico de una función de coste convexa.
 def funcion_coste(theta):
     """Calcula el valor de la función de coste J(θ) = θ^2."""
     return theta**2
 
-# Calculamos los valores de J(θ) para cada valor de θ.
-coste = funcion_coste(theta)
+# Calculamos los valores de J(θ) en 400 puntos equidistantes de θ en [-4.5, 4.5]
+# (reutilizados de la caché de superficies si ya se evaluaron antes).
+theta, coste = superficie(funcion_coste, (-4.5, 4.5), resolucion=400)
 
 # =============================================================================
 # 3. GENERACIÓN DEL GRÁFICO
@@ -118,11 +118,8 @@ fig.tight_layout(rect=[0, 0.03, 1, 0.95]) # rect deja espacio para suptitle y co
 
 # Guardar la figura en formato SVG (vectorial, escalable) y PNG (alta resolución).
 # SVG es ideal para publicaciones y PowerPoint, ya que no pierde calidad al escalar.
-output_filename_svg = 'funcion_de_coste.svg'
-output_filename_png = 'funcion_de_coste.png'
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, 'funcion_de_coste', formatos=('svg', 'png'))
 
 # Mostrar el gráfico en pantalla (opcional).
 plt.show()
@@ -11,7 +11,13 @@ Autor: Alejandro Quintero Ruiz (Generado con asistencia de IA)
 # =============================================================================
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.stats import norm, binom, beta
+
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+
+norm = diferido('scipy.stats', 'norm')
+binom = diferido('scipy.stats', 'binom')
+beta = diferido('scipy.stats', 'beta')
 
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
@@ -166,14 +172,11 @@ if __name__ == '__main__':
     formato_vectorial = 'svg'
     formato_raster = 'png'
 
-    # Guardar en formato vectorial (SVG) - ideal para escalabilidad
-    ruta_svg = f'{nombre_base}.{formato_vectorial}'
-    grafico.savefig(ruta_svg, format=formato_vectorial, bbox_inches='tight')
+    # Guardar en formato vectorial (SVG) - ideal para escalabilidad - y en
+    # formato raster (PNG) con alta resolución (DPI), con un único layout
+    ruta_svg, ruta_png = guardar_figura(grafico, nombre_base,
+                                        formatos=(formato_vectorial, formato_raster))
     print(f"Gráfico guardado en formato vectorial: {ruta_svg}")
-
-    # Guardar en formato raster (PNG) con alta resolución (DPI)
-    ruta_png = f'{nombre_base}.{formato_raster}'
-    grafico.savefig(ruta_png, format=formato_raster, dpi=300, bbox_inches='tight')
     print(f"Gráfico guardado en formato raster de alta calidad: {ruta_png}")
 
     # Mostrar el gráfico (opcional)
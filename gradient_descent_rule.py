@@ -12,6 +12,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from utilidades.cache_superficies import superficie
+from utilidades.exportacion import guardar_figura
+
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # Función de pérdida cuadrática J(θ) = θ^2 (un ejemplo simple y claro)
 def loss_function(theta):
@@ -25,9 +28,9 @@ def gradient(theta):
 learning_rate = 0.3  # Tasa de aprendizaje (η)
 theta_initial = -3.5 # Valor inicial del parámetro θ
 
-# Generar datos para la curva de la función de pérdida
-theta_range = np.linspace(-4.5, 4.5, 400)
-J_values = loss_function(theta_range)
+# Generar datos para la curva de la función de pérdida (reutilizados de la
+# caché de superficies si otra figura ya evaluó la misma curva)
+theta_range, J_values = superficie(loss_function, (-4.5, 4.5), resolucion=400)
 
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
 def create_gradient_descent_plot():
@@ -111,11 +114,8 @@ fig.text(
 
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # Guardar en formato SVG (vectorial, ideal para escalabilidad) y PNG de alta resolución
-output_filename_svg = "gradient_descent_rule.svg"
-output_filename_png = "gradient_descent_rule.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, "gradient_descent_rule", formatos=('svg', 'png'))
 
 # Opcional: Mostrar el gráfico en pantalla
 plt.show()
@@ -9,6 +9,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.style as style
 
+from utilidades.exportacion import guardar_figura
+
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 
 # Definimos la función de coste J(θ) y su derivada (gradiente en 1D)
@@ -96,11 +98,8 @@ fig.text(0.5, 0.01, copyright_text, ha='center', va='bottom', fontsize=10, color
 
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # Se guardará en formato SVG (vectorial, escalable) y PNG (alta resolución)
-output_filename_svg = "gradiente_optimizacion.svg"
-output_filename_png = "gradiente_optimizacion.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, "gradiente_optimizacion", formatos=('svg', 'png'))
 
 # Mostrar el gráfico (opcional, útil en entornos interactivos)
 plt.show()
@@ -9,6 +9,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 #    Se define la función escalar y se calcula su gradiente analíticamente.
@@ -102,11 +104,8 @@ fig.text(0.95, 0.03, '© Alejandro Quintero Ruiz. Generado con Python.',
 fig.tight_layout(rect=[0, 0.05, 1, 0.95]) # Dejamos espacio para el copyright y título
 
 # Guardamos el gráfico en formato SVG (vectorial, ideal para escalar) y PNG (alta resolución).
-output_filename_svg = "gradiente_visualizacion.svg"
-output_filename_png = "gradiente_visualizacion.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, "gradiente_visualizacion", formatos=('svg', 'png'))
 
 # Mostramos el gráfico en pantalla (opcional).
 plt.show()
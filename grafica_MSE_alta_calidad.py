@@ -17,6 +17,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 
+from utilidades.exportacion import guardar_figura
+
 # ==============================================================================
 # 2. Definición de Datos y Parámetros Matemáticos
 # ==============================================================================
@@ -146,13 +148,10 @@ plt.tight_layout(rect=[0, 0.03, 1, 0.95])
 # ==============================================================================
 # 5. Bloque de Guardado/Exportación del Archivo
 # ==============================================================================
-# Guardar en formato SVG (vectorial, ideal para escalabilidad)
-output_filename_svg = "grafico_mse_alta_calidad.svg"
-figura_mse.savefig(output_filename_svg, format='svg', bbox_inches='tight', dpi=300)
-
-# Guardar también en formato PNG de alta resolución como alternativa
-output_filename_png = "grafico_mse_alta_calidad.png"
-figura_mse.savefig(output_filename_png, format='png', bbox_inches='tight', dpi=300)
+# Guardar en formato SVG (vectorial, ideal para escalabilidad) y también en
+# formato PNG de alta resolución como alternativa
+output_filename_svg, output_filename_png = guardar_figura(
+    figura_mse, "grafico_mse_alta_calidad", formatos=('svg', 'png'))
 
 # Mostrar el gráfico (opcional, útil durante el desarrollo)
 plt.show()
@@ -5,9 +5,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from matplotlib.patches import ConnectionPatch
-from scipy.stats import norm
 import warnings
 
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+
+norm = diferido('scipy.stats', 'norm')
+
 # Ignorar advertencias de fuentes para una salida más limpia
 warnings.filterwarnings("ignore", category=UserWarning, module='matplotlib')
 
@@ -144,14 +148,10 @@ def guardar_grafico(fig, nombre_archivo_base):
     """
     Guarda la figura en formatos de alta calidad (SVG, PDF, PNG).
     """
-    # Guardar en formato SVG (Vectorial, ideal para escalabilidad)
-    fig.savefig(f'{nombre_archivo_base}.svg', format='svg', bbox_inches='tight')
-    
-    # Guardar en formato PDF (Vectorial, ideal para publicaciones)
-    fig.savefig(f'{nombre_archivo_base}.pdf', format='pdf', bbox_inches='tight')
-    
-    # Guardar en formato PNG (Ráster de alta resolución, para compatibilidad)
-    fig.savefig(f'{nombre_archivo_base}.png', format='png', dpi=300, bbox_inches='tight')
+    # SVG (vectorial, ideal para escalabilidad), PDF (vectorial, ideal para
+    # publicaciones) y PNG (ráster de alta resolución, para compatibilidad),
+    # calculando el layout una sola vez para los tres formatos.
+    guardar_figura(fig, nombre_archivo_base)
     
     print(f"Gráfico guardado exitosamente como:\n"
           f"- {nombre_archivo_base}.svg\n"
@@ -12,6 +12,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
@@ -129,11 +131,8 @@ if __name__ == '__main__':
     # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
     # Guardamos la imagen en formato SVG (vectorial, ideal para escalabilidad)
     # y PNG (alta resolución para compatibilidad).
-    output_filename_svg = 'grafico_entropia_cruzada.svg'
-    output_filename_png = 'grafico_entropia_cruzada.png'
-    
-    main_figure.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-    main_figure.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+    output_filename_svg, output_filename_png = guardar_figura(
+        main_figure, 'grafico_entropia_cruzada', formatos=('svg', 'png'))
 
     print(f"Gráfico guardado exitosamente como '{output_filename_svg}' y '{output_filename_png}'.")
     
@@ -12,6 +12,8 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
 
+from utilidades.exportacion import guardar_figura
+
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS DE ESTILO
 # -------------------------------------------------
 # Configuración general de estilo para los gráficos
@@ -144,12 +146,9 @@ if __name__ == '__main__':
     # ---------------------------------------------
     # Guardar en formato SVG (vectorial, ideal para PowerPoint y escalado)
     # y PNG de alta resolución como alternativa.
-    nombre_archivo_svg = 'grafico_probabilidad_conceptos.svg'
-    nombre_archivo_png = 'grafico_probabilidad_conceptos.png'
-    
     try:
-        figura_probabilidad.savefig(nombre_archivo_svg, format='svg', bbox_inches='tight')
-        figura_probabilidad.savefig(nombre_archivo_png, format='png', dpi=300, bbox_inches='tight')
+        nombre_archivo_svg, nombre_archivo_png = guardar_figura(
+            figura_probabilidad, 'grafico_probabilidad_conceptos', formatos=('svg', 'png'))
         print(f"Gráfico guardado exitosamente como '{nombre_archivo_svg}' y '{nombre_archivo_png}'.")
     except Exception as e:
         print(f"Error al guardar el archivo: {e}")
@@ -2,7 +2,17 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
+from matplotlib.colors import ListedColormap, LogNorm
+
+from utilidades.animacion import animar_trayectorias, formato_animacion
+from utilidades.cache_superficies import superficie
+from utilidades.descenso_vectorizado import descenso_gradiente_lote, mapa_estabilidad
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+from utilidades.medicion import etapa
+from utilidades.puntos_criticos import puntos_criticos
+
+sns = diferido('seaborn')
 
 # --- 1. Importación de Librerías ---
 # matplotlib.pyplot para la creación de gráficos.
@@ -36,6 +46,15 @@ learning_rates = {
     "η muy grande (0.8)": 0.8  # Divergencia (se aleja del mínimo).
 }
 
+# Modo de la figura: 'trayectorias' (las cuatro tasas anteriores) o
+# 'estabilidad' (mapa de convergencia/divergencia sobre una rejilla densa
+# de tasas de aprendizaje × puntos iniciales).
+MODO = 'trayectorias'
+mapa_tasas = (0.005, 1.2)       # Rango de η del mapa de estabilidad
+mapa_puntos = (-5.0, 5.0)       # Rango de x₀ del mapa de estabilidad
+mapa_resolucion = 800           # Celdas por eje (800 × 800 trayectorias)
+mapa_iteraciones = 200          # Pasos máximos por trayectoria
+
 # --- 3. Función o Bloque de Generación del Gráfico ---
 
 def generate_gradient_descent_plot(initial_x, iterations, learning_rates, cost_func, grad_func):
@@ -51,7 +70,8 @@ def generate_gradient_descent_plot(initial_x, iterations, learning_rates, cost_f
         grad_func (function): La función que calcula el gradiente de la función de costo.
 
     Returns:
-        matplotlib.figure.Figure: El objeto figura de matplotlib con el gráfico generado.
+        tuple: El objeto figura de matplotlib con el gráfico generado y la
+        lista de líneas de las trayectorias (una por tasa de aprendizaje).
     """
     # Configuración estética con Seaborn para un estilo profesional y moderno.
     # 'whitegrid' proporciona un fondo limpio con cuadrícula.
@@ -62,28 +82,29 @@ def generate_gradient_descent_plot(initial_x, iterations, learning_rates, cost_f
     fig, ax = plt.subplots(figsize=(16, 9))
 
     # Rango de x para graficar la función de costo completa.
-    x_vals = np.linspace(-4, 4, 400)
-    y_vals = cost_func(x_vals)
+    # (la curva se reutiliza de la caché de superficies si ya se evaluó antes)
+    x_vals, y_vals = superficie(cost_func, (-4, 4), resolucion=400)
     ax.plot(x_vals, y_vals, label="Función de Costo f(x) = x²", color='gray', linestyle='--', linewidth=1.5)
 
     # Marcar el punto mínimo global de la función de costo.
     ax.plot(0, 0, 'o', color='red', markersize=8, label="Mínimo Global")
 
-    # Simular y graficar el descenso de gradiente para cada tasa de aprendizaje definida.
-    for label, eta in learning_rates.items():
-        x_history = [initial_x]
-        y_history = [cost_func(initial_x)]
-
-        current_x = initial_x
-        for _ in range(iterations):
-            # Fórmula de actualización del descenso de gradiente: x_nuevo = x_actual - η * gradiente(x_actual)
-            current_x = current_x - eta * grad_func(current_x)
-            x_history.append(current_x)
-            y_history.append(cost_func(current_x))
-        
+    # Simular el descenso de gradiente para todas las tasas de aprendizaje a la vez.
+    # Fórmula de actualización: x_nuevo = x_actual - η * gradiente(x_actual), aplicada al lote.
+    # Forma de las trayectorias: (iterations + 1, número de tasas).
+    etas = np.array(list(learning_rates.values()))
+    trayectorias = descenso_gradiente_lote(grad_func, [initial_x], etas, iterations)[:, :, 0]
+    lineas_trayectoria = []
+
+    # Graficar el descenso de gradiente para cada tasa de aprendizaje definida.
+    for k, (label, eta) in enumerate(learning_rates.items()):
+        x_history = trayectorias[:, k]
+        y_history = cost_func(x_history)
+
         # Graficar la trayectoria del descenso de gradiente.
         # Se usan marcadores 'o' para cada paso y líneas para conectar la trayectoria.
-        ax.plot(x_history, y_history, marker='o', linestyle='-', linewidth=2, markersize=6, label=f"{label} (η={eta})")
+        linea, = ax.plot(x_history, y_history, marker='o', linestyle='-', linewidth=2, markersize=6, label=f"{label} (η={eta})")
+        lineas_trayectoria.append(linea)
         
         # Añadir anotaciones con flechas para los primeros pasos.
         # Esto visualiza el "tamaño del paso" que toma el algoritmo en cada iteración.
@@ -131,16 +152,100 @@ def generate_gradient_descent_plot(initial_x, iterations, learning_rates, cost_f
     # sean visibles y no se superpongan.
     plt.tight_layout(rect=[0, 0.03, 1, 0.95]) # [left, bottom, right, top] para el área del plot
     
-    return fig
+    return fig, lineas_trayectoria
+
+def generate_stability_map(cost_func, grad_func, eta_range, x0_range, resolution, max_iterations,
+                           cost_label="f(x)"):
+    """
+    Genera el mapa de estabilidad del descenso de gradiente sobre una rejilla (η, x₀).
 
-# Generar el gráfico llamando a la función principal
-fig = generate_gradient_descent_plot(initial_x, iterations, learning_rates, cost_function, gradient)
+    Cada celda es una trayectoria completa; todas avanzan a la vez como un
+    único arreglo y solo se guarda su resultado (iteración de convergencia,
+    pérdida final y divergencia), no su historial.
+
+    Args:
+        cost_func (function): La función de costo 1-D a minimizar.
+        grad_func (function): Su gradiente.
+        eta_range (tuple): (η mínima, η máxima).
+        x0_range (tuple): (x₀ mínimo, x₀ máximo).
+        resolution (int): Número de valores por eje.
+        max_iterations (int): Pasos máximos por trayectoria.
+        cost_label (str): Expresión de la función para el título (p. ej. "f(x) = x²").
+
+    Returns:
+        matplotlib.figure.Figure: La figura con el mapa.
+    """
+    etas = np.linspace(*eta_range, resolution)
+    x0s = np.linspace(*x0_range, resolution)
+    with etapa('mapa_estabilidad'):
+        mapa = mapa_estabilidad(cost_func, grad_func, etas, x0s, max_iterations)
+
+    sns.set_theme(style="white")
+    fig, ax = plt.subplots(figsize=(16, 9))
+    extension = (etas[0], etas[-1], x0s[0], x0s[-1])
+
+    # Iteraciones hasta converger (escala logarítmica); las celdas que no
+    # convergen se pintan aparte: gris si se estancan, rojo si divergen.
+    iteraciones = np.ma.masked_less(mapa['iteracion'].astype(float), 0)
+    imagen = ax.imshow(np.ma.maximum(iteraciones, 1), extent=extension, origin='lower', aspect='auto',
+                       cmap='viridis_r', norm=LogNorm(1, max_iterations),
+                       interpolation='nearest')
+    estado = np.where(mapa['divergente'], 2.0, np.where(mapa['iteracion'] < 0, 1.0, np.nan))
+    ax.imshow(estado, extent=extension, origin='lower', aspect='auto', interpolation='nearest',
+              cmap=ListedColormap(['#b0b0b0', '#c0392b']), vmin=0.5, vmax=2.5)
+
+    barra = fig.colorbar(imagen, ax=ax)
+    barra.set_label("Iteraciones hasta converger", fontsize=16)
+
+    # Fronteras teóricas en cada mínimo x* del rango dibujado: cerca de x* el
+    # descenso es x_{k+1} − x* ≈ (1 − η·f''(x*))·(x_k − x*), que converge si
+    # η < 2/f''(x*) y, en una cuadrática, lo hace en un solo paso con η = 1/f''(x*).
+    criticos = puntos_criticos(cost_func, [x0_range], gradiente=grad_func)
+    es_minimo = criticos['tipos'] == 'minimo'
+    varios = np.count_nonzero(es_minimo) > 1
+    for x_min, curvatura in zip(criticos['puntos'][es_minimo, 0], criticos['autovalores'][es_minimo, 0]):
+        donde = f" en x* = {x_min:.2f}" if varios else ""
+        ax.axvline(2 / curvatura, color='black', linestyle='--', linewidth=1.5,
+                   label=f"η = 2/f''(x*) = {2 / curvatura:.3g}{donde} (límite de estabilidad)")
+        ax.axvline(1 / curvatura, color='#f9a602', linestyle=':', linewidth=1.5,
+                   label=f"η = 1/f''(x*) = {1 / curvatura:.3g}{donde}: convergencia más rápida")
+    ax.plot([], [], 's', color='#c0392b', markersize=12, label="Diverge")
+    ax.plot([], [], 's', color='#b0b0b0', markersize=12, label=f"No converge en {max_iterations} pasos")
+
+    ax.set_title(f"Mapa de Estabilidad del Descenso de Gradiente para {cost_label}", fontsize=22, fontweight='bold', pad=20)
+    ax.set_xlim(etas[0], etas[-1])
+    ax.set_xlabel("Tasa de aprendizaje (η)", fontsize=16)
+    ax.set_ylabel("Punto inicial (x₀)", fontsize=16)
+    ax.legend(fontsize=12, loc='upper left', frameon=True, shadow=True)
+
+    fig.text(0.99, 0.01, "© Alejandro Quintero Ruiz. Generado con Python.",
+             ha='right', va='bottom', fontsize=10, color='gray', alpha=0.7)
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+    return fig
 
-# --- 5. Bloque de Guardado/Exportación del Archivo ---
-# Guardar la imagen en formato SVG (Scalable Vector Graphics).
-# SVG es ideal para gráficos vectoriales de alta fidelidad y escalables,
-# perfectos para publicaciones y presentaciones sin pérdida de calidad.
-output_filename = "impacto_tasa_aprendizaje.svg"
-fig.savefig(output_filename, format="svg", bbox_inches="tight")
 
-print(f"Gráfico de alta calidad guardado como '{output_filename}'")
+if MODO == 'estabilidad':
+    fig = generate_stability_map(cost_function, gradient, mapa_tasas, mapa_puntos,
+                                 mapa_resolucion, mapa_iteraciones, cost_label="f(x) = x²")
+    output_svg, output_png = guardar_figura(fig, "mapa_estabilidad_tasa_aprendizaje",
+                                            formatos=('svg', 'png'))
+    print(f"Mapa de estabilidad guardado como '{output_svg}' y '{output_png}'")
+else:
+    # Generar el gráfico llamando a la función principal
+    fig, lineas_trayectoria = generate_gradient_descent_plot(initial_x, iterations, learning_rates, cost_function, gradient)
+
+    # --- 5. Bloque de Guardado/Exportación del Archivo ---
+    # Guardar la imagen en formato SVG (Scalable Vector Graphics).
+    # SVG es ideal para gráficos vectoriales de alta fidelidad y escalables,
+    # perfectos para publicaciones y presentaciones sin pérdida de calidad.
+    output_filename = "impacto_tasa_aprendizaje.svg"
+    fig.savefig(output_filename, format="svg", bbox_inches="tight")
+
+    print(f"Gráfico de alta calidad guardado como '{output_filename}'")
+
+    # Animación de las trayectorias (opcional, con EXPORTAR_ANIMACION=gif|mp4):
+    # las cuatro tasas de aprendizaje avanzan a la vez, un paso por cuadro.
+    formato = formato_animacion()
+    if formato:
+        ruta_animacion = animar_trayectorias(fig, lineas_trayectoria, f"impacto_tasa_aprendizaje.{formato}", fps=4)
+        print(f"Animación guardada como '{ruta_animacion}'")
@@ -14,6 +14,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
+from utilidades.exportacion import guardar_figura
+from utilidades.malla_adaptativa import malla_adaptativa
+
 # =============================================================================
 # 2. Definición de Datos y Parámetros Matemáticos
 # =============================================================================
@@ -23,11 +26,12 @@ import matplotlib as mpl
 def f(x, y):
     return x**2 + 2 * y**2
 
-# Creamos una malla de puntos (grid) para evaluar la función.
-x = np.linspace(-2.5, 2.5, 400)
-y = np.linspace(-2.5, 2.5, 400)
-X, Y = np.meshgrid(x, y)
-Z = f(X, Y)
+# Niveles de las curvas de nivel que se dibujarán.
+niveles = np.arange(0, 12, 1.0)
+
+# Creamos una malla adaptativa de puntos para evaluar la función: se refina
+# solo donde las curvas de nivel lo requieren.
+triangulacion, Z = malla_adaptativa(f, (-2.5, 2.5), (-2.5, 2.5), niveles)
 
 # Punto de interés P donde calcularemos el gradiente.
 punto_p = np.array([-1.5, 1.0])
@@ -59,12 +63,11 @@ fig, ax = plt.subplots(figsize=(12, 6.75))
 
 # --- Dibujo de las Curvas de Nivel (Contour Plot) ---
 # Usamos un mapa de color amigable con el daltonismo (viridis).
-niveles = np.arange(0, 12, 1.0)
-contour = ax.contour(X, Y, Z, levels=niveles, cmap='viridis', linewidths=1.0)
+contour = ax.tricontour(triangulacion, Z, levels=niveles, cmap='viridis', linewidths=1.0)
 ax.clabel(contour, inline=True, fontsize=10, fmt='%1.0f')
 
 # Relleno de color para mejorar la visualización de crecimiento.
-contourf = ax.contourf(X, Y, Z, levels=niveles, cmap='viridis', alpha=0.75)
+contourf = ax.tricontourf(triangulacion, Z, levels=niveles, cmap='viridis', alpha=0.75)
 
 # --- Dibujo del Punto P y los Vectores Gradiente ---
 # Punto P
@@ -106,13 +109,10 @@ fig.tight_layout(rect=[0, 0.03, 1, 0.97])
 # =============================================================================
 # 5. Guardado y Exportación del Archivo
 # =============================================================================
-# Guardar en formato vectorial SVG (ideal para escalabilidad y calidad)
-output_filename_svg = "interpretacion_gradiente.svg"
-fig.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-
-# Guardar en formato PNG de alta resolución (300 DPI) como alternativa
-output_filename_png = "interpretacion_gradiente.png"
-fig.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+# Guardar en formato vectorial SVG (ideal para escalabilidad y calidad) y en
+# formato PNG de alta resolución (300 DPI) como alternativa
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, "interpretacion_gradiente", formatos=('svg', 'png'))
 
 plt.show()
 
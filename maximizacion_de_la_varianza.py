@@ -6,11 +6,14 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.ticker import MaxNLocator
 
+from utilidades.exportacion import guardar_figura
+from utilidades.muestreo import generador_figura, normal_multivariante
+
 # ----------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ----------------------------------------------------
 # Semilla para reproducibilidad de los datos
-np.random.seed(42)
+generador = generador_figura('maximizacion_de_la_varianza')
 
 # Parámetros de la distribución de datos original
 mean = [0, 0]
@@ -20,7 +23,7 @@ cov_matrix = [[1, 0.9],
               [0.9, 1]]
 
 # Generación de 200 puntos de datos en 2D siguiendo una distribución normal multivariada
-X = np.random.multivariate_normal(mean, cov_matrix, 200)
+X = normal_multivariante(mean, cov_matrix, 200, generador)
 
 # --- Cálculo de Componentes Principales ---
 # 1. Centrar los datos (aunque ya están centrados por la media [0,0])
@@ -149,17 +152,11 @@ if __name__ == '__main__':
     main_fig.tight_layout(rect=[0, 0.03, 1, 0.95]) # Ajustar para dar espacio al título y copyright
 
     # Guardar la imagen en formatos de alta calidad
-    # SVG es un formato vectorial ideal para escalabilidad y edición
-    output_filename_svg = 'pca_maximization_of_variance.svg'
-    main_fig.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-
-    # PDF es otra excelente opción vectorial para publicaciones
-    output_filename_pdf = 'pca_maximization_of_variance.pdf'
-    main_fig.savefig(output_filename_pdf, format='pdf', bbox_inches='tight')
-
-    # PNG con alta resolución (DPI) como alternativa rasterizada
-    output_filename_png = 'pca_maximization_of_variance.png'
-    main_fig.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+    # SVG es un formato vectorial ideal para escalabilidad y edición, PDF es
+    # otra excelente opción vectorial para publicaciones y PNG con alta
+    # resolución (DPI) es la alternativa rasterizada
+    output_filename_svg, output_filename_pdf, output_filename_png = guardar_figura(
+        main_fig, 'pca_maximization_of_variance')
 
     print(f"Gráfico guardado en los siguientes formatos:\n- {output_filename_svg}\n- {output_filename_pdf}\n- {output_filename_png}")
 
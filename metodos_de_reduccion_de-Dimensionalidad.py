@@ -4,33 +4,130 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
-from sklearn.datasets import make_swiss_roll
-from sklearn.manifold import LocallyLinearEmbedding, TSNE
-from sklearn.decomposition import PCA
-from umap import UMAP # Requiere instalar 'umap-learn'
+
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+from utilidades.incrustaciones import calcular_incrustaciones
+from utilidades.medicion import etapa
+from utilidades.densidad import dispersion
+from utilidades.reduccion_masiva import interpolar_desde_referencias, rollo_suizo_por_bloques
+from utilidades.vecinos import conservacion_vecinos, grafo_vecinos
+
+make_swiss_roll = diferido('sklearn.datasets', 'make_swiss_roll')
 
 # ==============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ==============================================================================
+# Número de puntos del rollo suizo (p. ej. 1_000_000 para el modo masivo).
+N_SAMPLES = 1500
+
+# Modo masivo: por encima de este tamaño los datos se generan por bloques,
+# el PCA es incremental, los métodos no lineales se ajustan sobre
+# N_REFERENCIAS puntos de referencia y se interpolan al resto, y los paneles
+# 2D se dibujan como imágenes de densidad en lugar de diagramas de dispersión.
+UMBRAL_MODO_MASIVO = 20_000
+N_REFERENCIAS = 3000
+MAX_PUNTOS_3D = 20_000  # Muestra dibujada en el panel 3D
+
 # Generamos el conjunto de datos "Swiss Roll"
 # n_samples: Número de puntos en el conjunto de datos.
 # noise: Cantidad de ruido gaussiano añadido a los datos.
 # random_state: Semilla para reproducibilidad.
-X, color = make_swiss_roll(n_samples=1500, noise=0.1, random_state=42)
+MODO_MASIVO = N_SAMPLES > UMBRAL_MODO_MASIVO
+with etapa('datos'):
+    if MODO_MASIVO:
+        X, color = rollo_suizo_por_bloques(N_SAMPLES, ruido=0.1, semilla=42)
+    else:
+        X, color = make_swiss_roll(n_samples=N_SAMPLES, noise=0.1, random_state=42)
 
 # Parámetros para los algoritmos de reducción de dimensionalidad
 # Estos parámetros son cruciales para el resultado y se eligen comúnmente.
 N_NEIGHBORS = 12  # Número de vecinos para LLE y UMAP
 N_COMPONENTS = 2   # Dimensión de destino (2D)
+PERPLEXITY = 30    # Perplejidad de t-SNE
+
+# Métodos a comparar: {nombre: (clase, hiperparámetros)}. Cada uno lleva su
+# semilla fija, así que se pueden ajustar en paralelo con resultados
+# deterministas; las incrustaciones se guardan en disco y no se vuelven a
+# ajustar mientras no cambien los datos ni estos parámetros. LLE y UMAP
+# comparten un único grafo de N_NEIGHBORS vecinos (ver `calcular_ajustes`).
+METODOS_REDUCCION = {
+    'pca': ('sklearn.decomposition.PCA',
+            dict(n_components=N_COMPONENTS, random_state=42)),
+    'lle': ('sklearn.manifold.LocallyLinearEmbedding',
+            dict(n_neighbors=N_NEIGHBORS, n_components=N_COMPONENTS, method='modified', random_state=42)),
+    'tsne': ('sklearn.manifold.TSNE',
+             dict(n_components=N_COMPONENTS, perplexity=PERPLEXITY, random_state=42, init='pca', learning_rate='auto')),
+    'umap': ('umap.UMAP',  # Requiere instalar 'umap-learn'
+             dict(n_neighbors=N_NEIGHBORS, n_components=N_COMPONENTS, random_state=42)),
+}
+
+def calcular_ajustes():
+    """
+    Construye el grafo de vecinos compartido y calcula las incrustaciones.
+
+    El índice espacial se construye una sola vez: LLE y UMAP lo reutilizan y
+    la métrica de conservación de vecinos compara contra él. En modo masivo
+    el grafo y los métodos no lineales se limitan a los puntos de referencia,
+    y el PCA se ajusta de forma incremental sobre todos los datos.
+
+    Returns:
+        tuple: (incrustaciones {nombre: arreglo}, GrafoVecinos, referencias),
+        donde `referencias` indexa en X los puntos del grafo.
+    """
+    if not MODO_MASIVO:
+        referencias = slice(None)
+        with etapa('vecinos'):
+            grafo = grafo_vecinos(X, N_NEIGHBORS)
+        with etapa('ajuste_modelo'):
+            incrustaciones = calcular_incrustaciones(X, METODOS_REDUCCION, grafo=grafo)
+        return incrustaciones, grafo, referencias
+
+    referencias = np.sort(np.random.default_rng(42).choice(len(X), N_REFERENCIAS, replace=False))
+    X_referencias = np.asarray(X[referencias])
+    no_lineales = {nombre: metodo for nombre, metodo in METODOS_REDUCCION.items() if nombre != 'pca'}
+    with etapa('vecinos'):
+        grafo = grafo_vecinos(X_referencias, N_NEIGHBORS)
+    with etapa('ajuste_modelo'):
+        # El PCA sí se ajusta sobre todos los puntos: una pasada por bloques
+        acp = ACPIncremental(N_COMPONENTS).fit(X)
+        incrustaciones = {'pca': np.concatenate(list(acp.transformar_por_bloques(X)))}
+        ajustadas = calcular_incrustaciones(X_referencias, no_lineales, grafo=grafo)
+    with etapa('interpolacion'):
+        incrustaciones.update(interpolar_desde_referencias(X, referencias, ajustadas, k=N_NEIGHBORS))
+    return incrustaciones, grafo, referencias
 
 # =============================================================================
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
 # ==============================================================================
-def generar_grafico_comparativo():
+def dibujar_incrustacion(ax, incrustacion, cmap):
+    """
+    Dibuja una incrustación 2D coloreada por la posición sobre el rollo.
+
+    En modo masivo se agrega en una imagen de densidad: un diagrama de
+    dispersión con millones de puntos es lento y produce SVG enormes.
+    """
+    dispersion(ax, incrustacion[:, 0], incrustacion[:, 1], c=color, cmap=cmap, s=20, alpha=0.8,
+               umbral=UMBRAL_MODO_MASIVO)
+
+def generar_grafico_comparativo(incrustaciones=None, grafo=None, referencias=slice(None)):
     """
     Genera y estiliza una visualización comparativa de métodos de reducción
     de dimensionalidad.
+
+    Args:
+        incrustaciones (dict, opcional): {nombre: incrustación} de los métodos
+            de METODOS_REDUCCION. Si se omite, se calculan (o se recuperan de
+            la caché) con `calcular_ajustes`.
+        grafo (GrafoVecinos, opcional): Grafo de vecinos de X, para la
+            métrica de conservación de vecinos de cada panel.
+        referencias (slice | np.ndarray): Puntos de X a los que corresponde
+            el grafo (todos, salvo en modo masivo).
     """
+    if incrustaciones is None or grafo is None:
+        incrustaciones, grafo, referencias = calcular_ajustes()
+
     # --- Configuración del Estilo y Figura ---
     plt.style.use('seaborn-v0_8-whitegrid') # Estilo profesional y limpio
     fig = plt.figure(figsize=(16, 9), constrained_layout=True)
@@ -59,37 +156,39 @@ def generar_grafico_comparativo():
     axes = [ax1, ax2, ax3, ax4]
 
     # --- Gráfico 1: Datos Originales en 3D ---
-    ax0.scatter(X[:, 0], X[:, 1], X[:, 2], c=color, cmap=cmap, s=20, alpha=0.8)
+    # En modo masivo se dibuja solo una muestra de MAX_PUNTOS_3D puntos.
+    muestra = slice(None)
+    if len(X) > MAX_PUNTOS_3D:
+        muestra = np.random.default_rng(0).choice(len(X), MAX_PUNTOS_3D, replace=False)
+    X_3d = np.asarray(X[muestra])
+    ax0.scatter(X_3d[:, 0], X_3d[:, 1], X_3d[:, 2], c=color[muestra], cmap=cmap, s=20, alpha=0.8,
+                rasterized=MODO_MASIVO)
     ax0.set_title("1. Datos Originales (Rollo Suizo 3D)", fontsize=14, pad=10)
     ax0.set_xlabel("Eje X")
     ax0.set_ylabel("Eje Y")
     ax0.set_zlabel("Eje Z")
     ax0.view_init(elev=10, azim=-75) # Ajuste de la vista 3D para mejor perspectiva
 
-    # --- Aplicación y visualización de los algoritmos ---
+    # --- Visualización de las incrustaciones ---
     
     # Método 1: PCA (Principal Component Analysis) - Lineal
-    pca = PCA(n_components=N_COMPONENTS, random_state=42)
-    X_pca = pca.fit_transform(X)
-    ax1.scatter(X_pca[:, 0], X_pca[:, 1], c=color, cmap=cmap, s=20, alpha=0.8)
+    X_pca = incrustaciones['pca']
+    dibujar_incrustacion(ax1, X_pca, cmap)
     ax1.set_title("2. PCA (Lineal)", fontsize=14)
 
     # Método 2: LLE (Locally Linear Embedding) - No Lineal
-    lle = LocallyLinearEmbedding(n_neighbors=N_NEIGHBORS, n_components=N_COMPONENTS, method='modified', random_state=42)
-    X_lle = lle.fit_transform(X)
-    ax2.scatter(X_lle[:, 0], X_lle[:, 1], c=color, cmap=cmap, s=20, alpha=0.8)
+    X_lle = incrustaciones['lle']
+    dibujar_incrustacion(ax2, X_lle, cmap)
     ax2.set_title("3. LLE (No Lineal)", fontsize=14)
 
     # Método 3: t-SNE (t-distributed Stochastic Neighbor Embedding) - No Lineal
-    tsne = TSNE(n_components=N_COMPONENTS, perplexity=30, random_state=42, init='pca', learning_rate='auto')
-    X_tsne = tsne.fit_transform(X)
-    ax3.scatter(X_tsne[:, 0], X_tsne[:, 1], c=color, cmap=cmap, s=20, alpha=0.8)
+    X_tsne = incrustaciones['tsne']
+    dibujar_incrustacion(ax3, X_tsne, cmap)
     ax3.set_title("4. t-SNE (No Lineal)", fontsize=14)
 
     # Método 4: UMAP (Uniform Manifold Approximation and Projection) - No Lineal
-    reducer_umap = UMAP(n_neighbors=N_NEIGHBORS, n_components=N_COMPONENTS, random_state=42)
-    X_umap = reducer_umap.fit_transform(X)
-    ax4.scatter(X_umap[:, 0], X_umap[:, 1], c=color, cmap=cmap, s=20, alpha=0.8)
+    X_umap = incrustaciones['umap']
+    dibujar_incrustacion(ax4, X_umap, cmap)
     ax4.set_title("5. UMAP (No Lineal)", fontsize=14)
 
     # --- Ajustes Estéticos Finales para los subplots 2D ---
@@ -104,6 +203,14 @@ def generar_grafico_comparativo():
         ax.spines['left'].set_visible(True)
         ax.set_aspect('equal', 'box') # Asegura que la escala sea la misma en ambos ejes
 
+    # --- Calidad de cada incrustación: vecinos originales que se conservan ---
+    for ax, nombre in zip(axes, ['pca', 'lle', 'tsne', 'umap']):
+        with etapa('metricas'):
+            conservados = conservacion_vecinos(grafo, np.asarray(incrustaciones[nombre])[referencias])
+        ax.text(0.02, 0.02, f"Vecinos conservados: {conservados:.0%}", transform=ax.transAxes,
+                fontsize=10, color='dimgray', ha='left', va='bottom',
+                bbox=dict(facecolor='white', edgecolor='none', alpha=0.8, pad=2))
+
     return fig
 
 # ==============================================================================
@@ -130,26 +237,21 @@ def guardar_grafico(fig, nombre_archivo="comparacion_reduccion_dimensionalidad")
     """
     Guarda la figura en formatos de alta calidad.
     """
-    # Guardar en formato SVG (Vectorial, ideal para escalabilidad y edición)
-    ruta_svg = f"{nombre_archivo}.svg"
-    fig.savefig(ruta_svg, format='svg', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado como: {ruta_svg}")
-
-    # Guardar en formato PDF (Vectorial, excelente para publicaciones)
-    ruta_pdf = f"{nombre_archivo}.pdf"
-    fig.savefig(ruta_pdf, format='pdf', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado como: {ruta_pdf}")
-    
-    # Guardar en formato PNG (Ráster de alta resolución, para compatibilidad)
-    ruta_png = f"{nombre_archivo}.png"
-    fig.savefig(ruta_png, format='png', dpi=300, bbox_inches='tight')
-    print(f"Gráfico guardado como: {ruta_png}")
+    # SVG (vectorial, ideal para escalabilidad y edición), PDF (vectorial,
+    # excelente para publicaciones) y PNG (ráster de alta resolución, para
+    # compatibilidad), con un único cálculo de layout para los tres.
+    for ruta in guardar_figura(fig, nombre_archivo):
+        print(f"Gráfico guardado como: {ruta}")
 
 
 # --- Ejecución Principal ---
 if __name__ == "__main__":
-    # Generamos la figura base
-    figura_generada = generar_grafico_comparativo()
+    # Grafo de vecinos compartido y ajuste de los cuatro métodos en paralelo
+    # (o lectura de la caché)
+    incrustaciones, grafo, referencias = calcular_ajustes()
+
+    # Generamos la figura base a partir de las incrustaciones
+    figura_generada = generar_grafico_comparativo(incrustaciones, grafo, referencias)
     
     # Añadimos el copyright
     agregar_copyright(figura_generada)
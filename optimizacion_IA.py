@@ -15,7 +15,10 @@ Fecha: 2023-10-27
 # =============================================================================
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+
+from utilidades.importacion_diferida import diferido
+
+sns = diferido('seaborn')
 
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
@@ -11,6 +11,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import Ellipse, Rectangle
 
+from utilidades.exportacion import guardar_figura
+
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS/ESTÉTICOS
 
 # -- Parámetros del Gráfico --
@@ -136,17 +138,11 @@ fig.text(
 
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 
-# Guardar en formato SVG (vectorial, ideal para PowerPoint y publicaciones)
-output_filename_svg = "probabilidad_conceptos_fundamentales.svg"
-fig.savefig(output_filename_svg, format='svg', bbox_inches='tight', pad_inches=0.2)
-
-# Opcional: Guardar en formato PNG de alta resolución
-output_filename_png = "probabilidad_conceptos_fundamentales.png"
-fig.savefig(output_filename_png, format='png', dpi=DPI_VALUE, bbox_inches='tight', pad_inches=0.2)
-
-# Opcional: Guardar en formato PDF (vectorial)
-output_filename_pdf = "probabilidad_conceptos_fundamentales.pdf"
-fig.savefig(output_filename_pdf, format='pdf', bbox_inches='tight', pad_inches=0.2)
+# Guardar en formato SVG (vectorial, ideal para PowerPoint y publicaciones),
+# PNG de alta resolución y PDF (vectorial), con un único cálculo de layout
+output_filename_svg, output_filename_png, output_filename_pdf = guardar_figura(
+    fig, "probabilidad_conceptos_fundamentales", formatos=('svg', 'png', 'pdf'),
+    dpi=DPI_VALUE, margen=0.2)
 
 plt.show()
 
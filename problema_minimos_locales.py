@@ -13,34 +13,59 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
+from utilidades.cuencas import COLORES_CUENCAS, cuencas_atraccion, dibujar_cuencas, rejilla
+from utilidades.exportacion import guardar_figura
+from utilidades.puntos_criticos import minimos, puntos_criticos
+
 # ==============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ==============================================================================
 
 # Definimos la función no convexa.
-# Una parábola (0.1*x^2) con una sinusoide (cos(x)) superpuesta.
+# Una parábola (0.1*x^2) con una sinusoide (cos(x)) superpuesta y una ligera
+# inclinación (0.15*x): sin ella la función es par y sus dos mínimos empatan.
 def non_convex_function(x):
     """Función no convexa de ejemplo para la visualización."""
-    return 0.1 * x**2 + np.cos(x)
+    return 0.1 * x**2 + np.cos(x) + 0.15 * x
+
+# Derivada de la función, para lanzar el descenso del gradiente.
+def non_convex_gradient(x):
+    """Derivada f'(x) = 0.2x - sen(x) + 0.15 de la función no convexa."""
+    return 0.2 * x - np.sin(x) + 0.15
+
+# Modo de la figura: 'curva' (la función y sus mínimos) o 'cuencas' (a qué
+# mínimo llega el descenso desde cada punto inicial y con cada tasa de aprendizaje).
+MODO = 'curva'
+cuencas_tasas = (0.01, 2.6)     # Rango de tasas de aprendizaje (η) del mapa de cuencas
+cuencas_iteraciones = 1000      # Pasos máximos por trayectoria
 
 # Generamos los datos para el eje X
 x_data = np.linspace(-10, 10, 500)
 # Calculamos los valores correspondientes del eje Y
 y_data = non_convex_function(x_data)
 
-# Coordenadas de puntos de interés (calculados analíticamente o por inspección)
-# Mínimo Local
-x_local_min = 3.05
-y_local_min = non_convex_function(x_local_min)
-
-# Mínimo Global
-x_global_min = -3.05
-y_global_min = non_convex_function(x_global_min)
-
 # Punto de inicio para el descenso del gradiente (hipotético)
 x_start = 8.0
 y_start = non_convex_function(x_start)
 
+def puntos_de_interes():
+    """
+    Mínimos global y local de la función, a partir de sus puntos críticos.
+
+    Returns:
+        tuple: (x_global_min, y_global_min, x_local_min, y_local_min). El
+        mínimo local es el más cercano al punto de inicio, donde se detiene
+        el descenso; el global, el más bajo de todos.
+    """
+    x_minimos, y_minimos = minimos(puntos_criticos(non_convex_function, [(x_data[0], x_data[-1])],
+                                                   gradiente=non_convex_gradient))
+    x_minimos = x_minimos[:, 0]
+    indice_local = np.argmin(np.abs(x_minimos - x_start))
+    if indice_local == 0:
+        raise ValueError("El descenso desde x_start llega al mínimo global: no hay mínimo local que mostrar.")
+    # `minimos` los ordena del más bajo al más alto
+    return x_minimos[0], y_minimos[0], x_minimos[indice_local], y_minimos[indice_local]
+
 # ==============================================================================
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
 # ==============================================================================
@@ -49,6 +74,8 @@ def create_plot():
     """
     Crea y personaliza el gráfico de la función no convexa.
     """
+    x_global_min, y_global_min, x_local_min, y_local_min = puntos_de_interes()
+
     # --- Configuración de Estilo y Figura ---
     plt.style.use('seaborn-v0_8-whitegrid')
     mpl.rcParams['font.family'] = 'Arial' # Fuente profesional y legible
@@ -69,7 +96,7 @@ def create_plot():
 
     # --- Anotaciones y Elementos Explicativos ---
     # Flechas y texto para anotar los puntos
-    ax.annotate('Mínimo Global\n(Solución Óptima)', xy=(x_global_min, y_global_min), xytext=(-8, -1.5),
+    ax.annotate('Mínimo Global\n(Solución Óptima)', xy=(x_global_min, y_global_min), xytext=(-7.5, 2),
                 arrowprops=dict(facecolor='black', shrink=0.05, width=1, headwidth=8),
                 fontsize=12, ha='center', va='center', bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", lw=1, alpha=0.8))
 
@@ -104,10 +131,64 @@ def create_plot():
     # ==========================================================================
     # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
     # ==========================================================================
-    plt.savefig("problema_minimos_locales.svg", format='svg', bbox_inches='tight')
-    plt.savefig("problema_minimos_locales.png", format='png', dpi=300, bbox_inches='tight')
+    guardar_figura(fig, "problema_minimos_locales", formatos=('svg', 'png'))
     
     plt.show()
 
+def create_basin_plot():
+    """
+    Crea el mapa de cuencas de atracción sobre el plano (punto inicial, tasa de aprendizaje).
+
+    Se lanza un descenso del gradiente desde cada celda de una rejilla de
+    400 × 400 pares (x₀, η), todos a la vez, y cada celda se colorea según el
+    mínimo al que llega (más oscura cuantas más iteraciones necesita).
+    """
+    plt.style.use('seaborn-v0_8-whitegrid')
+    mpl.rcParams['font.family'] = 'Arial' # Fuente profesional y legible
+    mpl.rcParams['axes.labelweight'] = 'bold'
+    mpl.rcParams['axes.titleweight'] = 'bold'
+
+    # --- Descenso desde cada par (x₀, η) de la rejilla ---
+    x_lim = (x_data[0], x_data[-1])
+    x0s, etas, puntos = rejilla(x_lim, cuencas_tasas)
+    cuencas = cuencas_atraccion(non_convex_gradient, puntos[:, 0], puntos[:, 1],
+                                cuencas_iteraciones, non_convex_function)
+    forma = (len(etas), len(x0s))
+
+    # Arriba la función, abajo el mapa de cuencas con el mismo eje x
+    fig, (ax_curva, ax) = plt.subplots(2, 1, figsize=(12, 6.75), sharex=True,
+                                       gridspec_kw={'height_ratios': [1, 2]})
+    ax_curva.plot(x_data, y_data, color='#440154', linewidth=2.5, label='$f(x)$')
+    for i, minimo in enumerate(cuencas['minimos'][:, 0]):
+        ax_curva.plot(minimo, non_convex_function(minimo), 'o', markersize=10, markeredgecolor='black',
+                      color=COLORES_CUENCAS[i % len(COLORES_CUENCAS)])
+    ax_curva.set_ylabel('$f(x)$', fontsize=14)
+    ax_curva.set_title('Cuencas de Atracción del Descenso del Gradiente', fontsize=18, pad=20)
+
+    elementos = dibujar_cuencas(ax, cuencas['etiquetas'].reshape(forma),
+                                (*x_lim, *cuencas_tasas), cuencas,
+                                iteraciones=cuencas['iteraciones'].reshape(forma),
+                                formato_minimo='x = {:.2f}')
+    # Por encima de η = 2 / f''(x*) el mínimo deja de ser estable para el descenso
+    curvatura = 0.2 - np.cos(cuencas['minimos'][0, 0])
+    elementos.append(ax.axhline(2 / curvatura, color='#f9a602', linestyle='--', linewidth=2,
+                                label=f"$\\eta = 2 / f''(x^*) \\approx {2 / curvatura:.2f}$"))
+    ax.set_xlabel('Punto inicial $x_0$', fontsize=14)
+    ax.set_ylabel('Tasa de aprendizaje $\\eta$', fontsize=14)
+    ax.tick_params(axis='both', which='major', labelsize=12)
+    ax.legend(handles=elementos, fontsize=11, loc='upper center', bbox_to_anchor=(0.5, -0.2),
+              fancybox=True, shadow=True, ncol=3)
+
+    plt.tight_layout(rect=[0, 0.05, 1, 0.95])
+    fig.text(0.98, 0.02, '© Alejandro Quintero Ruiz. Generado con Python.',
+             ha='right', va='bottom', fontsize=10, color='gray', style='italic')
+
+    guardar_figura(fig, "problema_minimos_locales_cuencas", formatos=('svg', 'png'))
+
+    plt.show()
+
 if __name__ == '__main__':
-    create_plot()
+    if MODO == 'cuencas':
+        create_basin_plot()
+    else:
+        create_plot()
@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from datetime import datetime
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS DE ESTILO
 # -----------------------------------------------------------------------------
@@ -139,15 +141,10 @@ if __name__ == '__main__':
     # .png: Formato rasterizado de alta resolución, ideal para inserción directa.
     nombre_archivo_base = "visualizacion_producto_escalar_matricial"
     
-    # Guardar en formato SVG (Vectorial)
-    ruta_svg = f"{nombre_archivo_base}.svg"
-    figura.savefig(ruta_svg, format='svg', bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado exitosamente en: {ruta_svg}")
-
-    # Guardar en formato PNG (Alta resolución)
-    ruta_png = f"{nombre_archivo_base}.png"
-    figura.savefig(ruta_png, format='png', dpi=DPI_EXPORT, bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado exitosamente en: {ruta_png}")
+    # Guardar en formato SVG (Vectorial) y PNG (Alta resolución)
+    for ruta in guardar_figura(figura, nombre_archivo_base, formatos=('svg', 'png'),
+                               dpi=DPI_EXPORT):
+        print(f"Gráfico guardado exitosamente en: {ruta}")
 
     # Opcional: Mostrar el gráfico en una ventana
     # plt.show()
@@ -2,6 +2,8 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np # Aunque no se usa directamente para operaciones matriciales aquí, es una buena práctica incluirlo para tareas numéricas.
 
+from utilidades.exportacion import guardar_figura
+
 # --- 1. Importación de Librerías ---
 # matplotlib.pyplot para la creación de gráficos.
 # matplotlib.patches para formas geométricas como rectángulos.
@@ -184,13 +186,8 @@ def generate_matrix_multiplication_plot():
 
     # --- 5. Bloque de Guardado/Exportación del Archivo ---
     # Guardar la imagen en formatos vectoriales y de alta resolución.
-    output_filename_svg = "producto_matrices_fila_columna.svg"
-    output_filename_pdf = "producto_matrices_fila_columna.pdf"
-    output_filename_png = "producto_matrices_fila_columna.png"
-
-    plt.savefig(output_filename_svg, format='svg', bbox_inches='tight', dpi=300)
-    plt.savefig(output_filename_pdf, format='pdf', bbox_inches='tight', dpi=300)
-    plt.savefig(output_filename_png, format='png', bbox_inches='tight', dpi=300)
+    output_filename_svg, output_filename_pdf, output_filename_png = guardar_figura(
+        fig, "producto_matrices_fila_columna")
 
     print(f"Gráfico guardado como: {output_filename_svg}, {output_filename_pdf}, y {output_filename_png}")
     plt.close(fig) # Cierra la figura para liberar memoria.
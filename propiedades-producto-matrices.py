@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patheffects import withStroke
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 
 # 2. Definición de Datos/Parámetros
@@ -164,11 +166,10 @@ def main():
     plt.tight_layout(rect=[0, 0.03, 1, 0.95]) # Ajustar para que todo encaje
 
     # 5. Bloque de Guardado/Exportación del Archivo
-    # Guardar en formato vectorial SVG (ideal para escalabilidad)
-    plt.savefig("propiedades_matrices.svg", format="svg", transparent=True)
-    
-    # Guardar en formato PNG de alta resolución (para compatibilidad)
-    plt.savefig("propiedades_matrices.png", format="png", dpi=DPI, transparent=True)
+    # Guardar en formato vectorial SVG (ideal para escalabilidad) y en formato
+    # PNG de alta resolución (para compatibilidad), sin recorte ajustado
+    guardar_figura(fig, "propiedades_matrices", formatos=("svg", "png"), dpi=DPI,
+                   ajustar=False, transparent=True)
 
     print("Gráficos 'propiedades_matrices.svg' y 'propiedades_matrices.png' generados exitosamente.")
     
@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 
+from utilidades.exportacion import guardar_figura
+
 # --- Configuración de Estilo Profesional ---
 # Usamos un estilo limpio y una fuente sans-serif profesional como 'Arial' o 'Helvetica'.
 # Si no están disponibles, Matplotlib usará una alternativa predeterminada.
@@ -138,11 +140,8 @@ main_figure.text(0.98, 0.02, '© Alejandro Quintero Ruiz. Generado con Python.',
 
 # 5. Bloque de Guardado/Exportación del Archivo
 # Guardar en formato SVG (vectorial, ideal para escalabilidad) y PNG (alta resolución)
-output_filename_svg = "propiedades_autovalores.svg"
-output_filename_png = "propiedades_autovalores.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    main_figure, "propiedades_autovalores", formatos=('svg', 'png'))
 
 # Mostrar el gráfico (opcional, útil en entornos interactivos como Jupyter)
 plt.show()
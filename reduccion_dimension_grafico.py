@@ -11,6 +11,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 
 # 2. DEFINICIÓN DE DATOS/PARÁMETROS MATEMÁTICOS
@@ -123,11 +125,8 @@ fig.text(
 # Guardamos la imagen en formato SVG (vectorial) y PNG (alta resolución).
 # SVG es ideal para escalar sin pérdida de calidad en PowerPoint.
 # PNG es una alternativa de alta calidad.
-output_filename_svg = "reduccion_dimension_grafico.svg"
-output_filename_png = "reduccion_dimension_grafico.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_png = guardar_figura(
+    fig, "reduccion_dimension_grafico", formatos=('svg', 'png'))
 
 # Opcional: Mostrar el gráfico en pantalla al ejecutar el script
 plt.show()
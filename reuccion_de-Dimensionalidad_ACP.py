@@ -3,26 +3,38 @@
 # ----------------------------------------------------
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
 from matplotlib.patches import FancyArrowPatch
 from mpl_toolkits.mplot3d import proj3d
 
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion
+from utilidades.exportacion import guardar_figura
+from utilidades.medicion import etapa
+from utilidades.muestreo import generador_figura, normal_multivariante
+
 # ----------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ----------------------------------------------------
 # Generamos datos sintéticos en 3D que tengan una clara dirección principal
 # para que PCA pueda ser ilustrado de forma efectiva.
-np.random.seed(42)  # Para reproducibilidad
+generador = generador_figura('reuccion_de-Dimensionalidad_ACP')  # Para reproducibilidad
 mean = [0, 0, 0]
 # Matriz de covarianza que define la forma alargada de la nube de puntos
 cov = [[13, 12, -2], 
        [12, 13, -2], 
        [-2, -2, 2]]
-X = np.random.multivariate_normal(mean, cov, 200)
+with etapa('datos'):
+    X = normal_multivariante(mean, cov, 200, generador)
+
+# Solver del ACP: 'covarianza', 'aleatorizado' (SVD aleatorizada, solo los
+# componentes dibujados; para datos con miles de columnas) o 'auto'.
+SOLVER_ACP = 'auto'
 
 # Aplicamos PCA para obtener los componentes
-pca = PCA(n_components=3)
-X_pca = pca.fit_transform(X)
+with etapa('ajuste_modelo'):
+    pca = ACPIncremental(n_components=3, solver=SOLVER_ACP)
+    X_pca = pca.fit_transform(X)
+    print(f"ACP (solver {pca.solver_}): error relativo de aproximación {pca.error_aproximacion_:.3f}")
 
 # ----------------------------------------------------
 # CLASE AUXILIAR PARA FLECHAS 3D (Mejora Estética)
@@ -129,7 +141,7 @@ def generar_grafico_pca():
     ax3 = fig.add_subplot(gs[1, 2])
     ax3.set_title('3. Datos Proyectados en Subespacio 2D')
     
-    ax3.scatter(X_pca[:, 0], X_pca[:, 1], c=color_puntos, alpha=0.7, s=30)
+    dispersion(ax3, X_pca[:, 0], X_pca[:, 1], color=color_puntos, alpha=0.7, s=30)
     ax3.set_xlabel('Componente Principal 1')
     ax3.set_ylabel('Componente Principal 2')
     ax3.set_aspect('equal', adjustable='box') # Asegura que los ejes tengan la misma escala
@@ -171,9 +183,7 @@ if __name__ == '__main__':
     # PDF también es vectorial y excelente para publicaciones.
     # PNG con alto DPI es una buena alternativa de raster.
     nombre_archivo_base = "visualizacion_pca"
-    figura_pca.savefig(f'{nombre_archivo_base}.svg', format='svg', bbox_inches='tight')
-    figura_pca.savefig(f'{nombre_archivo_base}.pdf', format='pdf', bbox_inches='tight')
-    figura_pca.savefig(f'{nombre_archivo_base}.png', format='png', dpi=300, bbox_inches='tight')
+    guardar_figura(figura_pca, nombre_archivo_base)
 
     print(f"Gráficos guardados como '{nombre_archivo_base}.svg', '{nombre_archivo_base}.pdf' y '{nombre_archivo_base}.png'")
     
@@ -3,6 +3,9 @@
 Script para generar un gráfico de alta calidad de la función de Rosenbrock,
 ilustrando la optimización mediante Descenso de Gradiente (GD).
 
+Importar el módulo no dibuja nada: la figura se genera con
+`figura_rosenbrock(ParametrosRosenbrock(...))` o desde `utilidades.registro`.
+
 Autor: Alejandro Quintero Ruiz (Generado con asistencia de IA)
 Fecha: 2023-10-27
 """
@@ -14,6 +17,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
+from utilidades.animacion import animar_trayectorias, formato_animacion
+from utilidades.cache_superficies import malla_adaptativa_memoizada
+from utilidades.descenso_vectorizado import descenso_gradiente_lote
+from utilidades.malla_adaptativa import NIVEL_MAXIMO
+from utilidades.registro import Parametros, exportar, nueva_figura, registrar
+from utilidades.trayectorias import decimar
+
 # ==============================================================================
 # 2. Definición de Datos y Parámetros Matemáticos
 # ==============================================================================
@@ -34,92 +44,143 @@ def rosenbrock_grad(x, y, a=A, b=B):
     grad_y = 2 * b * (y - x**2)
     return np.array([grad_x, grad_y])
 
-# --- Parámetros del Algoritmo de Descenso de Gradiente ---
-punto_inicial = np.array([-1.5, 2.5])
-tasa_aprendizaje = 0.0012
-num_iteraciones = 1500
-
-# --- Simulación del Descenso de Gradiente ---
-trayectoria = [punto_inicial]
-punto_actual = punto_inicial.copy()
-
-for _ in range(num_iteraciones):
-    gradiente = rosenbrock_grad(punto_actual[0], punto_actual[1])
-    punto_actual = punto_actual - tasa_aprendizaje * gradiente
-    trayectoria.append(punto_actual)
-
-trayectoria = np.array(trayectoria)
+def rosenbrock_hess(x, y, a=A, b=B):
+    """Calcula la hessiana de la función de Rosenbrock (filas [f_xx, f_xy] y [f_yx, f_yy])."""
+    hess_xx = 2 - 4 * b * (y - x**2) + 8 * b * x**2
+    hess_xy = -4 * b * x
+    hess_yy = 2 * b * np.ones_like(x)
+    return np.array([[hess_xx, hess_xy], [hess_xy, hess_yy]])
+
+# --- Parámetros de la figura ---
+class ParametrosRosenbrock(Parametros):
+    punto_inicial = (-1.5, 2.5)
+    tasa_aprendizaje = 0.0012
+    num_iteraciones = 1500
+    x_lim = (-2.0, 2.0)
+    y_lim = (-1.0, 3.0)
+    niveles = 20                  # Curvas de nivel logarítmicas entre 1 y 10^3.5
+    nivel_maximo = NIVEL_MAXIMO   # Resolución máxima de la malla adaptativa
+    nombre_archivo = 'rosenbrock_optimization_plot'
+    rasterizar = True
+
+
+def trayectoria_decimada(parametros):
+    """
+    Simula el descenso de gradiente y lo simplifica para dibujarlo.
+
+    Returns:
+        tuple: (puntos simplificados de forma (n, 2), posiciones de los
+        marcadores en ellos, iteración original de cada punto).
+    """
+    # Lote de una sola trayectoria: forma (pasos + 1, 1, 2) -> (pasos + 1, 2).
+    # El descenso se detiene antes de `num_iteraciones` si converge.
+    trayectoria = descenso_gradiente_lote(rosenbrock_grad, [parametros.punto_inicial],
+                                          parametros.tasa_aprendizaje, parametros.num_iteraciones,
+                                          funcion=rosenbrock)[:, 0, :]
+    # Marcador en el inicio y cada 200 iteraciones a partir de la 100
+    marcas = [0, *range(100, len(trayectoria) - 1, 200)]
+    return decimar(trayectoria, marcas, limites=[parametros.x_lim, parametros.y_lim])
 
 # ==============================================================================
 # 3. Generación del Gráfico
 # ==============================================================================
-
-# --- Configuración del estilo del gráfico ---
-plt.style.use('seaborn-v0_8-whitegrid')
-mpl.rcParams['font.family'] = 'sans-serif'
-mpl.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial']
-mpl.rcParams['axes.labelweight'] = 'bold'
-mpl.rcParams['axes.titleweight'] = 'bold'
-
-# --- Creación de la figura y los ejes ---
-# Aspect ratio 16:9 para presentaciones
-fig, ax = plt.subplots(figsize=(12, 6.75))
-
-# --- Creación de la malla para el gráfico de contorno ---
-x_range = np.linspace(-2.0, 2.0, 400)
-y_range = np.linspace(-1.0, 3.0, 400)
-X, Y = np.meshgrid(x_range, y_range)
-Z = rosenbrock(X, Y)
-
-# --- Dibujo del gráfico de contorno ---
-# Usamos niveles logarítmicos para visualizar mejor el valle
-niveles = np.logspace(0, 3.5, 20)
-contour = ax.contourf(X, Y, Z, levels=niveles, cmap='viridis', alpha=0.85)
-contour_lines = ax.contour(X, Y, Z, levels=niveles, colors='white', linewidths=0.5, alpha=0.5)
-
-# --- Dibujo de la trayectoria del Descenso de Gradiente ---
-ax.plot(trayectoria[:, 0], trayectoria[:, 1], 'r-o', 
-        markersize=3, linewidth=1.5, label='Trayectoria del Descenso de Gradiente',
-        markevery=[0] + list(range(100, num_iteraciones, 200))) # Marcar solo algunos puntos
-
-# --- Marcadores para puntos clave ---
-ax.plot(punto_inicial[0], punto_inicial[1], 'go', markersize=10, label='Punto de Inicio', markeredgecolor='white', markeredgewidth=1.5)
-ax.plot(A, A**2, 'm*', markersize=15, label=f'Mínimo Global ({A}, {A})', markeredgecolor='white', markeredgewidth=1.5)
-
-# --- Títulos, etiquetas y leyenda ---
-ax.set_title('Optimización de la Función de Rosenbrock con Descenso de Gradiente', fontsize=16, pad=20)
-ax.set_xlabel('x', fontsize=12)
-ax.set_ylabel('y', fontsize=12, rotation=0, labelpad=15)
-ax.legend(loc='upper left', fontsize=10, frameon=True, facecolor='white', framealpha=0.8)
-
-# --- Ajustes estéticos ---
-ax.set_xlim(-2, 2)
-ax.set_ylim(-1, 3)
-ax.set_aspect('equal', adjustable='box')
-cbar = fig.colorbar(contour, ax=ax)
-cbar.set_label('Valor de f(x, y) - Escala Logarítmica', rotation=270, labelpad=20)
-
-# ==============================================================================
-# 4. Adición del Copyright
-# ==============================================================================
-copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
-fig.text(0.5, 0.01, copyright_text, ha='center', va='bottom', fontsize=8, color='gray')
+ESTILO = {
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['DejaVu Sans', 'Arial'],
+    'axes.labelweight': 'bold',
+    'axes.titleweight': 'bold',
+}
+
+@registrar('rosenbrock_optimization_plot', ParametrosRosenbrock)
+def figura_rosenbrock(parametros, fig=None):
+    """
+    Dibuja las curvas de nivel de Rosenbrock y la trayectoria del descenso de gradiente.
+
+    Args:
+        parametros (ParametrosRosenbrock): Punto inicial, tasa de aprendizaje,
+            iteraciones, dominio y resolución de la malla.
+        fig (Figure, opcional): Figura sobre la que dibujar.
+
+    Returns:
+        matplotlib.figure.Figure: La figura generada.
+    """
+    punto_inicial = np.asarray(parametros.punto_inicial, dtype=float)
+    trayectoria, marcas, _ = trayectoria_decimada(parametros)
+
+    # --- Configuración del estilo del gráfico (solo dentro de esta figura) ---
+    with plt.style.context('seaborn-v0_8-whitegrid'), mpl.rc_context(ESTILO):
+        # --- Creación de la figura y los ejes ---
+        # Aspect ratio 16:9 para presentaciones
+        fig = nueva_figura(parametros, fig)
+        ax = fig.subplots()
+
+        # --- Creación de la malla adaptativa para el gráfico de contorno ---
+        # Usamos niveles logarítmicos para visualizar mejor el valle; la malla se
+        # refina solo donde las curvas de nivel lo necesitan (el fondo del valle).
+        # Entre llamadas (p. ej. en un barrido) se reutiliza desde la caché de superficies.
+        niveles = np.logspace(0, 3.5, parametros.niveles)
+        triangulacion, Z = malla_adaptativa_memoizada(rosenbrock, parametros.x_lim, parametros.y_lim,
+                                                      niveles, nivel_maximo=parametros.nivel_maximo)
+
+        # --- Dibujo del gráfico de contorno ---
+        contour = ax.tricontourf(triangulacion, Z, levels=niveles, cmap='viridis', alpha=0.85)
+        ax.tricontour(triangulacion, Z, levels=niveles, colors='white', linewidths=0.5, alpha=0.5)
+
+        # --- Dibujo de la trayectoria del Descenso de Gradiente ---
+        ax.plot(trayectoria[:, 0], trayectoria[:, 1], 'r-o',
+                markersize=3, linewidth=1.5, label='Trayectoria del Descenso de Gradiente',
+                markevery=marcas, # Marcar solo algunas iteraciones
+                gid='trayectoria')
+
+        # --- Marcadores para puntos clave ---
+        ax.plot(punto_inicial[0], punto_inicial[1], 'go', markersize=10, label='Punto de Inicio', markeredgecolor='white', markeredgewidth=1.5)
+        ax.plot(A, A**2, 'm*', markersize=15, label=f'Mínimo Global ({A}, {A})', markeredgecolor='white', markeredgewidth=1.5)
+
+        # --- Títulos, etiquetas y leyenda ---
+        ax.set_title('Optimización de la Función de Rosenbrock con Descenso de Gradiente', fontsize=16, pad=20)
+        ax.set_xlabel('x', fontsize=12)
+        ax.set_ylabel('y', fontsize=12, rotation=0, labelpad=15)
+        ax.legend(loc='upper left', fontsize=10, frameon=True, facecolor='white', framealpha=0.8)
+
+        # --- Ajustes estéticos ---
+        ax.set_xlim(*parametros.x_lim)
+        ax.set_ylim(*parametros.y_lim)
+        ax.set_aspect('equal', adjustable='box')
+        cbar = fig.colorbar(contour, ax=ax)
+        cbar.set_label('Valor de f(x, y) - Escala Logarítmica', rotation=270, labelpad=20)
+
+        # ======================================================================
+        # 4. Adición del Copyright
+        # ======================================================================
+        copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
+        fig.text(0.5, 0.01, copyright_text, ha='center', va='bottom', fontsize=8, color='gray')
+
+        # --- Ajustar el layout para que no se corten los elementos ---
+        fig.tight_layout(rect=[0, 0.03, 1, 0.97]) # Ajustar para dejar espacio al copyright
+    return fig
 
 # ==============================================================================
 # 5. Guardado y Exportación del Archivo
 # ==============================================================================
-
-# --- Ajustar el layout para que no se corten los elementos ---
-fig.tight_layout(rect=[0, 0.03, 1, 0.97]) # Ajustar para dejar espacio al copyright
-
-# --- Guardar en formato vectorial SVG y PNG de alta resolución ---
-output_filename_svg = "rosenbrock_optimization_plot.svg"
-output_filename_png = "rosenbrock_optimization_plot.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
-
-# --- Mostrar el gráfico (opcional) ---
-plt.show()
-
-print(f"Gráfico guardado como '{output_filename_svg}' y '{output_filename_png}'.")
+if __name__ == '__main__':
+    parametros = ParametrosRosenbrock()
+    fig = figura_rosenbrock(parametros, plt.figure())
+
+    # --- Guardar en formato vectorial SVG y PNG de alta resolución ---
+    rutas_salida = exportar(fig, parametros)  # Una ruta por formato de `parametros.formatos`
+
+    # --- Mostrar el gráfico (opcional) ---
+    plt.show()
+
+    for ruta in rutas_salida:
+        print(f"Gráfico guardado como '{ruta}'.")
+
+    # --- Animación de la trayectoria (opcional, con EXPORTAR_ANIMACION=gif|mp4) ---
+    formato = formato_animacion()
+    if formato:
+        linea_trayectoria = [linea for linea in fig.axes[0].lines if linea.get_gid() == 'trayectoria']
+        # La línea está decimada: los cuadros avanzan por iteraciones, no por puntos
+        _, _, pasos = trayectoria_decimada(parametros)
+        ruta_animacion = animar_trayectorias(fig, linea_trayectoria, f"rosenbrock_optimization_plot.{formato}",
+                                             pasos=[pasos])
+        print(f"Animación guardada como '{ruta_animacion}'.")
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Script para generar un gráfico comparativo de métodos de segundo orden y
+cuasi-Newton sobre la función de Rosenbrock: Newton, Newton amortiguado con
+búsqueda de Armijo, BFGS, L-BFGS y gradiente conjugado no lineal, frente al
+descenso de gradiente de `rosenbrock_optimization_plot`.
+
+La figura muestra, de izquierda a derecha, las trayectorias desde el punto
+de inicio de la figura original, la brecha f(x_k) − f* por iteración y el
+coste mediano (evaluaciones de f, ∇f y ∇²f) sobre un lote de puntos
+iniciales aleatorios. Al ejecutarse como script también escribe el resumen
+del lote en `rosenbrock_segundo_orden.csv`.
+
+Importar el módulo no dibuja nada: la figura se genera con
+`figura_segundo_orden(ParametrosSegundoOrden(...))` o desde `utilidades.registro`.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. Importación de Librerías
+# ==============================================================================
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib as mpl
+import matplotlib.patheffects as path_effects
+from matplotlib.patches import Patch
+
+from rosenbrock_optimization_plot import A, rosenbrock, rosenbrock_grad, rosenbrock_hess
+from utilidades.cache_superficies import malla_adaptativa_memoizada
+from utilidades.malla_adaptativa import NIVEL_MAXIMO
+from utilidades.optimizadores_segundo_orden import METODOS, NOMBRES, comparar, guardar_csv, resumen
+from utilidades.registro import Parametros, exportar, nueva_figura, registrar
+from utilidades.trayectorias import decimar
+
+# ==============================================================================
+# 2. Parámetros
+# ==============================================================================
+class ParametrosSegundoOrden(Parametros):
+    punto_inicial = (-1.5, 2.5)
+    tasa_aprendizaje = 0.0012     # Tasa del descenso de gradiente de referencia
+    num_iteraciones = 1500
+    metodos = METODOS
+    puntos_lote = 400             # Puntos iniciales aleatorios del resumen
+    semilla = 0
+    x_lim = (-2.0, 2.0)
+    y_lim = (-1.0, 3.0)
+    niveles = 20
+    nivel_maximo = NIVEL_MAXIMO
+    tamano = (16, 6.75)
+    nombre_archivo = 'rosenbrock_segundo_orden'
+    rasterizar = True
+
+
+def simular_metodos(parametros):
+    """
+    Ejecuta cada método desde el punto de inicio y sobre el lote aleatorio.
+
+    Returns:
+        tuple: (resultados desde el punto de inicio, resultados del lote),
+        ambos {método: resultado de `minimizar`}.
+    """
+    opciones = dict(hessiana=rosenbrock_hess, tasa_aprendizaje=parametros.tasa_aprendizaje,
+                    metodos=parametros.metodos)
+    unico = comparar(rosenbrock, rosenbrock_grad, [parametros.punto_inicial], parametros.num_iteraciones,
+                     **opciones)
+    rng = np.random.default_rng(parametros.semilla)
+    lote = np.column_stack([rng.uniform(*parametros.x_lim, parametros.puntos_lote),
+                            rng.uniform(*parametros.y_lim, parametros.puntos_lote)])
+    return unico, comparar(rosenbrock, rosenbrock_grad, lote, parametros.num_iteraciones, **opciones)
+
+# ==============================================================================
+# 3. Generación del Gráfico
+# ==============================================================================
+ESTILO = {
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['DejaVu Sans', 'Arial'],
+    'axes.labelweight': 'bold',
+    'axes.titleweight': 'bold',
+    'legend.fontsize': 9,
+}
+
+# Paleta amigable con el daltonismo; el GD conserva el rojo de la figura original
+COLORES = {'gd': '#e41a1c', 'newton': '#377eb8', 'newton_armijo': '#4daf4a',
+           'bfgs': '#984ea3', 'lbfgs': '#ff7f00', 'gc': '#a65628'}
+
+@registrar('rosenbrock_segundo_orden', ParametrosSegundoOrden)
+def figura_segundo_orden(parametros, fig=None, simulacion=None):
+    """
+    Dibuja trayectorias, convergencia y coste de cada método sobre Rosenbrock.
+
+    Args:
+        parametros (ParametrosSegundoOrden): Punto de inicio, tasa del GD,
+            iteraciones, métodos, tamaño y semilla del lote, y dominio.
+        fig (Figure, opcional): Figura sobre la que dibujar.
+        simulacion (tuple, opcional): El resultado de `simular_metodos(parametros)`,
+            si ya se calculó (p. ej. para escribir también el CSV); si se
+            omite, se ejecuta aquí.
+
+    Returns:
+        matplotlib.figure.Figure: La figura generada.
+    """
+    unico, lote = simulacion if simulacion is not None else simular_metodos(parametros)
+    filas = {fila['metodo']: fila for fila in resumen(lote)}
+
+    with plt.style.context('seaborn-v0_8-whitegrid'), mpl.rc_context(ESTILO):
+        fig = nueva_figura(parametros, fig)
+        ax, ax_conv, ax_coste = fig.subplots(1, 3, gridspec_kw={'width_ratios': [1, 1, 1.1]})
+
+        # --- Trayectorias sobre las curvas de nivel ---
+        niveles = np.logspace(0, 3.5, parametros.niveles)
+        triangulacion, Z = malla_adaptativa_memoizada(rosenbrock, parametros.x_lim, parametros.y_lim,
+                                                      niveles, nivel_maximo=parametros.nivel_maximo)
+        ax.tricontourf(triangulacion, Z, levels=niveles, cmap='viridis', alpha=0.85)
+        ax.tricontour(triangulacion, Z, levels=niveles, colors='white', linewidths=0.5, alpha=0.5)
+        for metodo, resultado in unico.items():
+            iteraciones = resultado['iteraciones'][0]
+            fin = iteraciones + 1 if iteraciones >= 0 else len(resultado['trayectorias'])
+            trayectoria, _, _ = decimar(resultado['trayectorias'][:fin, 0],
+                                        limites=[parametros.x_lim, parametros.y_lim])
+            # L-BFGS sigue casi la misma ruta que BFGS: discontinua para que se vean ambas
+            estilo = '--' if metodo == 'lbfgs' else '-'
+            ax.plot(trayectoria[:, 0], trayectoria[:, 1], estilo, color=COLORES[metodo], linewidth=1.8,
+                    marker='o' if fin < 60 else None, markersize=3,
+                    path_effects=[path_effects.withStroke(linewidth=3, foreground='white')])
+        ax.plot(*parametros.punto_inicial, 'go', markersize=9, markeredgecolor='white', markeredgewidth=1.5)
+        ax.plot(A, A**2, 'm*', markersize=14, markeredgecolor='white', markeredgewidth=1.5)
+        ax.set_xlim(*parametros.x_lim)
+        ax.set_ylim(*parametros.y_lim)
+        ax.set_title('Trayectorias', pad=12)
+        ax.set_xlabel('x')
+        ax.set_ylabel('y', rotation=0, labelpad=10)
+
+        # --- Convergencia: brecha f(x_k) − f* (f* = 0 en (a, a²)) ---
+        for metodo, resultado in unico.items():
+            iteraciones = resultado['iteraciones'][0]
+            fin = iteraciones + 1 if iteraciones >= 0 else len(resultado['perdidas'])
+            brecha = np.maximum(resultado['perdidas'][:fin, 0], 1e-16)
+            etiqueta = f"{NOMBRES[metodo]} ({iteraciones if iteraciones >= 0 else '>' + str(fin - 1)} it.)"
+            ax_conv.plot(np.arange(1, fin + 1), brecha, color=COLORES[metodo], linewidth=2, label=etiqueta)
+        ax_conv.set_xscale('log')
+        ax_conv.set_yscale('log')
+        ax_conv.set_title('Convergencia', pad=12)
+        ax_conv.set_xlabel('Iteración')
+        ax_conv.set_ylabel('f(x) − f*')
+        ax_conv.legend(loc='upper center', bbox_to_anchor=(0.5, -0.14), ncol=2, fontsize=8, frameon=False)
+
+        # --- Coste mediano sobre el lote: evaluaciones de f, ∇f y ∇²f apiladas ---
+        metodos = list(lote)
+        posiciones = np.arange(len(metodos))
+        base = np.zeros(len(metodos))
+        for clave, alpha in (('evaluaciones_f_mediana', 1.0), ('evaluaciones_g_mediana', 0.7),
+                             ('evaluaciones_h_mediana', 0.4)):
+            valores = np.nan_to_num([filas[m][clave] for m in metodos])
+            ax_coste.barh(posiciones, valores, left=base, color=[COLORES[m] for m in metodos],
+                          alpha=alpha, edgecolor='white')
+            base += valores
+        for posicion, metodo in zip(posiciones, metodos):
+            fila = filas[metodo]
+            texto = (f"{fila['convergidas']}/{fila['trayectorias']}" if fila['convergidas']
+                     else f"0/{fila['trayectorias']}, f̃ = {fila['perdida_final_mediana']:.1e}")
+            ax_coste.text(max(base[posicion], 1) * 1.1, posicion, texto, va='center', fontsize=8, color='#333333')
+        ax_coste.set_xscale('log')
+        ax_coste.set_xlim(1, max(base.max(), 10) * 60)
+        ax_coste.set_yticks(posiciones, [NOMBRES[m] for m in metodos], fontsize=9)
+        ax_coste.invert_yaxis()
+        ax_coste.set_title(f'Coste mediano ({parametros.puntos_lote} inicios)', pad=12)
+        ax_coste.set_xlabel('Evaluaciones (convergidas)')
+        tramos = [Patch(facecolor='#555555', alpha=alpha, label=etiqueta)
+                  for etiqueta, alpha in (('f', 1.0), ('∇f', 0.7), ('∇²f', 0.4))]
+        ax_coste.legend(handles=tramos, loc='upper center', bbox_to_anchor=(0.5, -0.14), ncol=3,
+                        frameon=False, title='Tramos: evaluaciones de')
+
+        fig.suptitle('Métodos de Segundo Orden y Cuasi-Newton en la Función de Rosenbrock',
+                     fontsize=16, fontweight='bold')
+
+        # ======================================================================
+        # 4. Adición del Copyright
+        # ======================================================================
+        copyright_text = "© Alejandro Quintero Ruiz. Generado con Python."
+        fig.text(0.5, 0.01, copyright_text, ha='center', va='bottom', fontsize=8, color='gray')
+
+        fig.tight_layout(rect=[0, 0.03, 1, 0.97])
+    return fig
+
+# ==============================================================================
+# 5. Guardado y Exportación del Archivo
+# ==============================================================================
+if __name__ == '__main__':
+    parametros = ParametrosSegundoOrden()
+    # Una sola simulación para la figura y para el CSV
+    unico, lote = simular_metodos(parametros)
+    fig = figura_segundo_orden(parametros, plt.figure(), simulacion=(unico, lote))
+
+    rutas_salida = exportar(fig, parametros)  # Una ruta por formato de `parametros.formatos`
+    for ruta in rutas_salida:
+        print(f"Gráfico guardado como '{ruta}'.")
+
+    # --- Resumen del lote en CSV ---
+    ruta_csv = guardar_csv(resumen(lote), f"{parametros.nombre_archivo}.csv")
+    print(f"Resumen guardado como '{ruta_csv}'.")
+
+    plt.show()
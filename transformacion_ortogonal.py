@@ -10,6 +10,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import Arc
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
@@ -143,20 +145,11 @@ def save_plot(fig, filename_base):
     """
     Guarda la figura en formatos de alta calidad (SVG, PDF, PNG).
     """
-    # Guardar en formato SVG (Vectorial, ideal para escalabilidad)
-    svg_path = f"{filename_base}.svg"
-    fig.savefig(svg_path, format='svg', bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado en: {svg_path}")
-
-    # Guardar en formato PDF (Vectorial, ideal para documentos)
-    pdf_path = f"{filename_base}.pdf"
-    fig.savefig(pdf_path, format='pdf', bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado en: {pdf_path}")
-
-    # Guardar en formato PNG (Ráster de alta resolución, 300 DPI)
-    png_path = f"{filename_base}.png"
-    fig.savefig(png_path, format='png', dpi=300, bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado en: {png_path}")
+    # SVG (vectorial, ideal para escalabilidad), PDF (vectorial, ideal para
+    # documentos) y PNG (ráster de alta resolución, 300 DPI), con un único
+    # cálculo de layout para los tres formatos.
+    for path in guardar_figura(fig, filename_base):
+        print(f"Gráfico guardado en: {path}")
 
 # -----------------------------------------------------------------------------
 
@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.patches as mpatches
 import matplotlib.gridspec as gridspec
 
+from utilidades.exportacion import guardar_figura
+
 # --- 1. Importación de Librerías ---
 # numpy para operaciones matriciales y vectoriales
 # matplotlib.pyplot para la creación de gráficos
@@ -191,17 +193,11 @@ def save_plot(fig, filename="transformaciones_lineales_matrices_accion"):
     """
     Guarda la figura en múltiples formatos de alta fidelidad.
     """
-    # Guardar como SVG (formato vectorial escalable, ideal para presentaciones y publicaciones)
-    fig.savefig(f'{filename}.svg', format='svg', bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado como {filename}.svg")
-
-    # Guardar como PDF (formato vectorial, también excelente para impresión y documentos)
-    fig.savefig(f'{filename}.pdf', format='pdf', bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado como {filename}.pdf")
-
-    # Guardar como PNG de alta resolución (300 DPI, para uso rasterizado de alta calidad)
-    fig.savefig(f'{filename}.png', format='png', dpi=300, bbox_inches='tight', pad_inches=0.1)
-    print(f"Gráfico guardado como {filename}.png")
+    # SVG (vectorial escalable, ideal para presentaciones y publicaciones),
+    # PDF (vectorial, excelente para impresión y documentos) y PNG de alta
+    # resolución (300 DPI), con un único cálculo de layout para los tres.
+    for path in guardar_figura(fig, filename):
+        print(f"Gráfico guardado como {path}")
 
 # --- Ejecución del script ---
 if __name__ == "__main__":
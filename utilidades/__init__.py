@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Utilidades compartidas por los scripts de figuras del repositorio.
+
+Cada script de la raíz genera una figura y puede ejecutarse por sí solo;
+este paquete reúne la infraestructura común (renderizado por lotes,
+exportación, cachés, motores numéricos) para no duplicarla en cada archivo.
+
+Autor: Alejandro Quintero Ruiz
+"""
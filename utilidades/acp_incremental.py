@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Análisis de Componentes Principales (ACP/PCA) en flujo, por bloques de filas.
+
+Las figuras de ACP calculaban los componentes sobre un arreglo cargado por
+completo en memoria (`sklearn.decomposition.PCA`, o `np.cov` + `eig`). Este
+motor acumula la media y la matriz de covarianza bloque a bloque, con la
+actualización numéricamente estable de Welford generalizada a bloques
+(fórmula de combinación de Chan et al.):
+
+    n    = n_a + n_b
+    δ    = media_b - media_a
+    media = media_a + δ · n_b / n
+    M2   = M2_a + M2_b + δ δᵀ · n_a n_b / n
+
+donde M2 es la suma de productos cruzados centrados. Los datos pueden
+llegar como un arreglo (también un `np.memmap`, que se recorre por bloques
+sin cargarlo entero) o como cualquier iterable de bloques de filas, así que
+las mismas figuras funcionan con decenas de millones de filas.
+
+Para matrices anchas (miles de columnas) la covarianza d x d no cabe en
+memoria ni se puede descomponer; el solver 'aleatorizado' calcula solo los
+k componentes pedidos con una SVD aleatorizada (buscador de rango de Halko,
+Martinsson y Tropp): proyecta los datos centrados sobre k + p direcciones
+gaussianas, refina la base con iteraciones de potencia y descompone la
+pequeña matriz proyectada. Cada producto es una pasada por bloques sobre
+los datos y el centrado es implícito (nunca se materializa A - media).
+
+Los atributos y métodos siguen los nombres de scikit-learn (`components_`,
+`explained_variance_`, `fit`, `transform`...) para poder sustituir a `PCA`
+sin tocar el código de las figuras.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+TAMANO_BLOQUE = 100_000
+
+# Solver 'auto': SVD aleatorizada a partir de este número de columnas si se
+# piden pocos componentes; por debajo, covarianza completa.
+UMBRAL_COLUMNAS_ALEATORIZADO = 1000
+SOBREMUESTREO = 10
+ITERACIONES_POTENCIA = 4
+
+# ==============================================================================
+# 3. RECORRIDO POR BLOQUES
+# ==============================================================================
+def bloques_de_filas(datos, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Recorre `datos` en bloques de filas 2D.
+
+    Args:
+        datos (array_like | iterable): Un arreglo (o memmap) de forma
+            (muestras, características), que se rebana en bloques de
+            `tamano_bloque` filas, o un iterable que ya produce bloques.
+
+    Yields:
+        np.ndarray: Bloques de forma (filas, características).
+    """
+    if hasattr(datos, 'shape'):
+        for inicio in range(0, datos.shape[0], tamano_bloque):
+            yield np.asarray(datos[inicio:inicio + tamano_bloque], dtype=float)
+    else:
+        for bloque in datos:
+            yield np.atleast_2d(np.asarray(bloque, dtype=float))
+
+# ==============================================================================
+# 4. MOTOR DE ACP INCREMENTAL
+# ==============================================================================
+def _convenio_signo(componentes):
+    """Convenio de signo de scikit-learn: la carga de mayor valor absoluto de
+    cada componente es positiva."""
+    signos = np.sign(componentes[np.arange(len(componentes)), np.argmax(np.abs(componentes), axis=1)])
+    return componentes * np.where(signos == 0, 1.0, signos)[:, None]
+
+
+class ACPIncremental:
+    """
+    ACP acumulado sobre bloques de filas.
+
+    Args:
+        n_components (int, opcional): Componentes a conservar; por defecto, todos.
+        estandarizar (bool): Si es True, el análisis se hace sobre las
+            variables estandarizadas (media 0 y desviación típica 1, como con
+            `StandardScaler`), es decir, sobre la matriz de correlación.
+            `transform` e `inverse_transform` trabajan siempre en las
+            unidades originales.
+        solver (str): 'covarianza' (una pasada, covarianza completa),
+            'aleatorizado' (SVD aleatorizada de los `n_components` primeros
+            componentes; requiere un arreglo o memmap, que se recorre
+            2 + 2·iteraciones_potencia veces) o 'auto' (aleatorizado si hay
+            más de UMBRAL_COLUMNAS_ALEATORIZADO columnas y se piden menos de
+            la mitad de componentes).
+        sobremuestreo (int): Direcciones aleatorias extra del buscador de rango.
+        iteraciones_potencia (int): Iteraciones de potencia del buscador de rango.
+        semilla (int): Semilla de las direcciones aleatorias.
+        tamano_bloque (int): Filas por bloque al recorrer arreglos.
+
+    Atributos (tras `fit`/`partial_fit`):
+        n_samples_seen_, mean_, scale_, covariance_ (None con el solver
+        aleatorizado), components_, explained_variance_,
+        explained_variance_ratio_, singular_values_, solver_ (el solver
+        usado) y error_aproximacion_: error relativo, en norma de Frobenius,
+        de reconstruir los datos centrados con los componentes conservados.
+    """
+
+    def __init__(self, n_components=None, estandarizar=False, solver='covarianza',
+                 sobremuestreo=SOBREMUESTREO, iteraciones_potencia=ITERACIONES_POTENCIA,
+                 semilla=0, tamano_bloque=TAMANO_BLOQUE):
+        self.n_components = n_components
+        self.estandarizar = estandarizar
+        self.solver = solver
+        self.sobremuestreo = sobremuestreo
+        self.iteraciones_potencia = iteraciones_potencia
+        self.semilla = semilla
+        self.tamano_bloque = tamano_bloque
+        self.n_samples_seen_ = 0
+        self._m2 = None
+
+    # --- Acumulación ---
+    def _acumular(self, bloque, diagonal=False):
+        """Combina (Chan) la media y M2 de `bloque` con las acumuladas.
+        Con `diagonal`, M2 se limita a las sumas de cuadrados por columna."""
+        n_b = bloque.shape[0]
+        media_b = bloque.mean(axis=0)
+        centrado = bloque - media_b
+        m2_b = (centrado ** 2).sum(axis=0) if diagonal else centrado.T @ centrado
+
+        if self._m2 is None:
+            self.n_samples_seen_, self.mean_, self._m2 = n_b, media_b, m2_b
+        else:
+            n_a = self.n_samples_seen_
+            n = n_a + n_b
+            delta = media_b - self.mean_
+            self.mean_ = self.mean_ + delta * (n_b / n)
+            correccion = delta ** 2 if diagonal else np.outer(delta, delta)
+            self._m2 = self._m2 + m2_b + correccion * (n_a * n_b / n)
+            self.n_samples_seen_ = n
+
+    def partial_fit(self, bloque):
+        """Incorpora un bloque de filas a la media y la covarianza acumuladas."""
+        bloque = np.atleast_2d(np.asarray(bloque, dtype=float))
+        if bloque.shape[0] == 0:
+            return self
+        self.solver_ = 'covarianza'
+        self._acumular(bloque)
+        self._actualizar_componentes()
+        return self
+
+    def _elegir_solver(self, datos):
+        if self.solver != 'auto':
+            return self.solver
+        if not hasattr(datos, 'shape'):
+            return 'covarianza'
+        columnas = datos.shape[1]
+        pocos = self.n_components is not None and self.n_components < columnas / 2
+        return 'aleatorizado' if columnas > UMBRAL_COLUMNAS_ALEATORIZADO and pocos else 'covarianza'
+
+    def fit(self, datos, y=None):
+        """Ajusta el ACP recorriendo `datos` (arreglo, memmap o iterable de bloques)."""
+        self.n_samples_seen_, self._m2 = 0, None
+        self.solver_ = self._elegir_solver(datos)
+        if self.solver_ == 'aleatorizado':
+            return self._ajustar_aleatorizado(datos)
+        if self.solver_ != 'covarianza':
+            raise ValueError(f"Solver desconocido: {self.solver!r}")
+        for bloque in bloques_de_filas(datos, self.tamano_bloque):
+            self._acumular(bloque)
+        self._actualizar_componentes()
+        return self
+
+    def _calcular_escala(self, m2_diagonal):
+        """Desviación típica poblacional (ddof=0) si se estandariza, como StandardScaler."""
+        if not self.estandarizar:
+            return np.ones_like(self.mean_)
+        desviacion = np.sqrt(m2_diagonal / self.n_samples_seen_)
+        return np.where(desviacion > 0, desviacion, 1.0)
+
+    def _fijar_componentes(self, componentes, autovalores, varianza_total):
+        """Guarda los k primeros componentes y sus varianzas explicadas."""
+        n = max(self.n_samples_seen_ - 1, 1)
+        k = self.n_components or len(autovalores)
+        self.components_ = _convenio_signo(componentes[:k])
+        self.explained_variance_ = autovalores[:k]
+        self.explained_variance_ratio_ = (autovalores[:k] / varianza_total if varianza_total > 0
+                                          else np.zeros(k))
+        self.singular_values_ = np.sqrt(autovalores[:k] * n)
+        capturada = self.explained_variance_ratio_.sum() if varianza_total > 0 else 1.0
+        self.error_aproximacion_ = float(np.sqrt(max(1.0 - capturada, 0.0)))
+
+    def _actualizar_componentes(self):
+        """Descompone la covarianza acumulada en autovalores y autovectores."""
+        self.scale_ = self._calcular_escala(np.diag(self._m2))
+        self.covariance_ = self._m2 / max(self.n_samples_seen_ - 1, 1) / np.outer(self.scale_, self.scale_)
+
+        autovalores, autovectores = np.linalg.eigh(self.covariance_)
+        orden = np.argsort(autovalores)[::-1]
+        autovalores = np.clip(autovalores[orden], 0.0, None)
+        self._fijar_componentes(autovectores[:, orden].T, autovalores, autovalores.sum())
+
+    # --- SVD aleatorizada ---
+    def _producto(self, datos, matriz):
+        """(A - media)/escala @ matriz, por bloques; devuelve (muestras, l)."""
+        return np.concatenate([self.estandarizar_datos(bloque) @ matriz
+                               for bloque in bloques_de_filas(datos, self.tamano_bloque)])
+
+    def _producto_traspuesto(self, datos, matriz):
+        """((A - media)/escala)ᵀ @ matriz, por bloques; devuelve (columnas, l)."""
+        resultado = np.zeros((datos.shape[1], matriz.shape[1]))
+        inicio = 0
+        for bloque in bloques_de_filas(datos, self.tamano_bloque):
+            fin = inicio + len(bloque)
+            resultado += self.estandarizar_datos(bloque).T @ matriz[inicio:fin]
+            inicio = fin
+        return resultado
+
+    def _ajustar_aleatorizado(self, datos):
+        """SVD aleatorizada de los datos centrados (y escalados), por bloques."""
+        if not hasattr(datos, 'shape'):
+            raise ValueError("El solver 'aleatorizado' recorre los datos varias veces: "
+                             "necesita un arreglo o un memmap, no un iterable de bloques.")
+        columnas = datos.shape[1]
+        k = self.n_components or columnas
+        l = min(k + self.sobremuestreo, columnas)
+
+        # Pasada 1: media y varianza de cada columna (para centrar, escalar y
+        # medir la varianza total).
+        for bloque in bloques_de_filas(datos, self.tamano_bloque):
+            self._acumular(bloque, diagonal=True)
+        self.scale_ = self._calcular_escala(self._m2)
+        self.covariance_ = None
+        n = max(self.n_samples_seen_ - 1, 1)
+        varianza_total = float(np.sum(self._m2 / self.scale_ ** 2)) / n
+
+        # Buscador de rango con iteraciones de potencia (reortogonalizando
+        # en cada paso para no perder los valores singulares pequeños).
+        omega = np.random.default_rng(self.semilla).standard_normal((columnas, l))
+        Q, _ = np.linalg.qr(self._producto(datos, omega))
+        for _ in range(self.iteraciones_potencia):
+            Z, _ = np.linalg.qr(self._producto_traspuesto(datos, Q))
+            Q, _ = np.linalg.qr(self._producto(datos, Z))
+
+        # SVD de la matriz pequeña B = Qᵀ A (l x columnas).
+        B = self._producto_traspuesto(datos, Q).T
+        _, valores_singulares, Vt = np.linalg.svd(B, full_matrices=False)
+        self._fijar_componentes(Vt, valores_singulares ** 2 / n, varianza_total)
+        return self
+
+    # --- Proyección ---
+    def estandarizar_datos(self, X):
+        """Centra (y, si procede, escala) `X` como lo hace el análisis."""
+        return (np.asarray(X, dtype=float) - self.mean_) / self.scale_
+
+    def transform(self, X):
+        """Proyecta `X` (unidades originales) sobre los componentes."""
+        return self.estandarizar_datos(X) @ self.components_.T
+
+    def fit_transform(self, X, y=None):
+        """Ajusta con `X` y devuelve su proyección."""
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, Z):
+        """Reconstruye, en unidades originales, los puntos con proyección `Z`."""
+        return (np.asarray(Z) @ self.components_) * self.scale_ + self.mean_
+
+    def transformar_por_bloques(self, datos):
+        """
+        Proyecta `datos` bloque a bloque, sin cargarlos enteros en memoria.
+
+        Yields:
+            np.ndarray: La proyección de cada bloque.
+        """
+        for bloque in bloques_de_filas(datos, self.tamano_bloque):
+            yield self.transform(bloque)
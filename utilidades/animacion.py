@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación de animaciones de trayectorias con blitting y codificación en flujo.
+
+`matplotlib.animation.FuncAnimation` vuelve a dibujar la figura completa en
+cada cuadro (contornos, superficies, textos...) y su escritor de GIF guarda
+todos los cuadros en memoria. `exportar_animacion`:
+
+  - dibuja el fondo estático una sola vez y lo guarda como mapa de bits;
+  - en cada cuadro restaura ese mapa de bits y dibuja solo los artistas
+    dinámicos (blitting);
+  - envía los píxeles RGBA del lienzo, sin copias, por una tubería a
+    ffmpeg (MP4, WebM o GIF). Sin ffmpeg, los GIF se escriben cuadro a
+    cuadro con Pillow sobre una paleta fija.
+
+En ambos casos la memoria no depende del número de cuadros y una animación
+de 1500 cuadros tarda segundos.
+
+Los scripts de figuras exportan su animación solo si se define la variable
+de entorno EXPORTAR_ANIMACION (con un formato, p. ej. `gif` o `mp4`, o con
+`1` para elegir MP4 si hay ffmpeg y GIF si no).
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from utilidades.medicion import etapa
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+FPS = 30
+DPI_ANIMACION = 100
+MAX_CUADROS = 1500       # Cuadros por defecto de una trayectoria larga
+COLORES_GIF = 256
+
+VARIABLE_ANIMACION = 'EXPORTAR_ANIMACION'
+FORMATOS_ANIMACION = ('mp4', 'webm', 'gif')
+
+# Argumentos de salida de ffmpeg por formato. Los cuadros entran como RGBA
+# crudo por la entrada estándar; el GIF calcula una paleta por cuadro
+# (stats_mode=single), de modo que ffmpeg tampoco acumula cuadros.
+ARGUMENTOS_FFMPEG = {
+    'mp4': ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+            '-preset', 'veryfast', '-crf', '20'],
+    'webm': ['-c:v', 'libvpx-vp9', '-pix_fmt', 'yuv420p', '-b:v', '0', '-crf', '32'],
+    'gif': ['-filter_complex',
+            'split[a][b];[a]palettegen=stats_mode=single[p];[b][p]paletteuse=new=1'],
+}
+
+# ==============================================================================
+# 3. SELECCIÓN DEL FORMATO
+# ==============================================================================
+def ruta_ffmpeg():
+    """Ejecutable de ffmpeg configurado en matplotlib, o None si no está instalado."""
+    return shutil.which(mpl.rcParams['animation.ffmpeg_path'])
+
+
+def formato_animacion():
+    """
+    Formato pedido con la variable de entorno EXPORTAR_ANIMACION.
+
+    Returns:
+        str | None: 'mp4', 'webm' o 'gif'; None si la variable no está
+        definida (o vale '0'), en cuyo caso no se exporta la animación.
+    """
+    valor = os.environ.get(VARIABLE_ANIMACION, '').strip().lower()
+    if valor in ('', '0'):
+        return None
+    if valor in FORMATOS_ANIMACION:
+        return valor
+    return 'mp4' if ruta_ffmpeg() else 'gif'
+
+# ==============================================================================
+# 4. CODIFICADORES EN FLUJO
+# ==============================================================================
+class CodificadorFFmpeg:
+    """Envía cuadros RGBA crudos a un proceso de ffmpeg por su entrada estándar."""
+
+    def __init__(self, ruta, ancho, alto, fps=FPS):
+        formato = Path(ruta).suffix.lstrip('.').lower()
+        self.proceso = subprocess.Popen(
+            [ruta_ffmpeg(), '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{ancho}x{alto}', '-r', str(fps),
+             '-i', 'pipe:0', *ARGUMENTOS_FFMPEG[formato], str(ruta)],
+            stdin=subprocess.PIPE)
+
+    def escribir(self, rgba):
+        self.proceso.stdin.write(rgba)
+
+    def cerrar(self):
+        self.proceso.stdin.close()
+        if self.proceso.wait() != 0:
+            raise RuntimeError(f"ffmpeg terminó con código {self.proceso.returncode}.")
+
+
+class CodificadorGif:
+    """
+    Escribe un GIF cuadro a cuadro con Pillow, sin guardar los cuadros.
+
+    La paleta global se calcula con un cuadro de referencia (el último, con
+    las trayectorias completas, para que sus colores no se pierdan) y, de
+    cada cuadro después del primero, solo se cuantiza y se escribe el
+    rectángulo de píxeles que cambió respecto al anterior.
+    """
+
+    def __init__(self, ruta, ancho, alto, fps=FPS, referencia=None):
+        from PIL import Image
+
+        self.archivo = open(ruta, 'wb')
+        self.tamano = (ancho, alto)
+        self.duracion = round(1000 / fps)
+        self.paleta = None
+        if referencia is not None:
+            rgb = np.frombuffer(referencia, dtype=np.uint8).reshape(alto, ancho, 4)[..., :3]
+            self.paleta = Image.fromarray(rgb).quantize(COLORES_GIF, method=Image.Quantize.MAXCOVERAGE)
+        self.anterior = None
+
+    def escribir(self, rgba):
+        from PIL import GifImagePlugin, Image
+
+        ancho, alto = self.tamano
+        actual = np.frombuffer(rgba, dtype=np.uint8).reshape(alto, ancho, 4)
+        if self.anterior is None:
+            primero = Image.fromarray(actual[..., :3])
+            if self.paleta is None:
+                self.paleta = primero.quantize(COLORES_GIF, method=Image.Quantize.MAXCOVERAGE)
+            indexado = primero.quantize(palette=self.paleta, dither=Image.Dither.NONE)
+            cabecera, _ = GifImagePlugin.getheader(indexado, info={'loop': 0, 'optimize': False})
+            self.archivo.writelines(cabecera)
+            self.archivo.writelines(GifImagePlugin.getdata(indexado, duration=self.duracion))
+            self.anterior = actual.copy()
+            return
+
+        # Cada píxel RGBA se compara como un entero de 32 bits.
+        cambios = actual.view(np.uint32)[..., 0] != self.anterior.view(np.uint32)[..., 0]
+        filas, columnas = np.flatnonzero(cambios.any(axis=1)), np.flatnonzero(cambios.any(axis=0))
+        if len(filas) == 0:
+            # Cuadro idéntico: un píxel basta para mantener la duración.
+            y0, y1, x0, x1 = 0, 1, 0, 1
+        else:
+            y0, y1, x0, x1 = filas[0], filas[-1] + 1, columnas[0], columnas[-1] + 1
+        recorte = Image.fromarray(actual[y0:y1, x0:x1, :3])
+        indexado = recorte.quantize(palette=self.paleta, dither=Image.Dither.NONE)
+        self.archivo.writelines(GifImagePlugin.getdata(indexado, offset=(int(x0), int(y0)),
+                                                       duration=self.duracion))
+        self.anterior[y0:y1, x0:x1] = actual[y0:y1, x0:x1]
+
+    def cerrar(self):
+        self.archivo.write(b';')
+        self.archivo.close()
+
+
+def abrir_codificador(ruta, ancho, alto, fps=FPS, referencia=None):
+    """
+    Codificador para `ruta` según su extensión: ffmpeg si está instalado,
+    Pillow para GIF si no (`referencia` es el cuadro RGBA del que sale su paleta).
+    """
+    formato = Path(ruta).suffix.lstrip('.').lower()
+    if formato not in FORMATOS_ANIMACION:
+        raise ValueError(f"Formato de animación no soportado: '{formato}'.")
+    if ruta_ffmpeg():
+        return CodificadorFFmpeg(ruta, ancho, alto, fps)
+    if formato == 'gif':
+        return CodificadorGif(ruta, ancho, alto, fps, referencia)
+    raise RuntimeError(f"Exportar a '{formato}' requiere ffmpeg; usa EXPORTAR_ANIMACION=gif.")
+
+# ==============================================================================
+# 5. ANIMACIÓN CON BLITTING
+# ==============================================================================
+def exportar_animacion(fig, artistas, actualizar, n_cuadros, ruta, fps=FPS, dpi=DPI_ANIMACION):
+    """
+    Exporta una animación redibujando en cada cuadro solo los artistas dinámicos.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura con el layout ya aplicado.
+        artistas (list): Artistas que cambian entre cuadros; el resto de la
+            figura se dibuja una sola vez como fondo.
+        actualizar (callable): `actualizar(i)` ajusta los artistas al cuadro i.
+        n_cuadros (int): Número de cuadros.
+        ruta (str | Path): Archivo de salida (.mp4, .webm o .gif).
+        fps (int): Cuadros por segundo.
+        dpi (int): Resolución de los cuadros.
+
+    Returns:
+        Path: La ruta del archivo generado.
+    """
+    ruta = Path(ruta)
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    dpi_original = fig.dpi
+    fig.set_dpi(dpi)
+    for artista in artistas:
+        artista.set_animated(True)
+    try:
+        with etapa(f'animacion_{ruta.suffix.lstrip(".")}'):
+            canvas.draw()  # Fondo: todo salvo los artistas animados
+            fondo = canvas.copy_from_bbox(fig.bbox)
+            ancho, alto = canvas.get_width_height(physical=True)
+            # Cuadro final, como referencia de colores para los formatos con paleta.
+            actualizar(n_cuadros - 1)
+            for artista in artistas:
+                fig.draw_artist(artista)
+            referencia = bytes(canvas.buffer_rgba())
+            codificador = abrir_codificador(ruta, ancho, alto, fps, referencia)
+            try:
+                for i in range(n_cuadros):
+                    canvas.restore_region(fondo)
+                    actualizar(i)
+                    for artista in artistas:
+                        fig.draw_artist(artista)
+                    codificador.escribir(canvas.buffer_rgba())
+            finally:
+                codificador.cerrar()
+    finally:
+        for artista in artistas:
+            artista.set_animated(False)
+        fig.set_dpi(dpi_original)
+    return ruta
+
+
+def indices_cuadros(n_puntos, max_cuadros=MAX_CUADROS):
+    """Índice del último punto visible en cada cuadro (como mucho `max_cuadros`)."""
+    return np.unique(np.linspace(0, n_puntos - 1, min(n_puntos, max_cuadros)).round().astype(int))
+
+
+def _fijar_puntos(linea, puntos):
+    """Asigna a una línea 2D o 3D los puntos de forma (n, 2) o (n, 3)."""
+    if puntos.shape[1] == 3:
+        linea.set_data_3d(puntos[:, 0], puntos[:, 1], puntos[:, 2])
+    else:
+        linea.set_data(puntos[:, 0], puntos[:, 1])
+
+
+def _puntos_linea(linea):
+    """Puntos de una línea 2D o 3D, de forma (n, 2) o (n, 3)."""
+    datos = linea.get_data_3d() if hasattr(linea, 'get_data_3d') else linea.get_data()
+    return np.column_stack([np.asarray(d, dtype=float) for d in datos])
+
+
+def animar_trayectorias(fig, lineas, ruta, trayectorias=None, max_cuadros=MAX_CUADROS, fps=FPS,
+                        dpi=DPI_ANIMACION, pasos=None):
+    """
+    Anima líneas ya dibujadas haciendo crecer cada una a lo largo de su trayectoria.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura con el layout ya aplicado.
+        lineas (list[Line2D]): Líneas de las trayectorias (2D o 3D).
+        ruta (str | Path): Archivo de salida.
+        trayectorias (list[np.ndarray], opcional): Puntos de cada línea, de
+            forma (pasos, 2) o (pasos, 3); por defecto, los datos de las líneas.
+        max_cuadros (int): Cuadros máximos; las trayectorias largas se
+            recorren a saltos regulares.
+        pasos (list[np.ndarray], opcional): Iteración original de cada punto
+            de cada línea (la que devuelve `trayectorias.decimar`); si se da,
+            los cuadros avanzan por iteraciones y no por puntos dibujados, así
+            que una trayectoria decimada se anima al mismo ritmo que la completa.
+
+    Returns:
+        Path: La ruta del archivo generado.
+    """
+    if trayectorias is None:
+        trayectorias = [_puntos_linea(linea) for linea in lineas]
+    trayectorias = [np.asarray(t) for t in trayectorias]
+    if pasos is None:
+        pasos = [np.arange(len(t)) for t in trayectorias]
+    n_pasos = max(int(p[-1]) + 1 for p in pasos)
+    # Puntos visibles de cada línea en cada cuadro: forma (líneas, cuadros)
+    iteraciones = indices_cuadros(n_pasos, max_cuadros)
+    cortes = [np.searchsorted(p, iteraciones, side='right') for p in pasos]
+    # Los `markevery` explícitos (listas de índices) se recortan a los puntos visibles.
+    marcas = [linea.get_markevery() for linea in lineas]
+
+    def actualizar(i):
+        for linea, trayectoria, marca, corte in zip(lineas, trayectorias, marcas, cortes):
+            visible = trayectoria[:corte[i]]
+            if isinstance(marca, (list, np.ndarray)):
+                linea.set_markevery([m for m in marca if m < len(visible)])
+            _fijar_puntos(linea, visible)
+
+    try:
+        return exportar_animacion(fig, lineas, actualizar, len(iteraciones), ruta, fps, dpi)
+    finally:
+        for linea, trayectoria, marca in zip(lineas, trayectorias, marcas):
+            linea.set_markevery(marca)
+            _fijar_puntos(linea, trayectoria)
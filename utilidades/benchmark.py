@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de las figuras con tiempos por etapa e historial entre commits.
+
+Para cada figura, en un proceso nuevo y con el backend 'Agg':
+  1. importa el script como módulo (etapa 'modulo': el código de nivel
+     superior, que en muchos scripts genera los datos y la figura);
+  2. si el script tiene un bloque `if __name__ == '__main__'`, llama a su función
+     generadora (`generar_grafico_pca`, `create_gradient_descent_plot`,
+     `generar_grafico_comparativo`...), detectada por el prefijo del nombre
+     (etapa 'artistas') y, si la devuelve, exporta la figura en SVG, PDF y PNG;
+  3. si no hay generadora sin argumentos, ejecuta el script como '__main__'
+     (etapa 'principal').
+
+Las etapas internas ('datos', 'ajuste_modelo', 'layout', 'exportar_<formato>')
+se registran con `utilidades.medicion.etapa`; cada etapa cuenta solo su tiempo
+exclusivo. Los resultados se añaden a un historial JSONL junto con el commit
+actual, y se comparan con la última medición de cada figura en otro commit
+para señalar regresiones de tiempo o de pico de memoria.
+
+Uso:
+    python -m utilidades.benchmark
+    python -m utilidades.benchmark visualizacion_ACP rosenbrock_optimization_plot --repeticiones 3
+    python -m utilidades.benchmark --arranque      # importaciones: diferidas frente a anticipadas
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import argparse
+import ast
+import importlib.machinery
+import importlib.util
+import inspect
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+
+from utilidades import importacion_diferida, medicion
+from utilidades.renderizado_lotes import RAIZ_REPOSITORIO, _pico_rss_mb, descubrir_figuras
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+ARCHIVO_HISTORIAL = RAIZ_REPOSITORIO / ".benchmark" / "historial.jsonl"
+
+# Prefijos con los que se reconocen las funciones generadoras de figuras.
+PREFIJOS_GENERADORAS = ('generar', 'generate', 'crear', 'create', 'graficar', 'plot',
+                        'visualizar', 'dibujar')
+
+FORMATOS_BENCHMARK = ('svg', 'pdf', 'png')
+
+# Umbrales de regresión: una figura se señala si empeora a la vez más que el
+# umbral relativo y más que el absoluto (para ignorar el ruido en figuras rápidas).
+UMBRAL_TIEMPO_RELATIVO = 0.20
+UMBRAL_TIEMPO_ABSOLUTO_S = 0.25
+UMBRAL_MEMORIA_RELATIVO = 0.10
+UMBRAL_MEMORIA_ABSOLUTO_MB = 20.0
+
+# ==============================================================================
+# 3. MEDICIÓN DE UNA FIGURA (PROCESO TRABAJADOR)
+# ==============================================================================
+def buscar_generadora(modulo):
+    """
+    Devuelve la función generadora de figuras de `modulo`, o None.
+
+    Se acepta la primera función definida en el propio módulo cuyo nombre
+    empiece por uno de `PREFIJOS_GENERADORAS` y que pueda llamarse sin
+    argumentos.
+    """
+    for nombre, objeto in vars(modulo).items():
+        if not (inspect.isfunction(objeto) and objeto.__module__ == modulo.__name__):
+            continue
+        if not nombre.lower().startswith(PREFIJOS_GENERADORAS):
+            continue
+        parametros = inspect.signature(objeto).parameters.values()
+        if all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+               for p in parametros):
+            return objeto
+    return None
+
+
+def tiene_bloque_principal(ruta_script):
+    """Indica si el script tiene un bloque `if __name__ == '__main__':`."""
+    arbol = ast.parse(Path(ruta_script).read_bytes())
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.If) and isinstance(nodo.test, ast.Compare):
+            nombres = [nodo.test.left, *nodo.test.comparators]
+            if any(isinstance(n, ast.Name) and n.id == '__name__' for n in nombres):
+                return True
+    return False
+
+
+def _instrumentar_savefig():
+    """Registra cada `Figure.savefig` como la etapa 'exportar_<formato>'."""
+    from matplotlib.figure import Figure
+    savefig_original = Figure.savefig
+
+    def savefig(self, fname, *args, **kwargs):
+        formato = kwargs.get('format') or Path(str(fname)).suffix.lstrip('.') or 'png'
+        with medicion.etapa(f'exportar_{formato.lower()}'):
+            return savefig_original(self, fname, *args, **kwargs)
+
+    Figure.savefig = savefig
+
+
+def _figura_devuelta(resultado):
+    """Extrae la figura del valor devuelto por una generadora (fig o (fig, ax))."""
+    from matplotlib.figure import Figure
+    candidatos = resultado if isinstance(resultado, (tuple, list)) else [resultado]
+    for candidato in candidatos:
+        if isinstance(candidato, Figure):
+            return candidato
+    return None
+
+
+def medir_figura(nombre, ruta_script):
+    """
+    Mide una figura por etapas. Pensada para correr en un proceso nuevo.
+
+    Returns:
+        dict: figura, éxito, modo ('modulo', 'generadora' o 'principal'),
+        tiempo total (s), pico de RSS (MB), etapas {nombre: s} y error.
+    """
+    directorio = tempfile.mkdtemp(prefix=f"benchmark-{nombre}-")
+    os.chdir(directorio)
+    os.environ['MPLBACKEND'] = 'Agg'
+    if str(RAIZ_REPOSITORIO) not in sys.path:
+        sys.path.insert(0, str(RAIZ_REPOSITORIO))
+
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    from utilidades.exportacion import guardar_figura
+
+    _instrumentar_savefig()
+    modo, error = 'modulo', None
+    medicion.iniciar_registro()
+    inicio = time.perf_counter()
+    try:
+        # Los nombres de archivo con guiones o sin extensión no son importables
+        # con `import`: se cargan desde su ruta con un nombre de módulo válido.
+        nombre_modulo = 'figura_' + ''.join(c if c.isalnum() else '_' for c in nombre)
+        cargador = importlib.machinery.SourceFileLoader(nombre_modulo, str(ruta_script))
+        spec = importlib.util.spec_from_loader(nombre_modulo, cargador)
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[nombre_modulo] = modulo
+        with medicion.etapa('modulo'):
+            cargador.exec_module(modulo)
+
+        # Sin bloque principal, la importación ya generó y exportó la figura.
+        if tiene_bloque_principal(ruta_script):
+            generadora = buscar_generadora(modulo)
+            if generadora is not None:
+                modo = 'generadora'
+                with medicion.etapa('artistas'):
+                    fig = _figura_devuelta(generadora())
+                # Si la generadora no devuelve la figura, es que ya la exportó ella.
+                if fig is not None:
+                    guardar_figura(fig, nombre, formatos=FORMATOS_BENCHMARK)
+            else:
+                import runpy
+                modo = 'principal'
+                with medicion.etapa('principal'):
+                    runpy.run_path(str(ruta_script), run_name='__main__')
+    except BaseException:  # SystemExit incluido: se reporta, no se propaga
+        error = traceback.format_exc()
+    finally:
+        plt.close('all')
+    tiempo = time.perf_counter() - inicio
+    etapas = medicion.detener_registro()
+    os.chdir(RAIZ_REPOSITORIO)
+    shutil.rmtree(directorio, ignore_errors=True)
+
+    return {
+        'figura': nombre,
+        'exito': error is None,
+        'modo': modo,
+        'tiempo_s': round(tiempo, 4),
+        'pico_rss_mb': round(_pico_rss_mb(), 1),
+        'etapas': {etapa: round(segundos, 4) for etapa, segundos in sorted(etapas.items())},
+        'error': error,
+    }
+
+
+def _medir_tarea(tarea):
+    """Adaptador de una tupla (nombre, ruta) para `Pool.imap`."""
+    return medir_figura(*tarea)
+
+# ==============================================================================
+# 4. EJECUCIÓN DEL BENCHMARK
+# ==============================================================================
+def commit_actual():
+    """Hash del commit de git actual (con sufijo '-sucio' si hay cambios), o None."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ_REPOSITORIO,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        cambios = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                 cwd=RAIZ_REPOSITORIO, capture_output=True, text=True,
+                                 check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-sucio" if cambios else commit
+
+
+def ejecutar_benchmark(figuras=None, repeticiones=1, al_terminar=None):
+    """
+    Mide un conjunto de figuras, una a una y cada repetición en un proceso nuevo.
+
+    Las figuras se miden en serie (no en paralelo) para que no compitan por
+    la CPU; de cada figura se conserva la repetición más rápida.
+
+    Returns:
+        list[dict]: Un resultado por figura, en orden alfabético.
+    """
+    disponibles = descubrir_figuras()
+    if figuras is None:
+        figuras = list(disponibles)
+    desconocidas = [f for f in figuras if f not in disponibles]
+    if desconocidas:
+        raise ValueError(f"Figuras desconocidas: {', '.join(desconocidas)}")
+
+    resultados = []
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as grupo:
+        for nombre in sorted(figuras):
+            tareas = [(nombre, str(disponibles[nombre]))] * repeticiones
+            medidas = list(grupo.imap(_medir_tarea, tareas))
+            correctas = [m for m in medidas if m['exito']]
+            resultado = min(correctas, key=lambda m: m['tiempo_s']) if correctas else medidas[0]
+            resultado['repeticiones'] = repeticiones
+            resultados.append(resultado)
+            if al_terminar is not None:
+                al_terminar(resultado)
+    return resultados
+
+# ==============================================================================
+# 5. HISTORIAL Y REGRESIONES
+# ==============================================================================
+def leer_historial(ruta=ARCHIVO_HISTORIAL):
+    """Lee el historial JSONL (lista de registros, del más antiguo al más reciente)."""
+    ruta = Path(ruta)
+    if not ruta.is_file():
+        return []
+    with open(ruta, encoding='utf-8') as archivo:
+        return [json.loads(linea) for linea in archivo if linea.strip()]
+
+
+def guardar_en_historial(resultados, commit, ruta=ARCHIVO_HISTORIAL):
+    """Añade los resultados al historial, uno por línea, con commit y entorno."""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    fecha = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    with open(ruta, 'a', encoding='utf-8') as archivo:
+        for resultado in resultados:
+            registro = {'fecha': fecha, 'commit': commit, 'maquina': platform.node(),
+                        'python': platform.python_version(),
+                        **{k: v for k, v in resultado.items() if k != 'error'}}
+            archivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+
+def _empeora(actual, anterior, relativo, absoluto):
+    return actual - anterior > absoluto and actual > anterior * (1 + relativo)
+
+
+def detectar_regresiones(resultados, historial, commit,
+                         tiempo_relativo=UMBRAL_TIEMPO_RELATIVO, tiempo_absoluto=UMBRAL_TIEMPO_ABSOLUTO_S,
+                         memoria_relativa=UMBRAL_MEMORIA_RELATIVO, memoria_absoluta=UMBRAL_MEMORIA_ABSOLUTO_MB):
+    """
+    Compara cada figura con su última medición correcta en otro commit.
+
+    Returns:
+        list[str]: Una descripción por regresión detectada.
+    """
+    referencias = {}
+    for registro in historial:
+        if registro.get('exito') and registro.get('commit') != commit:
+            referencias[registro['figura']] = registro
+
+    regresiones = []
+    for resultado in resultados:
+        anterior = referencias.get(resultado['figura'])
+        if anterior is None or not resultado['exito']:
+            continue
+        referencia = f"(commit {str(anterior['commit'])[:10]})"
+        if _empeora(resultado['tiempo_s'], anterior['tiempo_s'], tiempo_relativo, tiempo_absoluto):
+            regresiones.append(f"{resultado['figura']}: tiempo {anterior['tiempo_s']:.2f} s -> "
+                               f"{resultado['tiempo_s']:.2f} s {referencia}")
+        if _empeora(resultado['pico_rss_mb'], anterior['pico_rss_mb'], memoria_relativa, memoria_absoluta):
+            regresiones.append(f"{resultado['figura']}: memoria {anterior['pico_rss_mb']:.1f} MB -> "
+                               f"{resultado['pico_rss_mb']:.1f} MB {referencia}")
+    return regresiones
+
+# ==============================================================================
+# 6. TIEMPO DE ARRANQUE (IMPORTACIONES)
+# ==============================================================================
+def codigo_importaciones(ruta_script):
+    """
+    Código de las importaciones de nivel superior de un script.
+
+    Incluye las sentencias `import`/`from ... import` y las asignaciones
+    `nombre = diferido(...)`, sin el resto del script.
+    """
+    arbol = ast.parse(Path(ruta_script).read_bytes())
+    sentencias = []
+    for nodo in arbol.body:
+        es_diferido = (isinstance(nodo, ast.Assign) and isinstance(nodo.value, ast.Call)
+                       and isinstance(nodo.value.func, ast.Name) and nodo.value.func.id == 'diferido')
+        if isinstance(nodo, (ast.Import, ast.ImportFrom)) or es_diferido:
+            sentencias.append(nodo)
+    return ast.unparse(ast.Module(body=sentencias, type_ignores=[]))
+
+
+def medir_arranque(ruta_script, anticipada, repeticiones=3):
+    """
+    Tiempo (s) de ejecutar las importaciones de un script en un intérprete nuevo.
+
+    Args:
+        ruta_script (str | Path): Script de figura.
+        anticipada (bool): Si es True, desactiva la importación diferida.
+        repeticiones (int): Se devuelve el mínimo de estas mediciones.
+    """
+    programa = ("import time\n_inicio = time.perf_counter()\n"
+                f"{codigo_importaciones(ruta_script)}\n"
+                "print(time.perf_counter() - _inicio)\n")
+    entorno = {**os.environ, 'MPLBACKEND': 'Agg',
+               importacion_diferida.VARIABLE_ANTICIPADA: '1' if anticipada else '0'}
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', programa], cwd=RAIZ_REPOSITORIO, env=entorno,
+                                capture_output=True, text=True, check=True).stdout
+        tiempos.append(float(salida.strip().splitlines()[-1]))
+    return min(tiempos)
+
+
+def benchmark_arranque(figuras=None, repeticiones=3, al_terminar=None):
+    """
+    Compara el tiempo de importación de cada script con y sin importación diferida.
+
+    Returns:
+        list[dict]: figura, tiempo anticipado (s), tiempo diferido (s) y reducción (s).
+    """
+    disponibles = descubrir_figuras()
+    resultados = []
+    for nombre in sorted(figuras or disponibles):
+        ruta = disponibles[nombre]
+        anticipado = medir_arranque(ruta, True, repeticiones)
+        diferido = medir_arranque(ruta, False, repeticiones)
+        resultado = {'figura': nombre, 'anticipada_s': round(anticipado, 4),
+                     'diferida_s': round(diferido, 4), 'reduccion_s': round(anticipado - diferido, 4)}
+        resultados.append(resultado)
+        if al_terminar is not None:
+            al_terminar(resultado)
+    return resultados
+
+# ==============================================================================
+# 7. INFORME
+# ==============================================================================
+def formatear_resultado(resultado):
+    """Línea de informe con el tiempo total, la memoria y las etapas principales."""
+    estado = 'OK   ' if resultado['exito'] else 'FALLO'
+    etapas = sorted(resultado['etapas'].items(), key=lambda e: -e[1])
+    detalle = ', '.join(f"{etapa} {segundos:.2f}" for etapa, segundos in etapas[:4])
+    return (f"{estado} {resultado['figura']:<45} {resultado['tiempo_s']:>7.2f} s "
+            f"{resultado['pico_rss_mb']:>8.1f} MB  [{detalle}]")
+
+
+def formatear_arranque(resultado):
+    """Línea de informe del benchmark de arranque de una figura."""
+    return (f"{resultado['figura']:<45} anticipada {resultado['anticipada_s']:>6.2f} s   "
+            f"diferida {resultado['diferida_s']:>6.2f} s   reducción {resultado['reduccion_s']:>6.2f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mide por etapas el tiempo y la memoria de cada figura del repositorio.")
+    parser.add_argument('figuras', nargs='*',
+                        help="Nombres de figura (archivo sin extensión). Por defecto, todas.")
+    parser.add_argument('--repeticiones', type=int, default=1,
+                        help="Repeticiones por figura; se conserva la más rápida.")
+    parser.add_argument('--historial', default=str(ARCHIVO_HISTORIAL),
+                        help="Archivo JSONL donde se acumulan las mediciones.")
+    parser.add_argument('--sin-historial', action='store_true',
+                        help="No añade los resultados al historial.")
+    parser.add_argument('--umbral-tiempo', type=float, default=UMBRAL_TIEMPO_RELATIVO,
+                        help="Aumento relativo de tiempo considerado regresión (0.2 = 20 %%).")
+    parser.add_argument('--umbral-memoria', type=float, default=UMBRAL_MEMORIA_RELATIVO,
+                        help="Aumento relativo del pico de memoria considerado regresión.")
+    parser.add_argument('--estricto', action='store_true',
+                        help="Termina con código 1 si se detecta alguna regresión.")
+    parser.add_argument('--arranque', action='store_true',
+                        help="Solo compara el tiempo de importación con y sin importación diferida.")
+    args = parser.parse_args(argv)
+
+    if args.arranque:
+        resultados = benchmark_arranque(args.figuras or None, max(1, args.repeticiones),
+                                        al_terminar=lambda r: print(formatear_arranque(r), flush=True))
+        total_anticipado = sum(r['anticipada_s'] for r in resultados)
+        total_diferido = sum(r['diferida_s'] for r in resultados)
+        print('-' * 80)
+        print(f"Total: anticipada {total_anticipado:.2f} s, diferida {total_diferido:.2f} s")
+        return 0
+
+    commit = commit_actual()
+    historial = leer_historial(args.historial)
+    resultados = ejecutar_benchmark(args.figuras or None, args.repeticiones,
+                                    al_terminar=lambda r: print(formatear_resultado(r), flush=True))
+    regresiones = detectar_regresiones(resultados, historial, commit,
+                                       tiempo_relativo=args.umbral_tiempo,
+                                       memoria_relativa=args.umbral_memoria)
+
+    print('-' * 80)
+    print(f"Commit: {commit or 'desconocido'}")
+    for resultado in resultados:
+        if not resultado['exito']:
+            print(f"\n=== Error en {resultado['figura']} ===\n{resultado['error']}")
+    if regresiones:
+        print("Regresiones detectadas:")
+        for regresion in regresiones:
+            print(f"  REGRESIÓN {regresion}")
+    else:
+        print("Sin regresiones respecto al historial.")
+
+    if not args.sin_historial:
+        guardar_en_historial(resultados, commit, args.historial)
+
+    fallos = not all(r['exito'] for r in resultados)
+    return 1 if fallos or (args.estricto and regresiones) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Caché de renderizado direccionada por contenido.
+
+La clave de cada figura es un hash de:
+  - el código fuente del script (normalizado con `ast`, de modo que editar
+    comentarios no invalida la caché), que incluye sus parámetros
+    (tasas de aprendizaje, semillas, tamaños de malla...);
+  - el código de las utilidades compartidas que el script puede usar y el
+    de cualquier otro módulo del repositorio que importe, directa o
+    indirectamente (p. ej. `rosenbrock_segundo_orden` importa la función y
+    la hessiana de `rosenbrock_optimization_plot`);
+  - los parámetros explícitos con los que se renderiza (si los hay);
+  - las versiones de matplotlib, numpy y scikit-learn.
+
+Si la clave no cambia, los archivos SVG/PNG/PDF se reutilizan desde un
+almacén en disco en lugar de volver a renderizar. El almacén tiene un
+tamaño máximo y desaloja primero las entradas usadas hace más tiempo.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import ast
+import hashlib
+import json
+import os
+import shutil
+import time
+from importlib import metadata
+from pathlib import Path
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent
+DIRECTORIO_CACHE = RAIZ_REPOSITORIO / ".cache_renderizado"
+TAMANO_MAXIMO_MB = 1024
+
+# Paquetes cuya versión forma parte de la clave: un cambio de versión puede
+# alterar el resultado visual aunque el script sea idéntico.
+PAQUETES_CLAVE = ('matplotlib', 'numpy', 'scikit-learn')
+
+ARCHIVO_MANIFIESTO = 'manifiesto.json'
+
+# ==============================================================================
+# 3. CÁLCULO DE LA CLAVE
+# ==============================================================================
+def _fuente_normalizada(ruta):
+    """Código fuente normalizado (sin comentarios ni formato) de un script."""
+    fuente = Path(ruta).read_bytes()
+    try:
+        return ast.dump(ast.parse(fuente)).encode('utf-8')
+    except SyntaxError:
+        return fuente
+
+
+def versiones_paquetes(paquetes=PAQUETES_CLAVE):
+    """Versiones instaladas de los paquetes que afectan al renderizado."""
+    versiones = {}
+    for paquete in paquetes:
+        try:
+            versiones[paquete] = metadata.version(paquete)
+        except metadata.PackageNotFoundError:
+            versiones[paquete] = None
+    return versiones
+
+
+def _resolver_modulo(nombre, raices):
+    """Archivo del repositorio de un módulo importado (o None si no es local)."""
+    partes = nombre.split('.')
+    for raiz in raices:
+        base = raiz.joinpath(*partes)
+        for candidato in (base.with_suffix('.py'), base / '__init__.py'):
+            if candidato.is_file():
+                return candidato.resolve()
+    return None
+
+
+def modulos_locales(ruta_script, raiz=RAIZ_REPOSITORIO):
+    """
+    Módulos del repositorio que importa un script, directa o transitivamente.
+
+    Recorre con `ast` todas las sentencias `import` y `from ... import` (también
+    las que están dentro de funciones) y resuelve cada nombre contra la
+    carpeta del script y la raíz del repositorio; los módulos instalados
+    (numpy, matplotlib...) no se resuelven y se ignoran.
+
+    Returns:
+        list[Path]: Rutas de los módulos locales, ordenadas, sin el propio script.
+    """
+    ruta_script = Path(ruta_script).resolve()
+    raices = list(dict.fromkeys([ruta_script.parent, Path(raiz).resolve()]))
+    visitados, pendientes = {ruta_script}, [ruta_script]
+    while pendientes:
+        ruta = pendientes.pop()
+        try:
+            arbol = ast.parse(ruta.read_bytes())
+        except (OSError, SyntaxError):
+            continue
+        nombres = []
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, ast.Import):
+                nombres.extend(alias.name for alias in nodo.names)
+            elif isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+                nombres.append(nodo.module)
+                # `from paquete import submodulo` importa también paquete/submodulo.py
+                nombres.extend(f"{nodo.module}.{alias.name}" for alias in nodo.names)
+        for nombre in nombres:
+            modulo = _resolver_modulo(nombre, raices)
+            if modulo is not None and modulo not in visitados:
+                visitados.add(modulo)
+                pendientes.append(modulo)
+    visitados.discard(ruta_script)
+    return sorted(visitados)
+
+
+def clave_renderizado(ruta_script, parametros=None):
+    """
+    Calcula la clave de caché (hash SHA-256 en hexadecimal) de una figura.
+
+    Args:
+        ruta_script (str | Path): Script que genera la figura.
+        parametros (dict, opcional): Parámetros explícitos del renderizado.
+
+    Returns:
+        str: La clave de la figura.
+    """
+    h = hashlib.sha256()
+    h.update(_fuente_normalizada(ruta_script))
+    utilidades = set(Path(__file__).resolve().parent.glob('*.py'))
+    for ruta in sorted(utilidades | set(modulos_locales(ruta_script))):
+        h.update(ruta.relative_to(RAIZ_REPOSITORIO).as_posix().encode('utf-8')
+                 if ruta.is_relative_to(RAIZ_REPOSITORIO) else ruta.name.encode('utf-8'))
+        h.update(_fuente_normalizada(ruta))
+    h.update(json.dumps(parametros or {}, sort_keys=True, default=repr).encode('utf-8'))
+    h.update(json.dumps(versiones_paquetes(), sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+# ==============================================================================
+# 4. ALMACÉN EN DISCO
+# ==============================================================================
+class CacheRenderizado:
+    """
+    Almacén en disco de las salidas de cada figura, indexado por clave.
+
+    Cada entrada es una carpeta `<directorio>/<clave>/` con los archivos
+    generados y un manifiesto. La fecha de modificación del manifiesto marca
+    el último uso y guía el desalojo (LRU) cuando se supera el tamaño máximo.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, tamano_maximo_mb=TAMANO_MAXIMO_MB):
+        self.directorio = Path(directorio)
+        self.tamano_maximo = int(tamano_maximo_mb * 1024 ** 2)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+
+    def _entrada(self, clave):
+        return self.directorio / clave
+
+    def obtener(self, clave, destino):
+        """
+        Copia las salidas cacheadas de `clave` en `destino`.
+
+        Returns:
+            list[str] | None: Nombres de los archivos restaurados, o None si
+            la clave no está en la caché.
+        """
+        manifiesto_ruta = self._entrada(clave) / ARCHIVO_MANIFIESTO
+        try:
+            manifiesto = json.loads(manifiesto_ruta.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        destino = Path(destino)
+        destino.mkdir(parents=True, exist_ok=True)
+        try:
+            for nombre in manifiesto['archivos']:
+                shutil.copy2(self._entrada(clave) / nombre, destino / nombre)
+        except OSError:
+            # Entrada incompleta (p. ej. desalojada a medias): se trata como fallo.
+            return None
+        os.utime(manifiesto_ruta)  # marca de último uso para el LRU
+        return list(manifiesto['archivos'])
+
+    def guardar(self, clave, archivos):
+        """
+        Guarda una copia de `archivos` bajo `clave` y aplica el desalojo.
+
+        La entrada se escribe en una carpeta temporal y se renombra al final,
+        de modo que otro proceso nunca ve una entrada a medio escribir.
+        """
+        archivos = [Path(a) for a in archivos]
+        temporal = self.directorio / f".tmp-{clave}-{os.getpid()}"
+        shutil.rmtree(temporal, ignore_errors=True)
+        temporal.mkdir(parents=True)
+        for archivo in archivos:
+            shutil.copy2(archivo, temporal / archivo.name)
+        manifiesto = {
+            'archivos': [a.name for a in archivos],
+            'tamano_bytes': sum(a.stat().st_size for a in archivos),
+            'creado': time.time(),
+        }
+        (temporal / ARCHIVO_MANIFIESTO).write_text(json.dumps(manifiesto, indent=2), encoding='utf-8')
+
+        try:
+            os.rename(temporal, self._entrada(clave))
+        except OSError:
+            # Otro proceso guardó la misma clave primero: su entrada es equivalente.
+            shutil.rmtree(temporal, ignore_errors=True)
+        self.desalojar()
+
+    def _entradas(self):
+        """Lista de (último_uso, tamaño_bytes, ruta) de las entradas completas."""
+        entradas = []
+        for ruta in self.directorio.iterdir():
+            manifiesto = ruta / ARCHIVO_MANIFIESTO
+            if ruta.name.startswith('.') or not manifiesto.is_file():
+                continue
+            tamano = sum(p.stat().st_size for p in ruta.iterdir() if p.is_file())
+            entradas.append((manifiesto.stat().st_mtime, tamano, ruta))
+        return entradas
+
+    def tamano_total(self):
+        """Tamaño total de la caché en bytes."""
+        return sum(tamano for _, tamano, _ in self._entradas())
+
+    def desalojar(self):
+        """Elimina las entradas menos usadas hasta respetar el tamaño máximo."""
+        entradas = sorted(self._entradas())
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in entradas:
+            if total <= self.tamano_maximo:
+                break
+            shutil.rmtree(ruta, ignore_errors=True)
+            total -= tamano
+
+    def vaciar(self):
+        """Elimina todas las entradas de la caché."""
+        for ruta in self.directorio.iterdir():
+            shutil.rmtree(ruta, ignore_errors=True)
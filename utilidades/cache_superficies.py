@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Caché compartida de superficies evaluadas (curvas 1-D y superficies 2-D).
+
+Varios scripts evalúan la misma función analítica sobre la misma malla en
+cada ejecución: el cuenco cuadrático, la parábola J(θ) = θ²... Este módulo
+guarda cada arreglo evaluado como un archivo `.npy` y, en ejecuciones
+posteriores (o en otras figuras con la misma superficie), lo carga como
+memoria mapeada (`mmap_mode='r'`), sin copiarlo ni recalcularlo.
+
+La clave combina:
+  - la identidad de la función por contenido: su bytecode, constantes, los
+    valores de las constantes globales que usa, las funciones auxiliares que
+    llama y las variables de sus cierres (no su nombre ni su módulo, para
+    que dos scripts con la misma fórmula compartan entrada). Si depende de
+    un valor sin huella estable, la superficie se calcula sin caché;
+  - el dominio y la resolución de la malla.
+
+El almacén tiene un tamaño máximo y desaloja primero los archivos usados
+hace más tiempo (LRU), igual que la caché de renderizado.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import hashlib
+import json
+import numbers
+import os
+import types
+from pathlib import Path
+
+import numpy as np
+
+from utilidades.malla_adaptativa import malla_adaptativa, triangular
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent
+DIRECTORIO_CACHE = RAIZ_REPOSITORIO / ".cache_superficies"
+TAMANO_MAXIMO_MB = 256
+
+# ==============================================================================
+# 3. IDENTIDAD DE LA FUNCIÓN
+# ==============================================================================
+class _NoHasheable(Exception):
+    """Un valor del que depende la función no tiene una huella estable."""
+
+
+def _huella_valor(valor, h, visitadas):
+    """
+    Añade a `h` el contenido de un valor del que depende una función.
+
+    Admite escalares, cadenas, tuplas y listas, arreglos de NumPy, módulos
+    (por nombre), funciones de Python (por contenido, recursivamente) y
+    funciones compiladas o ufuncs (por nombre cualificado). Cualquier otro
+    valor lanza `_NoHasheable`: es preferible no usar la caché a devolver
+    una superficie de otra función.
+    """
+    if valor is None or isinstance(valor, (numbers.Number, str, bytes)):
+        h.update(f"{type(valor).__name__}:{valor!r}".encode('utf-8'))
+    elif isinstance(valor, (tuple, list)):
+        h.update(f"{type(valor).__name__}[{len(valor)}]".encode('utf-8'))
+        for elemento in valor:
+            _huella_valor(elemento, h, visitadas)
+    elif isinstance(valor, np.ndarray):
+        if valor.dtype.hasobject:
+            raise _NoHasheable(repr(valor.dtype))
+        h.update(f"ndarray{valor.shape}{valor.dtype.str}".encode('utf-8'))
+        h.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, types.ModuleType):
+        h.update(f"modulo:{valor.__name__}".encode('utf-8'))
+    elif isinstance(valor, types.FunctionType):
+        _huella_funcion(valor, h, visitadas)
+    elif isinstance(valor, (types.BuiltinFunctionType, np.ufunc)):
+        h.update(f"compilada:{getattr(valor, '__module__', None)}.{valor.__name__}".encode('utf-8'))
+    else:
+        raise _NoHasheable(type(valor).__name__)
+
+
+def _huella_codigo(codigo, funcion_globales, h, visitadas):
+    """Añade a `h` el contenido de un objeto código (y de los anidados)."""
+    h.update(codigo.co_code)
+    h.update(repr(codigo.co_names).encode('utf-8'))
+    for constante in codigo.co_consts:
+        if isinstance(constante, types.CodeType):
+            _huella_codigo(constante, funcion_globales, h, visitadas)
+        else:
+            h.update(repr(constante).encode('utf-8'))
+    # Globales usados por la función: constantes (p. ej. A = 1.0, B = 100.0 en
+    # Rosenbrock) y funciones auxiliares, cuyo contenido se recorre a su vez.
+    # Los nombres que no están en los globales son atributos o builtins.
+    for nombre in codigo.co_names:
+        if nombre in funcion_globales:
+            h.update(f"{nombre}=".encode('utf-8'))
+            _huella_valor(funcion_globales[nombre], h, visitadas)
+
+
+def _huella_funcion(funcion, h, visitadas):
+    """Añade a `h` el código, los globales, las celdas y los valores por defecto de `funcion`."""
+    if id(funcion) in visitadas:   # Recursión (directa o mutua): basta con marcarla
+        h.update(f"recursiva:{visitadas[id(funcion)]}".encode('utf-8'))
+        return
+    visitadas[id(funcion)] = len(visitadas)
+    codigo = funcion.__code__
+    constantes = codigo.co_consts
+    if funcion.__doc__ is not None and constantes and constantes[0] == funcion.__doc__:
+        codigo = codigo.replace(co_consts=(None,) + constantes[1:])
+    _huella_codigo(codigo, funcion.__globals__, h, visitadas)
+    # Variables capturadas por un cierre (p. ej. `k` en `lambda x, y: k * x + y`)
+    for nombre, celda in zip(codigo.co_freevars, funcion.__closure__ or ()):
+        try:
+            contenido = celda.cell_contents
+        except ValueError:   # Celda aún vacía
+            raise _NoHasheable(nombre) from None
+        h.update(f"celda {nombre}=".encode('utf-8'))
+        _huella_valor(contenido, h, visitadas)
+    _huella_valor(funcion.__defaults__, h, visitadas)
+    _huella_valor(tuple(sorted((funcion.__kwdefaults__ or {}).items())), h, visitadas)
+
+
+def huella_funcion(funcion):
+    """
+    Huella (hash SHA-256) del contenido de una función de Python.
+
+    Ignora el nombre, el módulo, la docstring y los números de línea, de
+    modo que la misma fórmula definida en dos scripts produce la misma huella.
+    Incluye las funciones auxiliares que llama, las variables de sus cierres
+    y las constantes globales que usa.
+
+    Returns:
+        str | None: La huella, o None si la función depende de algún valor
+        sin huella estable (un objeto arbitrario, una celda vacía...), en
+        cuyo caso no debe usarse la caché.
+    """
+    h = hashlib.sha256()
+    try:
+        _huella_funcion(funcion, h, {})
+    except _NoHasheable:
+        return None
+    return h.hexdigest()
+
+
+def clave_superficie(funcion, tipo, parametros):
+    """
+    Clave de caché de `funcion` evaluada con la malla descrita por `parametros`.
+
+    Returns:
+        str | None: La clave, o None si la función no tiene huella estable.
+    """
+    huella = huella_funcion(funcion)
+    if huella is None:
+        return None
+    h = hashlib.sha256()
+    h.update(huella.encode('utf-8'))
+    h.update(tipo.encode('utf-8'))
+    h.update(json.dumps(parametros, sort_keys=True, default=repr).encode('utf-8'))
+    h.update(np.__version__.encode('utf-8'))
+    return h.hexdigest()
+
+# ==============================================================================
+# 4. ALMACÉN EN DISCO
+# ==============================================================================
+class CacheSuperficies:
+    """
+    Almacén de arreglos `.npy` indexado por clave, con desalojo LRU.
+
+    La fecha de modificación de cada archivo marca su último uso.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, tamano_maximo_mb=TAMANO_MAXIMO_MB):
+        self.directorio = Path(directorio)
+        self.tamano_maximo = int(tamano_maximo_mb * 1024 ** 2)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+
+    def _ruta(self, clave):
+        return self.directorio / f"{clave}.npy"
+
+    def obtener(self, clave):
+        """
+        Devuelve el arreglo de `clave` mapeado en memoria (solo lectura).
+
+        Returns:
+            np.memmap | None: El arreglo, o None si la clave no está en la caché.
+        """
+        ruta = self._ruta(clave)
+        try:
+            arreglo = np.load(ruta, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        os.utime(ruta)  # marca de último uso para el LRU
+        return arreglo
+
+    def guardar(self, clave, arreglo):
+        """
+        Guarda `arreglo` bajo `clave`, aplica el desalojo y lo devuelve mapeado.
+
+        Se escribe en un archivo temporal que se renombra al final, de modo
+        que otro proceso nunca lee un archivo a medio escribir.
+        """
+        temporal = self.directorio / f".tmp-{clave}-{os.getpid()}.npy"
+        np.save(temporal, np.ascontiguousarray(arreglo))
+        os.replace(temporal, self._ruta(clave))
+        self.desalojar()
+        guardado = self.obtener(clave)
+        return guardado if guardado is not None else arreglo
+
+    def memoizar(self, clave, calcular):
+        """
+        Devuelve el arreglo de `clave`, calculándolo con `calcular()` si falta.
+
+        Con `clave` None (función sin huella estable) se calcula sin usar la caché.
+        """
+        if clave is None:
+            return calcular()
+        arreglo = self.obtener(clave)
+        if arreglo is None:
+            arreglo = self.guardar(clave, calcular())
+        return arreglo
+
+    def _entradas(self):
+        """Lista de (último_uso, tamaño_bytes, ruta) de los archivos completos."""
+        entradas = []
+        for ruta in self.directorio.glob('*.npy'):
+            if ruta.name.startswith('.'):
+                continue
+            estado = ruta.stat()
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+        return entradas
+
+    def tamano_total(self):
+        """Tamaño total de la caché en bytes."""
+        return sum(tamano for _, tamano, _ in self._entradas())
+
+    def desalojar(self):
+        """Elimina los archivos menos usados hasta respetar el tamaño máximo."""
+        entradas = sorted(self._entradas())
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in entradas:
+            if total <= self.tamano_maximo:
+                break
+            ruta.unlink(missing_ok=True)
+            total -= tamano
+
+    def vaciar(self):
+        """Elimina todos los archivos de la caché."""
+        for ruta in self.directorio.glob('*.npy'):
+            ruta.unlink(missing_ok=True)
+
+# ==============================================================================
+# 5. SUPERFICIES MEMOIZADAS
+# ==============================================================================
+def superficie(funcion, x_lim, y_lim=None, resolucion=400, cache=None):
+    """
+    Evalúa `funcion` en una malla regular, reutilizando la caché si es posible.
+
+    Args:
+        funcion (callable): f(x) o f(x, y), vectorizada sobre arreglos.
+        x_lim (tuple): (x_min, x_max), como en `np.linspace`.
+        y_lim (tuple, opcional): (y_min, y_max). Si se omite, la curva es 1-D.
+        resolucion (int): Puntos por eje.
+        cache (CacheSuperficies, opcional): Almacén a usar; por defecto, el
+            compartido del repositorio.
+
+    Returns:
+        tuple: (x, z) para curvas 1-D o (X, Y, Z) para superficies 2-D, como
+        con `np.meshgrid`. Z es de solo lectura (memoria mapeada).
+    """
+    cache = cache or CacheSuperficies()
+    x = np.linspace(*x_lim, resolucion)
+    if y_lim is None:
+        clave = clave_superficie(funcion, 'curva', {'x': list(x_lim), 'n': resolucion})
+        return x, cache.memoizar(clave, lambda: funcion(x))
+
+    X, Y = np.meshgrid(x, np.linspace(*y_lim, resolucion))
+    clave = clave_superficie(funcion, 'malla', {'x': list(x_lim), 'y': list(y_lim), 'n': resolucion})
+    return X, Y, cache.memoizar(clave, lambda: funcion(X, Y))
+
+
+def malla_adaptativa_memoizada(funcion, x_lim, y_lim, niveles, cache=None, **opciones):
+    """
+    Igual que `malla_adaptativa`, pero guarda los nodos evaluados en la caché.
+
+    Se almacenan las coordenadas y los valores de los nodos (un arreglo de
+    forma (3, nodos)); la triangulación se reconstruye al cargarlos.
+
+    Returns:
+        tuple: (matplotlib.tri.Triangulation, valores en los nodos).
+    """
+    cache = cache or CacheSuperficies()
+    parametros = {'x': list(x_lim), 'y': list(y_lim),
+                  'niveles': np.asarray(niveles).tolist(), **opciones}
+    clave = clave_superficie(funcion, 'malla_adaptativa', parametros)
+
+    def calcular():
+        triangulacion, valores = malla_adaptativa(funcion, x_lim, y_lim, niveles, **opciones)
+        return np.array([triangulacion.x, triangulacion.y, valores])
+
+    nodos = cache.memoizar(clave, calcular)
+    return triangular(nodos[0], nodos[1], nodos[2]), nodos[2]
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Mapas de cuencas de atracción del descenso de gradiente.
+
+En lugar de dibujar uno o dos descensos elegidos a mano, se lanza una
+trayectoria desde cada celda de una rejilla (p. ej. 400 × 400 = 160 000) y
+todas avanzan a la vez como un único arreglo de estado. De cada trayectoria
+solo se conserva a qué mínimo llegó y en cuántas iteraciones
+(`descenso_vectorizado.descenso_gradiente_final`), así que la memoria es
+O(rejilla) y no O(rejilla × iteraciones). Después, los puntos finales se
+agrupan en mínimos distintos y el plano se colorea según la cuenca.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+from matplotlib.colors import to_rgb
+from matplotlib.patches import Patch
+
+from utilidades.descenso_vectorizado import (LIMITE_DIVERGENCIA, TOLERANCIA_CONVERGENCIA,
+                                             descenso_gradiente_final)
+from utilidades.medicion import etapa
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+RESOLUCION = 400          # Celdas por eje de la rejilla (400 × 400 trayectorias)
+RADIO_FUSION = 1e-3       # Puntos finales más cercanos que esto son el mismo mínimo
+CUENCAS_EN_LEYENDA = 5    # Cuencas más extensas que se nombran en la leyenda
+
+# Paleta cualitativa para las cuencas (se repite si hay más mínimos) y color
+# de las celdas que divergen o no convergen en el número de pasos dado.
+COLORES_CUENCAS = ('#21918c', '#fde725', '#440154', '#f98e09', '#5ec962',
+                   '#3b528b', '#e45a31', '#a2d8f0', '#b5367a', '#8c8c8c')
+COLOR_SIN_CUENCA = '#d9d9d9'
+SOMBREADO_MAXIMO = 0.55   # Oscurecimiento de las celdas que más tardan en converger
+
+# ==============================================================================
+# 3. CÁLCULO DE LAS CUENCAS
+# ==============================================================================
+def rejilla(x_lim, y_lim, resolucion=RESOLUCION):
+    """
+    Puntos iniciales de una rejilla regular del plano.
+
+    Returns:
+        tuple: (x de forma (resolucion,), y de forma (resolucion,), puntos
+        de forma (resolucion², 2) en el orden de `np.meshgrid(x, y)`).
+    """
+    x = np.linspace(*x_lim, resolucion)
+    y = np.linspace(*y_lim, resolucion)
+    X, Y = np.meshgrid(x, y)
+    return x, y, np.column_stack([X.ravel(), Y.ravel()])
+
+
+def agrupar_minimos(puntos, radio=RADIO_FUSION):
+    """
+    Agrupa puntos finales en mínimos distintos.
+
+    Los puntos se cuantizan a celdas de lado `radio` y después se fusionan
+    los representantes a menos de `radio` (el mismo mínimo puede caer en dos
+    celdas vecinas). El número de mínimos es pequeño, así que la fusión es
+    cuadrática en mínimos pero lineal en puntos.
+
+    Args:
+        puntos (np.ndarray): Forma (n, dimensión).
+        radio (float): Distancia por debajo de la cual dos puntos son el mismo mínimo.
+
+    Returns:
+        tuple: (mínimos de forma (k, dimensión), etiqueta de cada punto de forma (n,)).
+    """
+    if len(puntos) == 0:
+        return np.empty((0, puntos.shape[1])), np.empty(0, dtype=np.int32)
+    _, inversa = np.unique(np.round(puntos / radio).astype(np.int64), axis=0, return_inverse=True)
+    inversa = inversa.ravel()
+    cuentas = np.bincount(inversa)
+    centros = np.stack([np.bincount(inversa, weights=puntos[:, d]) / cuentas
+                        for d in range(puntos.shape[1])], axis=1)
+
+    # Fusión de centros vecinos: cada centro apunta al primero que esté a menos de `radio`.
+    destino = np.arange(len(centros))
+    for i in range(len(centros)):
+        if destino[i] != i:
+            continue
+        cercanos = np.linalg.norm(centros[i + 1:] - centros[i], axis=1) < radio
+        indices = i + 1 + np.flatnonzero(cercanos)
+        destino[indices[destino[indices] == indices]] = i
+    destino = np.unique(destino, return_inverse=True)[1]
+    minimos = np.stack([np.bincount(destino, weights=centros[:, d] * cuentas)
+                        / np.bincount(destino, weights=cuentas)
+                        for d in range(puntos.shape[1])], axis=1)
+    return minimos, destino[inversa].astype(np.int32)
+
+
+def cuencas_atraccion(gradiente, puntos_iniciales, tasa_aprendizaje, num_iteraciones, funcion=None,
+                      radio=RADIO_FUSION, tolerancia=TOLERANCIA_CONVERGENCIA, limite=LIMITE_DIVERGENCIA):
+    """
+    Lanza el descenso de gradiente desde cada punto y etiqueta el mínimo alcanzado.
+
+    Args:
+        gradiente (callable): Gradiente de la función de coste, con la
+            convención de `descenso_vectorizado.evaluar_gradiente`.
+        puntos_iniciales (array_like): Forma (lote, dimensión), p. ej. los de `rejilla`.
+        tasa_aprendizaje (float | array_like): Tasa común o una por punto.
+        num_iteraciones (int): Pasos máximos por trayectoria.
+        funcion (callable, opcional): Función de coste; si se da, los mínimos
+            se ordenan por su valor (la etiqueta 0 es el mejor encontrado).
+        radio (float): Ver `agrupar_minimos`.
+        tolerancia (float): Ver `descenso_gradiente_final`.
+        limite (float): Ver `descenso_gradiente_final`.
+
+    Returns:
+        dict: 'etiquetas' (lote,) con el índice del mínimo alcanzado o -1 si
+        la trayectoria divergió o no convergió; 'iteraciones' (lote,);
+        'minimos' (k, dimensión); 'valores' (k,) si se dio `funcion`; y
+        'area' (k,), el número de puntos de cada cuenca.
+    """
+    with etapa('descenso_cuencas'):
+        finales, iteraciones, divergente = descenso_gradiente_final(
+            gradiente, puntos_iniciales, tasa_aprendizaje, num_iteraciones, tolerancia, limite)
+
+    convergidas = (iteraciones >= 0) & ~divergente
+    minimos, etiquetas_convergidas = agrupar_minimos(finales[convergidas], radio)
+    valores = None
+    if funcion is not None and len(minimos):
+        valores = np.asarray(funcion(*minimos.T), dtype=float)
+        orden = np.argsort(valores, kind='stable')
+        rango = np.empty_like(orden)
+        rango[orden] = np.arange(len(orden))
+        minimos, valores = minimos[orden], valores[orden]
+        etiquetas_convergidas = rango[etiquetas_convergidas]
+
+    etiquetas = np.full(len(finales), -1, dtype=np.int32)
+    etiquetas[convergidas] = etiquetas_convergidas
+    return {'etiquetas': etiquetas, 'iteraciones': iteraciones, 'minimos': minimos,
+            'valores': valores, 'area': np.bincount(etiquetas_convergidas, minlength=len(minimos))}
+
+# ==============================================================================
+# 4. DIBUJO
+# ==============================================================================
+def dibujar_cuencas(ax, etiquetas, extension, cuencas, iteraciones=None, n_leyenda=CUENCAS_EN_LEYENDA,
+                    formato_minimo='({:.2f}, {:.2f})', alpha=1.0):
+    """
+    Colorea el plano según la cuenca de atracción de cada celda.
+
+    Args:
+        ax (matplotlib.axes.Axes): Ejes 2D donde dibujar.
+        etiquetas (np.ndarray): Etiquetas en forma de imagen (filas = eje y).
+        extension (tuple): (x_min, x_max, y_min, y_max) de la imagen.
+        cuencas (dict): El resultado de `cuencas_atraccion`.
+        iteraciones (np.ndarray, opcional): Iteraciones de convergencia con
+            la forma de `etiquetas`; si se dan, cada celda se oscurece según
+            lo que tardó en converger (escala logarítmica entre la celda más
+            rápida y la más lenta).
+        n_leyenda (int): Cuencas (las más extensas) que se nombran en la leyenda.
+        formato_minimo (str): Formato de las coordenadas de cada mínimo en
+            la leyenda; recibe tantos valores como dimensiones tenga.
+        alpha (float): Opacidad de la imagen.
+
+    Returns:
+        list: Los elementos de leyenda (parches) de las cuencas nombradas.
+    """
+    n_minimos = len(cuencas['minimos'])
+    colores = [COLORES_CUENCAS[i % len(COLORES_CUENCAS)] for i in range(n_minimos)]
+    # Tabla de colores indexada por etiqueta + 1: la fila 0 es "sin cuenca" (etiqueta -1).
+    tabla = np.array([to_rgb(color) for color in (COLOR_SIN_CUENCA, *colores)])
+    imagen = tabla[etiquetas + 1]
+    if iteraciones is not None:
+        # Escala entre la celda convergida más rápida y la más lenta
+        convergidas = etiquetas >= 0
+        pasos = np.log1p(np.maximum(iteraciones, 0))
+        if np.any(convergidas):
+            minimo, maximo = pasos[convergidas].min(), pasos[convergidas].max()
+            oscurecer = 1 - SOMBREADO_MAXIMO * (pasos - minimo) / max(maximo - minimo, 1e-12)
+            imagen = np.where(convergidas[..., np.newaxis], imagen * oscurecer[..., np.newaxis], imagen)
+    ax.imshow(imagen, extent=extension, origin='lower', aspect='auto',
+              interpolation='nearest', alpha=alpha)
+
+    elementos = []
+    for i in np.argsort(cuencas['area'])[::-1][:n_leyenda]:
+        texto = f"Cuenca de {formato_minimo.format(*cuencas['minimos'][i])}"
+        if cuencas['valores'] is not None:
+            texto += f", f = {cuencas['valores'][i]:.3f}"
+        if cuencas['valores'] is not None and np.isclose(cuencas['valores'][i], cuencas['valores'][0]):
+            texto += " (global)"   # Puede haber varios mínimos empatados
+        elementos.append(Patch(facecolor=colores[i], edgecolor='none', label=texto))
+    if n_minimos > n_leyenda:
+        elementos.append(Patch(facecolor='none', edgecolor='none',
+                               label=f"... y {n_minimos - n_leyenda} cuencas más"))
+    if np.any(etiquetas < 0):
+        elementos.append(Patch(facecolor=COLOR_SIN_CUENCA, edgecolor='none', label="Diverge / no converge"))
+    return elementos
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Diagramas de dispersión que pasan a imagen de densidad con muchos puntos.
+
+Con `ax.scatter` cada punto es un marcador: el tiempo de renderizado y el
+tamaño del SVG crecen linealmente con los datos y dejan de ser usables a
+partir de ~10^5 puntos. `dispersion` dibuja un `scatter` normal por debajo
+de un umbral y, por encima, agrupa los puntos en un histograma 2D
+(vectorizado con `np.bincount`, por bloques) que se dibuja como una única
+imagen, cuyo coste depende de los píxeles y no de los datos:
+
+  - con `c` numérico, cada celda toma el valor medio de `c` y la imagen es
+    un `ScalarMappable` con el mismo `cmap`/`norm`, así que `fig.colorbar`
+    funciona igual que con el `scatter`;
+  - con un solo color, la opacidad de cada celda crece con su densidad;
+  - `dispersion_por_categoria` mezcla los colores de varias categorías
+    según cuántos puntos de cada una caen en la celda.
+
+La opacidad crece con el logaritmo del número de puntos de la celda. Si se
+pasa `label`, se añade un marcador vacío que representa a la imagen en la
+leyenda.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+from matplotlib.colors import Normalize, to_rgba
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+UMBRAL_PUNTOS = 50_000    # Por encima, imagen de densidad en lugar de marcadores
+RESOLUCION = 400          # Celdas por eje de la imagen
+TAMANO_BLOQUE = 1_000_000
+ALFA_MINIMO = 0.25        # Opacidad de una celda con un solo punto
+
+# ==============================================================================
+# 3. HISTOGRAMA 2D VECTORIZADO
+# ==============================================================================
+def extension_datos(x, y):
+    """(x_min, x_max, y_min, y_max) de los puntos, sin rangos nulos."""
+    x_min, x_max = float(np.min(x)), float(np.max(x))
+    y_min, y_max = float(np.min(y)), float(np.max(y))
+    if x_max == x_min:
+        x_min, x_max = x_min - 0.5, x_max + 0.5
+    if y_max == y_min:
+        y_min, y_max = y_min - 0.5, y_max + 0.5
+    return x_min, x_max, y_min, y_max
+
+
+def histograma(x, y, extension, resolucion=RESOLUCION, pesos=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Cuenta los puntos (o suma `pesos`) que caen en cada celda de la rejilla.
+
+    Args:
+        x, y (array_like): Coordenadas de los puntos.
+        extension (tuple): (x_min, x_max, y_min, y_max) de la rejilla.
+        resolucion (int): Celdas por eje.
+        pesos (array_like, opcional): Peso de cada punto; por defecto, 1.
+
+    Returns:
+        np.ndarray: Matriz (resolucion, resolucion) indexada [fila = y, columna = x],
+        lista para `imshow(..., origin='lower')`.
+    """
+    x_min, x_max, y_min, y_max = extension
+    total = np.zeros(resolucion * resolucion)
+    for inicio in range(0, len(x), tamano_bloque):
+        fin = inicio + tamano_bloque
+        columnas = ((np.asarray(x[inicio:fin]) - x_min) * (resolucion / (x_max - x_min))).astype(np.intp)
+        filas = ((np.asarray(y[inicio:fin]) - y_min) * (resolucion / (y_max - y_min))).astype(np.intp)
+        np.clip(columnas, 0, resolucion - 1, out=columnas)
+        np.clip(filas, 0, resolucion - 1, out=filas)
+        peso = None if pesos is None else np.asarray(pesos[inicio:fin], dtype=float)
+        total += np.bincount(filas * resolucion + columnas, weights=peso, minlength=resolucion * resolucion)
+    return total.reshape(resolucion, resolucion)
+
+
+def opacidad(cuentas, alfa=1.0):
+    """Opacidad de cada celda: 0 si está vacía y de ALFA_MINIMO a `alfa` según log(cuentas)."""
+    maximo = np.log1p(cuentas.max()) if cuentas.max() > 0 else 1.0
+    relativa = ALFA_MINIMO + (1 - ALFA_MINIMO) * np.log1p(cuentas) / maximo
+    return np.where(cuentas > 0, alfa * relativa, 0.0)
+
+# ==============================================================================
+# 4. DIAGRAMAS DE DISPERSIÓN
+# ==============================================================================
+def _marcador_leyenda(ax, label, color, kwargs):
+    """Marcador vacío que representa a la imagen en la leyenda."""
+    if label is not None:
+        ax.scatter([], [], color=color, label=label, marker=kwargs.get('marker', 'o'),
+                   s=kwargs.get('s'), alpha=kwargs.get('alpha'))
+
+
+def dispersion(ax, x, y, c=None, cmap=None, norm=None, vmin=None, vmax=None, color=None,
+               label=None, umbral=UMBRAL_PUNTOS, resolucion=RESOLUCION, **kwargs):
+    """
+    `ax.scatter(x, y, ...)` o, con más de `umbral` puntos, su imagen de densidad.
+
+    Args:
+        ax (matplotlib.axes.Axes): Ejes de destino.
+        x, y (array_like): Coordenadas.
+        c (array_like, opcional): Valor numérico por punto, para el mapa de colores.
+        cmap, norm, vmin, vmax: Como en `ax.scatter`.
+        color (color, opcional): Color único de los puntos (si no hay `c`).
+        label (str, opcional): Etiqueta para la leyenda.
+        umbral (int): Número de puntos a partir del cual se usa la imagen.
+        resolucion (int): Celdas por eje de la imagen.
+        **kwargs: Resto de argumentos de `ax.scatter` (s, alpha, marker,
+            zorder...). En modo imagen solo se usan alpha y zorder.
+
+    Returns:
+        PathCollection | AxesImage: El artista dibujado; ambos sirven para
+        `fig.colorbar` cuando se pasa `c`.
+    """
+    if len(x) <= umbral:
+        return ax.scatter(x, y, c=c, cmap=cmap, norm=norm, vmin=vmin, vmax=vmax,
+                          color=color, label=label, **kwargs)
+
+    extension = extension_datos(x, y)
+    cuentas = histograma(x, y, extension, resolucion)
+    alfa = opacidad(cuentas, kwargs.get('alpha') or 1.0)
+    opciones = dict(origin='lower', extent=extension, interpolation='nearest', aspect='auto',
+                    zorder=kwargs.get('zorder'))
+
+    if c is not None:
+        sumas = histograma(x, y, extension, resolucion, pesos=c)
+        media = np.ma.masked_where(cuentas == 0, sumas / np.maximum(cuentas, 1))
+        if norm is None:
+            norm = Normalize(np.min(c) if vmin is None else vmin, np.max(c) if vmax is None else vmax)
+        imagen = ax.imshow(media, cmap=cmap, norm=norm, alpha=alfa, **opciones)
+        _marcador_leyenda(ax, label, imagen.cmap(0.5), kwargs)
+        return imagen
+
+    rgba = np.zeros(cuentas.shape + (4,))
+    rgba[..., :3] = to_rgba(color or 'C0')[:3]
+    rgba[..., 3] = alfa
+    imagen = ax.imshow(rgba, **opciones)
+    _marcador_leyenda(ax, label, color or 'C0', kwargs)
+    return imagen
+
+
+def dispersion_por_categoria(ax, x, y, categorias, colores, etiquetas=None,
+                             umbral=UMBRAL_PUNTOS, resolucion=RESOLUCION, **kwargs):
+    """
+    Dispersión coloreada por categoría, o su imagen de densidad con muchos puntos.
+
+    En modo imagen, el color de cada celda es la media de los colores de las
+    categorías ponderada por sus puntos en la celda.
+
+    Args:
+        ax (matplotlib.axes.Axes): Ejes de destino.
+        x, y (array_like): Coordenadas.
+        categorias (array_like): Categoría de cada punto.
+        colores (dict): {categoría: color}.
+        etiquetas (dict, opcional): {categoría: texto de la leyenda}.
+        **kwargs: Argumentos de `ax.scatter` (s, alpha, marker, zorder...).
+
+    Returns:
+        list: Los artistas dibujados (uno por categoría, o una sola imagen).
+    """
+    x, y, categorias = np.asarray(x), np.asarray(y), np.asarray(categorias)
+    etiquetas = etiquetas or {categoria: str(categoria) for categoria in colores}
+    if len(x) <= umbral:
+        return [ax.scatter(x[categorias == categoria], y[categorias == categoria], color=color,
+                           label=etiquetas.get(categoria), **kwargs)
+                for categoria, color in colores.items()]
+
+    extension = extension_datos(x, y)
+    cuentas = np.zeros((resolucion, resolucion))
+    mezcla = np.zeros((resolucion, resolucion, 3))
+    for categoria, color in colores.items():
+        seleccion = categorias == categoria
+        cuentas_categoria = histograma(x[seleccion], y[seleccion], extension, resolucion)
+        cuentas += cuentas_categoria
+        mezcla += cuentas_categoria[..., None] * np.asarray(to_rgba(color)[:3])
+        _marcador_leyenda(ax, etiquetas.get(categoria), color, kwargs)
+
+    rgba = np.zeros((resolucion, resolucion, 4))
+    rgba[..., :3] = mezcla / np.maximum(cuentas, 1)[..., None]
+    rgba[..., 3] = opacidad(cuentas, kwargs.get('alpha') or 1.0)
+    return [ax.imshow(rgba, origin='lower', extent=extension, interpolation='nearest',
+                      aspect='auto', zorder=kwargs.get('zorder'))]
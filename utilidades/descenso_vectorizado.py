@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Motor vectorizado de descenso de gradiente para lotes de trayectorias.
+
+En lugar de avanzar un punto cada vez en un bucle de Python, el motor
+avanza a la vez un lote completo de puntos iniciales (cada uno con su propia
+tasa de aprendizaje) como arreglos de NumPy. Las funciones gradiente de los
+scripts (`rosenbrock_grad`, `gradient`, `grad_f`...) ya aceptan arreglos,
+así que se llaman una sola vez por iteración para todo el lote.
+
+Las trayectorias se escriben en el búfer de `trayectorias.RegistroTrayectorias`
+en lugar de acumularse en listas, y el bucle se detiene en cuanto todas
+convergen. Cuando
+solo interesa el resultado de cada trayectoria (mapas de estabilidad o de
+cuencas de atracción), `descenso_gradiente_final` guarda únicamente el
+estado final y la iteración de convergencia.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+
+from utilidades.trayectorias import TOLERANCIA_GRADIENTE, TOLERANCIA_RELATIVA, RegistroTrayectorias
+
+# Criterios de parada de `descenso_gradiente_final`.
+TOLERANCIA_CONVERGENCIA = TOLERANCIA_GRADIENTE   # Norma del gradiente que se considera nula
+LIMITE_DIVERGENCIA = 1e6         # Valor absoluto de una coordenada que se considera divergente
+CRECIMIENTO_DIVERGENCIA = 1e-9   # Aumento relativo de la pérdida que el mapa de estabilidad trata como divergencia
+FRACCION_COMPACTACION = 0.75     # Se compacta el lote activo cuando quedan menos de esta fracción
+
+# ==============================================================================
+# 2. PREPARACIÓN DEL LOTE
+# ==============================================================================
+def preparar_lote(puntos_iniciales, tasas_aprendizaje):
+    """
+    Normaliza los puntos iniciales y las tasas de aprendizaje de un lote.
+
+    Args:
+        puntos_iniciales (array_like): Forma (lote, dimensión). Un arreglo 1-D
+            se interpreta como un lote de puntos de dimensión 1.
+        tasas_aprendizaje (float | array_like): Una tasa común o una por
+            trayectoria. Si hay un único punto y varias tasas (o viceversa),
+            se difunde para formar el lote.
+
+    Returns:
+        tuple: (puntos de forma (lote, dimensión), tasas de forma (lote,)).
+    """
+    puntos = np.asarray(puntos_iniciales, dtype=float)
+    if puntos.ndim == 1:
+        puntos = puntos[:, np.newaxis]
+    if puntos.ndim != 2:
+        raise ValueError("puntos_iniciales debe tener forma (lote, dimensión).")
+    tasas = np.atleast_1d(np.asarray(tasas_aprendizaje, dtype=float))
+    if tasas.ndim != 1:
+        raise ValueError("tasas_aprendizaje debe ser un escalar o un arreglo 1-D.")
+
+    lote = np.broadcast_shapes((puntos.shape[0],), tasas.shape)[0]
+    puntos = np.broadcast_to(puntos, (lote, puntos.shape[1]))
+    tasas = np.broadcast_to(tasas, (lote,))
+    return puntos, tasas
+
+
+def evaluar_gradiente(gradiente, puntos):
+    """
+    Evalúa `gradiente` sobre un lote de puntos de forma (lote, dimensión).
+
+    La función gradiente recibe una coordenada por argumento (cada una un
+    arreglo de forma (lote,)), como `rosenbrock_grad(x, y)`, y devuelve un
+    componente por coordenada (o un único arreglo si la dimensión es 1).
+
+    Returns:
+        np.ndarray: El gradiente de cada punto, de forma (lote, dimensión).
+    """
+    lote, dimension = puntos.shape
+    componentes = gradiente(*puntos.T)
+    if dimension == 1:
+        componentes = [componentes]
+    # broadcast_arrays admite componentes constantes (escalares) del gradiente
+    componentes = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in componentes])
+    return np.stack(componentes, axis=-1).reshape(lote, dimension)
+
+# ==============================================================================
+# 3. MOTOR DE DESCENSO DE GRADIENTE
+# ==============================================================================
+def descenso_gradiente_lote(gradiente, puntos_iniciales, tasas_aprendizaje, num_iteraciones,
+                            tolerancia=TOLERANCIA_CONVERGENCIA, funcion=None,
+                            tolerancia_relativa=TOLERANCIA_RELATIVA):
+    """
+    Ejecuta descenso de gradiente para un lote de trayectorias a la vez.
+
+    Regla de actualización, aplicada a todo el lote en cada iteración:
+        θ_{k+1} = θ_k - η · ∇J(θ_k)
+
+    Cada trayectoria se congela en cuanto converge (‖∇J‖ < `tolerancia` o,
+    si se da `funcion`, cambio relativo de J menor que `tolerancia_relativa`)
+    y el bucle termina cuando han convergido todas.
+
+    Args:
+        gradiente (callable): Gradiente de la función de coste; ver
+            `evaluar_gradiente` para su convención de argumentos.
+        puntos_iniciales (array_like): Forma (lote, dimensión).
+        tasas_aprendizaje (float | array_like): Tasa común o una por trayectoria.
+        num_iteraciones (int): Número máximo de pasos de descenso.
+        tolerancia (float | None): Norma del gradiente que se considera nula;
+            None recorre siempre `num_iteraciones` pasos.
+        funcion (callable, opcional): Función de coste, para el criterio de
+            cambio relativo.
+        tolerancia_relativa (float | None): Ver `trayectorias.RegistroTrayectorias`.
+
+    Returns:
+        np.ndarray: Trayectorias de forma (pasos + 1, lote, dimensión), con
+        pasos ≤ num_iteraciones; la fila 0 contiene los puntos iniciales y
+        las trayectorias convergidas repiten su último punto.
+    """
+    puntos, tasas = preparar_lote(puntos_iniciales, tasas_aprendizaje)
+    lote, dimension = puntos.shape
+
+    perdidas = None if funcion is None else funcion(*puntos.T)
+    registro = RegistroTrayectorias(puntos, num_iteraciones, perdidas, tolerancia,
+                                    tolerancia_relativa if funcion is not None else None)
+    paso = np.empty((lote, dimension))
+    tasas_columna = tasas[:, np.newaxis]
+
+    # Las trayectorias divergentes (η demasiado grande) desbordan a inf/nan:
+    # es un resultado válido, no un error.
+    with np.errstate(over='ignore', invalid='ignore'):
+        for _ in range(num_iteraciones):
+            grad = evaluar_gradiente(gradiente, registro.actual)
+            if not registro.comprobar(grad):
+                break
+            np.multiply(grad, tasas_columna, out=paso)
+            paso[~registro.activas] = 0
+            nuevos = registro.actual - paso
+            if not registro.registrar(nuevos, None if funcion is None else funcion(*nuevos.T)):
+                break
+
+    return registro.trayectorias
+
+# ==============================================================================
+# 4. DESCENSO SIN HISTORIAL (SOLO ESTADO FINAL)
+# ==============================================================================
+def descenso_gradiente_final(gradiente, puntos_iniciales, tasas_aprendizaje, num_iteraciones,
+                             tolerancia=TOLERANCIA_CONVERGENCIA, limite=LIMITE_DIVERGENCIA):
+    """
+    Descenso de gradiente de un lote guardando solo el estado final de cada trayectoria.
+
+    A diferencia de `descenso_gradiente_lote`, no guarda el historial: la
+    memoria es O(lote) y no O(lote × iteraciones), lo que permite lanzar
+    millones de trayectorias (p. ej. una por celda de una rejilla). Cada
+    trayectoria se retira del lote activo en cuanto converge (‖∇J‖ <
+    `tolerancia`) o diverge (coordenada no finita o mayor que `limite`), así
+    que cada iteración solo trabaja con las que siguen en marcha.
+
+    Args:
+        gradiente (callable): Gradiente de la función de coste; ver
+            `evaluar_gradiente` para su convención de argumentos.
+        puntos_iniciales (array_like): Forma (lote, dimensión).
+        tasas_aprendizaje (float | array_like): Tasa común o una por trayectoria.
+        num_iteraciones (int): Número máximo de pasos de descenso.
+        tolerancia (float): Norma del gradiente por debajo de la cual una
+            trayectoria se considera convergida.
+        limite (float): Valor absoluto de una coordenada a partir del cual
+            una trayectoria se considera divergente.
+
+    Returns:
+        tuple: (puntos finales de forma (lote, dimensión),
+        iteración de convergencia de forma (lote,) con -1 si no convergió,
+        indicador de divergencia de forma (lote,)).
+    """
+    puntos, tasas = preparar_lote(puntos_iniciales, tasas_aprendizaje)
+    lote = puntos.shape[0]
+    finales = puntos.copy()
+    iteracion = np.full(lote, -1, dtype=np.int32)
+    divergente = np.zeros(lote, dtype=bool)
+
+    # Lote activo: índices, posiciones y tasas de las trayectorias aún en
+    # marcha. Las terminadas se marcan en `pendientes` y el lote solo se
+    # compacta cuando sobra una fracción apreciable (copiarlo en cada
+    # iteración costaría más que seguir avanzando las ya terminadas).
+    indices = np.arange(lote)
+    actuales = finales.copy()
+    tasas_activas = tasas[:, np.newaxis].copy()
+    pendientes = np.ones(lote, dtype=bool)
+    n_pendientes = lote
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for k in range(num_iteraciones + 1):
+            grad = evaluar_gradiente(gradiente, actuales)
+            convergidas = np.einsum('ij,ij->i', grad, grad) < tolerancia ** 2
+            divergidas = ~np.all(np.abs(actuales) <= limite, axis=1)  # También atrapa inf/nan
+            terminadas = (convergidas | divergidas) if k < num_iteraciones else np.ones_like(pendientes)
+            terminadas &= pendientes
+            if terminadas.any():
+                finales[indices[terminadas]] = actuales[terminadas]
+                iteracion[indices[terminadas & convergidas & ~divergidas]] = k
+                divergente[indices[terminadas & divergidas]] = True
+                pendientes &= ~terminadas
+                n_pendientes -= np.count_nonzero(terminadas)
+                if n_pendientes == 0:
+                    break
+                if n_pendientes < FRACCION_COMPACTACION * pendientes.size:
+                    indices, actuales, tasas_activas, grad = (
+                        indices[pendientes], actuales[pendientes], tasas_activas[pendientes],
+                        grad[pendientes])
+                    pendientes = np.ones(n_pendientes, dtype=bool)
+            actuales -= tasas_activas * grad
+
+    return finales, iteracion, divergente
+
+# ==============================================================================
+# 5. MAPA DE ESTABILIDAD (TASA DE APRENDIZAJE × PUNTO INICIAL)
+# ==============================================================================
+def mapa_estabilidad(funcion, gradiente, tasas_aprendizaje, puntos_iniciales, num_iteraciones,
+                     tolerancia=TOLERANCIA_CONVERGENCIA, limite=LIMITE_DIVERGENCIA):
+    """
+    Ejecuta el descenso para cada combinación (η, x₀) de una función de coste 1-D.
+
+    Args:
+        funcion (callable): Función de coste J(x), vectorizada.
+        gradiente (callable): Su derivada J'(x), vectorizada.
+        tasas_aprendizaje (array_like): Valores de η (eje horizontal del mapa).
+        puntos_iniciales (array_like): Valores de x₀ (eje vertical del mapa).
+        num_iteraciones (int): Número máximo de pasos por trayectoria.
+        tolerancia (float): Ver `descenso_gradiente_final`.
+        limite (float): Ver `descenso_gradiente_final`.
+
+    Una trayectoria cuenta como divergente si supera `limite` o si, sin
+    haber convergido, termina con una pérdida mayor que la inicial: cerca de
+    la frontera de estabilidad (|1 − η·J''(x*)| apenas mayor que 1) la
+    trayectoria crece tan despacio que no llega a `limite` en
+    `num_iteraciones` pasos, pero ya se aleja del mínimo.
+
+    Returns:
+        dict: Arreglos de forma (len(puntos_iniciales), len(tasas_aprendizaje)):
+        'iteracion' (de convergencia, -1 si no convergió), 'perdida' (J en el
+        punto final, nan si divergió) y 'divergente'; más 'tasas' y 'puntos'.
+    """
+    tasas = np.asarray(tasas_aprendizaje, dtype=float)
+    puntos = np.asarray(puntos_iniciales, dtype=float)
+    forma = (puntos.size, tasas.size)
+    # Lote de una trayectoria por celda: fila = x₀, columna = η.
+    finales, iteracion, divergente = descenso_gradiente_final(
+        gradiente, np.repeat(puntos, tasas.size), np.tile(tasas, puntos.size),
+        num_iteraciones, tolerancia, limite)
+    with np.errstate(over='ignore', invalid='ignore'):
+        perdida = funcion(finales[:, 0])
+        inicial = funcion(np.repeat(puntos, tasas.size))
+        # Sin converger y con la pérdida creciendo (o no finita): se aleja del mínimo
+        creciente = (iteracion < 0) & ~(perdida <= inicial + CRECIMIENTO_DIVERGENCIA * np.abs(inicial))
+    divergente |= creciente
+    perdida = np.where(divergente, np.nan, perdida)
+    return {'iteracion': iteracion.reshape(forma), 'perdida': perdida.reshape(forma),
+            'divergente': divergente.reshape(forma), 'tasas': tasas, 'puntos': puntos}
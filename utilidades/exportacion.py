@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación de una figura a varios formatos con un único cálculo de layout.
+
+Llamar a `fig.savefig(..., bbox_inches='tight')` una vez por formato repite
+en cada llamada el layout (tight/constrained) y un dibujado previo para medir
+el recuadro ajustado, además del dibujado final. `guardar_figura` ejecuta el
+layout y calcula el recuadro ajustado una sola vez, congela ese estado y
+después solo serializa la figura en cada backend (SVG, PDF, PNG...).
+
+En los formatos vectoriales cada polígono de un `contourf`, cada faceta de
+una superficie y cada marcador de un `scatter` denso es un trazo propio, y
+los archivos pesan megabytes. Con `rasterizar=True` se mide lo que aporta
+cada artista al SVG y solo los pesados (colecciones de más de
+UMBRAL_RASTERIZADO bytes) se incrustan como imagen a `dpi_rasterizado`;
+textos, ejes y anotaciones siguen siendo vectoriales. Con `informe=True` se
+imprime el desglose de tamaño por artista.
+
+Ambas opciones pueden activarse sin editar los scripts con las variables de
+entorno EXPORTACION_RASTERIZAR=1 y EXPORTACION_INFORME_TAMANO=1.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import io
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import matplotlib as mpl
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+
+from utilidades.medicion import etapa
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+FORMATOS_POR_DEFECTO = ('svg', 'pdf', 'png')
+DPI_POR_DEFECTO = 300   # Resolución de los formatos ráster (PNG, JPG...)
+MARGEN_POR_DEFECTO = 0.1  # Margen alrededor del recuadro ajustado, en pulgadas
+
+# Formatos ráster: su resolución determina con qué métricas de texto se mide
+# el recuadro ajustado. Los vectoriales trabajan internamente a 72 DPI.
+FORMATOS_RASTER = {'png', 'jpg', 'jpeg', 'tif', 'tiff', 'webp'}
+DPI_VECTORIAL = 72
+
+# Rasterizado selectivo: artistas cuyo trazo vectorial supera este tamaño
+# (en bytes de SVG) se incrustan como imagen en los formatos vectoriales.
+UMBRAL_RASTERIZADO = 50_000
+DPI_RASTERIZADO = 150   # Resolución por defecto de los artistas rasterizados
+ARTISTAS_RASTERIZABLES = (Collection, Line2D)
+ARTISTAS_EN_INFORME = 8
+
+VARIABLE_RASTERIZAR = 'EXPORTACION_RASTERIZAR'
+VARIABLE_INFORME = 'EXPORTACION_INFORME_TAMANO'
+
+# ==============================================================================
+# 3. CÁLCULO DEL ESTADO COMPARTIDO
+# ==============================================================================
+def _renderizador(fig):
+    """Renderizador con el que medir textos y recuadros de la figura."""
+    obtener = getattr(fig.canvas, 'get_renderer', None)
+    return obtener() if obtener is not None else fig._get_renderer()
+
+
+def calcular_recuadro_ajustado(fig, margen=MARGEN_POR_DEFECTO, artistas_extra=None, dpi=None):
+    """
+    Ejecuta el layout de la figura y devuelve su recuadro ajustado (en pulgadas).
+
+    Equivale a lo que `savefig(bbox_inches='tight', pad_inches=margen)` calcula
+    internamente, pero hecho una sola vez para reutilizarlo en varios formatos.
+    `dpi` es la resolución a la que se miden los textos (la de la exportación
+    ráster), ya que el tamaño de un texto no escala exactamente con el DPI.
+    """
+    dpi_original = fig.dpi
+    if dpi is not None:
+        fig.set_dpi(dpi)
+    try:
+        # Dibujado sin rasterizar: aplica el motor de layout (tight/constrained)
+        # y coloca todos los artistas, sin el coste de pintar píxeles.
+        fig.draw_without_rendering()
+        recuadro = fig.get_tightbbox(_renderizador(fig), bbox_extra_artists=artistas_extra)
+    finally:
+        fig.set_dpi(dpi_original)
+    return recuadro.padded(margen)
+
+
+def _dpi_formato(dpi, formato):
+    """Resolución de exportación de `formato` según el argumento `dpi`."""
+    return dpi.get(formato, DPI_POR_DEFECTO) if isinstance(dpi, dict) else dpi
+
+# ==============================================================================
+# 4. TAMAÑO POR ARTISTA Y RASTERIZADO SELECTIVO
+# ==============================================================================
+def opciones_entorno():
+    """Opciones de exportación activadas por variables de entorno ({variable: valor})."""
+    return {variable: os.environ[variable] for variable in (VARIABLE_RASTERIZAR, VARIABLE_INFORME)
+            if os.environ.get(variable)}
+
+
+def _activada(valor, variable):
+    """`valor` si se indicó explícitamente; si no, la variable de entorno."""
+    if valor is not None:
+        return valor
+    return os.environ.get(variable, '') not in ('', '0')
+
+
+def _artistas_medibles(fig):
+    """Pares (descripción, artista) de los hijos de la figura y de cada eje."""
+    for artista in fig.get_children():
+        if artista not in fig.axes:
+            yield 'figura', artista
+    for i, ax in enumerate(fig.axes):
+        for artista in ax.get_children():
+            yield f'ejes {i}', artista
+
+
+def tamano_artistas(fig, recuadro=None, dpi=None):
+    """
+    Bytes que aporta cada artista al SVG de la figura.
+
+    Exporta la figura a SVG en memoria con un identificador temporal en cada
+    artista y mide el grupo `<g id=...>` que el backend escribe para él.
+
+    Args:
+        fig (matplotlib.figure.Figure): La figura, con el layout ya aplicado.
+        recuadro (Bbox, opcional): Recuadro ajustado de la exportación.
+        dpi (int, opcional): Resolución de los artistas rasterizados.
+
+    Returns:
+        tuple: (lista de (descripción, artista, bytes) de mayor a menor
+        tamaño, tamaño total del SVG en bytes).
+    """
+    medibles = list(_artistas_medibles(fig))
+    gids_originales = [artista.get_gid() for _, artista in medibles]
+    for k, (_, artista) in enumerate(medibles):
+        artista.set_gid(f'medida-{k}')
+    try:
+        svg = io.BytesIO()
+        fig.savefig(svg, format='svg', dpi=dpi, bbox_inches=recuadro, pad_inches=0)
+    finally:
+        for (_, artista), gid in zip(medibles, gids_originales):
+            artista.set_gid(gid)
+
+    tamanos = {}
+    for elemento in ET.fromstring(svg.getvalue()).iter():
+        identificador = elemento.get('id', '')
+        if identificador.startswith('medida-'):
+            tamanos[int(identificador[len('medida-'):])] = len(ET.tostring(elemento))
+
+    resultado = []
+    for k, (lugar, artista) in enumerate(medibles):
+        if k in tamanos:
+            etiqueta = artista.get_label()
+            nombre = type(artista).__name__
+            if isinstance(etiqueta, str) and etiqueta and not etiqueta.startswith('_'):
+                nombre += f" '{etiqueta}'"
+            resultado.append((f'{lugar}: {nombre}', artista, tamanos[k]))
+    return sorted(resultado, key=lambda fila: fila[2], reverse=True), len(svg.getvalue())
+
+
+def rasterizar_pesados(tamanos, umbral=UMBRAL_RASTERIZADO):
+    """
+    Marca como rasterizados los artistas pesados que aún son vectoriales.
+
+    Args:
+        tamanos (list): Resultado de `tamano_artistas`.
+        umbral (int): Tamaño mínimo (bytes de SVG) para rasterizar.
+
+    Returns:
+        list: Los artistas marcados, para poder restaurarlos.
+    """
+    marcados = []
+    for _, artista, tamano in tamanos:
+        if (tamano > umbral and isinstance(artista, ARTISTAS_RASTERIZABLES)
+                and not artista.get_rasterized()):
+            artista.set_rasterized(True)
+            marcados.append(artista)
+    return marcados
+
+
+def imprimir_informe_tamano(tamanos, total, titulo, total_final=None, n=ARTISTAS_EN_INFORME):
+    """
+    Imprime los `n` artistas que más aportan al SVG vectorial y su porcentaje.
+
+    Los artistas marcados con [ráster] se incrustan como imagen en la
+    exportación; `total_final` es el tamaño del SVG resultante.
+    """
+    print(f"Tamaño por artista de {titulo} (SVG vectorial: {total / 1024:.0f} KB):")
+    for descripcion, artista, tamano in tamanos[:n]:
+        modo = ' [ráster]' if artista.get_rasterized() else ''
+        print(f"  {tamano / 1024:>9.1f} KB {100 * tamano / total:>5.1f} %  {descripcion}{modo}")
+    if total_final is not None:
+        print(f"  SVG con los artistas pesados rasterizados: {total_final / 1024:.0f} KB")
+
+# ==============================================================================
+# 5. EXPORTACIÓN
+# ==============================================================================
+def guardar_figura(fig, nombre_base, formatos=FORMATOS_POR_DEFECTO, dpi=DPI_POR_DEFECTO,
+                   ajustar=True, margen=MARGEN_POR_DEFECTO, artistas_extra=None, rasterizar=None,
+                   dpi_rasterizado=DPI_RASTERIZADO, informe=None, **kwargs_savefig):
+    """
+    Guarda una figura en varios formatos con un solo cálculo de layout.
+
+    Args:
+        fig (matplotlib.figure.Figure): La figura a exportar.
+        nombre_base (str | Path): Ruta de salida sin extensión.
+        formatos (iterable): Extensiones a generar, p. ej. ('svg', 'pdf', 'png').
+        dpi (int | dict): Resolución; puede ser un diccionario {formato: dpi}
+            para usar valores distintos por formato.
+        ajustar (bool): Si es True, recorta al recuadro ajustado ('tight').
+        margen (float): Margen en pulgadas alrededor del recuadro ajustado.
+        artistas_extra (list, opcional): Artistas adicionales a incluir en
+            el recuadro ajustado (equivale a `bbox_extra_artists`).
+        rasterizar (bool, opcional): Si es True, en los formatos vectoriales
+            los artistas pesados se incrustan como imagen. Por defecto, según
+            la variable de entorno EXPORTACION_RASTERIZAR.
+        dpi_rasterizado (int): Resolución de los artistas rasterizados en
+            los formatos vectoriales.
+        informe (bool, opcional): Si es True, imprime el tamaño que aporta
+            cada artista. Por defecto, según EXPORTACION_INFORME_TAMANO.
+        **kwargs_savefig: Argumentos adicionales para `fig.savefig`.
+
+    Returns:
+        list[Path]: Las rutas de los archivos generados, en el orden de `formatos`.
+    """
+    rutas = [Path(f"{nombre_base}.{formato}") for formato in formatos]
+    return guardar_figura_en(fig, rutas, dpi=dpi, ajustar=ajustar, margen=margen,
+                             artistas_extra=artistas_extra, rasterizar=rasterizar,
+                             dpi_rasterizado=dpi_rasterizado, informe=informe, **kwargs_savefig)
+
+
+def guardar_figura_en(fig, rutas, dpi=DPI_POR_DEFECTO, ajustar=True, margen=MARGEN_POR_DEFECTO,
+                      artistas_extra=None, rasterizar=None, dpi_rasterizado=DPI_RASTERIZADO,
+                      informe=None, **kwargs_savefig):
+    """
+    Igual que `guardar_figura`, pero con rutas de salida explícitas.
+
+    El formato de cada archivo se deduce de su extensión; útil cuando los
+    archivos de una misma figura no comparten el nombre base.
+    """
+    rutas = [Path(ruta) for ruta in rutas]
+    formatos = [ruta.suffix.lstrip('.').lower() for ruta in rutas]
+    dpis_raster = [_dpi_formato(dpi, f) for f in formatos if f in FORMATOS_RASTER]
+    dpi_medida = max(dpis_raster) if dpis_raster else DPI_VECTORIAL
+
+    with etapa('layout'):
+        if ajustar:
+            recuadro = calcular_recuadro_ajustado(fig, margen, artistas_extra, dpi=dpi_medida)
+        else:
+            fig.draw_without_rendering()
+            recuadro = None
+
+    # Con el layout ya aplicado, se desactiva el motor de layout mientras se
+    # exporta: así `savefig` no repite el dibujado previo en cada formato.
+    motor_layout = fig.get_layout_engine()
+    with mpl.rc_context({'figure.autolayout': False, 'figure.constrained_layout.use': False}):
+        fig.set_layout_engine(None)
+
+    rasterizar = _activada(rasterizar, VARIABLE_RASTERIZAR)
+    informe = _activada(informe, VARIABLE_INFORME)
+    vectoriales = any(formato not in FORMATOS_RASTER for formato in formatos)
+    rasterizados = []
+    try:
+        if vectoriales and (rasterizar or informe):
+            with etapa('rasterizado'):
+                tamanos, total = tamano_artistas(fig, recuadro)
+                if rasterizar:
+                    rasterizados = rasterizar_pesados(tamanos)
+            if informe:
+                total_final = None
+                if rasterizados:
+                    total_final = tamano_artistas(fig, recuadro, dpi_rasterizado)[1]
+                imprimir_informe_tamano(tamanos, total, rutas[0].stem, total_final)
+
+        for ruta, formato in zip(rutas, formatos):
+            dpi_formato = _dpi_formato(dpi, formato)
+            if formato not in FORMATOS_RASTER and rasterizados:
+                dpi_formato = dpi_rasterizado
+            with etapa(f'exportar_{formato}'):
+                fig.savefig(ruta, format=formato, dpi=dpi_formato,
+                            bbox_inches=recuadro, pad_inches=0, **kwargs_savefig)
+    finally:
+        for artista in rasterizados:
+            artista.set_rasterized(False)
+        if motor_layout is not None:
+            fig.set_layout_engine(motor_layout)
+
+    return rutas
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Importación diferida de librerías pesadas (scipy, scikit-learn, seaborn, umap).
+
+Importar `umap` compila con numba al cargarse, y `sklearn` o `scipy.stats`
+tardan cientos de milisegundos; los scripts los importaban al inicio aunque
+solo los use la función que genera la figura. Con `diferido` el nombre queda
+ligado a un sustituto que importa el módulo (o su atributo) la primera vez
+que se usa:
+
+    sns = diferido('seaborn')                 # en vez de: import seaborn as sns
+    PCA = diferido('sklearn.decomposition', 'PCA')  # from sklearn.decomposition import PCA
+
+Con la variable de entorno IMPORTACION_ANTICIPADA=1 se importa todo en el
+acto, como antes (útil para comparar tiempos de arranque o depurar errores
+de importación).
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import importlib
+import os
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+VARIABLE_ANTICIPADA = 'IMPORTACION_ANTICIPADA'
+
+# ==============================================================================
+# 3. SUSTITUTO DIFERIDO
+# ==============================================================================
+class ObjetoDiferido:
+    """
+    Sustituto de un módulo o de un atributo de módulo aún no importado.
+
+    Reenvía el acceso a atributos y las llamadas al objeto real, que se
+    importa en el primer uso y se conserva para los siguientes.
+    """
+
+    __slots__ = ('_modulo', '_atributo', '_objeto')
+
+    def __init__(self, modulo, atributo=None):
+        object.__setattr__(self, '_modulo', modulo)
+        object.__setattr__(self, '_atributo', atributo)
+        object.__setattr__(self, '_objeto', None)
+
+    def _resolver(self):
+        """Importa (una sola vez) y devuelve el objeto real."""
+        objeto = object.__getattribute__(self, '_objeto')
+        if objeto is None:
+            objeto = importlib.import_module(self._modulo)
+            if self._atributo is not None:
+                objeto = getattr(objeto, self._atributo)
+            object.__setattr__(self, '_objeto', objeto)
+        return objeto
+
+    def __getattr__(self, nombre):
+        return getattr(self._resolver(), nombre)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolver()(*args, **kwargs)
+
+    def __repr__(self):
+        nombre = self._modulo if self._atributo is None else f"{self._modulo}.{self._atributo}"
+        estado = 'cargado' if object.__getattribute__(self, '_objeto') is not None else 'sin cargar'
+        return f"<diferido {nombre} ({estado})>"
+
+
+def importacion_anticipada():
+    """Indica si la importación diferida está desactivada por entorno."""
+    return os.environ.get(VARIABLE_ANTICIPADA, '').strip().lower() in ('1', 'true', 'si', 'sí')
+
+
+def diferido(modulo, atributo=None):
+    """
+    Devuelve un sustituto que importa `modulo` (o `modulo.atributo`) al usarse.
+
+    Args:
+        modulo (str): Nombre completo del módulo, p. ej. 'scipy.stats'.
+        atributo (str, opcional): Atributo del módulo, p. ej. 'norm'.
+
+    Returns:
+        ObjetoDiferido | object: El sustituto, o el objeto real si la
+        variable IMPORTACION_ANTICIPADA está activa.
+    """
+    objeto = ObjetoDiferido(modulo, atributo)
+    return objeto._resolver() if importacion_anticipada() else objeto
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Cálculo en paralelo, y con caché en disco, de incrustaciones (embeddings) de
+reducción de dimensionalidad: PCA, LLE, t-SNE, UMAP...
+
+Cada método se describe con la ruta de su clase y sus hiperparámetros:
+
+    METODOS = {
+        'tsne': ('sklearn.manifold.TSNE', {'perplexity': 30, 'random_state': 42}),
+        'umap': ('umap.UMAP', {'n_neighbors': 12, 'random_state': 42}),
+    }
+
+`calcular_incrustaciones` ajusta todos los métodos a la vez en un grupo de
+procesos (cada uno con su semilla fija en los hiperparámetros, de modo que el
+resultado es determinista) y guarda cada incrustación en disco con una clave
+que combina el método, sus hiperparámetros, un hash del conjunto de datos y
+las versiones de las librerías. Cambiar solo el estilo de la figura no
+vuelve a ajustar ningún modelo.
+
+Si se pasa un grafo de vecinos compartido (`utilidades.vecinos`), los
+métodos que saben aprovecharlo (LLE y UMAP, ver ADAPTADORES_GRAFO) lo usan en
+lugar de buscar sus propios vecinos.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import warnings
+
+import numpy as np
+
+from utilidades.cache_renderizado import RAIZ_REPOSITORIO, versiones_paquetes
+from utilidades.cache_superficies import CacheSuperficies
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+DIRECTORIO_CACHE = RAIZ_REPOSITORIO / ".cache_incrustaciones"
+TAMANO_MAXIMO_MB = 256
+
+# Librerías cuya versión puede cambiar el resultado de un ajuste.
+PAQUETES_AJUSTE = ('numpy', 'scipy', 'scikit-learn', 'umap-learn')
+
+# ==============================================================================
+# 3. CLAVES DE CACHÉ
+# ==============================================================================
+def hash_datos(X):
+    """Hash SHA-256 del contenido, la forma y el tipo de un arreglo."""
+    X = np.ascontiguousarray(X)
+    h = hashlib.sha256()
+    h.update(f"{X.shape}|{X.dtype.str}".encode('utf-8'))
+    h.update(X.tobytes())
+    return h.hexdigest()
+
+
+def clave_incrustacion(nombre, ruta_clase, hiperparametros, huella_datos, vecinos_grafo=None):
+    """Clave de caché de la incrustación de un método sobre un conjunto de datos."""
+    contenido = {
+        'metodo': nombre,
+        'clase': ruta_clase,
+        'hiperparametros': hiperparametros,
+        'datos': huella_datos,
+        'grafo': vecinos_grafo,
+        'versiones': versiones_paquetes(PAQUETES_AJUSTE),
+    }
+    return hashlib.sha256(json.dumps(contenido, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+# ==============================================================================
+# 4. AJUSTE DE UN MÉTODO (PROCESO TRABAJADOR)
+# ==============================================================================
+def _importar_clase(ruta_clase):
+    modulo, _, clase = ruta_clase.rpartition('.')
+    return getattr(importlib.import_module(modulo), clase)
+
+
+def _umap_con_grafo(hiperparametros, X, grafo):
+    """UMAP con los vecinos del grafo compartido como `precomputed_knn`."""
+    # En UMAP, n_neighbors cuenta el propio punto (columna 0 del grafo).
+    k = hiperparametros['n_neighbors']
+    precalculados = (np.ascontiguousarray(grafo.indices[:, :k]),
+                     np.ascontiguousarray(grafo.distancias[:, :k]))
+    with warnings.catch_warnings():
+        # Sin índice NNDescent, UMAP avisa de que no podrá transformar datos nuevos.
+        warnings.filterwarnings('ignore', message='precomputed_knn')
+        estimador = _importar_clase('umap.UMAP')(precomputed_knn=precalculados, **hiperparametros)
+        return estimador.fit_transform(X)
+
+
+def _lle_con_grafo(hiperparametros, X, grafo):
+    """LLE sobre el índice espacial (KD-tree) del grafo compartido."""
+    locally_linear_embedding = _importar_clase('sklearn.manifold.locally_linear_embedding')
+    argumentos = {clave: valor for clave, valor in hiperparametros.items()
+                  if clave != 'neighbors_algorithm'}
+    incrustacion, _ = locally_linear_embedding(X=grafo.indice(), **argumentos)
+    return incrustacion
+
+
+# Métodos que pueden reutilizar un grafo de vecinos: {ruta_clase: ajuste(hiperparámetros, X, grafo)}
+ADAPTADORES_GRAFO = {
+    'umap.UMAP': _umap_con_grafo,
+    'sklearn.manifold.LocallyLinearEmbedding': _lle_con_grafo,
+}
+
+
+def usa_grafo(ruta_clase, hiperparametros, grafo):
+    """Indica si el método puede ajustarse con el grafo de vecinos `grafo`."""
+    k = hiperparametros.get('n_neighbors')
+    if grafo is None or k is None or ruta_clase not in ADAPTADORES_GRAFO:
+        return False
+    # LLE usa k vecinos además del propio punto; UMAP, k contando el propio punto.
+    return k <= grafo.n_vecinos + (ruta_clase == 'umap.UMAP')
+
+
+def ajustar_metodo(ruta_clase, hiperparametros, X, grafo=None):
+    """
+    Importa la clase del método, la ajusta a `X` y devuelve la incrustación.
+
+    Args:
+        ruta_clase (str): Ruta completa de la clase, p. ej. 'sklearn.manifold.TSNE'.
+        hiperparametros (dict): Argumentos del constructor.
+        X (np.ndarray): Datos de forma (muestras, características).
+        grafo (GrafoVecinos, opcional): Grafo de vecinos compartido, si el
+            método puede aprovecharlo.
+    """
+    if usa_grafo(ruta_clase, hiperparametros, grafo):
+        return np.asarray(ADAPTADORES_GRAFO[ruta_clase](hiperparametros, X, grafo))
+    estimador = _importar_clase(ruta_clase)(**hiperparametros)
+    return np.asarray(estimador.fit_transform(X))
+
+
+def _ajustar_tarea(tarea):
+    """Adaptador de una tupla (nombre, ruta_clase, hiperparámetros, X, grafo) para `imap_unordered`."""
+    nombre, ruta_clase, hiperparametros, X, grafo = tarea
+    return nombre, ajustar_metodo(ruta_clase, hiperparametros, X, grafo)
+
+# ==============================================================================
+# 5. CÁLCULO DE TODAS LAS INCRUSTACIONES
+# ==============================================================================
+def _procesos_disponibles():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def calcular_incrustaciones(X, metodos, procesos=None, cache=None, grafo=None):
+    """
+    Calcula (o recupera de la caché) la incrustación de cada método.
+
+    Args:
+        X (array_like): Datos de forma (muestras, características).
+        metodos (dict): {nombre: (ruta_clase, hiperparámetros)}.
+        procesos (int, opcional): Tamaño del grupo de procesos. Por defecto,
+            uno por método pendiente, sin superar los núcleos disponibles.
+        cache (CacheSuperficies, opcional): Almacén de arreglos; por defecto,
+            `.cache_incrustaciones/` en la raíz del repositorio.
+        grafo (GrafoVecinos, opcional): Grafo de vecinos de `X` que comparten
+            los métodos de ADAPTADORES_GRAFO.
+
+    Returns:
+        dict: {nombre: incrustación}, en el mismo orden que `metodos`. Las
+        incrustaciones recuperadas de la caché son de solo lectura.
+    """
+    X = np.asarray(X)
+    cache = cache or CacheSuperficies(DIRECTORIO_CACHE, TAMANO_MAXIMO_MB)
+    huella = hash_datos(X)
+
+    resultados, claves, pendientes = {}, {}, []
+    for nombre, (ruta_clase, hiperparametros) in metodos.items():
+        grafo_metodo = grafo if usa_grafo(ruta_clase, hiperparametros, grafo) else None
+        claves[nombre] = clave_incrustacion(nombre, ruta_clase, hiperparametros, huella,
+                                            grafo_metodo and grafo_metodo.n_vecinos)
+        guardada = cache.obtener(claves[nombre])
+        if guardada is not None:
+            resultados[nombre] = guardada
+        else:
+            pendientes.append((nombre, ruta_clase, hiperparametros, X, grafo_metodo))
+
+    if pendientes:
+        if procesos is None:
+            procesos = min(len(pendientes), _procesos_disponibles())
+        # Un proceso de un grupo (p. ej. el del renderizado por lotes) es
+        # 'daemon' y no puede crear procesos hijos: ahí se ajusta en serie.
+        if procesos <= 1 or multiprocessing.current_process().daemon:
+            ajustados = map(_ajustar_tarea, pendientes)
+            for nombre, incrustacion in ajustados:
+                resultados[nombre] = cache.guardar(claves[nombre], incrustacion)
+        else:
+            with multiprocessing.Pool(processes=procesos) as grupo:
+                for nombre, incrustacion in grupo.imap_unordered(_ajustar_tarea, pendientes):
+                    resultados[nombre] = cache.guardar(claves[nombre], incrustacion)
+
+    return {nombre: resultados[nombre] for nombre in metodos}
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Muestreo adaptativo (quadtree) de una función f(x, y) para gráficos de contorno.
+
+Una malla densa de 400×400 evalúa la función en 160.000 puntos, aunque la
+mayoría caiga en zonas planas donde las curvas de nivel apenas cambian. Este
+módulo parte de una rejilla gruesa y subdivide (en cuatro) solo las celdas
+donde la interpolación lineal comete un error apreciable frente a la
+separación entre curvas de nivel, y solo si alguna curva de nivel puede
+pasar por ellas. Los puntos evaluados se triangulan para dibujar con
+`ax.tricontour` / `ax.tricontourf`.
+
+Todos los puntos viven en una retícula entera de (2^nivel_maximo + 1)² nodos,
+de modo que los vértices compartidos entre celdas vecinas se evalúan una sola
+vez, y cada nivel del quadtree se evalúa en una única llamada vectorizada.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+from matplotlib.tri import Triangulation
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+NIVEL_INICIAL = 4     # Rejilla gruesa inicial de 2^4 × 2^4 celdas
+NIVEL_MAXIMO = 9      # Resolución máxima equivalente a una malla de 513 × 513
+TOLERANCIA = 0.05     # Error admitido, como fracción de la separación entre niveles
+NIVELES_POR_DEFECTO = 20
+
+# ==============================================================================
+# 3. CRITERIO DE SUBDIVISIÓN
+# ==============================================================================
+def _separacion_local(valores, niveles):
+    """
+    Separación entre las curvas de nivel próximas a cada valor.
+
+    Con niveles no uniformes (p. ej. logarítmicos) las curvas se juntan en
+    unas zonas más que en otras, y ahí hace falta más resolución.
+    """
+    separaciones = np.diff(niveles)
+    indices = np.clip(np.searchsorted(niveles, valores) - 1, 0, len(separaciones) - 1)
+    return separaciones[indices]
+
+
+def _celdas_a_subdividir(esquinas, puntos_medios, centro, niveles, tolerancia):
+    """
+    Decide qué celdas de un nivel del quadtree se subdividen.
+
+    Args:
+        esquinas (np.ndarray): Valores en las 4 esquinas, forma (4, celdas),
+            en el orden (i, j), (i+s, j), (i, j+s), (i+s, j+s).
+        puntos_medios (np.ndarray): Valores en los puntos medios de los lados
+            inferior, izquierdo, derecho y superior, forma (4, celdas).
+        centro (np.ndarray): Valor en el centro de cada celda.
+        niveles (np.ndarray): Niveles de contorno, ordenados.
+        tolerancia (float): Error admitido como fracción de la separación local.
+
+    Returns:
+        np.ndarray: Máscara booleana de las celdas a subdividir.
+    """
+    e00, e10, e01, e11 = esquinas
+    inferior, izquierdo, derecho, superior = puntos_medios
+    # Error de la interpolación lineal: diferencia entre el valor real y el
+    # promedio de los extremos en cada punto medio y en el centro.
+    error = np.max(np.abs([
+        inferior - (e00 + e10) / 2,
+        izquierdo - (e00 + e01) / 2,
+        derecho - (e10 + e11) / 2,
+        superior - (e01 + e11) / 2,
+        centro - (e00 + e10 + e01 + e11) / 4,
+    ]), axis=0)
+
+    todos = np.vstack([esquinas, puntos_medios, centro[np.newaxis]])
+    minimo, maximo = todos.min(axis=0), todos.max(axis=0)
+    # Una celda sin ninguna curva de nivel posible no necesita más detalle.
+    cruza_nivel = (maximo + error >= niveles[0]) & (minimo - error <= niveles[-1])
+    separacion = _separacion_local((minimo + maximo) / 2, niveles)
+    # Las celdas no finitas (p. ej. desbordamientos) se dejan sin subdividir.
+    return cruza_nivel & (error > tolerancia * separacion) & np.isfinite(error)
+
+# ==============================================================================
+# 4. MUESTREO ADAPTATIVO
+# ==============================================================================
+def triangular(x, y, valores):
+    """
+    Triangula los nodos evaluados, enmascarando los triángulos no finitos.
+
+    Los nodos donde la función no es finita (NaN, desbordamientos) se
+    conservan, pero los triángulos que los tocan se enmascaran: `tricontour`
+    deja un hueco en lugar de fallar o de interpolar a través de ellos.
+
+    Returns:
+        matplotlib.tri.Triangulation: La triangulación (con máscara si hace falta).
+    """
+    triangulacion = Triangulation(x, y)
+    no_finitos = ~np.isfinite(valores)
+    if no_finitos.any():
+        triangulacion.set_mask(no_finitos[triangulacion.triangles].any(axis=1))
+    return triangulacion
+
+
+def malla_adaptativa(funcion, x_lim, y_lim, niveles=NIVELES_POR_DEFECTO, nivel_inicial=NIVEL_INICIAL,
+                     nivel_maximo=NIVEL_MAXIMO, tolerancia=TOLERANCIA):
+    """
+    Evalúa `funcion` en una malla adaptativa y la triangula.
+
+    Args:
+        funcion (callable): f(x, y) vectorizada sobre arreglos.
+        x_lim (tuple): (x_min, x_max) del dominio.
+        y_lim (tuple): (y_min, y_max) del dominio.
+        niveles (int | array_like): Los mismos niveles que se pasarán a
+            `tricontourf`; guían dónde se refina. Un entero indica un número
+            de niveles equiespaciados entre el mínimo y el máximo.
+        nivel_inicial (int): Profundidad de la rejilla gruesa de partida.
+        nivel_maximo (int): Profundidad máxima del quadtree.
+        tolerancia (float): Error de interpolación admitido, como fracción
+            de la separación entre niveles.
+
+    Returns:
+        tuple: (matplotlib.tri.Triangulation, valores de la función en sus nodos).
+        El número de evaluaciones es `len(valores)`; los valores no finitos
+        se conservan y sus triángulos se enmascaran (ver `triangular`).
+    """
+    n = 2 ** nivel_maximo
+    (x_min, x_max), (y_min, y_max) = x_lim, y_lim
+    dx, dy = (x_max - x_min) / n, (y_max - y_min) / n
+    # Retícula de valores y máscara de nodos ya evaluados (aparte: la propia
+    # función puede devolver NaN, y esos nodos no deben evaluarse de nuevo).
+    valores = np.full((n + 1) * (n + 1), np.nan)
+    evaluado = np.zeros((n + 1) * (n + 1), dtype=bool)
+
+    def evaluar(i, j):
+        """Valores en los nodos (i, j), evaluando solo los nodos nuevos."""
+        claves = i * (n + 1) + j
+        nuevas = np.unique(claves[~evaluado[claves]])
+        if nuevas.size:
+            i_nuevo, j_nuevo = np.divmod(nuevas, n + 1)
+            with np.errstate(over='ignore', invalid='ignore'):
+                valores[nuevas] = funcion(x_min + i_nuevo * dx, y_min + j_nuevo * dy)
+            evaluado[nuevas] = True
+        return valores[claves]
+
+    lado = 2 ** (nivel_maximo - nivel_inicial)
+    i, j = (a.ravel() for a in np.meshgrid(np.arange(0, n, lado), np.arange(0, n, lado), indexing='ij'))
+    niveles_array = None
+
+    while i.size and lado >= 2:
+        m = lado // 2
+        esquinas = np.array([evaluar(i, j), evaluar(i + lado, j),
+                             evaluar(i, j + lado), evaluar(i + lado, j + lado)])
+        puntos_medios = np.array([evaluar(i + m, j), evaluar(i, j + m),
+                                  evaluar(i + lado, j + m), evaluar(i + m, j + lado)])
+        centro = evaluar(i + m, j + m)
+
+        if niveles_array is None:
+            if np.ndim(niveles) == 0:
+                finitos = valores[np.isfinite(valores)]
+                niveles_array = np.linspace(finitos.min(), finitos.max(), int(niveles) + 1)
+            else:
+                niveles_array = np.sort(np.asarray(niveles, dtype=float))
+
+        refinar = _celdas_a_subdividir(esquinas, puntos_medios, centro, niveles_array, tolerancia)
+        i, j = i[refinar], j[refinar]
+        # Cada celda subdividida da lugar a sus cuatro hijas de lado m.
+        i = np.concatenate([i, i + m, i, i + m])
+        j = np.concatenate([j, j, j + m, j + m])
+        lado = m
+
+    evaluados = np.flatnonzero(evaluado)
+    i_eval, j_eval = np.divmod(evaluados, n + 1)
+    triangulacion = triangular(x_min + i_eval * dx, y_min + j_eval * dy, valores[evaluados])
+    return triangulacion, valores[evaluados]
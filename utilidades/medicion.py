@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Medición de tiempos por etapa (datos, ajuste de modelos, layout, exportación...).
+
+Los scripts y utilidades marcan sus etapas con el gestor de contexto
+`etapa(nombre)`. Fuera de un benchmark no hay ningún registro activo y
+`etapa` no hace nada, así que el coste en un renderizado normal es nulo.
+
+Las etapas pueden anidarse: cada una acumula solo su tiempo exclusivo (sin
+el de las etapas internas), de modo que la suma de todas las etapas es el
+tiempo total medido.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import time
+from contextlib import contextmanager
+
+# ==============================================================================
+# 2. ESTADO DEL REGISTRO
+# ==============================================================================
+# Segundos exclusivos acumulados por etapa; None si no hay benchmark activo.
+_registro = None
+# Pila de etapas abiertas: [nombre, segundos consumidos por sus etapas internas]
+_pila = []
+
+# ==============================================================================
+# 3. API
+# ==============================================================================
+def iniciar_registro():
+    """Activa el registro de etapas (lo llama el arnés de benchmark)."""
+    global _registro
+    _registro = {}
+    _pila.clear()
+
+
+def detener_registro():
+    """
+    Desactiva el registro de etapas.
+
+    Returns:
+        dict: {etapa: segundos exclusivos} acumulados desde `iniciar_registro`.
+    """
+    global _registro
+    registro, _registro = _registro or {}, None
+    _pila.clear()
+    return registro
+
+
+@contextmanager
+def etapa(nombre):
+    """
+    Mide el bloque de código como la etapa `nombre` si hay un benchmark activo.
+
+    Uso:
+        with etapa('ajuste_modelo'):
+            X_pca = pca.fit_transform(X)
+    """
+    if _registro is None:
+        yield
+        return
+
+    _pila.append([nombre, 0.0])
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        _, internas = _pila.pop()
+        if _registro is not None:
+            _registro[nombre] = _registro.get(nombre, 0.0) + duracion - internas
+        if _pila:
+            _pila[-1][1] += duracion
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Muestreo rápido de la distribución normal multivariante.
+
+`np.random.multivariate_normal` factoriza la covarianza con una SVD en cada
+llamada y depende del estado global de `np.random.seed`. Este módulo:
+
+  - usa `numpy.random.Generator`, con un flujo independiente por figura
+    derivado de una semilla y del nombre de la figura (`generador_figura`),
+    de modo que procesos en paralelo obtienen datos reproducibles sin
+    compartir estado;
+  - factoriza cada covarianza una sola vez (Cholesky, con descomposición
+    espectral como alternativa si la matriz es solo semidefinida) y guarda
+    el factor en memoria;
+  - genera las muestras por bloques de tamaño fijo sobre un arreglo
+    preasignado o un `.npy` mapeado en memoria, así que nubes de 10^8
+    puntos caben en un búfer en disco sin copias intermedias.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+SEMILLA_POR_DEFECTO = 42
+TAMANO_BLOQUE = 1_000_000
+
+# ==============================================================================
+# 3. FLUJOS ALEATORIOS POR FIGURA
+# ==============================================================================
+def generador_figura(nombre, semilla=SEMILLA_POR_DEFECTO):
+    """
+    Generador con un flujo propio para la figura `nombre`.
+
+    El flujo depende solo de la semilla y del nombre: dos figuras con la
+    misma semilla no comparten números aleatorios y cada una es
+    reproducible en cualquier proceso.
+
+    Args:
+        nombre (str): Nombre de la figura (p. ej. el del script).
+        semilla (int): Semilla común.
+
+    Returns:
+        np.random.Generator: El generador.
+    """
+    clave = zlib.crc32(nombre.encode('utf-8'))
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(clave,)))
+
+# ==============================================================================
+# 4. FACTORIZACIÓN DE LA COVARIANZA
+# ==============================================================================
+@lru_cache(maxsize=64)
+def _factor_en_cache(forma, contenido):
+    covarianza = np.frombuffer(contenido).reshape(forma)
+    try:
+        factor = np.linalg.cholesky(covarianza)
+    except np.linalg.LinAlgError:
+        # Semidefinida (p. ej. variables colineales): C = V diag(λ) Vᵀ.
+        autovalores, autovectores = np.linalg.eigh(covarianza)
+        factor = autovectores * np.sqrt(np.clip(autovalores, 0.0, None))
+    factor.setflags(write=False)
+    return factor
+
+
+def factor_covarianza(covarianza):
+    """
+    Factor L con L Lᵀ = `covarianza`, calculado una sola vez por matriz.
+
+    Args:
+        covarianza (array_like): Matriz simétrica semidefinida positiva.
+
+    Returns:
+        np.ndarray: El factor (de solo lectura).
+    """
+    covarianza = np.ascontiguousarray(covarianza, dtype=float)
+    if covarianza.ndim != 2 or covarianza.shape[0] != covarianza.shape[1]:
+        raise ValueError(f"La covarianza debe ser una matriz cuadrada, no de forma {covarianza.shape}.")
+    return _factor_en_cache(covarianza.shape, covarianza.tobytes())
+
+# ==============================================================================
+# 5. MUESTREO POR BLOQUES
+# ==============================================================================
+def normal_multivariante(media, covarianza, n_muestras, generador=None, salida=None, ruta=None,
+                         tamano_bloque=TAMANO_BLOQUE):
+    """
+    Muestras de N(media, covarianza), generadas por bloques.
+
+    Args:
+        media (array_like): Vector de medias, de longitud d.
+        covarianza (array_like): Matriz de covarianza d x d.
+        n_muestras (int): Número de muestras.
+        generador (np.random.Generator, opcional): Flujo aleatorio; por
+            defecto, uno nuevo con SEMILLA_POR_DEFECTO.
+        salida (np.ndarray, opcional): Búfer preasignado de forma (n_muestras, d).
+        ruta (str | Path, opcional): Si se indica (y no hay `salida`), las
+            muestras se escriben en un `.npy` mapeado en memoria.
+        tamano_bloque (int): Muestras generadas por bloque.
+
+    Returns:
+        np.ndarray | np.memmap: Las muestras, de forma (n_muestras, d).
+    """
+    media = np.asarray(media, dtype=float)
+    factor = factor_covarianza(covarianza)
+    d = factor.shape[0]
+    if media.shape != (d,):
+        raise ValueError(f"La media debe tener longitud {d}, no forma {media.shape}.")
+    generador = generador or np.random.default_rng(SEMILLA_POR_DEFECTO)
+
+    if salida is None:
+        if ruta is None:
+            salida = np.empty((n_muestras, d))
+        else:
+            salida = np.lib.format.open_memmap(ruta, mode='w+', dtype=float, shape=(n_muestras, d))
+
+    normales = np.empty((min(tamano_bloque, n_muestras), d))
+    for inicio in range(0, n_muestras, tamano_bloque):
+        m = min(tamano_bloque, n_muestras - inicio)
+        generador.standard_normal(out=normales[:m])
+        np.matmul(normales[:m], factor.T, out=salida[inicio:inicio + m])
+        salida[inicio:inicio + m] += media
+
+    if isinstance(salida, np.memmap):
+        salida.flush()
+    return salida
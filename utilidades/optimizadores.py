@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Optimizadores de primer orden vectorizados: GD, SGD, Momentum, RMSProp y Adam.
+
+Cada optimizador avanza un lote de puntos iniciales a la vez (misma
+convención que `utilidades.descenso_vectorizado`) y escribe el estado en
+el búfer de `trayectorias.RegistroTrayectorias`: la trayectoria de forma
+(pasos + 1, lote, dimensión) y la pérdida de forma (pasos + 1, lote). Cada
+trayectoria se congela al converger y el bucle termina cuando convergen
+todas, así que pueden pedirse miles de iteraciones sin pagarlas enteras.
+
+El SGD se modela como el gradiente exacto más un ruido gaussiano con
+semilla fija, que imita el error de estimar el gradiente con un minilote.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+
+from utilidades.descenso_vectorizado import TOLERANCIA_CONVERGENCIA, evaluar_gradiente, preparar_lote
+from utilidades.trayectorias import TOLERANCIA_RELATIVA, RegistroTrayectorias
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+# Hiperparámetros por defecto de cada método (los habituales en la literatura).
+HIPERPARAMETROS_POR_DEFECTO = {
+    'gd': {},
+    'sgd': {'ruido': 1.0, 'semilla': 0},
+    'momentum': {'beta': 0.9},
+    'rmsprop': {'rho': 0.9, 'epsilon': 1e-8},
+    'adam': {'beta1': 0.9, 'beta2': 0.999, 'epsilon': 1e-8},
+}
+METODOS = tuple(HIPERPARAMETROS_POR_DEFECTO)
+
+PASO_DIFERENCIAS = 1e-6  # Paso h de las diferencias finitas centradas
+
+# ==============================================================================
+# 3. GRADIENTE POR DIFERENCIAS FINITAS
+# ==============================================================================
+def gradiente_diferencias_finitas(funcion, h=PASO_DIFERENCIAS):
+    """
+    Construye el gradiente numérico (diferencias centradas) de `funcion`.
+
+    Para funciones sin gradiente analítico escrito a mano. El gradiente
+    devuelto es vectorizado: evalúa todo el lote con 2·dimensión llamadas a
+    `funcion`, sin bucles por punto.
+
+    Args:
+        funcion (callable): Función escalar f(x1, x2, ...) que acepta arreglos.
+        h (float): Paso de las diferencias finitas.
+
+    Returns:
+        callable: gradiente(x1, x2, ...) -> lista con un componente por coordenada.
+    """
+    def gradiente(*coordenadas):
+        coordenadas = [np.asarray(c, dtype=float) for c in coordenadas]
+        componentes = []
+        for i, c in enumerate(coordenadas):
+            adelante = coordenadas[:i] + [c + h] + coordenadas[i + 1:]
+            atras = coordenadas[:i] + [c - h] + coordenadas[i + 1:]
+            componentes.append((funcion(*adelante) - funcion(*atras)) / (2 * h))
+        return componentes
+    return gradiente
+
+# ==============================================================================
+# 4. OPTIMIZACIÓN
+# ==============================================================================
+def optimizar(metodo, funcion, puntos_iniciales, tasa_aprendizaje, num_iteraciones,
+              gradiente=None, tolerancia=TOLERANCIA_CONVERGENCIA, tolerancia_relativa=TOLERANCIA_RELATIVA,
+              **hiperparametros):
+    """
+    Ejecuta un optimizador sobre un lote de puntos iniciales.
+
+    Args:
+        metodo (str): Uno de 'gd', 'sgd', 'momentum', 'rmsprop' o 'adam'.
+        funcion (callable): Función de pérdida f(x1, x2, ...) vectorizada.
+        puntos_iniciales (array_like): Forma (lote, dimensión).
+        tasa_aprendizaje (float | array_like): Tasa común o una por trayectoria.
+        num_iteraciones (int): Número máximo de pasos.
+        gradiente (callable, opcional): Gradiente analítico; si se omite se
+            usan diferencias finitas sobre `funcion`.
+        tolerancia (float | None): Norma del gradiente (exacto, sin el ruido
+            del SGD) que se considera nula; None recorre todos los pasos.
+        tolerancia_relativa (float | None): Cambio relativo de la pérdida
+            que se considera nulo; ver `trayectorias.RegistroTrayectorias`.
+        **hiperparametros: Sobrescriben los de `HIPERPARAMETROS_POR_DEFECTO`
+            (p. ej. beta=0.8 en Momentum o ruido=2.0 y semilla=1 en SGD).
+
+    Returns:
+        tuple: (trayectorias de forma (pasos + 1, lote, dimensión),
+        pérdidas de forma (pasos + 1, lote)), con pasos ≤ num_iteraciones;
+        las trayectorias convergidas repiten su último punto.
+    """
+    if metodo not in HIPERPARAMETROS_POR_DEFECTO:
+        raise ValueError(f"Método desconocido '{metodo}'. Opciones: {', '.join(METODOS)}.")
+    desconocidos = set(hiperparametros) - set(HIPERPARAMETROS_POR_DEFECTO[metodo])
+    if desconocidos:
+        raise ValueError(f"Hiperparámetros no válidos para '{metodo}': {', '.join(sorted(desconocidos))}.")
+    hp = {**HIPERPARAMETROS_POR_DEFECTO[metodo], **hiperparametros}
+    if gradiente is None:
+        gradiente = gradiente_diferencias_finitas(funcion)
+
+    puntos, tasas = preparar_lote(puntos_iniciales, tasa_aprendizaje)
+    lote, dimension = puntos.shape
+    tasas = tasas[:, np.newaxis]
+
+    # --- Historial con parada por tolerancia ---
+    registro = RegistroTrayectorias(puntos, num_iteraciones, funcion(*puntos.T), tolerancia,
+                                    tolerancia_relativa)
+    paso = np.empty((lote, dimension))
+    # Estado interno: velocidad (Momentum), media de g² (RMSProp) o momentos (Adam)
+    m = np.zeros((lote, dimension))
+    v = np.zeros((lote, dimension))
+    ruido = np.empty((lote, dimension))
+    rng = np.random.default_rng(hp['semilla']) if metodo == 'sgd' else None
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for k in range(num_iteraciones):
+            g = evaluar_gradiente(gradiente, registro.actual)
+            if not registro.comprobar(g):
+                break
+
+            if metodo == 'gd':
+                np.multiply(tasas, g, out=paso)
+            elif metodo == 'sgd':
+                rng.standard_normal(out=ruido)
+                g += hp['ruido'] * ruido
+                np.multiply(tasas, g, out=paso)
+            elif metodo == 'momentum':
+                # v ← β·v + g ;  θ ← θ - η·v
+                m *= hp['beta']
+                m += g
+                np.multiply(tasas, m, out=paso)
+            elif metodo == 'rmsprop':
+                # s ← ρ·s + (1-ρ)·g² ;  θ ← θ - η·g / (√s + ε)
+                v *= hp['rho']
+                v += (1 - hp['rho']) * g * g
+                np.divide(g, np.sqrt(v) + hp['epsilon'], out=paso)
+                paso *= tasas
+            else:  # adam
+                # Momentos con corrección de sesgo (Kingma y Ba, 2015)
+                m *= hp['beta1']
+                m += (1 - hp['beta1']) * g
+                v *= hp['beta2']
+                v += (1 - hp['beta2']) * g * g
+                m_corregido = m / (1 - hp['beta1'] ** (k + 1))
+                v_corregido = v / (1 - hp['beta2'] ** (k + 1))
+                np.divide(m_corregido, np.sqrt(v_corregido) + hp['epsilon'], out=paso)
+                paso *= tasas
+
+            paso[~registro.activas] = 0   # Las convergidas no se mueven
+            nuevos = registro.actual - paso
+            if not registro.registrar(nuevos, funcion(*nuevos.T)):
+                break
+
+    return registro.trayectorias, registro.perdidas
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+Optimizadores de segundo orden y cuasi-Newton vectorizados: Newton, Newton
+amortiguado con búsqueda de Armijo, BFGS, L-BFGS y gradiente conjugado no
+lineal, junto al descenso de gradiente con tasa fija como referencia.
+
+Igual que `utilidades.optimizadores`, cada método avanza un lote de puntos
+iniciales a la vez y guarda la trayectoria en un `RegistroTrayectorias`, que
+solo crece hasta la última iteración con alguna trayectoria activa. Además
+cuenta, por trayectoria, las iteraciones hasta converger y las evaluaciones
+de la función, del gradiente y de la hessiana, y mide el tiempo total del
+lote, para comparar los métodos por lo que de verdad cuestan y no solo por
+el número de pasos.
+
+Una trayectoria se detiene (y deja de evaluarse) cuando la norma de su
+gradiente baja de `tolerancia`, cuando diverge o cuando su búsqueda lineal no
+encuentra paso; a partir de ahí el registro repite su último punto.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import csv
+import time
+
+import numpy as np
+
+from utilidades.descenso_vectorizado import evaluar_gradiente, preparar_lote
+from utilidades.trayectorias import RegistroTrayectorias
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+METODOS = ('gd', 'newton', 'newton_armijo', 'bfgs', 'lbfgs', 'gc')
+NOMBRES = {
+    'gd': 'Descenso de Gradiente',
+    'newton': 'Newton',
+    'newton_armijo': 'Newton amortiguado (Armijo)',
+    'bfgs': 'BFGS',
+    'lbfgs': 'L-BFGS',
+    'gc': 'Gradiente Conjugado (PR+)',
+}
+TOLERANCIA = 1e-8          # Norma del gradiente con la que una trayectoria ha convergido
+ARMIJO_C = 1e-4            # Constante de decrecimiento suficiente
+ARMIJO_REDUCCION = 0.5     # Factor con el que se reduce el paso en la búsqueda lineal
+ARMIJO_INTENTOS = 40       # Reducciones máximas del paso antes de aceptar el último
+WOLFE_C2 = {'bfgs': 0.9, 'lbfgs': 0.9, 'gc': 0.1}   # Constante de curvatura de cada método
+WOLFE_INTENTOS = 40        # Pasos máximos de la búsqueda de Wolfe
+MEMORIA_LBFGS = 10         # Pares (s, y) que guarda L-BFGS
+
+# ==============================================================================
+# 3. EVALUACIONES CONTADAS
+# ==============================================================================
+def evaluar_hessiana(hessiana, puntos):
+    """
+    Evalúa `hessiana` sobre un lote de puntos de forma (lote, dimensión).
+
+    La función hessiana recibe una coordenada por argumento, como el
+    gradiente, y devuelve una fila de derivadas segundas por coordenada
+    (p. ej. `[[f_xx, f_xy], [f_xy, f_yy]]`); las componentes constantes se
+    difunden al tamaño del lote.
+
+    Returns:
+        np.ndarray: Forma (lote, dimensión, dimensión).
+    """
+    lote, dimension = puntos.shape
+    filas = hessiana(*puntos.T)
+    componentes = np.broadcast_arrays(*[np.asarray(c, dtype=float) for fila in filas for c in fila],
+                                      np.empty(lote))[:-1]
+    return np.stack(componentes, axis=-1).reshape(lote, dimension, dimension)
+
+
+class Evaluador:
+    """
+    Evalúa función, gradiente y hessiana sobre subconjuntos del lote y
+    cuenta cuántas veces se ha evaluado cada trayectoria.
+    """
+
+    def __init__(self, funcion, gradiente, hessiana, lote):
+        self.funcion = funcion
+        self.gradiente = gradiente
+        self.hessiana = hessiana
+        self.n_f = np.zeros(lote, dtype=np.int64)
+        self.n_g = np.zeros(lote, dtype=np.int64)
+        self.n_h = np.zeros(lote, dtype=np.int64)
+
+    def f(self, indices, puntos):
+        self.n_f[indices] += 1
+        return np.asarray(self.funcion(*puntos.T), dtype=float).reshape(len(puntos))
+
+    def g(self, indices, puntos):
+        self.n_g[indices] += 1
+        return evaluar_gradiente(self.gradiente, puntos)
+
+    def h(self, indices, puntos):
+        self.n_h[indices] += 1
+        return evaluar_hessiana(self.hessiana, puntos)
+
+# ==============================================================================
+# 4. PIEZAS COMUNES
+# ==============================================================================
+def resolver(H, g):
+    """
+    Resuelve H·d = g para cada matriz del lote.
+
+    Si alguna hessiana es singular, el lote entero se resuelve con la
+    pseudoinversa (el caso es raro y así se evita un bucle por punto).
+    """
+    try:
+        return np.linalg.solve(H, g[..., np.newaxis])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum('lij,lj->li', np.linalg.pinv(H), g)
+
+
+def busqueda_armijo(evaluador, indices, x, f, g, d, paso_inicial=1.0):
+    """
+    Búsqueda lineal hacia atrás con la condición de Armijo, por lotes.
+
+    Reduce el paso de cada trayectoria por separado hasta que
+    f(x + α·d) ≤ f(x) + c·α·gᵀd; solo se evalúan las que aún no cumplen.
+
+    Returns:
+        tuple: (pasos α de forma (lote,), f en los nuevos puntos).
+    """
+    pendiente = np.einsum('li,li->l', g, d)
+    alfa = np.broadcast_to(np.asarray(paso_inicial, dtype=float), (len(x),)).copy()
+    f_nuevo = np.empty(len(x))
+    pendientes = np.arange(len(x))
+    for intento in range(ARMIJO_INTENTOS):
+        candidatos = x[pendientes] + alfa[pendientes, np.newaxis] * d[pendientes]
+        with np.errstate(over='ignore', invalid='ignore'):
+            valores = evaluador.f(indices[pendientes], candidatos)
+        aceptados = valores <= f[pendientes] + ARMIJO_C * alfa[pendientes] * pendiente[pendientes]
+        if intento == ARMIJO_INTENTOS - 1:
+            aceptados[:] = True
+        f_nuevo[pendientes[aceptados]] = valores[aceptados]
+        pendientes = pendientes[~aceptados]
+        if len(pendientes) == 0:
+            break
+        alfa[pendientes] *= ARMIJO_REDUCCION
+    return alfa, f_nuevo
+
+
+def busqueda_wolfe(evaluador, indices, x, f, g, d, c2, paso_inicial=1.0):
+    """
+    Búsqueda lineal por bisección con las condiciones de Wolfe débiles, por lotes.
+
+    Busca α con decrecimiento suficiente (Armijo) y curvatura
+    ∇f(x + α·d)ᵀd ≥ c2·∇fᵀd: si falla Armijo el paso es demasiado largo y se
+    acota por arriba; si falla la curvatura es demasiado corto y se acota por
+    abajo (duplicándolo mientras no haya cota superior). Garantiza yᵀs > 0
+    en BFGS y L-BFGS y da a los gradientes conjugados los pasos casi exactos
+    que necesitan. Devuelve además el gradiente en el punto aceptado.
+
+    Returns:
+        tuple: (pasos α (lote,), f (lote,) y gradiente (lote, dimensión) en
+        los nuevos puntos).
+    """
+    pendiente = np.einsum('li,li->l', g, d)
+    alfa = np.broadcast_to(np.asarray(paso_inicial, dtype=float), (len(x),)).copy()
+    bajo, alto = np.zeros(len(x)), np.full(len(x), np.inf)
+    f_nuevo, g_nuevo = np.empty(len(x)), np.empty_like(g)
+    pendientes = np.arange(len(x))
+    for intento in range(WOLFE_INTENTOS):
+        i = pendientes
+        candidatos = x[i] + alfa[i, np.newaxis] * d[i]
+        with np.errstate(over='ignore', invalid='ignore'):
+            valores = evaluador.f(indices[i], candidatos)
+            armijo = valores <= f[i] + ARMIJO_C * alfa[i] * pendiente[i]
+            gradientes = evaluador.g(indices[i[armijo]], candidatos[armijo])
+        curvatura = np.zeros(len(i), dtype=bool)
+        curvatura[armijo] = np.einsum('li,li->l', gradientes, d[i[armijo]]) >= c2 * pendiente[i[armijo]]
+        aceptados = armijo & curvatura
+        if intento == WOLFE_INTENTOS - 1:
+            # Sin paso de Wolfe: se acepta el último que cumplía Armijo (o ninguno)
+            aceptados = armijo
+        f_nuevo[i[aceptados]] = valores[aceptados]
+        g_nuevo[i[aceptados]] = gradientes[aceptados[armijo]]
+        alto[i[~armijo]] = alfa[i[~armijo]]
+        bajo[i[armijo & ~curvatura]] = alfa[i[armijo & ~curvatura]]
+        pendientes = i[~aceptados]
+        if len(pendientes) == 0:
+            break
+        acotados = np.isfinite(alto[pendientes])
+        alfa[pendientes] = np.where(acotados, (bajo[pendientes] + alto[pendientes]) / 2, 2 * alfa[pendientes])
+    # Las trayectorias que agotan los intentos sin cumplir Armijo no se mueven
+    alfa[pendientes] = 0
+    f_nuevo[pendientes], g_nuevo[pendientes] = f[pendientes], g[pendientes]
+    return alfa, f_nuevo, g_nuevo
+
+
+def direccion_descenso(g, d):
+    """Sustituye por −g las direcciones que no son de descenso (gᵀd ≥ 0)."""
+    no_descenso = np.einsum('li,li->l', g, d) >= 0
+    d[no_descenso] = -g[no_descenso]
+    return d
+
+# ==============================================================================
+# 5. OPTIMIZACIÓN
+# ==============================================================================
+def minimizar(metodo, funcion, gradiente, puntos_iniciales, num_iteraciones, hessiana=None,
+              tasa_aprendizaje=None, tolerancia=TOLERANCIA, memoria=MEMORIA_LBFGS):
+    """
+    Minimiza `funcion` desde cada punto de un lote con el método indicado.
+
+    Args:
+        metodo (str): Uno de `METODOS`.
+        funcion (callable): Función f(x1, x2, ...) vectorizada.
+        gradiente (callable): Gradiente con la convención de
+            `descenso_vectorizado.evaluar_gradiente`.
+        puntos_iniciales (array_like): Forma (lote, dimensión).
+        num_iteraciones (int): Iteraciones máximas.
+        hessiana (callable, opcional): Necesaria para 'newton' y
+            'newton_armijo'; ver `evaluar_hessiana`.
+        tasa_aprendizaje (float, opcional): Necesaria para 'gd'.
+        tolerancia (float): Norma del gradiente con la que se considera convergida.
+        memoria (int): Pares guardados por L-BFGS.
+
+    Returns:
+        dict: 'trayectorias' (pasos + 1, lote, dimensión) y 'perdidas'
+        (pasos + 1, lote), con pasos ≤ num_iteraciones; 'iteraciones' (lote,) hasta
+        converger (-1 si no convergió), 'evaluaciones_f', 'evaluaciones_g' y
+        'evaluaciones_h' (lote,), y 'tiempo_s' del lote completo.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido '{metodo}'. Opciones: {', '.join(METODOS)}.")
+    if metodo in ('newton', 'newton_armijo') and hessiana is None:
+        raise ValueError(f"El método '{metodo}' necesita la hessiana.")
+    if metodo == 'gd' and tasa_aprendizaje is None:
+        raise ValueError("El método 'gd' necesita una tasa de aprendizaje.")
+
+    inicio = time.perf_counter()
+    puntos, _ = preparar_lote(puntos_iniciales, 0.0)
+    lote, dimension = puntos.shape
+    evaluador = Evaluador(funcion, gradiente, hessiana, lote)
+
+    todos = np.arange(lote)
+    x = puntos.copy()
+    f = evaluador.f(todos, x)
+    g = evaluador.g(todos, x)
+    # Solo el criterio del gradiente: `iteraciones` cuenta los pasos hasta ‖∇f‖ < tolerancia
+    registro = RegistroTrayectorias(x, num_iteraciones, f, tolerancia=tolerancia, tolerancia_relativa=None)
+
+    # Estado de cada método, indexado por trayectoria
+    H_inv = np.broadcast_to(np.eye(dimension), (lote, dimension, dimension)).copy()   # BFGS
+    S = np.zeros((memoria, lote, dimension))                                          # L-BFGS
+    Y = np.zeros((memoria, lote, dimension))
+    rho = np.zeros((memoria, lote))
+    escala = np.ones(lote)
+    d_previa = np.zeros((lote, dimension))                                            # GC
+    g_previo = g.copy()
+    alfa_previo = np.ones(lote)
+
+    for k in range(num_iteraciones):
+        if not registro.comprobar(g):
+            break
+        activos = np.flatnonzero(registro.activas)
+        xa, fa, ga = x[activos], f[activos], g[activos]
+
+        if metodo == 'gd':
+            paso = -tasa_aprendizaje * ga
+            alfa = np.ones(len(activos))
+            with np.errstate(over='ignore', invalid='ignore'):
+                f_nuevo = evaluador.f(activos, xa + paso)
+        elif metodo == 'newton':
+            # Paso completo x ← x − H⁻¹∇f: convergencia cuadrática cerca del
+            # mínimo, pero sin garantía de descenso lejos de él.
+            paso = -resolver(evaluador.h(activos, xa), ga)
+            alfa = np.ones(len(activos))
+            with np.errstate(over='ignore', invalid='ignore'):
+                f_nuevo = evaluador.f(activos, xa + paso)
+        elif metodo == 'newton_armijo':
+            paso = direccion_descenso(ga, -resolver(evaluador.h(activos, xa), ga))
+            alfa, f_nuevo = busqueda_armijo(evaluador, activos, xa, fa, ga, paso)
+        elif metodo == 'bfgs':
+            paso = direccion_descenso(ga, -np.einsum('lij,lj->li', H_inv[activos], ga))
+            alfa, f_nuevo, g_nuevo = busqueda_wolfe(evaluador, activos, xa, fa, ga, paso, WOLFE_C2[metodo])
+        elif metodo == 'lbfgs':
+            # Recursión de dos bucles; los pares descartados tienen ρ = 0 y no aportan nada.
+            q = ga.copy()
+            coeficientes = np.empty((memoria, len(activos)))
+            orden = [(k - 1 - i) % memoria for i in range(memoria)]
+            for j in orden:
+                coeficientes[j] = rho[j, activos] * np.einsum('li,li->l', S[j, activos], q)
+                q -= coeficientes[j, :, np.newaxis] * Y[j, activos]
+            r = escala[activos, np.newaxis] * q
+            for j in reversed(orden):
+                beta = rho[j, activos] * np.einsum('li,li->l', Y[j, activos], r)
+                r += (coeficientes[j] - beta)[:, np.newaxis] * S[j, activos]
+            paso = direccion_descenso(ga, -r)
+            alfa, f_nuevo, g_nuevo = busqueda_wolfe(evaluador, activos, xa, fa, ga, paso, WOLFE_C2[metodo])
+        else:  # gc
+            # Polak-Ribière con reinicio (β ≥ 0) y paso inicial escalado del anterior
+            if k == 0:
+                paso = -ga
+                alfa_inicial = 1.0
+            else:
+                gp = g_previo[activos]
+                beta = np.maximum(0, np.einsum('li,li->l', ga, ga - gp) / np.einsum('li,li->l', gp, gp))
+                paso = direccion_descenso(ga, -ga + beta[:, np.newaxis] * d_previa[activos])
+                # α₀ = α_{k-1}·(∇f_{k-1}ᵀd_{k-1}) / (∇f_kᵀd_k): mismo descenso de primer orden que el paso anterior
+                alfa_inicial = alfa_previo[activos] * (np.einsum('li,li->l', gp, d_previa[activos])
+                                                       / np.einsum('li,li->l', ga, paso))
+            alfa, f_nuevo, g_nuevo = busqueda_wolfe(evaluador, activos, xa, fa, ga, paso, WOLFE_C2[metodo],
+                                                    alfa_inicial)
+            d_previa[activos], g_previo[activos], alfa_previo[activos] = paso, ga, alfa
+
+        s = alfa[:, np.newaxis] * paso
+        x_nuevo = xa + s
+        if metodo in ('gd', 'newton', 'newton_armijo'):
+            with np.errstate(over='ignore', invalid='ignore'):
+                g_nuevo = evaluador.g(activos, x_nuevo)
+
+        if metodo in ('bfgs', 'lbfgs'):
+            y = g_nuevo - ga
+            curvatura = np.einsum('li,li->l', y, s)
+            valida = curvatura > 1e-12 * np.linalg.norm(s, axis=1) * np.linalg.norm(y, axis=1)
+            if metodo == 'bfgs':
+                # H ← (I − ρsyᵀ) H (I − ρysᵀ) + ρssᵀ, solo con curvatura positiva
+                idx = activos[valida]
+                rv = 1 / curvatura[valida]
+                sv, yv = s[valida], y[valida]
+                if k == 0:
+                    H_inv[idx] *= (curvatura[valida] / np.einsum('li,li->l', yv, yv))[:, np.newaxis, np.newaxis]
+                I_menos = np.eye(dimension) - rv[:, np.newaxis, np.newaxis] * np.einsum('li,lj->lij', sv, yv)
+                H_inv[idx] = (np.einsum('lij,ljk,lmk->lim', I_menos, H_inv[idx], I_menos)
+                              + rv[:, np.newaxis, np.newaxis] * np.einsum('li,lj->lij', sv, sv))
+            else:
+                j = k % memoria
+                S[j, activos], Y[j, activos] = s, y
+                rho[j, activos] = np.where(valida, 1 / np.where(valida, curvatura, 1), 0)
+                escala[activos[valida]] = curvatura[valida] / np.einsum('li,li->l', y[valida], y[valida])
+
+        # Las trayectorias que divergen (valores no finitos) o cuya búsqueda
+        # lineal no encuentra paso se detienen, sin converger, en su último punto válido
+        siguen = np.isfinite(f_nuevo) & np.all(np.isfinite(g_nuevo), axis=1) & (alfa > 0)
+        x[activos[siguen]], f[activos[siguen]], g[activos[siguen]] = \
+            x_nuevo[siguen], f_nuevo[siguen], g_nuevo[siguen]
+        registro.activas[activos[~siguen]] = False
+        if not registro.registrar(x, f):
+            break
+    registro.comprobar(g)   # Las que convergen justo en el último paso
+
+    return {'trayectorias': registro.trayectorias, 'perdidas': registro.perdidas,
+            'iteraciones': registro.iteraciones,
+            'evaluaciones_f': evaluador.n_f, 'evaluaciones_g': evaluador.n_g,
+            'evaluaciones_h': evaluador.n_h, 'tiempo_s': time.perf_counter() - inicio}
+
+# ==============================================================================
+# 6. COMPARACIÓN Y RESUMEN
+# ==============================================================================
+def comparar(funcion, gradiente, puntos_iniciales, num_iteraciones, metodos=METODOS, **opciones):
+    """
+    Ejecuta `minimizar` con cada método sobre el mismo lote de puntos iniciales.
+
+    Returns:
+        dict: {método: resultado de `minimizar`}.
+    """
+    return {metodo: minimizar(metodo, funcion, gradiente, puntos_iniciales, num_iteraciones, **opciones)
+            for metodo in metodos}
+
+
+def resumen(resultados):
+    """
+    Una fila por método con las medianas sobre las trayectorias convergidas.
+
+    Returns:
+        list[dict]: método, trayectorias, convergidas, mediana de
+        iteraciones y de evaluaciones de f, ∇f y ∇²f, mediana de la pérdida
+        final (de todas las trayectorias) y tiempo del lote.
+    """
+    filas = []
+    for metodo, resultado in resultados.items():
+        convergidas = resultado['iteraciones'] >= 0
+
+        def mediana(clave):
+            return float(np.median(resultado[clave][convergidas])) if np.any(convergidas) else float('nan')
+
+        filas.append({
+            'metodo': metodo,
+            'trayectorias': len(convergidas),
+            'convergidas': int(convergidas.sum()),
+            'iteraciones_mediana': mediana('iteraciones'),
+            'evaluaciones_f_mediana': mediana('evaluaciones_f'),
+            'evaluaciones_g_mediana': mediana('evaluaciones_g'),
+            'evaluaciones_h_mediana': mediana('evaluaciones_h'),
+            'perdida_final_mediana': float(np.median(resultado['perdidas'][-1])),
+            'tiempo_lote_s': round(resultado['tiempo_s'], 4),
+        })
+    return filas
+
+
+def guardar_csv(filas, ruta):
+    """Escribe las filas de `resumen` en un CSV. Devuelve la ruta."""
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(filas[0]))
+        escritor.writeheader()
+        escritor.writerows(filas)
+    return ruta
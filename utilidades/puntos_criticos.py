@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Búsqueda automática de los puntos críticos de una función en un dominio.
+
+Los scripts marcaban los mínimos con coordenadas escritas a mano
+("aproximados"), que dejan de ser correctas en cuanto cambia la función o
+el dominio. Aquí se siembra una rejilla gruesa de puntos sobre el dominio
+dibujado y todos avanzan a la vez con el método de Newton amortiguado
+(x ← x − αH⁻¹∇f, con α elegido para que disminuya |∇f|), como un único
+arreglo.
+Newton converge a cualquier punto crítico, no solo a los mínimos; los
+puntos a los que llegan las semillas se deduplican con un índice espacial
+(KD-tree) y cada uno se clasifica como mínimo, máximo o punto de silla
+según los autovalores de su hessiana.
+
+Con unos pocos miles de semillas la búsqueda tarda milisegundos, así que
+las figuras pueden calcular sus anotaciones al generarse:
+
+    criticos = puntos_criticos(loss_function, [(-5, 5), (-7, 7)])
+    minimos = criticos['puntos'][criticos['tipos'] == 'minimo']
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+
+from utilidades.descenso_vectorizado import evaluar_gradiente
+from utilidades.importacion_diferida import diferido
+from utilidades.medicion import etapa
+from utilidades.optimizadores import gradiente_diferencias_finitas
+
+cKDTree = diferido('scipy.spatial', 'cKDTree')
+connected_components = diferido('scipy.sparse.csgraph', 'connected_components')
+coo_matrix = diferido('scipy.sparse', 'coo_matrix')
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+SEMILLAS = 1024            # Semillas totales, repartidas en una rejilla regular del dominio
+ITERACIONES_NEWTON = 25    # Pasos máximos de Newton por semilla
+TOLERANCIA_GRADIENTE = 1e-8  # Norma del gradiente que se considera nula
+FRACCION_PASO_MAXIMO = 0.1 # Paso máximo, como fracción de la diagonal del dominio
+RADIO_DUPLICADOS = 1e-5    # Puntos más cercanos que esto son el mismo punto crítico
+BUSQUEDA_LINEAL = 12      # Reducciones a la mitad del paso de Newton antes de abandonar una semilla
+PASO_HESSIANA = 1e-5       # Paso de las diferencias finitas del gradiente
+TOLERANCIA_AUTOVALOR = 1e-8  # Autovalores menores en valor absoluto se consideran nulos
+
+# ==============================================================================
+# 3. DERIVADAS
+# ==============================================================================
+def hessiana_diferencias_finitas(gradiente, h=PASO_HESSIANA):
+    """
+    Construye la hessiana numérica (diferencias centradas del gradiente).
+
+    Args:
+        gradiente (callable): Gradiente con la convención de
+            `descenso_vectorizado.evaluar_gradiente`.
+        h (float): Paso de las diferencias finitas.
+
+    Returns:
+        callable: hessiana(puntos) -> arreglo de forma (lote, dimensión, dimensión),
+        simetrizado.
+    """
+    def hessiana(puntos):
+        dimension = puntos.shape[1]
+        columnas = []
+        for j in range(dimension):
+            desplazamiento = np.zeros(dimension)
+            desplazamiento[j] = h
+            columnas.append((evaluar_gradiente(gradiente, puntos + desplazamiento)
+                             - evaluar_gradiente(gradiente, puntos - desplazamiento)) / (2 * h))
+        H = np.stack(columnas, axis=-1)
+        return (H + np.swapaxes(H, 1, 2)) / 2
+    return hessiana
+
+
+def clasificar(autovalores, tolerancia=TOLERANCIA_AUTOVALOR):
+    """
+    Tipo de punto crítico según los autovalores de su hessiana.
+
+    Args:
+        autovalores (np.ndarray): Forma (k, dimensión).
+        tolerancia (float): Autovalores menores en valor absoluto se consideran nulos.
+
+    Returns:
+        np.ndarray: Por punto, 'minimo', 'maximo', 'silla' o 'degenerado'
+        (algún autovalor nulo: el criterio de la hessiana no decide).
+    """
+    positivos = np.all(autovalores > tolerancia, axis=1)
+    negativos = np.all(autovalores < -tolerancia, axis=1)
+    nulos = np.any(np.abs(autovalores) <= tolerancia, axis=1)
+    return np.select([positivos, negativos, nulos], ['minimo', 'maximo', 'degenerado'], 'silla')
+
+# ==============================================================================
+# 4. NEWTON AMORTIGUADO POR LOTES
+# ==============================================================================
+def newton_lote(gradiente, hessiana, puntos_iniciales, paso_maximo, num_iteraciones=ITERACIONES_NEWTON,
+                tolerancia=TOLERANCIA_GRADIENTE):
+    """
+    Método de Newton amortiguado para un lote de puntos iniciales a la vez.
+
+    La dirección d = −H⁻¹∇f se calcula con la pseudoinversa de la hessiana
+    (que tolera hessianas singulares) a partir de su descomposición en
+    autovalores, y su longitud se acota a `paso_maximo`. El paso se reduce a
+    la mitad mientras no disminuya |∇f|: así Newton converge también a
+    máximos y sillas, pero no cicla entre regiones de curvatura distinta.
+    Las semillas convergidas dejan de evaluarse.
+
+    Returns:
+        tuple: (puntos finales de forma (lote, dimensión), máscara (lote,) de
+        las semillas cuyo gradiente quedó por debajo de `tolerancia`).
+    """
+    puntos = np.array(puntos_iniciales, dtype=float)
+    convergido = np.zeros(len(puntos), dtype=bool)
+    activos = np.arange(len(puntos))
+    g = evaluar_gradiente(gradiente, puntos)
+    norma = np.linalg.norm(g, axis=1)
+    for _ in range(num_iteraciones):
+        listos = norma < tolerancia
+        convergido[activos[listos]] = True
+        activos, g, norma = activos[~listos], g[~listos], norma[~listos]
+        if len(activos) == 0:
+            break
+        x = puntos[activos]
+
+        # Pseudoinversa de la hessiana simétrica: H⁺ = V diag(1/λ) Vᵀ, sin los λ ≈ 0
+        autovalores, vectores = np.linalg.eigh(hessiana(x))
+        inversos = np.divide(1, autovalores, out=np.zeros_like(autovalores),
+                             where=np.abs(autovalores) > TOLERANCIA_AUTOVALOR)
+        direccion = -np.einsum('lij,lj,lkj,lk->li', vectores, inversos, vectores, g)
+        longitud = np.linalg.norm(direccion, axis=1, keepdims=True)
+        direccion *= np.minimum(1, paso_maximo / np.maximum(longitud, 1e-300))
+
+        # Búsqueda lineal hacia atrás sobre |∇f|, solo para los que aún no mejoran
+        paso = np.ones(len(activos))
+        nuevo_g = np.empty_like(g)
+        nueva_norma = np.full(len(activos), np.inf)
+        pendientes = np.arange(len(activos))
+        for _ in range(BUSQUEDA_LINEAL):
+            candidatos = x[pendientes] + paso[pendientes, np.newaxis] * direccion[pendientes]
+            g_candidatos = evaluar_gradiente(gradiente, candidatos)
+            normas = np.linalg.norm(g_candidatos, axis=1)
+            mejora = normas < (1 - 1e-4 * paso[pendientes]) * norma[pendientes]
+            nuevo_g[pendientes[mejora]] = g_candidatos[mejora]
+            nueva_norma[pendientes[mejora]] = normas[mejora]
+            pendientes = pendientes[~mejora]
+            if len(pendientes) == 0:
+                break
+            paso[pendientes] /= 2
+
+        # Las semillas que no logran mejorar (o dejan de ser finitas) se abandonan
+        avanzan = np.isfinite(nueva_norma)
+        puntos[activos[avanzan]] = x[avanzan] + paso[avanzan, np.newaxis] * direccion[avanzan]
+        activos, g, norma = activos[avanzan], nuevo_g[avanzan], nueva_norma[avanzan]
+    convergido[activos[norma < tolerancia]] = True
+    return puntos, convergido
+
+# ==============================================================================
+# 5. DEDUPLICACIÓN Y CLASIFICACIÓN
+# ==============================================================================
+def deduplicar(puntos, radio=RADIO_DUPLICADOS):
+    """
+    Agrupa puntos que distan menos de `radio` (componentes conexas de los pares cercanos).
+
+    Returns:
+        tuple: (representantes de forma (k, dimensión), la media de cada
+        grupo; y la etiqueta de grupo de cada punto de forma (n,)).
+    """
+    if len(puntos) == 0:
+        return np.empty((0, puntos.shape[1])), np.empty(0, dtype=np.int64)
+    pares = cKDTree(puntos).query_pairs(radio, output_type='ndarray')
+    grafo = coo_matrix((np.ones(len(pares)), (pares[:, 0], pares[:, 1])), shape=(len(puntos),) * 2)
+    n_grupos, etiquetas = connected_components(grafo, directed=False)
+    cuentas = np.bincount(etiquetas, minlength=n_grupos)
+    representantes = np.stack([np.bincount(etiquetas, weights=puntos[:, d], minlength=n_grupos) / cuentas
+                               for d in range(puntos.shape[1])], axis=1)
+    return representantes, etiquetas
+
+
+def puntos_criticos(funcion, limites, gradiente=None, hessiana=None, semillas=SEMILLAS,
+                    num_iteraciones=ITERACIONES_NEWTON, radio=RADIO_DUPLICADOS):
+    """
+    Encuentra y clasifica los puntos críticos de `funcion` dentro de `limites`.
+
+    Args:
+        funcion (callable): Función escalar f(x1, x2, ...) que acepta arreglos.
+        limites (sequence): Un par (mínimo, máximo) por coordenada, p. ej.
+            [(-5, 5), (-7, 7)]; también el dominio de las semillas.
+        gradiente (callable, opcional): Gradiente analítico con la convención
+            de `descenso_vectorizado.evaluar_gradiente`; por defecto, por
+            diferencias finitas.
+        hessiana (callable, opcional): hessiana(puntos (lote, dimensión)) ->
+            (lote, dimensión, dimensión); por defecto, diferencias finitas del gradiente.
+        semillas (int): Semillas totales de la rejilla inicial.
+        num_iteraciones (int): Pasos máximos de Newton por semilla.
+        radio (float): Ver `deduplicar`.
+
+    Returns:
+        dict: 'puntos' (k, dimensión) ordenados por valor de la función,
+        'valores' (k,), 'tipos' (k,) ('minimo', 'maximo', 'silla' o
+        'degenerado'), 'autovalores' (k, dimensión) de la hessiana y
+        'semillas' (k,), cuántas semillas llegaron a cada punto.
+    """
+    limites = np.asarray(limites, dtype=float).reshape(-1, 2)
+    dimension = len(limites)
+    gradiente = gradiente or gradiente_diferencias_finitas(funcion)
+    hessiana = hessiana or hessiana_diferencias_finitas(gradiente)
+
+    # Rejilla regular de semillas, sin los bordes (donde el dominio se corta)
+    por_eje = max(int(round(semillas ** (1 / dimension))), 2)
+    ejes = [np.linspace(bajo, alto, por_eje + 2)[1:-1] for bajo, alto in limites]
+    iniciales = np.stack([c.ravel() for c in np.meshgrid(*ejes, indexing='ij')], axis=1)
+
+    with etapa('puntos_criticos'):
+        paso_maximo = FRACCION_PASO_MAXIMO * np.linalg.norm(limites[:, 1] - limites[:, 0])
+        finales, convergido = newton_lote(gradiente, hessiana, iniciales, paso_maximo, num_iteraciones)
+        dentro = np.all((finales >= limites[:, 0]) & (finales <= limites[:, 1]), axis=1)
+        puntos, etiquetas = deduplicar(finales[convergido & dentro], radio)
+        valores = np.asarray(funcion(*puntos.T), dtype=float).reshape(len(puntos))
+        autovalores = np.linalg.eigvalsh(hessiana(puntos)) if len(puntos) else np.empty((0, dimension))
+
+    orden = np.argsort(valores, kind='stable')
+    return {'puntos': puntos[orden], 'valores': valores[orden], 'tipos': clasificar(autovalores)[orden],
+            'autovalores': autovalores[orden], 'semillas': np.bincount(etiquetas, minlength=len(puntos))[orden]}
+
+
+def minimos(criticos):
+    """
+    Mínimos de un resultado de `puntos_criticos`, del más bajo al más alto.
+
+    Returns:
+        tuple: (puntos de forma (k, dimensión), valores de forma (k,)).
+    """
+    es_minimo = criticos['tipos'] == 'minimo'
+    return criticos['puntos'][es_minimo], criticos['valores'][es_minimo]
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Reducción de dimensionalidad para conjuntos de datos masivos (millones de
+puntos) con memoria acotada.
+
+t-SNE y LLE cuestan del orden de n² y un diagrama de dispersión con un
+millón de puntos produce un SVG enorme. Este módulo reúne las piezas del
+"modo masivo" de la comparación del rollo suizo:
+
+  - `rollo_suizo_por_bloques`: genera el conjunto por bloques, con un flujo
+    aleatorio independiente por bloque (opcionalmente en un memmap en disco).
+  - `interpolar_desde_referencias`: los métodos no lineales se ajustan solo
+    sobre un subconjunto de puntos de referencia (landmarks) y el resto se
+    coloca por interpolación de sus vecinos de referencia más cercanos.
+
+El PCA se ajusta en una pasada por bloques con `utilidades.acp_incremental`
+y los paneles densos se dibujan con `utilidades.densidad.dispersion`.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+
+from utilidades.importacion_diferida import diferido
+
+cKDTree = diferido('scipy.spatial', 'cKDTree')
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+TAMANO_BLOQUE = 100_000
+
+# ==============================================================================
+# 3. GENERACIÓN POR BLOQUES
+# ==============================================================================
+def _bloques(n, tamano_bloque):
+    """Rebanadas consecutivas de `tamano_bloque` elementos que cubren range(n)."""
+    return [slice(inicio, min(inicio + tamano_bloque, n)) for inicio in range(0, n, tamano_bloque)]
+
+
+def rollo_suizo_por_bloques(n_muestras, ruido=0.0, semilla=None, tamano_bloque=TAMANO_BLOQUE, ruta=None):
+    """
+    Genera el rollo suizo (la misma distribución que `sklearn.datasets.make_swiss_roll`)
+    bloque a bloque.
+
+    Cada bloque usa su propio generador, derivado de `semilla` con
+    `SeedSequence.spawn`, así que el resultado es reproducible.
+
+    Args:
+        n_muestras (int): Número de puntos.
+        ruido (float): Desviación típica del ruido gaussiano.
+        semilla (int, opcional): Semilla del conjunto.
+        tamano_bloque (int): Puntos generados por bloque.
+        ruta (str | Path, opcional): Si se indica, los puntos se escriben en
+            un archivo `.npy` mapeado en memoria en lugar de en RAM.
+
+    Returns:
+        tuple: (X de forma (n_muestras, 3), color = posición t sobre el rollo).
+    """
+    if ruta is None:
+        X = np.empty((n_muestras, 3))
+    else:
+        X = np.lib.format.open_memmap(ruta, mode='w+', dtype=float, shape=(n_muestras, 3))
+    color = np.empty(n_muestras)
+
+    bloques = _bloques(n_muestras, tamano_bloque)
+    for bloque, secuencia in zip(bloques, np.random.SeedSequence(semilla).spawn(len(bloques))):
+        rng = np.random.default_rng(secuencia)
+        m = bloque.stop - bloque.start
+        t = 1.5 * np.pi * (1 + 2 * rng.uniform(size=m))
+        X[bloque, 0] = t * np.cos(t)
+        X[bloque, 1] = 21 * rng.uniform(size=m)
+        X[bloque, 2] = t * np.sin(t)
+        X[bloque] += ruido * rng.standard_normal((m, 3))
+        color[bloque] = t
+
+    if ruta is not None:
+        X.flush()
+    return X, color
+
+# ==============================================================================
+# 4. INTERPOLACIÓN DESDE PUNTOS DE REFERENCIA
+# ==============================================================================
+def interpolar_desde_referencias(X, referencias, incrustaciones_referencia, k=8,
+                                 tamano_bloque=TAMANO_BLOQUE):
+    """
+    Extiende incrustaciones ajustadas sobre puntos de referencia a todo `X`.
+
+    Cada punto se coloca en la media de las incrustaciones de sus `k`
+    referencias más cercanas (en el espacio original), ponderada por el
+    inverso de la distancia. Las referencias conservan su propia incrustación.
+    La búsqueda de vecinos se hace una sola vez por bloque y sirve para
+    todos los métodos.
+
+    Args:
+        X (array_like): Datos completos, de forma (muestras, características).
+        referencias (np.ndarray): Índices en `X` de los puntos de referencia.
+        incrustaciones_referencia (dict): {nombre: incrustación de las referencias}.
+        k (int): Referencias vecinas usadas por punto.
+        tamano_bloque (int): Puntos procesados por bloque.
+
+    Returns:
+        dict: {nombre: incrustación de forma (muestras, componentes)}.
+    """
+    arbol = cKDTree(np.asarray(X[referencias]))
+    resultado = {nombre: np.empty((len(X), incrustacion.shape[1]))
+                 for nombre, incrustacion in incrustaciones_referencia.items()}
+
+    for bloque in _bloques(len(X), tamano_bloque):
+        distancias, vecinos = arbol.query(X[bloque], k=k)
+        pesos = 1.0 / np.maximum(distancias, 1e-12)
+        pesos /= pesos.sum(axis=1, keepdims=True)
+        for nombre, incrustacion in incrustaciones_referencia.items():
+            resultado[nombre][bloque] = np.einsum('nk,nkc->nc', pesos, incrustacion[vecinos])
+
+    for nombre, incrustacion in incrustaciones_referencia.items():
+        resultado[nombre][referencias] = incrustacion
+    return resultado
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de figuras parametrizadas e importables.
+
+Un script de figura registrado no hace nada al importarse: expone una
+función pura que recibe un objeto de parámetros (tasa de aprendizaje,
+iteraciones, semillas, resolución de la malla, DPI, archivos de salida...)
+y devuelve una `matplotlib.figure.Figure`. El guardado y `plt.show()` quedan
+en el bloque `if __name__ == '__main__':` del script.
+
+Así una figura puede generarse miles de veces en un mismo proceso (barridos
+de parámetros) sin reimportar ni reejecutar nada más:
+
+    from utilidades.registro import barrido, combinaciones
+    resultados = barrido('rosenbrock_optimization_plot',
+                         combinaciones(tasa_aprendizaje=[0.0008, 0.0012, 0.0016],
+                                       num_iteraciones=[500, 1500]),
+                         directorio='barrido_rosenbrock')
+
+El nombre de cada figura es el del script (sin extensión), que también es
+el nombre del módulo: `obtener` lo importa la primera vez que se pide.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import ast
+import copy
+import hashlib
+import importlib
+import itertools
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+from matplotlib.figure import Figure
+
+from utilidades.exportacion import DPI_POR_DEFECTO, guardar_figura
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+# Raíz del repositorio: los scripts de figuras (y por tanto sus módulos) viven en ella.
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent
+
+# {nombre de la figura: (función de la figura, clase de sus parámetros)}
+REGISTRO = {}
+
+# ==============================================================================
+# 3. OBJETOS DE PARÁMETROS
+# ==============================================================================
+class Parametros:
+    """
+    Base de los parámetros de una figura.
+
+    Los valores por defecto se declaran como atributos de clase en cada
+    subclase; al instanciarla pueden sustituirse por nombre, y un nombre
+    desconocido es un error (así una errata en un barrido no pasa
+    desapercibida). Los atributos de esta base describen la salida.
+
+    Ejemplo:
+        class ParametrosRosenbrock(Parametros):
+            tasa_aprendizaje = 0.0012
+            num_iteraciones = 1500
+
+        ParametrosRosenbrock(num_iteraciones=500)
+    """
+    tamano = (12, 6.75)          # Pulgadas; 16:9 para presentaciones
+    dpi = DPI_POR_DEFECTO        # Resolución de los formatos ráster
+    formatos = ('svg', 'png')
+    nombre_archivo = None        # Ruta de salida sin extensión
+    rasterizar = None            # Ver `exportacion.guardar_figura`
+
+    def __init__(self, **cambios):
+        defectos = self.valores_por_defecto()
+        desconocidos = set(cambios) - set(defectos)
+        if desconocidos:
+            raise ValueError(f"Parámetros desconocidos para {type(self).__name__}: "
+                             f"{', '.join(sorted(desconocidos))}")
+        for nombre, valor in defectos.items():
+            # Los valores por defecto mutables (listas, arreglos) se copian
+            # para que una instancia no modifique los de la clase.
+            setattr(self, nombre, cambios[nombre] if nombre in cambios else copy.deepcopy(valor))
+
+    @classmethod
+    def valores_por_defecto(cls):
+        """Devuelve {nombre: valor por defecto} de todos los parámetros, incluidos los heredados."""
+        defectos = {}
+        for clase in reversed(cls.__mro__):
+            for nombre, valor in vars(clase).items():
+                if not nombre.startswith('_') and not callable(valor) \
+                        and not isinstance(valor, (classmethod, staticmethod, property)):
+                    defectos[nombre] = valor
+        return defectos
+
+    def como_dict(self):
+        """Devuelve los valores actuales como diccionario."""
+        return {nombre: getattr(self, nombre) for nombre in self.valores_por_defecto()}
+
+    def reemplazar(self, **cambios):
+        """Devuelve una copia con `cambios` aplicados."""
+        return type(self)(**{**self.como_dict(), **cambios})
+
+    def __repr__(self):
+        valores = ', '.join(f"{nombre}={valor!r}" for nombre, valor in self.como_dict().items())
+        return f"{type(self).__name__}({valores})"
+
+
+def nueva_figura(parametros, fig=None):
+    """
+    Figura sobre la que dibuja una función registrada.
+
+    Por defecto es una `Figure` independiente de pyplot: no queda registrada
+    en el gestor de figuras, así que un barrido no acumula figuras abiertas.
+    Los scripts pasan `plt.figure()` cuando quieren mostrarla con `plt.show()`.
+    """
+    if fig is None:
+        return Figure(figsize=parametros.tamano)
+    fig.set_size_inches(parametros.tamano)
+    return fig
+
+# ==============================================================================
+# 4. REGISTRO
+# ==============================================================================
+def registrar(nombre, clase_parametros):
+    """
+    Decorador que registra una función de figura bajo `nombre`.
+
+    La función debe aceptar `(parametros, fig=None)` y devolver la figura.
+    """
+    def decorador(funcion):
+        REGISTRO[nombre] = (funcion, clase_parametros)
+        funcion.nombre_figura = nombre
+        funcion.clase_parametros = clase_parametros
+        return funcion
+    return decorador
+
+
+def obtener(nombre):
+    """
+    Devuelve (función, clase de parámetros) de una figura registrada.
+
+    Si la figura aún no está en el registro, importa el módulo del mismo
+    nombre de la raíz del repositorio (una sola vez por proceso).
+
+    Raises:
+        KeyError: Si el módulo no registra ninguna figura con ese nombre.
+    """
+    if nombre not in REGISTRO:
+        if str(RAIZ_REPOSITORIO) not in sys.path:
+            sys.path.insert(0, str(RAIZ_REPOSITORIO))
+        try:
+            importlib.import_module(nombre)
+        except ModuleNotFoundError as error:
+            if error.name != nombre:
+                raise
+    if nombre not in REGISTRO:
+        raise KeyError(f"Figura no registrada: {nombre}")
+    return REGISTRO[nombre]
+
+
+def es_figura_registrada(ruta_script):
+    """
+    Indica, sin importarlo, si un script registra una figura con `@registrar(...)`.
+
+    Importar un script no registrado lo ejecutaría entero, así que la
+    comprobación se hace sobre su árbol sintáctico.
+    """
+    ruta_script = Path(ruta_script)
+    if ruta_script.suffix != '.py':
+        return False
+    arbol = ast.parse(ruta_script.read_bytes(), filename=str(ruta_script))
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.FunctionDef):
+            for decorador in nodo.decorator_list:
+                llamada = decorador.func if isinstance(decorador, ast.Call) else decorador
+                if getattr(llamada, 'id', getattr(llamada, 'attr', None)) == 'registrar':
+                    return True
+    return False
+
+
+def generar(nombre, parametros=None, fig=None, **cambios):
+    """
+    Genera una figura registrada.
+
+    Args:
+        nombre (str): Nombre de la figura (el del script, sin extensión).
+        parametros (Parametros, opcional): Parámetros completos; por
+            defecto, los de la clase de la figura.
+        fig (Figure, opcional): Figura sobre la que dibujar.
+        **cambios: Parámetros a sustituir.
+
+    Returns:
+        tuple: (matplotlib.figure.Figure, parámetros usados).
+    """
+    funcion, clase_parametros = obtener(nombre)
+    if parametros is None:
+        parametros = clase_parametros(**cambios)
+    elif cambios:
+        parametros = parametros.reemplazar(**cambios)
+    return funcion(parametros, fig), parametros
+
+# ==============================================================================
+# 5. EXPORTACIÓN
+# ==============================================================================
+def exportar(fig, parametros, directorio=None, nombre_archivo=None):
+    """
+    Guarda una figura según los parámetros de salida de `parametros`.
+
+    Args:
+        fig (Figure): La figura generada.
+        parametros (Parametros): Indican nombre, formatos, DPI y rasterizado.
+        directorio (str | Path, opcional): Carpeta de salida; por defecto,
+            la de trabajo.
+        nombre_archivo (str, opcional): Sustituye a `parametros.nombre_archivo`.
+
+    Returns:
+        list[Path]: Las rutas generadas, en el orden de `parametros.formatos`.
+    """
+    nombre_base = Path(nombre_archivo or parametros.nombre_archivo)
+    if directorio is not None:
+        Path(directorio).mkdir(parents=True, exist_ok=True)
+        nombre_base = Path(directorio) / nombre_base
+    return guardar_figura(fig, nombre_base, formatos=parametros.formatos, dpi=parametros.dpi,
+                          rasterizar=parametros.rasterizar)
+
+
+def renderizar(nombre, directorio=None, **cambios):
+    """Genera y guarda una figura registrada. Devuelve las rutas generadas."""
+    fig, parametros = generar(nombre, **cambios)
+    return exportar(fig, parametros, directorio)
+
+# ==============================================================================
+# 6. BARRIDOS DE PARÁMETROS
+# ==============================================================================
+def combinaciones(**rejilla):
+    """
+    Producto cartesiano de valores de parámetros.
+
+    Ejemplo:
+        combinaciones(tasa=[0.1, 0.2], semilla=[0, 1])
+        -> [{'tasa': 0.1, 'semilla': 0}, {'tasa': 0.1, 'semilla': 1}, ...]
+    """
+    nombres = list(rejilla)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*rejilla.values())]
+
+
+def _sufijo(cambios):
+    """Sufijo legible de nombre de archivo para una combinación de parámetros."""
+    partes = []
+    for nombre, valor in cambios.items():
+        texto = str(valor).replace(' ', '').replace('/', '-')
+        partes.append(f"{nombre}={texto}" if len(texto) <= 24 else f"{nombre}={hashlib.sha1(texto.encode()).hexdigest()[:8]}")
+    return '__'.join(partes) or 'defecto'
+
+
+def _ejecutar_variante(tarea):
+    """Genera una variante de un barrido. Es de nivel superior para poder repartirse entre procesos."""
+    nombre, cambios, directorio, medir = tarea
+    inicio = time.perf_counter()
+    fig, parametros = generar(nombre, **cambios)
+    resultado = {'parametros': cambios}
+    if medir is not None:
+        resultado['medida'] = medir(fig, parametros)
+    if directorio is not None:
+        nombre_archivo = f"{Path(parametros.nombre_archivo).name}__{_sufijo(cambios)}"
+        resultado['archivos'] = [str(ruta) for ruta in
+                                 exportar(fig, parametros, directorio, nombre_archivo)]
+    resultado['tiempo_s'] = time.perf_counter() - inicio
+    return resultado
+
+
+def barrido(nombre, variantes, directorio=None, medir=None, procesos=1):
+    """
+    Genera una figura registrada para cada combinación de parámetros.
+
+    El módulo de la figura se importa una sola vez; cada variante solo
+    ejecuta la función de la figura (y, si se pide, la exportación).
+
+    Args:
+        nombre (str): Nombre de la figura registrada.
+        variantes (iterable[dict]): Cambios de parámetros de cada variante,
+            p. ej. los de `combinaciones(...)`.
+        directorio (str | Path, opcional): Si se indica, cada variante se
+            guarda en él con un sufijo que identifica sus parámetros.
+        medir (callable, opcional): f(fig, parametros) -> valor que se
+            añade al resultado (p. ej. una métrica de la figura). Con
+            `procesos > 1` debe ser una función de nivel de módulo.
+        procesos (int): Procesos entre los que repartir las variantes.
+
+    Returns:
+        list[dict]: Por variante, sus parámetros, el tiempo en segundos y,
+        según lo pedido, la medida y los archivos generados.
+    """
+    obtener(nombre)  # Falla pronto si la figura no existe
+    tareas = [(nombre, dict(cambios), directorio, medir) for cambios in variantes]
+    if procesos <= 1:
+        return [_ejecutar_variante(tarea) for tarea in tareas]
+    with multiprocessing.Pool(procesos) as grupo:
+        return grupo.map(_ejecutar_variante, tareas)
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+Renderizado por lotes, sin interfaz gráfica, de todas las figuras del repositorio.
+
+Descubre cada script de figura de la raíz del repositorio, lo ejecuta en un
+grupo de procesos dimensionado al número de núcleos disponibles con el backend
+'Agg' forzado (de modo que `plt.show()` no bloquea) y reporta, por figura, el
+tiempo de ejecución, el pico de memoria residente (RSS) y el éxito o fallo.
+
+Uso:
+    python -m utilidades.renderizado_lotes
+    python -m utilidades.renderizado_lotes rosenbrock_optimization_plot visualizacion_ACP
+    python -m utilidades.renderizado_lotes --procesos 4 --salida salidas
+    python -m utilidades.renderizado_lotes --rasterizar --informe-tamano
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import argparse
+import ast
+import json
+import multiprocessing
+import os
+import resource
+import runpy
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from utilidades import registro
+from utilidades.cache_renderizado import TAMANO_MAXIMO_MB, CacheRenderizado, clave_renderizado
+from utilidades.animacion import VARIABLE_ANIMACION
+from utilidades.exportacion import VARIABLE_INFORME, VARIABLE_RASTERIZAR, opciones_entorno
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+# Raíz del repositorio: los scripts de figuras viven directamente en ella.
+RAIZ_REPOSITORIO = Path(__file__).resolve().parent.parent
+
+# Directorio por defecto donde cada figura escribe sus archivos (una
+# subcarpeta por figura, para que los nombres de salida no colisionen).
+DIRECTORIO_SALIDA = RAIZ_REPOSITORIO / "salidas"
+
+# ==============================================================================
+# 3. DESCUBRIMIENTO DE FIGURAS
+# ==============================================================================
+def _es_script_de_figura(ruta):
+    """
+    Indica si un archivo de la raíz es un script de figura.
+
+    Se aceptan los archivos '.py' y los scripts sin extensión que importan
+    matplotlib (p. ej. 'visualizacion_calculo_autovalores').
+    """
+    if not ruta.is_file() or ruta.name.startswith('.'):
+        return False
+    if ruta.suffix == '.py':
+        return True
+    if ruta.suffix == '':
+        try:
+            return 'import matplotlib' in ruta.read_text(encoding='utf-8')
+        except (UnicodeDecodeError, OSError):
+            return False
+    return False
+
+
+def descubrir_figuras(directorio=RAIZ_REPOSITORIO):
+    """
+    Devuelve un diccionario {nombre_figura: ruta_script} ordenado por nombre.
+
+    El nombre de la figura es el nombre del archivo sin extensión.
+    """
+    rutas = sorted(p for p in Path(directorio).iterdir() if _es_script_de_figura(p))
+    return {ruta.stem: ruta for ruta in rutas}
+
+# ==============================================================================
+# 4. EJECUCIÓN DE UNA FIGURA (PROCESO TRABAJADOR)
+# ==============================================================================
+def _pico_rss_mb():
+    """Pico de memoria residente del proceso actual, en MB."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # En Linux ru_maxrss está en KB; en macOS, en bytes.
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return pico / divisor
+
+
+def aplicar_parametros(ruta_script, parametros):
+    """
+    Código del script con sus constantes de nivel de módulo reemplazadas.
+
+    Cada parámetro sustituye el valor de la asignación `NOMBRE = ...` de
+    nivel superior del script (p. ej. {'tasa_aprendizaje': 0.002}), de modo
+    que el script se ejecuta tal cual pero con otros datos.
+
+    Args:
+        ruta_script (str | Path): Script de la figura.
+        parametros (dict): {nombre de la constante: valor literal}.
+
+    Returns:
+        code: El código compilado, listo para `exec`.
+    """
+    ruta_script = Path(ruta_script)
+    arbol = ast.parse(ruta_script.read_bytes(), filename=str(ruta_script))
+    pendientes = dict(parametros)
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Assign):
+            objetivos = nodo.targets
+        elif isinstance(nodo, ast.AnnAssign) and nodo.value is not None:
+            objetivos = [nodo.target]
+        else:
+            continue
+        for objetivo in objetivos:
+            if isinstance(objetivo, ast.Name) and objetivo.id in parametros:
+                # Se reemplazan todas las asignaciones del nombre, no solo la primera.
+                nodo.value = ast.parse(repr(parametros[objetivo.id]), mode='eval').body
+                pendientes.pop(objetivo.id, None)
+    if pendientes:
+        raise ValueError(f"Parámetros desconocidos en {ruta_script.name}: {', '.join(sorted(pendientes))}")
+    ast.fix_missing_locations(arbol)
+    return compile(arbol, str(ruta_script), 'exec')
+
+
+def ejecutar_script(ruta_script, parametros=None):
+    """
+    Ejecuta un script como '__main__', con `parametros` sustituidos si se indican.
+
+    Para las figuras registradas (ver `utilidades.registro`) los parámetros
+    son los de su objeto de parámetros y la figura se genera y guarda desde
+    el registro; para el resto se sustituyen constantes de nivel de módulo.
+    """
+    if not parametros:
+        runpy.run_path(str(ruta_script), run_name='__main__')
+        return
+    if registro.es_figura_registrada(ruta_script):
+        registro.renderizar(Path(ruta_script).stem, **parametros)
+        return
+    codigo = aplicar_parametros(ruta_script, parametros)
+    exec(codigo, {'__name__': '__main__', '__file__': str(ruta_script), '__builtins__': __builtins__})
+
+
+def ejecutar_figura(nombre, ruta_script, directorio_salida, parametros=None):
+    """
+    Ejecuta un script de figura como '__main__' con el backend 'Agg'.
+
+    Está pensada para correr en un proceso nuevo por figura: cambia el
+    directorio de trabajo a `directorio_salida` para que los archivos
+    generados queden agrupados por figura. `parametros` sustituye
+    constantes del script (ver `aplicar_parametros`).
+
+    Returns:
+        dict: nombre, éxito, tiempo (s), pico de RSS (MB), error y archivos
+        generados (solo los creados o modificados por esta ejecución).
+    """
+    directorio_salida = Path(directorio_salida)
+    directorio_salida.mkdir(parents=True, exist_ok=True)
+    os.chdir(directorio_salida)
+    previos = {p.name: p.stat().st_mtime_ns for p in directorio_salida.iterdir() if p.is_file()}
+    os.environ['MPLBACKEND'] = 'Agg'
+    if str(RAIZ_REPOSITORIO) not in sys.path:
+        sys.path.insert(0, str(RAIZ_REPOSITORIO))
+
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+
+    inicio = time.perf_counter()
+    error = None
+    try:
+        ejecutar_script(ruta_script, parametros)
+    except BaseException:  # SystemExit incluido: se reporta, no se propaga
+        error = traceback.format_exc()
+    finally:
+        plt.close('all')
+    tiempo = time.perf_counter() - inicio
+
+    return {
+        'figura': nombre,
+        'exito': error is None,
+        'tiempo_s': round(tiempo, 3),
+        'pico_rss_mb': round(_pico_rss_mb(), 1),
+        'error': error,
+        'archivos': sorted(p.name for p in directorio_salida.iterdir()
+                           if p.is_file() and previos.get(p.name) != p.stat().st_mtime_ns),
+        'cache': False,
+    }
+
+
+def _ejecutar_tarea(tarea):
+    """Adaptador de una tupla (nombre, ruta, salida) para `Pool.imap_unordered`."""
+    return ejecutar_figura(*tarea)
+
+# ==============================================================================
+# 5. RENDERIZADO EN PARALELO
+# ==============================================================================
+def _resultado_desde_cache(nombre, archivos):
+    """Resultado de una figura restaurada desde la caché sin renderizar."""
+    return {'figura': nombre, 'exito': True, 'tiempo_s': 0.0, 'pico_rss_mb': 0.0,
+            'error': None, 'archivos': sorted(archivos), 'cache': True}
+
+
+def parametros_entorno():
+    """Variables de entorno que cambian los archivos que generan las figuras."""
+    parametros = opciones_entorno()
+    if os.environ.get(VARIABLE_ANIMACION):
+        parametros[VARIABLE_ANIMACION] = os.environ[VARIABLE_ANIMACION]
+    return parametros
+
+
+def renderizar_figuras(figuras=None, directorio_salida=DIRECTORIO_SALIDA, procesos=None,
+                       al_terminar=None, cache=None):
+    """
+    Renderiza un conjunto de figuras en paralelo.
+
+    Args:
+        figuras (iterable, opcional): Nombres de figura a renderizar. Por
+            defecto, todas las descubiertas en la raíz del repositorio.
+        directorio_salida (str | Path): Carpeta base de salida.
+        procesos (int, opcional): Tamaño del grupo de procesos. Por defecto,
+            el número de núcleos disponibles.
+        al_terminar (callable, opcional): Se invoca con el resultado de cada
+            figura en cuanto termina (útil para mostrar progreso).
+        cache (CacheRenderizado, opcional): Si se indica, las figuras cuya
+            clave no ha cambiado se restauran desde la caché en lugar de
+            renderizarse, y las renderizadas con éxito se añaden a ella.
+
+    Returns:
+        list[dict]: Un resultado por figura, en orden alfabético.
+    """
+    disponibles = descubrir_figuras()
+    if figuras is None:
+        seleccion = disponibles
+    else:
+        desconocidas = [f for f in figuras if f not in disponibles]
+        if desconocidas:
+            raise ValueError(f"Figuras desconocidas: {', '.join(desconocidas)}")
+        seleccion = {f: disponibles[f] for f in figuras}
+
+    directorio_salida = Path(directorio_salida).resolve()
+    resultados = []
+    tareas = []
+    claves = {}
+    for nombre, ruta in seleccion.items():
+        destino = directorio_salida / nombre
+        if cache is not None:
+            # Las opciones de exportación por entorno cambian los archivos
+            # generados: forman parte de la clave.
+            claves[nombre] = clave_renderizado(ruta, parametros_entorno() or None)
+            archivos = cache.obtener(claves[nombre], destino)
+            if archivos is not None:
+                resultado = _resultado_desde_cache(nombre, archivos)
+                resultados.append(resultado)
+                if al_terminar is not None:
+                    al_terminar(resultado)
+                continue
+        tareas.append((nombre, str(ruta), str(destino)))
+
+    if not tareas:
+        return sorted(resultados, key=lambda r: r['figura'])
+    if procesos is None:
+        procesos = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    procesos = max(1, min(procesos, len(tareas) or 1))
+
+    # maxtasksperchild=1: cada figura corre en un proceso nuevo, de modo que
+    # el estado global de matplotlib y el pico de RSS no se mezclan entre figuras.
+    with multiprocessing.Pool(processes=procesos, maxtasksperchild=1) as grupo:
+        for resultado in grupo.imap_unordered(_ejecutar_tarea, tareas):
+            if cache is not None and resultado['exito'] and resultado['archivos']:
+                destino = directorio_salida / resultado['figura']
+                cache.guardar(claves[resultado['figura']],
+                              [destino / nombre for nombre in resultado['archivos']])
+            resultados.append(resultado)
+            if al_terminar is not None:
+                al_terminar(resultado)
+
+    return sorted(resultados, key=lambda r: r['figura'])
+
+# ==============================================================================
+# 6. INFORME
+# ==============================================================================
+def formatear_resultado(resultado):
+    """Línea de informe legible para el resultado de una figura."""
+    estado = 'OK   ' if resultado['exito'] else 'FALLO'
+    if resultado.get('cache'):
+        return f"{estado} {resultado['figura']:<50} {'(caché)':>21}"
+    return (f"{estado} {resultado['figura']:<50} "
+            f"{resultado['tiempo_s']:>8.2f} s {resultado['pico_rss_mb']:>9.1f} MB")
+
+
+def imprimir_resumen(resultados, tiempo_total):
+    """Imprime el resumen final del lote y los errores de las figuras fallidas."""
+    fallidas = [r for r in resultados if not r['exito']]
+    cacheadas = sum(1 for r in resultados if r.get('cache'))
+    print('-' * 80)
+    print(f"{len(resultados) - len(fallidas)}/{len(resultados)} figuras correctas "
+          f"({cacheadas} desde la caché) en {tiempo_total:.2f} s de tiempo total.")
+    renderizadas = [r for r in resultados if not r.get('cache')]
+    if renderizadas:
+        mas_lenta = max(renderizadas, key=lambda r: r['tiempo_s'])
+        print(f"Figura más lenta: {mas_lenta['figura']} ({mas_lenta['tiempo_s']:.2f} s)")
+    for resultado in fallidas:
+        print(f"\n=== Error en {resultado['figura']} ===\n{resultado['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Renderiza en paralelo y sin interfaz gráfica las figuras del repositorio.")
+    parser.add_argument('figuras', nargs='*',
+                        help="Nombres de figura (archivo sin extensión). Por defecto, todas.")
+    parser.add_argument('--salida', default=str(DIRECTORIO_SALIDA),
+                        help="Carpeta base de salida (una subcarpeta por figura).")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Número de procesos. Por defecto, los núcleos disponibles.")
+    parser.add_argument('--json', dest='ruta_json', default=None,
+                        help="Escribe además los resultados en este archivo JSON.")
+    parser.add_argument('--listar', action='store_true',
+                        help="Solo lista las figuras descubiertas.")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="Renderiza todas las figuras aunque su clave no haya cambiado.")
+    parser.add_argument('--cache-max-mb', type=float, default=TAMANO_MAXIMO_MB,
+                        help="Tamaño máximo de la caché de renderizado, en MB.")
+    parser.add_argument('--rasterizar', action='store_true',
+                        help="Rasteriza los artistas pesados (contornos, superficies, nubes densas) "
+                             "en los formatos vectoriales.")
+    parser.add_argument('--informe-tamano', action='store_true',
+                        help="Imprime cuánto aporta cada artista al tamaño de cada figura.")
+    args = parser.parse_args(argv)
+
+    # Los procesos de cada figura heredan el entorno: `guardar_figura` lee
+    # estas variables cuando el script no fija la opción.
+    if args.rasterizar:
+        os.environ[VARIABLE_RASTERIZAR] = '1'
+    if args.informe_tamano:
+        os.environ[VARIABLE_INFORME] = '1'
+
+    if args.listar:
+        for nombre in descubrir_figuras():
+            print(nombre)
+        return 0
+
+    cache = None if args.sin_cache else CacheRenderizado(tamano_maximo_mb=args.cache_max_mb)
+    inicio = time.perf_counter()
+    resultados = renderizar_figuras(args.figuras or None, args.salida, args.procesos,
+                                    al_terminar=lambda r: print(formatear_resultado(r), flush=True),
+                                    cache=cache)
+    imprimir_resumen(resultados, time.perf_counter() - inicio)
+
+    if args.ruta_json:
+        with open(args.ruta_json, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+
+    return 0 if all(r['exito'] for r in resultados) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local de renderizado con las librerías ya cargadas.
+
+Renderizar una figura sencilla cuesta sobre todo el arranque: iniciar el
+intérprete, importar matplotlib/seaborn/scipy y cargar las fuentes. Este
+servidor lo paga una sola vez: precarga las librerías y calienta la caché de
+fuentes, y atiende peticiones HTTP en 127.0.0.1. Cada petición se ejecuta en
+un proceso hijo creado con `fork`, que hereda el intérprete ya caliente y
+cuyos cambios de estado (rcParams, figuras, estilos) mueren con él.
+
+El servidor tiene un solo hilo: el `fork` se hace siempre desde el hilo
+principal, porque hacerlo desde un proceso con varios hilos puede dejar al
+hijo bloqueado en un cerrojo (importaciones, logging, caché de fuentes) que
+otro hilo tenía tomado. Las peticiones simultáneas esperan su turno.
+
+Uso:
+    python -m utilidades.servidor_renderizado                    # inicia el servidor
+    python -m utilidades.servidor_renderizado --renderizar rosenbrock_optimization_plot num_iteraciones=300
+
+API (JSON):
+    GET  /figuras      -> {"figuras": [...]}
+    GET  /estado       -> pid, trabajos atendidos y librerías precargadas
+    POST /renderizar   {"figura": "...", "parametros": {"NOMBRE": valor}, "salida": "..."}
+                       -> figura, éxito, tiempo_s, etapas, archivos (rutas
+                          absolutas), salida estándar y error
+
+"salida" es una subcarpeta relativa al directorio de salida del servidor;
+se rechazan las rutas que escapan de él.
+
+Los parámetros sustituyen constantes de nivel de módulo del script (ver
+`renderizado_lotes.aplicar_parametros`).
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import argparse
+import ast
+import contextlib
+import importlib
+import io
+import json
+import os
+import pkgutil
+import select
+import signal
+import sys
+import time
+import traceback
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from utilidades import medicion
+from utilidades.renderizado_lotes import DIRECTORIO_SALIDA, descubrir_figuras, ejecutar_figura
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+HOST = '127.0.0.1'
+PUERTO = 8765
+TIEMPO_MAXIMO = 300   # Segundos máximos por trabajo antes de terminar el proceso hijo
+
+# Librerías que los scripts de figuras importan (directa o diferidamente).
+PRECARGA = (
+    'numpy', 'pandas', 'matplotlib.pyplot', 'mpl_toolkits.mplot3d', 'seaborn',
+    'scipy.stats', 'scipy.spatial', 'scipy.optimize', 'scipy.interpolate',
+    'sklearn.datasets', 'sklearn.decomposition', 'sklearn.manifold',
+    'sklearn.neighbors', 'sklearn.preprocessing', 'umap',
+)
+
+# ==============================================================================
+# 3. PRECARGA
+# ==============================================================================
+def precargar(modulos=PRECARGA):
+    """
+    Importa las librerías pesadas y las utilidades, y calienta las fuentes.
+
+    Returns:
+        list[str]: Los módulos importados (los no instalados se omiten).
+    """
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+    cargados = []
+    for modulo in modulos:
+        try:
+            importlib.import_module(modulo)
+            cargados.append(modulo)
+        except ImportError:
+            pass
+
+    import utilidades
+    for info in pkgutil.iter_modules(utilidades.__path__):
+        importlib.import_module(f'utilidades.{info.name}')
+
+    # Un dibujado con texto en varios pesos carga las fuentes, el motor de
+    # texto matemático y los backends de exportación.
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.set_title('Título', fontweight='bold')
+    ax.text(0.5, 0.5, r'$\nabla J(\theta) = \sum_i x_i^2$', style='italic')
+    for formato in ('png', 'svg', 'pdf'):
+        fig.savefig(io.BytesIO(), format=formato)
+    plt.close(fig)
+    return cargados
+
+# ==============================================================================
+# 4. TRABAJOS EN PROCESOS HIJOS
+# ==============================================================================
+def _trabajo_hijo(nombre, ruta, destino, parametros, escritura):
+    """Cuerpo del proceso hijo: renderiza, envía el resultado por la tubería y termina."""
+    estado = 0
+    try:
+        salida = io.StringIO()
+        medicion.iniciar_registro()
+        with contextlib.redirect_stdout(salida):
+            resultado = ejecutar_figura(nombre, ruta, destino, parametros)
+        resultado['etapas'] = {etapa: round(s, 4) for etapa, s in sorted(medicion.detener_registro().items())}
+        resultado['salida'] = salida.getvalue()
+        resultado['archivos'] = [str(Path(destino) / archivo) for archivo in resultado['archivos']]
+        datos = json.dumps(resultado, ensure_ascii=False).encode('utf-8')
+    except BaseException:
+        estado = 1
+        datos = json.dumps({'figura': nombre, 'exito': False,
+                            'error': traceback.format_exc()}).encode('utf-8')
+    with os.fdopen(escritura, 'wb') as tuberia:
+        tuberia.write(datos)
+    os._exit(estado)
+
+
+def renderizar_en_hijo(nombre, ruta, destino, parametros=None, tiempo_maximo=TIEMPO_MAXIMO):
+    """
+    Renderiza una figura en un proceso hijo (fork) del servidor ya precargado.
+
+    Returns:
+        dict: El resultado de `ejecutar_figura`, con las etapas medidas, la
+        salida estándar del script y las rutas absolutas de los archivos.
+    """
+    inicio = time.perf_counter()
+    lectura, escritura = os.pipe()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(lectura)
+        _trabajo_hijo(nombre, ruta, destino, parametros, escritura)
+    os.close(escritura)
+
+    partes = []
+    limite = time.monotonic() + tiempo_maximo
+    with os.fdopen(lectura, 'rb') as tuberia:
+        while True:
+            restante = limite - time.monotonic()
+            listos, _, _ = select.select([tuberia], [], [], max(restante, 0))
+            if not listos:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                return {'figura': nombre, 'exito': False,
+                        'error': f"Tiempo máximo de {tiempo_maximo} s superado."}
+            bloque = os.read(tuberia.fileno(), 1 << 16)
+            if not bloque:
+                break
+            partes.append(bloque)
+    os.waitpid(pid, 0)
+
+    try:
+        resultado = json.loads(b''.join(partes))
+    except ValueError:
+        resultado = {'figura': nombre, 'exito': False, 'error': "El proceso hijo terminó sin resultado."}
+    resultado['tiempo_peticion_s'] = round(time.perf_counter() - inicio, 4)
+    return resultado
+
+# ==============================================================================
+# 5. SERVIDOR HTTP
+# ==============================================================================
+class ManejadorRenderizado(BaseHTTPRequestHandler):
+    """Atiende las peticiones JSON del servidor de renderizado."""
+
+    def _responder(self, codigo, datos):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        servidor = self.server
+        if self.path == '/figuras':
+            self._responder(200, {'figuras': sorted(servidor.figuras)})
+        elif self.path == '/estado':
+            self._responder(200, {'pid': os.getpid(), 'trabajos': servidor.trabajos,
+                                  'precargadas': servidor.precargadas})
+        else:
+            self._responder(404, {'error': f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/renderizar':
+            self._responder(404, {'error': f"Ruta desconocida: {self.path}"})
+            return
+        servidor = self.server
+        try:
+            peticion = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not isinstance(peticion, dict):
+                raise ValueError("el cuerpo debe ser un objeto JSON.")
+            nombre = peticion['figura']
+            if not isinstance(nombre, str):
+                raise ValueError("'figura' debe ser una cadena.")
+            parametros = peticion.get('parametros') or {}
+            if not isinstance(parametros, dict):
+                raise ValueError("'parametros' debe ser un objeto JSON.")
+            if not isinstance(peticion.get('salida') or '', str):
+                raise ValueError("'salida' debe ser una cadena.")
+        except (KeyError, ValueError) as error:
+            self._responder(400, {'error': f"Petición no válida: {error}"})
+            return
+        if nombre not in servidor.figuras:
+            self._responder(404, {'error': f"Figura desconocida: {nombre}"})
+            return
+
+        try:
+            destino = resolver_salida(servidor.directorio_salida, peticion.get('salida')) / nombre
+        except ValueError as error:
+            self._responder(400, {'error': f"Petición no válida: {error}"})
+            return
+        resultado = renderizar_en_hijo(nombre, servidor.figuras[nombre], destino, parametros)
+        servidor.trabajos += 1
+        self._responder(200, resultado)
+
+    def log_message(self, formato, *args):
+        sys.stderr.write(f"[servidor_renderizado] {formato % args}\n")
+
+
+def resolver_salida(directorio_salida, salida=None):
+    """
+    Carpeta de salida de una petición, siempre dentro de `directorio_salida`.
+
+    Args:
+        directorio_salida (Path): Directorio base del servidor (ya resuelto).
+        salida (str, opcional): Subcarpeta pedida por el cliente.
+
+    Returns:
+        Path: La carpeta resuelta.
+
+    Raises:
+        ValueError: Si la ruta (absoluta, con '..' o con enlaces simbólicos)
+            sale de `directorio_salida`.
+    """
+    if not salida:
+        return directorio_salida
+    ruta = (directorio_salida / salida).resolve()
+    if not ruta.is_relative_to(directorio_salida):
+        raise ValueError(f"la salida '{salida}' queda fuera de {directorio_salida}.")
+    return ruta
+
+
+def crear_servidor(host=HOST, puerto=PUERTO, directorio_salida=DIRECTORIO_SALIDA):
+    """Precarga las librerías y crea el servidor HTTP (sin ponerlo a escuchar)."""
+    # Un solo hilo: ver la nota sobre `fork` en la docstring del módulo.
+    servidor = HTTPServer((host, puerto), ManejadorRenderizado)
+    servidor.precargadas = precargar()
+    servidor.figuras = descubrir_figuras()
+    servidor.directorio_salida = Path(directorio_salida).resolve()
+    servidor.trabajos = 0
+    return servidor
+
+# ==============================================================================
+# 6. CLIENTE
+# ==============================================================================
+def solicitar_renderizado(figura, parametros=None, salida=None, host=HOST, puerto=PUERTO):
+    """
+    Pide un renderizado a un servidor en marcha.
+
+    Args:
+        salida (str, opcional): Subcarpeta dentro del directorio de salida del servidor.
+
+    Returns:
+        dict: La respuesta del servidor.
+    """
+    peticion = {'figura': figura, 'parametros': parametros or {}}
+    if salida is not None:
+        peticion['salida'] = str(salida)
+    solicitud = urllib.request.Request(f'http://{host}:{puerto}/renderizar',
+                                       data=json.dumps(peticion).encode('utf-8'),
+                                       headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(solicitud, timeout=TIEMPO_MAXIMO + 10) as respuesta:
+        return json.load(respuesta)
+
+
+def _parametro(texto):
+    """Convierte 'NOMBRE=valor' en (nombre, valor literal de Python, o texto si no lo es)."""
+    nombre, _, valor = texto.partition('=')
+    try:
+        return nombre, ast.literal_eval(valor)
+    except (ValueError, SyntaxError):
+        return nombre, valor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de renderizado con librerías precargadas.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--puerto', type=int, default=PUERTO)
+    parser.add_argument('--salida', default=None,
+                        help="Servidor: carpeta base de salida (una subcarpeta por figura). "
+                             "Cliente: subcarpeta dentro de la del servidor.")
+    parser.add_argument('--renderizar', metavar='FIGURA', default=None,
+                        help="Actúa como cliente: pide esta figura a un servidor en marcha.")
+    parser.add_argument('parametros', nargs='*', metavar='NOMBRE=valor',
+                        help="Constantes del script a sustituir (solo con --renderizar).")
+    args = parser.parse_args(argv)
+
+    if args.renderizar:
+        resultado = solicitar_renderizado(args.renderizar, dict(map(_parametro, args.parametros)),
+                                          args.salida, args.host, args.puerto)
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0 if resultado.get('exito') else 1
+
+    inicio = time.perf_counter()
+    servidor = crear_servidor(args.host, args.puerto, args.salida or DIRECTORIO_SALIDA)
+    print(f"Servidor de renderizado en http://{args.host}:{args.puerto} "
+          f"(precarga en {time.perf_counter() - inicio:.1f} s)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de trayectorias con parada por tolerancia y decimación para dibujar.
+
+Los bucles de descenso (`descenso_vectorizado.descenso_gradiente_lote`,
+`optimizadores.optimizar`) ya no avanzan siempre un número fijo de pasos:
+`RegistroTrayectorias` guarda el historial de un lote en un búfer que crece
+por duplicación, congela cada trayectoria en cuanto converge (norma del
+gradiente o cambio relativo de la pérdida por debajo de una tolerancia) y
+detiene el bucle cuando no queda ninguna activa.
+
+Antes de dibujar, `decimar` reduce cada trayectoria con Ramer–Douglas–Peucker
+(vectorizado: todos los segmentos pendientes se procesan a la vez en cada
+ronda) con una tolerancia relativa a los límites de los ejes, de modo que la
+línea simplificada no se distingue de la original y los marcadores se
+indican por número de iteración en lugar de por posición en el arreglo.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import numpy as np
+
+# ==============================================================================
+# 2. PARÁMETROS
+# ==============================================================================
+TOLERANCIA_GRADIENTE = 1e-6        # Norma del gradiente que se considera nula
+TOLERANCIA_RELATIVA = 1e-10        # Cambio relativo de la pérdida que se considera nulo
+CAPACIDAD_INICIAL = 256            # Filas iniciales del búfer (crece por duplicación)
+TOLERANCIA_SIMPLIFICACION = 5e-4   # Fracción del rango de cada eje (≈ medio píxel a 1000 px)
+
+# ==============================================================================
+# 3. REGISTRO CON PARADA POR TOLERANCIA
+# ==============================================================================
+class RegistroTrayectorias:
+    """
+    Historial de un lote de trayectorias que se detiene al converger.
+
+    Uso típico dentro de un bucle de descenso:
+
+        registro = RegistroTrayectorias(puntos, num_iteraciones, perdidas)
+        for k in range(num_iteraciones):
+            g = evaluar_gradiente(gradiente, registro.actual)
+            if not registro.comprobar(g):
+                break
+            paso = tasas * g
+            paso[~registro.activas] = 0     # Las convergidas no se mueven
+            registro.registrar(registro.actual - paso, perdidas_nuevas)
+
+    Args:
+        puntos_iniciales (array_like): Forma (lote, dimensión).
+        num_iteraciones (int): Pasos máximos; el búfer nunca pasa de
+            num_iteraciones + 1 filas.
+        perdidas_iniciales (array_like, opcional): Pérdida de cada punto
+            inicial; si se da, se registra la pérdida y se aplica el
+            criterio de cambio relativo.
+        tolerancia (float | None): Norma del gradiente por debajo de la cual
+            una trayectoria converge (None o 0 lo desactiva).
+        tolerancia_relativa (float | None): |Δf| / |f| por debajo del cual
+            una trayectoria converge (None o 0 lo desactiva).
+        capacidad (int): Filas iniciales del búfer.
+    """
+
+    def __init__(self, puntos_iniciales, num_iteraciones, perdidas_iniciales=None,
+                 tolerancia=TOLERANCIA_GRADIENTE, tolerancia_relativa=TOLERANCIA_RELATIVA,
+                 capacidad=CAPACIDAD_INICIAL):
+        puntos = np.asarray(puntos_iniciales, dtype=float)
+        lote = puntos.shape[0]
+        self.maximo = num_iteraciones + 1
+        self.tolerancia = tolerancia or 0.0
+        self.tolerancia_relativa = tolerancia_relativa or 0.0
+        filas = min(capacidad, self.maximo)
+        self._puntos = np.empty((filas, *puntos.shape))
+        self._puntos[0] = puntos
+        self._perdidas = None
+        if perdidas_iniciales is not None:
+            self._perdidas = np.empty((filas, lote))
+            self._perdidas[0] = perdidas_iniciales
+        self.n = 1
+        self.activas = np.ones(lote, dtype=bool)
+        self.iteraciones = np.full(lote, -1, dtype=np.int32)
+
+    @property
+    def actual(self):
+        """Último estado registrado, de forma (lote, dimensión)."""
+        return self._puntos[self.n - 1]
+
+    @property
+    def trayectorias(self):
+        """Historial de forma (pasos + 1, lote, dimensión)."""
+        return self._puntos[:self.n]
+
+    @property
+    def perdidas(self):
+        """Pérdidas de forma (pasos + 1, lote), o None si no se registran."""
+        return None if self._perdidas is None else self._perdidas[:self.n]
+
+    def _marcar(self, convergidas):
+        """Retira del lote activo las trayectorias recién convergidas."""
+        nuevas = convergidas & self.activas
+        self.iteraciones[nuevas] = self.n - 1
+        self.activas &= ~nuevas
+
+    def comprobar(self, gradiente):
+        """
+        Aplica el criterio del gradiente en el último estado registrado.
+
+        Args:
+            gradiente (np.ndarray): Gradiente en `actual`, de forma (lote, dimensión).
+
+        Returns:
+            bool: True si queda alguna trayectoria activa.
+        """
+        if self.tolerancia > 0:
+            self._marcar(np.einsum('ij,ij->i', gradiente, gradiente) < self.tolerancia ** 2)
+        return bool(self.activas.any())
+
+    def registrar(self, puntos, perdidas=None):
+        """
+        Añade un paso al historial y aplica el criterio de cambio relativo.
+
+        Args:
+            puntos (np.ndarray): Nuevo estado, de forma (lote, dimensión).
+            perdidas (np.ndarray, opcional): Pérdida de cada nuevo punto.
+
+        Returns:
+            bool: True si queda alguna trayectoria activa.
+        """
+        if self.n == len(self._puntos):
+            filas = min(2 * self.n, self.maximo)
+            self._puntos = _ampliar(self._puntos, filas)
+            if self._perdidas is not None:
+                self._perdidas = _ampliar(self._perdidas, filas)
+        self._puntos[self.n] = puntos
+        if self._perdidas is not None:
+            self._perdidas[self.n] = perdidas
+        self.n += 1
+
+        if self._perdidas is not None and self.tolerancia_relativa > 0:
+            anterior, nueva = self._perdidas[self.n - 2], self._perdidas[self.n - 1]
+            with np.errstate(invalid='ignore'):
+                estancadas = np.abs(nueva - anterior) <= self.tolerancia_relativa * np.abs(anterior)
+            self._marcar(estancadas)
+        return bool(self.activas.any())
+
+
+def _ampliar(bufer, filas):
+    """Copia `bufer` en uno nuevo con `filas` filas (las añadidas sin inicializar)."""
+    nuevo = np.empty((filas, *bufer.shape[1:]), dtype=bufer.dtype)
+    nuevo[:len(bufer)] = bufer
+    return nuevo
+
+# ==============================================================================
+# 4. DECIMACIÓN (RAMER–DOUGLAS–PEUCKER VECTORIZADO)
+# ==============================================================================
+def _distancia_segmento(puntos, a, b):
+    """Distancia de cada punto al segmento [a, b] correspondiente (filas emparejadas)."""
+    ab = b - a
+    longitud2 = np.einsum('ij,ij->i', ab, ab)
+    t = np.divide(np.einsum('ij,ij->i', puntos - a, ab), longitud2,
+                  out=np.zeros_like(longitud2), where=longitud2 > 0)
+    cercano = a + np.clip(t, 0, 1)[:, np.newaxis] * ab
+    return np.linalg.norm(puntos - cercano, axis=1)
+
+
+def simplificar(puntos, tolerancia=TOLERANCIA_SIMPLIFICACION, limites=None):
+    """
+    Índices de los puntos que conserva Ramer–Douglas–Peucker.
+
+    En cada ronda se calcula, para todos los segmentos pendientes a la vez,
+    el punto interior más alejado del segmento; los segmentos cuya distancia
+    máxima supera la tolerancia se parten por ese punto. Se usa la distancia
+    al segmento (no a la recta), que conserva las oscilaciones de ida y
+    vuelta típicas de las tasas de aprendizaje grandes.
+
+    Args:
+        puntos (array_like): Forma (n, dimensión).
+        tolerancia (float): Distancia máxima admitida, como fracción del
+            rango de cada eje.
+        limites (list, opcional): (mínimo, máximo) de cada eje, p. ej. los
+            límites de los ejes de la figura; por defecto, el rango de los puntos.
+
+    Returns:
+        np.ndarray: Índices conservados, en orden creciente (siempre el
+        primero y el último).
+    """
+    puntos = np.asarray(puntos, dtype=float)
+    n = len(puntos)
+    if n < 3 or not np.all(np.isfinite(puntos)):
+        return np.arange(n)   # Los no finitos cortan la línea: se dejan tal cual
+
+    rango = np.ptp(puntos, axis=0) if limites is None else np.ptp(np.asarray(limites, dtype=float), axis=1)
+    puntos = puntos / np.where(rango > 0, rango, 1.0)
+
+    conservar = np.zeros(n, dtype=bool)
+    conservar[[0, -1]] = True
+    inicios, finales = np.array([0]), np.array([n - 1])
+    while inicios.size:
+        interiores = finales - inicios - 1
+        con_interior = interiores > 0
+        inicios, finales, interiores = inicios[con_interior], finales[con_interior], interiores[con_interior]
+        if not inicios.size:
+            break
+        # Todos los puntos interiores de todos los segmentos, concatenados
+        arranques = np.cumsum(interiores) - interiores
+        segmento = np.repeat(np.arange(len(inicios)), interiores)
+        indices = inicios[segmento] + 1 + np.arange(interiores.sum()) - arranques[segmento]
+        distancia = _distancia_segmento(puntos[indices], puntos[inicios[segmento]], puntos[finales[segmento]])
+
+        # Punto más alejado de cada segmento
+        maximos = np.maximum.reduceat(distancia, arranques)
+        candidatos = np.flatnonzero(distancia == maximos[segmento])
+        primeros = candidatos[np.unique(segmento[candidatos], return_index=True)[1]]
+        partir = maximos > tolerancia
+        cortes = indices[primeros][partir]
+        conservar[cortes] = True
+        inicios = np.concatenate([inicios[partir], cortes])
+        finales = np.concatenate([cortes, finales[partir]])
+    return np.flatnonzero(conservar)
+
+
+def decimar(trayectoria, marcas=(), tolerancia=TOLERANCIA_SIMPLIFICACION, limites=None):
+    """
+    Simplifica una trayectoria para dibujarla, conservando las iteraciones marcadas.
+
+    Args:
+        trayectoria (array_like): Forma (pasos + 1, dimensión).
+        marcas (iterable): Iteraciones que se dibujan con marcador; las que
+            superan la longitud de la trayectoria se descartan.
+        tolerancia (float): Ver `simplificar`.
+        limites (list, opcional): Ver `simplificar`.
+
+    Returns:
+        tuple: (puntos simplificados, posiciones de las marcas en ellos
+        —para `markevery`—, iteración original de cada punto).
+    """
+    trayectoria = np.asarray(trayectoria, dtype=float)
+    marcas = np.asarray([m for m in marcas if 0 <= m < len(trayectoria)], dtype=int)
+    indices = np.union1d(simplificar(trayectoria, tolerancia, limites), marcas)
+    return trayectoria[indices], np.searchsorted(indices, marcas).tolist(), indices
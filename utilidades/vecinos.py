@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Grafo de k vecinos más cercanos compartido entre métodos de reducción de
+dimensionalidad (LLE, UMAP) y métricas de calidad de las incrustaciones.
+
+LLE y UMAP buscaban cada uno sus vecinos desde cero sobre los mismos datos.
+Aquí el índice espacial (un KD-tree) se construye una sola vez por conjunto
+de datos y el grafo resultante (los k + 1 vecinos de cada punto, incluido él
+mismo, con sus distancias) se guarda:
+  - en memoria, para las siguientes llamadas del mismo proceso;
+  - en disco, junto a las incrustaciones, para las siguientes ejecuciones.
+
+Cada método toma del grafo lo que necesita: UMAP sus `n_neighbors` columnas
+como `precomputed_knn` y LLE el índice ya construido. El grafo también se
+ofrece como matriz dispersa (CSR) de distancias.
+
+Autor: Alejandro Quintero Ruiz
+"""
+
+# ==============================================================================
+# 1. IMPORTACIÓN DE LIBRERÍAS
+# ==============================================================================
+import hashlib
+
+import numpy as np
+
+from utilidades.cache_superficies import CacheSuperficies
+from utilidades.importacion_diferida import diferido
+from utilidades.incrustaciones import DIRECTORIO_CACHE, TAMANO_MAXIMO_MB, hash_datos
+
+NearestNeighbors = diferido('sklearn.neighbors', 'NearestNeighbors')
+csr_matrix = diferido('scipy.sparse', 'csr_matrix')
+
+# ==============================================================================
+# 2. GRAFO DE VECINOS
+# ==============================================================================
+class GrafoVecinos:
+    """
+    Grafo de los `n_vecinos` vecinos más cercanos de cada punto de `X`.
+
+    Atributos:
+        X (np.ndarray): Datos de forma (muestras, características).
+        n_vecinos (int): Vecinos por punto, sin contar el propio punto.
+        indices (np.ndarray): (muestras, n_vecinos + 1); la columna 0 es el
+            propio punto.
+        distancias (np.ndarray): Distancias euclídeas, con la misma forma.
+    """
+
+    def __init__(self, X, n_vecinos, indices, distancias, indice=None):
+        self.X = X
+        self.n_vecinos = n_vecinos
+        self.indices = indices
+        self.distancias = distancias
+        self._indice = indice
+
+    def indice(self):
+        """Índice espacial (NearestNeighbors con KD-tree) ajustado a `X`."""
+        if self._indice is None:
+            self._indice = NearestNeighbors(n_neighbors=self.n_vecinos + 1,
+                                            algorithm='kd_tree').fit(self.X)
+        return self._indice
+
+    def vecinos(self, k=None):
+        """
+        Índices y distancias de los `k` vecinos de cada punto (sin él mismo).
+
+        Returns:
+            tuple: (indices, distancias), cada uno de forma (muestras, k).
+        """
+        k = self.n_vecinos if k is None else k
+        if k > self.n_vecinos:
+            raise ValueError(f"El grafo solo tiene {self.n_vecinos} vecinos por punto (se pidieron {k}).")
+        return self.indices[:, 1:k + 1], self.distancias[:, 1:k + 1]
+
+    def matriz_dispersa(self, k=None):
+        """Grafo de `k` vecinos como matriz CSR (muestras x muestras) de distancias."""
+        indices, distancias = self.vecinos(k)
+        n, k = indices.shape
+        return csr_matrix((np.ravel(distancias), np.ravel(indices), np.arange(0, n * k + 1, k)),
+                          shape=(n, n))
+
+    def __getstate__(self):
+        # El índice se reconstruye si hace falta en el proceso que lo use.
+        estado = self.__dict__.copy()
+        estado['_indice'] = None
+        return estado
+
+
+_grafos_en_memoria = {}
+
+
+def clave_grafo(huella_datos, n_vecinos):
+    """Clave de caché del grafo de `n_vecinos` vecinos de un conjunto de datos."""
+    return hashlib.sha256(f"grafo_vecinos|{huella_datos}|{n_vecinos}".encode('utf-8')).hexdigest()
+
+
+def grafo_vecinos(X, n_vecinos, cache=None):
+    """
+    Construye (o recupera de memoria o de disco) el grafo de vecinos de `X`.
+
+    Args:
+        X (array_like): Datos de forma (muestras, características).
+        n_vecinos (int): Vecinos por punto, sin contar el propio punto.
+        cache (CacheSuperficies, opcional): Almacén en disco; por defecto, el
+            de las incrustaciones.
+
+    Returns:
+        GrafoVecinos: El grafo.
+    """
+    X = np.asarray(X, dtype=float)
+    clave = clave_grafo(hash_datos(X), n_vecinos)
+    if clave in _grafos_en_memoria:
+        return _grafos_en_memoria[clave]
+
+    cache = cache or CacheSuperficies(DIRECTORIO_CACHE, TAMANO_MAXIMO_MB)
+    indice = None
+    guardado = cache.obtener(clave)
+    if guardado is None:
+        indice = NearestNeighbors(n_neighbors=n_vecinos + 1, algorithm='kd_tree').fit(X)
+        distancias, indices = indice.kneighbors(X)
+        # Un arreglo (2, muestras, k + 1): distancias e índices (exactos en float64).
+        guardado = cache.guardar(clave, np.stack([distancias, indices.astype(float)]))
+
+    grafo = GrafoVecinos(X, n_vecinos, np.asarray(guardado[1], dtype=np.intp),
+                         np.asarray(guardado[0]), indice)
+    _grafos_en_memoria[clave] = grafo
+    return grafo
+
+# ==============================================================================
+# 3. MÉTRICAS DE CALIDAD
+# ==============================================================================
+def conservacion_vecinos(grafo, incrustacion, k=None):
+    """
+    Fracción media de los `k` vecinos originales que siguen entre los `k`
+    vecinos de cada punto en la incrustación (1 = vecindarios intactos).
+
+    Args:
+        grafo (GrafoVecinos): Grafo de los datos originales.
+        incrustacion (array_like): Incrustación de forma (muestras, componentes).
+        k (int, opcional): Tamaño del vecindario; por defecto, el del grafo.
+    """
+    originales, _ = grafo.vecinos(k)
+    k = originales.shape[1]
+    incrustados = NearestNeighbors(n_neighbors=k + 1).fit(incrustacion).kneighbors(
+        incrustacion, return_distance=False)[:, 1:]
+    coincidencias = (originales[:, :, None] == incrustados[:, None, :]).any(axis=2)
+    return float(coincidencias.mean())
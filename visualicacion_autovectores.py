@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 
+from utilidades.exportacion import guardar_figura
+
 # --- Configuración Inicial para Estilo Profesional ---
 # Usar un estilo base que sea limpio y profesional.
 plt.style.use('seaborn-v0_8-whitegrid')
@@ -122,13 +124,8 @@ fig.text(0.98, 0.02, copyright_text, ha='right', va='bottom', fontsize=10, color
 # 5. Bloque de Guardado/Exportación del Archivo
 # Guardar la figura en formato vectorial SVG (escalable y de alta calidad)
 # y en PNG con alta resolución (300 DPI).
-output_filename_svg = "visualizacion_autovector.svg"
-output_filename_pdf = "visualizacion_autovector.pdf"
-output_filename_png = "visualizacion_autovector.png"
-
-plt.savefig(output_filename_svg, format='svg', bbox_inches='tight', pad_inches=0.1)
-plt.savefig(output_filename_pdf, format='pdf', bbox_inches='tight', pad_inches=0.1)
-plt.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight', pad_inches=0.1)
+output_filename_svg, output_filename_pdf, output_filename_png = guardar_figura(
+    fig, "visualizacion_autovector")
 
 # Mostrar el gráfico (opcional, útil si se ejecuta interactivamente)
 plt.show()
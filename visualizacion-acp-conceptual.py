@@ -3,13 +3,20 @@
 # =============================================================================
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+from utilidades.muestreo import generador_figura, normal_multivariante
+
+sns = diferido('seaborn')
 
 # =============================================================================
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # =============================================================================
 # Configuración para la reproducibilidad de los datos
-np.random.seed(42)
+generador = generador_figura('visualizacion-acp-conceptual')
 
 # Parámetros de la distribución de datos 2D
 # El centro de la nube de puntos
@@ -21,26 +28,19 @@ matriz_covarianza = [[1.0, 0.8],
                      [0.8, 1.0]]
 
 # Generación de 300 puntos de datos siguiendo una distribución normal multivariada
-datos = np.random.multivariate_normal(centro_datos, matriz_covarianza, 300)
+datos = normal_multivariante(centro_datos, matriz_covarianza, 300, generador)
 
 # --- Cálculo de Componentes Principales ---
-# a) Centrar los datos (restar la media)
-datos_centrados = datos - np.mean(datos, axis=0)
-
-# b) Calcular la matriz de covarianza empírica de los datos centrados
-#    (S en la definición)
-S = np.cov(datos_centrados, rowvar=False)
-
-# c) Calcular los autovalores (lambda) y autovectores de la matriz de covarianza S
+# En una sola pasada sobre los datos se acumulan:
+# a) la media (para centrar los datos),
+# b) la matriz de covarianza empírica de los datos centrados (S en la definición),
+# c) sus autovalores (lambda) y autovectores, ordenados de mayor a menor.
 #    Los autovalores representan la varianza explicada por cada componente.
 #    Los autovectores representan la dirección de los componentes.
-autovalores, autovectores = np.linalg.eigh(S)
-
-# d) Ordenar los autovalores y autovectores de mayor a menor
-#    El primer componente principal corresponde al autovalor más grande.
-orden = np.argsort(autovalores)[::-1]
-autovalores_ordenados = autovalores[orden]
-autovectores_ordenados = autovectores[:, orden]
+acp = ACPIncremental().fit(datos)
+S = acp.covariance_
+autovalores_ordenados = acp.explained_variance_
+autovectores_ordenados = acp.components_.T
 
 # =============================================================================
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
@@ -70,7 +70,7 @@ def generar_grafico_pca(datos, media, autovalores, autovectores):
 
     # --- Dibujo de los Elementos del Gráfico ---
     # a) Gráfico de dispersión de los datos
-    ax.scatter(datos[:, 0], datos[:, 1], alpha=0.6, c=color_datos, label="Datos Originales")
+    dispersion(ax, datos[:, 0], datos[:, 1], alpha=0.6, color=color_datos, label="Datos Originales")
 
     # b) Dibujo de los componentes principales como flechas (vectores)
     #    La longitud de la flecha se escala por la raíz cuadrada del autovalor
@@ -92,11 +92,12 @@ def generar_grafico_pca(datos, media, autovalores, autovectores):
 
     # --- Anotaciones y Etiquetas ---
     # Anotación para el Primer Componente Principal (CP1)
-    ax.text(media[0] + autovectores[0, 0] * 4.5, 
-            media[1] + autovectores[1, 0] * 4.5, 
-            "CP1 (Dirección de máxima varianza)\nVector propio del mayor autovalor (\u03BB\u2081)",
-            fontsize=12, color=color_cp1, weight='bold', ha='center', va='center',
-            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec=color_cp1, lw=1, alpha=0.9))
+    # (anclada a la punta de la flecha: el signo de un autovector es arbitrario)
+    ax.annotate("CP1 (Dirección de máxima varianza)\nVector propio del mayor autovalor (\u03BB\u2081)",
+                xy=media + np.sqrt(autovalores[0]) * 3 * autovectores[:, 0],
+                xytext=(-30, 0), textcoords='offset points',
+                fontsize=12, color=color_cp1, weight='bold', ha='right', va='center',
+                bbox=dict(boxstyle="round,pad=0.3", fc="white", ec=color_cp1, lw=1, alpha=0.9))
 
     # Anotación para el Segundo Componente Principal (CP2)
     ax.text(media[0] + autovectores[0, 1] * 2.5, 
@@ -127,7 +128,7 @@ def generar_grafico_pca(datos, media, autovalores, autovectores):
 # Llamada a la función para crear el gráfico
 fig, ax = generar_grafico_pca(
     datos=datos,
-    media=np.mean(datos, axis=0),
+    media=acp.mean_,
     autovalores=autovalores_ordenados,
     autovectores=autovectores_ordenados
 )
@@ -144,11 +145,8 @@ fig.text(0.98, 0.02, "© Alejandro Quintero Ruiz. Generado con Python.",
 # =============================================================================
 # Guardar la imagen en formato SVG (vectorial, ideal para PowerPoint y publicaciones)
 # y en PNG de alta resolución como alternativa.
-nombre_archivo_svg = "visualizacion_pca_conceptual.svg"
-nombre_archivo_png = "visualizacion_pca_conceptual.png"
-
-plt.savefig(nombre_archivo_svg, format='svg', bbox_inches='tight')
-plt.savefig(nombre_archivo_png, format='png', dpi=300, bbox_inches='tight')
+nombre_archivo_svg, nombre_archivo_png = guardar_figura(
+    fig, "visualizacion_pca_conceptual", formatos=('svg', 'png'))
 
 # Mostrar el gráfico en la consola/notebook (opcional)
 plt.show()
@@ -1,8 +1,18 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion
+from utilidades.exportacion import guardar_figura_en
+from utilidades.importacion_diferida import diferido
+from utilidades.medicion import etapa
+from utilidades.muestreo import generador_figura, normal_multivariante
+
+sns = diferido('seaborn')
+
+# Solver del ACP: 'covarianza', 'aleatorizado' (SVD aleatorizada, solo los
+# componentes dibujados; para datos con miles de columnas) o 'auto'.
+SOLVER_ACP = 'auto'
 
 def generate_pca_visualization(output_filename_svg="pca_visualization.svg", 
                                output_filename_png="pca_visualization.png", 
@@ -19,30 +29,31 @@ def generate_pca_visualization(output_filename_svg="pca_visualization.svg",
 
     # --- 1. Definición de Datos/Parámetros Matemáticos ---
     # Generar datos sintéticos 2D con una correlación clara
-    np.random.seed(42) # Para reproducibilidad
+    generador = generador_figura('visualizacion_ACP') # Para reproducibilidad
     mean = [0, 0]
     cov = [[10, 8], [8, 10]] # Matriz de covarianza para crear una correlación
-    X = np.random.multivariate_normal(mean, cov, 200)
+    with etapa('datos'):
+        X = normal_multivariante(mean, cov, 200, generador)
 
     # Escalar los datos para que la PCA sea más robusta (aunque en este caso 
     # con datos centrados en 0 no es estrictamente necesario para la dirección,
     # es una buena práctica general).
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    # Aplicar PCA
-    pca = PCA(n_components=2) # Calculamos 2 componentes para visualizarlos
-    pca.fit(X_scaled)
+    with etapa('ajuste_modelo'):
+        # Aplicar PCA sobre los datos estandarizados
+        pca = ACPIncremental(n_components=2, estandarizar=True, solver=SOLVER_ACP) # Calculamos 2 componentes para visualizarlos
+        pca.fit(X)
+        print(f"ACP (solver {pca.solver_}): error relativo de aproximación {pca.error_aproximacion_:.3f}")
+        X_scaled = pca.estandarizar_datos(X)
 
     # Obtener los componentes principales (eigenvectores) y la varianza explicada (eigenvalores)
     components = pca.components_
     explained_variance = pca.explained_variance_
 
     # Proyectar los datos sobre el primer componente principal
-    X_pca_projected = pca.transform(X_scaled)[:, 0] # Solo la primera componente
+    X_pca_projected = pca.transform(X)[:, 0] # Solo la primera componente
     # Para visualizar la proyección en el espacio original, necesitamos "deshacer" la proyección
     # Esto es, proyectar los datos de 1D de vuelta al espacio 2D a lo largo del PC1
-    X_reconstructed = pca.inverse_transform(pca.transform(X_scaled))
+    X_reconstructed = pca.estandarizar_datos(pca.inverse_transform(pca.transform(X)))
 
 
     # --- 2. Configuración Estética y Generación del Gráfico ---
@@ -67,7 +78,7 @@ def generate_pca_visualization(output_filename_svg="pca_visualization.svg",
     ax.set_title('Análisis de Componentes Principales (PCA): Reducción de Dimensionalidad', pad=20)
 
     # Plotear los datos originales escalados
-    ax.scatter(X_scaled[:, 0], X_scaled[:, 1], alpha=0.6, s=50, label='Datos Originales (Escalados)', zorder=2)
+    dispersion(ax, X_scaled[:, 0], X_scaled[:, 1], alpha=0.6, s=50, label='Datos Originales (Escalados)', zorder=2)
 
     # Plotear el centro de los datos
     ax.scatter(0, 0, color='red', marker='X', s=150, label='Centro de los Datos', zorder=3)
@@ -92,7 +103,7 @@ def generate_pca_visualization(output_filename_svg="pca_visualization.svg",
 
     # Plotear la proyección de los datos sobre el primer componente principal
     # Esto se visualiza como puntos en la línea del PC1
-    ax.scatter(X_reconstructed[:, 0], X_reconstructed[:, 1], 
+    dispersion(ax, X_reconstructed[:, 0], X_reconstructed[:, 1],
                color='orange', alpha=0.7, s=30, label='Datos Proyectados en PC1', zorder=3)
     
     # Dibujar la línea del primer componente principal
@@ -137,13 +148,10 @@ def generate_pca_visualization(output_filename_svg="pca_visualization.svg",
     plt.tight_layout(rect=[0, 0.03, 0.85, 0.95]) # Ajusta el área de trazado para dejar espacio a la leyenda y copyright
 
     # --- 4. Bloque de Guardado/Exportación del Archivo ---
-    # Guardar como SVG (vectorial)
-    plt.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-    print(f"Gráfico guardado como {output_filename_svg}")
-
-    # Guardar como PNG de alta resolución
-    plt.savefig(output_filename_png, format='png', dpi=dpi, bbox_inches='tight')
-    print(f"Gráfico guardado como {output_filename_png}")
+    # Guardar como SVG (vectorial) y PNG de alta resolución, con un único
+    # cálculo de layout para ambos formatos
+    for ruta in guardar_figura_en(fig, [output_filename_svg, output_filename_png], dpi=dpi):
+        print(f"Gráfico guardado como {ruta}")
 
     plt.show() # Mostrar el gráfico
 
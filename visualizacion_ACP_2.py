@@ -3,14 +3,21 @@
 # ----------------------------------------------------------------------------
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.decomposition import PCA
+
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion
+from utilidades.exportacion import guardar_figura
+from utilidades.importacion_diferida import diferido
+from utilidades.medicion import etapa
+from utilidades.muestreo import generador_figura, normal_multivariante
+
+sns = diferido('seaborn')
 
 # ----------------------------------------------------------------------------
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 # ----------------------------------------------------------------------------
 # Semilla para reproducibilidad de los datos aleatorios
-np.random.seed(42)
+generador = generador_figura('visualizacion_ACP_2')
 
 # Parámetros para generar datos 2D correlacionados
 # Media de los datos (centro de la nube de puntos)
@@ -23,12 +30,19 @@ cov = [[1, 0.8],
 n_samples = 300
 
 # Generación de los datos usando una distribución normal multivariada
-X = np.random.multivariate_normal(mean, cov, n_samples)
+with etapa('datos'):
+    X = normal_multivariante(mean, cov, n_samples, generador)
+
+# Solver del ACP: 'covarianza', 'aleatorizado' (SVD aleatorizada, solo los
+# componentes dibujados; para datos con miles de columnas) o 'auto'.
+SOLVER_ACP = 'auto'
 
 # Aplicación del Análisis de Componentes Principales (PCA)
 # n_components=2 para obtener los dos componentes principales de nuestros datos 2D
-pca = PCA(n_components=2)
-pca.fit(X)
+with etapa('ajuste_modelo'):
+    pca = ACPIncremental(n_components=2, solver=SOLVER_ACP)
+    pca.fit(X)
+    print(f"ACP (solver {pca.solver_}): error relativo de aproximación {pca.error_aproximacion_:.3f}")
 
 # ----------------------------------------------------------------------------
 # 3. FUNCIÓN DE GENERACIÓN DEL GRÁFICO
@@ -39,7 +53,7 @@ def generar_grafico_pca(X, pca_model):
     
     Args:
         X (np.ndarray): Datos originales.
-        pca_model (PCA): Modelo PCA ajustado a los datos.
+        pca_model (ACPIncremental): Modelo PCA ajustado a los datos.
     """
     # --- Configuración Estética Inicial ---
     # Usamos el estilo de seaborn para una base profesional y limpia
@@ -52,7 +66,7 @@ def generar_grafico_pca(X, pca_model):
 
     # --- Dibujo de los Datos y Componentes ---
     # Dibujar la nube de puntos de los datos originales
-    ax.scatter(X[:, 0], X[:, 1], alpha=0.6, color=palette[0], label='Datos Originales (Correlacionados)')
+    dispersion(ax, X[:, 0], X[:, 1], alpha=0.6, color=palette[0], label='Datos Originales (Correlacionados)')
 
     # Dibujar los componentes principales como vectores
     # Los componentes son vectores que indican la dirección de máxima varianza
@@ -107,13 +121,8 @@ fig.tight_layout(rect=[0, 0.03, 1, 0.97])
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # ----------------------------------------------------------------------------
 # Guardar la imagen en formato vectorial (SVG) y raster (PNG) de alta resolución
-output_filename_svg = "visualizacion_pca.svg"
-output_filename_pdf = "visualizacion_pca.pdf"
-output_filename_png = "visualizacion_pca.png"
-
-fig.savefig(output_filename_svg, format='svg', bbox_inches='tight')
-fig.savefig(output_filename_pdf, format='pdf', bbox_inches='tight')
-fig.savefig(output_filename_png, format='png', dpi=300, bbox_inches='tight')
+output_filename_svg, output_filename_pdf, output_filename_png = guardar_figura(
+    fig, "visualizacion_pca")
 
 # Mostrar el gráfico (opcional, útil en entornos interactivos como Jupyter)
 plt.show()
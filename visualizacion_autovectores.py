@@ -10,6 +10,8 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from matplotlib.patches import Arrow
 
+from utilidades.exportacion import guardar_figura
+
 # -----------------------------------------------------------------------------
 
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
@@ -136,14 +138,10 @@ if __name__ == '__main__':
     agregar_copyright(figura)
 
     # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
-    nombre_archivo_svg = 'visualizacion_autovectores.svg'
-    nombre_archivo_png = 'visualizacion_autovectores.png'
-
-    # Guardar en formato vectorial SVG (recomendado para PowerPoint)
-    figura.savefig(nombre_archivo_svg, format='svg', bbox_inches='tight')
-
-    # Guardar también en formato PNG de alta resolución (300 DPI) como alternativa
-    figura.savefig(nombre_archivo_png, format='png', dpi=300, bbox_inches='tight')
+    # Guardar en formato vectorial SVG (recomendado para PowerPoint) y también
+    # en formato PNG de alta resolución (300 DPI) como alternativa
+    nombre_archivo_svg, nombre_archivo_png = guardar_figura(
+        figura, 'visualizacion_autovectores', formatos=('svg', 'png'))
 
     print(f"Gráfico guardado exitosamente como '{nombre_archivo_svg}' y '{nombre_archivo_png}'.")
 
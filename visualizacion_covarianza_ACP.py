@@ -3,11 +3,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from utilidades.acp_incremental import ACPIncremental
+from utilidades.densidad import dispersion
+from utilidades.exportacion import guardar_figura
+from utilidades.muestreo import generador_figura, normal_multivariante
+
 # 2. DEFINICIÓN DE DATOS Y PARÁMETROS MATEMÁTICOS
 
 # Generar datos sintéticos con una correlación específica
 # Usaremos una distribución normal multivariada para tener control total.
-np.random.seed(42)  # Para reproducibilidad
+generador = generador_figura('visualizacion_covarianza_ACP')  # Para reproducibilidad
 media = [0, 0]
 # Matriz de covarianza:
 # [[Var(X), Cov(X,Y)],
@@ -16,22 +21,18 @@ media = [0, 0]
 matriz_cov_original = [[1.0, 0.8], 
                        [0.8, 1.0]]
 # Generamos 200 puntos de datos de 2 dimensiones
-X = np.random.multivariate_normal(media, matriz_cov_original, 200)
-
-# Centrar los datos (un paso crucial en PCA)
-X_centrado = X - np.mean(X, axis=0)
+X = normal_multivariante(media, matriz_cov_original, 200, generador)
 
-# Calcular la matriz de covarianza a partir de los datos (S o Σ)
-# S = (X^T * X) / (n-1)
-S = np.cov(X_centrado, rowvar=False)
+# Calcular la media y la matriz de covarianza de los datos (S o Σ) en una
+# sola pasada, S = (X_c^T * X_c) / (n-1), y sus autovalores y autovectores
+# (la esencia de PCA), ordenados por autovalor en orden descendente
+acp = ACPIncremental().fit(X)
+S = acp.covariance_
+autovalores_ordenados = acp.explained_variance_
+autovectores_ordenados = acp.components_.T
 
-# Calcular autovalores y autovectores (la esencia de PCA)
-autovalores, autovectores = np.linalg.eig(S)
-
-# Ordenar los autovectores por sus autovalores en orden descendente
-orden = np.argsort(autovalores)[::-1]
-autovalores_ordenados = autovalores[orden]
-autovectores_ordenados = autovectores[:, orden]
+# Centrar los datos (un paso crucial en PCA)
+X_centrado = acp.estandarizar_datos(X)
 
 # El primer autovector es el Componente Principal 1 (PC1)
 # El segundo autovector es el Componente Principal 2 (PC2)
@@ -61,7 +62,7 @@ fig, ax = plt.subplots(figsize=(12, 6.75))
 
 # --- Dibujar los Datos ---
 # Usamos un color suave y semitransparente para los puntos
-ax.scatter(X_centrado[:, 0], X_centrado[:, 1], alpha=0.6, c='#3498db', label='Datos Centrados (X)')
+dispersion(ax, X_centrado[:, 0], X_centrado[:, 1], alpha=0.6, color='#3498db', label='Datos Centrados (X)')
 
 # --- Dibujar los Componentes Principales (Autovectores) ---
 # La longitud de la flecha se escala por la raíz del autovalor (desviación estándar)
@@ -118,9 +119,7 @@ fig.text(0.5, 0.01, copyright_text, ha='center', va='bottom', fontsize=8, color=
 # 5. BLOQUE DE GUARDADO/EXPORTACIÓN DEL ARCHIVO
 # Guardamos en formato SVG (vectorial, escalable) y PNG (alta resolución)
 nombre_archivo_base = "pca_covariance_visualization"
-plt.savefig(f'{nombre_archivo_base}.svg', format='svg', bbox_inches='tight')
-plt.savefig(f'{nombre_archivo_base}.pdf', format='pdf', bbox_inches='tight')
-plt.savefig(f'{nombre_archivo_base}.png', format='png', dpi=300, bbox_inches='tight')
+guardar_figura(fig, nombre_archivo_base)
 
 print(f"Gráficos guardados como '{nombre_archivo_base}.svg', '{nombre_archivo_base}.pdf' y '{nombre_archivo_base}.png'")
 